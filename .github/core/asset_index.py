@@ -0,0 +1,126 @@
+# asset_index.py
+#
+# In-memory index over the Alpaca asset master list
+# Location: /.github/core/asset_index.py
+# Purpose: Builds a symbol-sorted asset table with posting sets per status, class,
+#          exchange, boolean flag and attribute, so filtered and paginated asset
+#          queries only visit the rows that can match instead of the whole list.
+
+import base64
+import binascii
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Categorical Asset fields indexed by value
+CATEGORY_FIELDS = ("status", "asset_class", "exchange")
+# Boolean Asset fields indexed as True/False
+FLAG_FIELDS = ("tradable", "marginable", "shortable", "easy_to_borrow", "fractionable")
+
+
+def _key(value: Any) -> str:
+    """Normalize an enum or string value for case-insensitive lookups."""
+    return str(getattr(value, "value", value)).lower()
+
+
+def encode_cursor(symbol: str) -> str:
+    """Opaque pagination cursor pointing just past symbol."""
+    return base64.urlsafe_b64encode(symbol.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Symbol encoded in a cursor from encode_cursor; raises ValueError if malformed."""
+    try:
+        symbol = base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        symbol = ""
+    if not symbol:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return symbol
+
+
+class AssetIndex:
+    """
+    Immutable index over a list of assets, sorted by symbol.
+
+    Rows are addressed by their position in symbol order, so a symbol prefix maps
+    to one contiguous row range and keyset cursors map to a bisect.
+    """
+
+    def __init__(self, assets: Iterable[Any]):
+        self.assets: List[Any] = sorted(assets, key=lambda asset: asset.symbol)
+        self.symbols: List[str] = [asset.symbol for asset in self.assets]
+        self._names: Optional[List[str]] = None
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {
+            field: {} for field in CATEGORY_FIELDS + FLAG_FIELDS + ("attributes",)}
+        for row, asset in enumerate(self.assets):
+            for field in CATEGORY_FIELDS:
+                self._postings[field].setdefault(_key(getattr(asset, field, None)), set()).add(row)
+            for field in FLAG_FIELDS:
+                self._postings[field].setdefault(bool(getattr(asset, field, False)), set()).add(row)
+            for attribute in getattr(asset, "attributes", None) or ():
+                self._postings["attributes"].setdefault(_key(attribute), set()).add(row)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def _lower_names(self) -> List[str]:
+        # Built on the first name search only; most queries filter by symbol or flags
+        if self._names is None:
+            self._names = [(asset.name or "").lower() for asset in self.assets]
+        return self._names
+
+    def query(self, symbol_prefix: Optional[str] = None, name_contains: Optional[str] = None,
+              after: Optional[str] = None, attributes: Optional[Iterable[str]] = None,
+              **filters: Any) -> List[int]:
+        """
+        Rows matching every given filter, in symbol order.
+
+        Args:
+            symbol_prefix: Keep symbols starting with this prefix (case-insensitive)
+            name_contains: Keep assets whose name contains this text (case-insensitive)
+            after: Keep symbols sorting after this one (keyset pagination)
+            attributes: Keep assets having any of these attributes
+            **filters: Field=value filters on CATEGORY_FIELDS and FLAG_FIELDS; None is ignored
+
+        Returns:
+            Row numbers into self.assets
+        """
+        lo, hi = 0, len(self.assets)
+        if symbol_prefix:
+            prefix = symbol_prefix.upper()
+            lo = bisect_left(self.symbols, prefix)
+            hi = bisect_left(self.symbols, prefix + "\uffff")
+        if after:
+            lo = max(lo, bisect_right(self.symbols, after))
+        if lo >= hi:
+            return []
+
+        postings: List[Set[int]] = []
+        for field, value in filters.items():
+            if field not in CATEGORY_FIELDS and field not in FLAG_FIELDS:
+                raise ValueError(f"Unknown asset filter: {field}")
+            if value is None:
+                continue
+            key = bool(value) if field in FLAG_FIELDS else _key(value)
+            postings.append(self._postings[field].get(key, set()))
+        if attributes:
+            wanted = [self._postings["attributes"].get(_key(name), set()) for name in attributes]
+            postings.append(set().union(*wanted))
+
+        rows: Iterable[int] = range(lo, hi)
+        if postings:
+            # Walk whichever is smaller - the symbol range or the most selective
+            # posting set - and probe the others
+            postings.sort(key=len)
+            if len(postings[0]) < hi - lo:
+                smallest, rest = postings[0], postings[1:]
+                rows = sorted(row for row in smallest
+                              if lo <= row < hi and all(row in other for other in rest))
+            else:
+                rows = [row for row in rows if all(row in other for other in postings)]
+
+        if name_contains:
+            needle = name_contains.lower()
+            names = self._lower_names()
+            return [row for row in rows if needle in names[row]]
+        return list(rows)
@@ -0,0 +1,368 @@
+# bar_store.py
+#
+# Persistent on-disk store for historical price bars
+# Location: /.github/core/bar_store.py
+# Purpose: Keeps downloaded stock/crypto bars in memory-mapped NumPy columnar files
+#          keyed by symbol, timeframe and feed, tracks which time ranges have been
+#          fetched, and hands back only the missing ranges so repeat history queries
+#          are served from disk.
+
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# One row per bar; timestamps are UTC nanoseconds since the epoch
+BAR_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("trade_count", "<f8"),
+    ("vwap", "<f8"),
+])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9.\-]")
+
+
+class BarRow(NamedTuple):
+    """A stored bar, shaped like the SDK's Bar model for formatting code."""
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    trade_count: Optional[float]
+    vwap: Optional[float]
+    symbol: Optional[str] = None
+
+
+def to_ns(value: datetime) -> int:
+    """Convert a datetime to UTC epoch nanoseconds; naive values are treated as UTC like the SDK does."""
+    if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def from_ns(value: int) -> datetime:
+    """Convert UTC epoch nanoseconds to an aware datetime."""
+    return _EPOCH + timedelta(microseconds=int(value) // 1000)
+
+
+def to_array(bars: Iterable[Any]) -> np.ndarray:
+    """Convert SDK Bar models to a BAR_DTYPE array (missing trade count/VWAP become NaN)."""
+    return np.array([
+        (to_ns(bar.timestamp), bar.open, bar.high, bar.low, bar.close, bar.volume,
+         np.nan if bar.trade_count is None else bar.trade_count,
+         np.nan if bar.vwap is None else bar.vwap)
+        for bar in bars
+    ], dtype=BAR_DTYPE)
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive OS-level lock on path (created if missing), across processes."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_intervals(start: int, end: int, covered: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    missing: List[Tuple[int, int]] = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            missing.append((cursor, cov_start))
+        cursor = max(cursor, cov_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+class BarStore:
+    """
+    Memory-mapped columnar bar files with coverage tracking.
+
+    Each key (symbol, timeframe, feed) maps to a `.npy` file of BAR_DTYPE rows sorted
+    by timestamp plus a `.json` sidecar listing the time intervals already fetched.
+    Callers ask for missing_ranges(), fetch those from the API, write() them back and
+    then read() the full window from disk.
+
+    Every load-merge-save cycle holds a per-key `.lock` file, so the server and the
+    compact-bars command (a separate process) never interleave their writes.
+    """
+
+    def __init__(self, root: str, retention_days: float = 0, settle_seconds: float = 900):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the bar files (created on first write)
+            retention_days: Drop bars older than this many days on compaction (0 keeps everything)
+            settle_seconds: Minimum age before a range counts as final; newer bars are refetched
+                because the most recent bar may still be forming
+        """
+        self.root = Path(root).expanduser()
+        self.retention_days = retention_days
+        self.settle_seconds = settle_seconds
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.bars_read = 0
+        self.bars_fetched = 0
+
+    # ------------------------------------------------------------------
+    # Paths and metadata
+    # ------------------------------------------------------------------
+
+    def _paths(self, key: Tuple[str, str, str]) -> Tuple[Path, Path]:
+        symbol, timeframe, feed = key
+        directory = self.root / _UNSAFE_CHARS.sub("_", feed) / _UNSAFE_CHARS.sub("_", timeframe)
+        stem = _UNSAFE_CHARS.sub("_", symbol.upper())
+        return directory / f"{stem}.npy", directory / f"{stem}.json"
+
+    @contextlib.contextmanager
+    def _lock(self, data_path: Path) -> Iterator[None]:
+        """Exclusive access to one bar file and its sidecar, for threads and other processes."""
+        with self._locks_lock:
+            thread_lock = self._locks.setdefault(data_path, threading.Lock())
+        with thread_lock, _file_lock(data_path.with_suffix(".lock")):
+            yield
+
+    def _load_coverage(self, meta_path: Path) -> List[Tuple[int, int]]:
+        try:
+            with open(meta_path) as f:
+                return [tuple(interval) for interval in json.load(f)["coverage"]]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _load_bars(self, data_path: Path) -> np.ndarray:
+        try:
+            return np.load(data_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return np.empty(0, dtype=BAR_DTYPE)
+
+    def _save(self, key: Tuple[str, str, str], bars: np.ndarray,
+              coverage: List[Tuple[int, int]]) -> None:
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to temp files and rename so concurrent readers keep a consistent mapping
+        tmp_data = data_path.with_suffix(".npy.tmp")
+        with open(tmp_data, "wb") as f:
+            np.save(f, np.ascontiguousarray(bars, dtype=BAR_DTYPE))
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        with open(tmp_meta, "w") as f:
+            json.dump({"symbol": key[0], "timeframe": key[1], "feed": key[2],
+                       "coverage": [list(interval) for interval in coverage],
+                       "updated_at": time.time()}, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def missing_ranges(self, key: Tuple[str, str, str], start: datetime,
+                       end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Get the parts of [start, end] that have not been fetched yet.
+
+        Args:
+            key: (symbol, timeframe, feed)
+            start: Window start
+            end: Window end
+
+        Returns:
+            List of (start, end) datetime ranges to fetch from the API, in order
+        """
+        _, meta_path = self._paths(key)
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        missing = _subtract_intervals(start_ns, end_ns, self._load_coverage(meta_path))
+        if not missing:
+            self.hits += 1
+        elif missing == [(start_ns, end_ns)]:
+            self.misses += 1
+        else:
+            self.partial_hits += 1
+        return [(from_ns(s), from_ns(e)) for s, e in missing]
+
+    def write(self, key: Tuple[str, str, str], bars: Iterable[Any],
+              fetched: Iterable[Tuple[datetime, datetime]], bar_seconds: float) -> None:
+        """
+        Merge freshly fetched bars into the store and record the fetched ranges.
+
+        Ranges are only marked as covered up to the settle horizon, so the latest
+        (possibly still forming) bars are refetched on the next request.
+
+        Args:
+            key: (symbol, timeframe, feed)
+            bars: SDK Bar models returned for the fetched ranges
+            fetched: The (start, end) ranges that were requested
+            bar_seconds: Duration of one bar, used to extend the settle horizon
+        """
+        rows = to_array(bars)
+        horizon = to_ns(datetime.now(timezone.utc)) - int(max(self.settle_seconds, bar_seconds) * 1e9)
+        new_coverage = [(to_ns(s), min(to_ns(e), horizon)) for s, e in fetched]
+        new_coverage = [(s, e) for s, e in new_coverage if e > s]
+
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock(data_path):
+            existing = self._load_bars(data_path)
+            if len(existing):
+                combined = np.concatenate([np.asarray(existing), rows])
+                # Keep the newest copy of each timestamp; fresh rows come last
+                order = np.argsort(combined["timestamp"], kind="stable")
+                combined = combined[order]
+                last = np.append(combined["timestamp"][1:] != combined["timestamp"][:-1], True)
+                combined = combined[last]
+            else:
+                combined = rows[np.argsort(rows["timestamp"], kind="stable")]
+            coverage = _merge_intervals(self._load_coverage(meta_path) + new_coverage)
+            self._save(key, combined, coverage)
+        self.bars_fetched += len(rows)
+
+    def read(self, key: Tuple[str, str, str], start: datetime, end: datetime,
+             limit: Optional[int] = None) -> np.ndarray:
+        """
+        Read stored bars with start <= timestamp <= end.
+
+        Args:
+            key: (symbol, timeframe, feed)
+            start: Window start
+            end: Window end
+            limit: Return at most this many bars from the start of the window
+
+        Returns:
+            Structured array of BAR_DTYPE rows (a view into the memory-mapped file)
+        """
+        data_path, _ = self._paths(key)
+        bars = self._load_bars(data_path)
+        timestamps = bars["timestamp"]
+        lo = int(np.searchsorted(timestamps, to_ns(start), side="left"))
+        hi = int(np.searchsorted(timestamps, to_ns(end), side="right"))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        self.bars_read += hi - lo
+        return bars[lo:hi]
+
+    @staticmethod
+    def rows(bars: np.ndarray, symbol: Optional[str] = None) -> Iterator[BarRow]:
+        """Iterate stored bars as BarRow tuples tagged with symbol."""
+        for ts, o, h, l, c, v, n, vw in bars.tolist():
+            yield BarRow(from_ns(ts), o, h, l, c, v,
+                         None if n != n else n, None if vw != vw else vw, symbol)
+
+    def compact(self, retention_days: Optional[float] = None) -> Dict[str, int]:
+        """
+        Apply retention and rewrite every bar file contiguously.
+
+        Args:
+            retention_days: Override the configured retention (0 keeps everything)
+
+        Returns:
+            Counters: files, files_removed, bars_dropped, bytes_before, bytes_after
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        cutoff = None
+        if retention_days and retention_days > 0:
+            cutoff = to_ns(datetime.now(timezone.utc) - timedelta(days=retention_days))
+        summary = {"files": 0, "files_removed": 0, "bars_dropped": 0,
+                   "bytes_before": 0, "bytes_after": 0}
+        if not self.root.exists():
+            return summary
+
+        # Leftovers from interrupted writes; a temp file is only removed under its key's
+        # lock so that a save in progress in the server is not cut short
+        for tmp in sorted(self.root.rglob("*.tmp")):
+            data_path = tmp.with_suffix("").with_suffix(".npy")
+            with self._lock(data_path):
+                tmp.unlink(missing_ok=True)
+
+        for meta_path in sorted(self.root.rglob("*.json")):
+            data_path = meta_path.with_suffix(".npy")
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                key = (meta["symbol"], meta["timeframe"], meta["feed"])
+            except (OSError, ValueError, KeyError):
+                continue
+            summary["files"] += 1
+            summary["bytes_before"] += data_path.stat().st_size if data_path.exists() else 0
+            with self._lock(data_path):
+                bars = np.array(self._load_bars(data_path))
+                coverage = _merge_intervals(self._load_coverage(meta_path))
+                if cutoff is not None:
+                    keep = bars["timestamp"] >= cutoff
+                    summary["bars_dropped"] += int((~keep).sum())
+                    bars = bars[keep]
+                    coverage = [(max(s, cutoff), e) for s, e in coverage if e > cutoff]
+                if not len(bars) and not coverage:
+                    data_path.unlink(missing_ok=True)
+                    meta_path.unlink(missing_ok=True)
+                    summary["files_removed"] += 1
+                    continue
+                self._save(key, bars, coverage)
+            summary["bytes_after"] += data_path.stat().st_size
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters and on-disk footprint."""
+        files = list(self.root.rglob("*.npy")) if self.root.exists() else []
+        return {
+            "root": str(self.root),
+            "files": len(files),
+            "bytes": sum(f.stat().st_size for f in files),
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "bars_read": self.bars_read,
+            "bars_fetched": self.bars_fetched,
+            "retention_days": self.retention_days,
+        }
@@ -0,0 +1,241 @@
+# client_registry.py
+#
+# Lazy construction of Alpaca SDK clients and cheap imports of SDK leaf modules
+# Location: /.github/core/client_registry.py
+# Purpose: Lets the server register client factories at import time and build each
+#          client on first use, hands out proxies so module-level names keep working,
+#          and loads dependency-free SDK modules (enums, timeframe, exceptions) without
+#          executing the heavy alpaca.data / alpaca.trading package initializers.
+
+import importlib.metadata
+import importlib.util
+import os
+import re
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# alpaca-py releases (major.minor) whose enum, timeframe and exception modules were
+# checked to import nothing from the SDK; other releases use the regular import
+VERIFIED_SDK_VERSIONS = ("0.44",)
+
+# Package name -> leaf modules loaded by sdk_module before the package itself
+_preloaded_children: Dict[str, List[str]] = {}
+_sdk_version_verified: Optional[bool] = None
+_SDK_IMPORT = re.compile(r"^\s*(from\s+(alpaca\b|\.)|import\s+alpaca\b)", re.MULTILINE)
+
+
+def _installed_minor() -> str:
+    """Installed alpaca-py release as "major.minor" ("" when it is not installed)."""
+    try:
+        version = importlib.metadata.version("alpaca-py")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+    return ".".join(version.split(".")[:2])
+
+
+def _leaf_loading_verified() -> bool:
+    """Whether the installed alpaca-py is a release the leaf loading was checked against."""
+    global _sdk_version_verified
+    if _sdk_version_verified is None:
+        _sdk_version_verified = _installed_minor() in VERIFIED_SDK_VERSIONS
+    return _sdk_version_verified
+
+
+class _PreloadedChildBinder:
+    """
+    Meta path finder that binds leaf modules loaded by sdk_module as attributes of
+    their package when the package is imported, as a regular submodule import would.
+    """
+
+    def find_spec(self, fullname: str, path: Any = None, target: Any = None) -> Any:
+        if fullname not in _preloaded_children:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None and spec.loader is not None:
+                break
+        else:
+            return None
+        exec_module = spec.loader.exec_module
+
+        def _bind_and_exec(module: ModuleType) -> None:
+            for child in _preloaded_children.pop(fullname, []):
+                setattr(module, child, sys.modules[f"{fullname}.{child}"])
+            exec_module(module)
+
+        spec.loader.exec_module = _bind_and_exec
+        return spec
+
+
+_binder = _PreloadedChildBinder()
+
+
+def sdk_module(name: str) -> ModuleType:
+    """
+    Import an alpaca-py module that has no imports from its own package.
+
+    ``import alpaca.data.enums`` runs ``alpaca/data/__init__.py``, which pulls in every
+    historical client, the request models and pandas. The enum, timeframe and exception
+    modules only depend on the standard library, so they are loaded straight from their
+    files and registered in sys.modules under their real names; when the package is
+    imported later its ``from alpaca.data.enums import *`` reuses the same module, so the
+    classes stay identical to the ones the SDK validates against.
+
+    This is only done for the alpaca-py releases in VERIFIED_SDK_VERSIONS, and only if
+    the module file still imports nothing from the SDK. Otherwise the module is
+    imported normally, which is slower but always correct.
+
+    Args:
+        name: Fully qualified module name (e.g. "alpaca.data.enums")
+
+    Returns:
+        The loaded module
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if not _leaf_loading_verified():
+        return importlib.import_module(name)
+    root = importlib.util.find_spec(name.split(".")[0])
+    if root is None or not root.submodule_search_locations:
+        return importlib.import_module(name)
+    path = os.path.join(list(root.submodule_search_locations)[0], *name.split(".")[1:]) + ".py"
+    try:
+        with open(path, encoding="utf-8") as f:
+            leaf = not _SDK_IMPORT.search(f.read())
+    except OSError:
+        leaf = False
+    if not leaf:
+        return importlib.import_module(name)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(name, None)
+        raise
+    package, _, child = name.rpartition(".")
+    parent = sys.modules.get(package)
+    if parent is not None:
+        setattr(parent, child, module)
+    else:
+        _preloaded_children.setdefault(package, []).append(child)
+        if _binder not in sys.meta_path:
+            sys.meta_path.insert(0, _binder)
+    return module
+
+
+class ClientRegistry:
+    """
+    Registry of named client factories whose instances are created on first use.
+
+    Construction is guarded per registry so concurrent first calls from SDK worker
+    threads build a single instance.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._init_ms: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> "LazyClient":
+        """
+        Register a factory and return a proxy for the client it builds.
+
+        Args:
+            name: Client name (matches the SDKExecutor lane, e.g. "trading")
+            factory: Zero-argument callable that imports the SDK and builds the client
+
+        Returns:
+            LazyClient proxy resolving to the instance on first attribute access
+        """
+        with self._lock:
+            self._factories[name] = factory
+        return LazyClient(self, name)
+
+    def get(self, name: str) -> Any:
+        """Return the client for name, constructing it if this is the first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                started = time.perf_counter()
+                instance = self._factories[name]()
+                self._init_ms[name] = (time.perf_counter() - started) * 1000
+                self._instances[name] = instance
+            return instance
+
+    def created(self, name: str) -> bool:
+        """Whether the client for name has been constructed."""
+        return name in self._instances
+
+    def prewarm(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """
+        Construct clients on a daemon thread so the first tool call does not pay for
+        SDK imports while the server is already answering the MCP handshake.
+
+        Args:
+            names: Clients to build (default: every registered client)
+
+        Returns:
+            The started thread
+        """
+        names = list(self._factories) if names is None else list(names)
+
+        def _build() -> None:
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    # Failures surface again (with context) on the first real use
+                    pass
+
+        thread = threading.Thread(target=_build, name="client-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-client construction status and time spent in the factory."""
+        with self._lock:
+            return {
+                name: {"created": name in self._instances, "init_ms": self._init_ms.get(name)}
+                for name in self._factories
+            }
+
+
+class LazyClient:
+    """
+    Stand-in for a registry client that builds it on first attribute access.
+
+    Attribute reads and writes are forwarded to the real instance, so code written
+    against module-level client objects (``trade_client.get_orders(...)``) works as is.
+    """
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ClientRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._registry.get(self._name), item)
+
+    def __setattr__(self, item: str, value: Any) -> None:
+        setattr(self._registry.get(self._name), item, value)
+
+    def __delattr__(self, item: str) -> None:
+        delattr(self._registry.get(self._name), item)
+
+    def __repr__(self) -> str:
+        if self._registry.created(self._name):
+            return repr(self._registry.get(self._name))
+        return f"<LazyClient {self._name!r} (not created)>"
@@ -0,0 +1,230 @@
+# history_stream.py
+#
+# Lazy pagination and bounded digests for tick-level history
+# Location: /.github/core/history_stream.py
+# Purpose: Follows market data page tokens one page at a time and folds every page into
+#          per-symbol head/tail buffers and running statistics, so trade and quote
+#          histories of any length are served in constant memory instead of being
+#          materialized as one list of models.
+
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Largest page the market data API returns
+MAX_PAGE_SIZE = 10_000
+
+
+def iter_pages(get: Callable[[str, Dict[str, Any]], Dict[str, Any]], path: str, params: Dict[str, Any],
+               key: str, limit: Optional[int] = None,
+               page_size: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Yield a paginated market data response one page at a time.
+
+    Nothing is requested until the first page is consumed, and each following
+    request is only made when the previous page has been consumed.
+
+    Args:
+        get: Callable(path, query params) returning the decoded JSON response
+            (the SDK client's get method)
+        path: Endpoint path, e.g. "/stocks/trades"
+        params: Query parameters (from the request model's to_request_fields())
+        key: Response field holding the records, e.g. "trades"
+        limit: Total number of records to read across all pages (None: everything);
+            the last request asks for the remainder only
+        page_size: Records per request (at most MAX_PAGE_SIZE)
+
+    Yields:
+        Symbol -> list of raw record dicts, for one page
+    """
+    params = dict(params)
+    params.pop("limit", None)
+    page_token = params.pop("page_token", None)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        params["limit"] = min(page_size, MAX_PAGE_SIZE, remaining if remaining is not None else MAX_PAGE_SIZE)
+        if page_token:
+            params["page_token"] = page_token
+        response = get(path, params) or {}
+        page = response.get(key) or {}
+        if remaining is not None:
+            remaining -= sum(len(records) for records in page.values())
+        yield page
+        page_token = response.get("next_page_token")
+        if not page_token:
+            return
+
+
+def next_page(pages: Iterator[Dict[str, List[Dict[str, Any]]]]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Advance a page iterator (one HTTP request); None when it is exhausted."""
+    return next(pages, None)
+
+
+class HeadTail:
+    """The first and last records of a sequence, kept in bounded memory."""
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size: Records kept in total: the first ceil(size / 2) and the last floor(size / 2)
+        """
+        self.head_size = (size + 1) // 2
+        self.head: List[Any] = []
+        self.tail: deque = deque(maxlen=size - self.head_size)
+        self.count = 0
+
+    def extend(self, records: List[Any]) -> None:
+        self.count += len(records)
+        room = self.head_size - len(self.head)
+        if room > 0:
+            self.head.extend(records[:room])
+            records = records[room:]
+        if self.tail.maxlen:
+            self.tail.extend(records)
+
+    @property
+    def omitted(self) -> int:
+        """Records between the head and the tail that were not kept."""
+        return self.count - len(self.head) - len(self.tail)
+
+    def records(self) -> List[Any]:
+        """Kept records in stream order."""
+        return self.head + list(self.tail)
+
+
+def _column(records: List[Dict[str, Any]], field: str) -> np.ndarray:
+    return np.fromiter((record.get(field) or 0.0 for record in records), dtype=np.float64, count=len(records))
+
+
+class TradeStats:
+    """Running OHLC, volume and VWAP over raw trade records ("p" price, "s" size)."""
+
+    def __init__(self):
+        self.count = 0
+        self.first: Optional[Dict[str, Any]] = None
+        self.last: Optional[Dict[str, Any]] = None
+        self.high = -np.inf
+        self.low = np.inf
+        self.volume = 0.0
+        self.notional = 0.0
+
+    def add(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        price, size = _column(records, "p"), _column(records, "s")
+        self.count += len(records)
+        self.first = self.first or records[0]
+        self.last = records[-1]
+        self.high = max(self.high, float(price.max()))
+        self.low = min(self.low, float(price.min()))
+        self.volume += float(size.sum())
+        self.notional += float(price @ size)
+
+    def summary(self, descending: bool = False) -> Dict[str, Any]:
+        """
+        Totals for everything added.
+
+        Args:
+            descending: Records arrived newest first (sort=desc), so open and close swap
+        """
+        if not self.count:
+            return {"count": 0}
+        earliest, latest = (self.last, self.first) if descending else (self.first, self.last)
+        return {
+            "count": self.count,
+            "start": earliest.get("t"),
+            "end": latest.get("t"),
+            "open": earliest.get("p"),
+            "high": self.high,
+            "low": self.low,
+            "close": latest.get("p"),
+            "volume": self.volume,
+            "vwap": self.notional / self.volume if self.volume else None,
+        }
+
+
+class QuoteStats:
+    """Running bid/ask range and average spread over raw quote records ("bp", "ap", ...)."""
+
+    def __init__(self):
+        self.count = 0
+        self.first: Optional[Dict[str, Any]] = None
+        self.last: Optional[Dict[str, Any]] = None
+        self.low_bid = np.inf
+        self.high_ask = -np.inf
+        self.two_sided = 0
+        self.spread_sum = 0.0
+        self.mid_sum = 0.0
+
+    def add(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        bid, ask = _column(records, "bp"), _column(records, "ap")
+        self.count += len(records)
+        self.first = self.first or records[0]
+        self.last = records[-1]
+        # One-sided quotes (a zero price) count toward the total but not the spread
+        both = (bid > 0) & (ask > 0)
+        if both.any():
+            self.low_bid = min(self.low_bid, float(bid[both].min()))
+            self.high_ask = max(self.high_ask, float(ask[both].max()))
+            self.two_sided += int(both.sum())
+            self.spread_sum += float((ask[both] - bid[both]).sum())
+            self.mid_sum += float(((ask[both] + bid[both]) * 0.5).sum())
+
+    def summary(self, descending: bool = False) -> Dict[str, Any]:
+        """Totals for everything added (descending: records arrived newest first)."""
+        if not self.count:
+            return {"count": 0}
+        earliest, latest = (self.last, self.first) if descending else (self.first, self.last)
+        return {
+            "count": self.count,
+            "start": earliest.get("t"),
+            "end": latest.get("t"),
+            "low_bid": self.low_bid if self.two_sided else None,
+            "high_ask": self.high_ask if self.two_sided else None,
+            "avg_spread": self.spread_sum / self.two_sided if self.two_sided else None,
+            "avg_mid": self.mid_sum / self.two_sided if self.two_sided else None,
+        }
+
+
+class HistoryDigest:
+    """
+    Per-symbol head/tail buffers plus running statistics over a paged history.
+
+    Pages are folded in as they arrive and then dropped, so memory is bounded by
+    max_rows per symbol however long the window is. When a symbol has at most
+    max_rows records, its buffer holds every one of them.
+    """
+
+    def __init__(self, stats_class: Callable[[], Any], max_rows: int):
+        """
+        Args:
+            stats_class: TradeStats or QuoteStats
+            max_rows: Raw records kept per symbol (half from the start, half from the end)
+        """
+        self.stats_class = stats_class
+        self.max_rows = max_rows
+        self.rows: Dict[str, HeadTail] = {}
+        self.stats: Dict[str, Any] = {}
+        self.pages = 0
+
+    def add(self, page: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Fold one page (symbol -> raw records) into the digest."""
+        self.pages += 1
+        for symbol, records in page.items():
+            if symbol not in self.rows:
+                self.rows[symbol] = HeadTail(self.max_rows)
+                self.stats[symbol] = self.stats_class()
+            self.rows[symbol].extend(records)
+            self.stats[symbol].add(records)
+
+    @property
+    def count(self) -> int:
+        """Records read so far, across symbols."""
+        return sum(rows.count for rows in self.rows.values())
+
+    def truncated(self, symbol: str) -> bool:
+        """Whether records of the symbol were left out of its buffer."""
+        return symbol in self.rows and self.rows[symbol].omitted > 0
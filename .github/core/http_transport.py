@@ -0,0 +1,312 @@
+# http_transport.py
+#
+# Shared keep-alive HTTP connection pools for the signed Alpaca SDK clients
+# Location: /.github/core/http_transport.py
+# Purpose: Replaces the per-client requests.Session of each alpaca-py REST client
+#          with one size-bounded connection pool per API host, optionally backed
+#          by httpx with HTTP/2, applies the shared rate limiter and 429 retry policy
+#          to every request, and exposes pool statistics.
+
+import importlib.util
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from client_registry import sdk_module
+from rate_limiter import (FAMILY_TRADING, PRIORITY_DATA, PRIORITY_ORDERS, PRIORITY_TRADING,
+                          RateLimiter, retry_after_seconds)
+from tracing import KIND_CLIENT, get_tracer
+
+# Loaded without alpaca.common's package initializer (pydantic models, requests session)
+_sdk_exceptions = sdk_module("alpaca.common.exceptions")
+APIError = _sdk_exceptions.APIError
+
+# Supported transport backends
+BACKEND_REQUESTS = "requests"
+BACKEND_HTTPX = "httpx"
+
+
+class _TransportSettings:
+    """Process-wide transport configuration (set once via configure_transport)."""
+
+    def __init__(self):
+        self.backend = BACKEND_REQUESTS
+        self.max_connections = 20
+        self.max_keepalive = 10
+        self.keepalive_expiry = 30.0
+        self.http2 = False
+        self.timeout = 30.0
+
+
+_settings = _TransportSettings()
+_pools: Dict[str, "HostConnectionPool"] = {}
+_pools_lock = threading.Lock()
+# Request budget shared by every pooled client (unlimited until configure_rate_limits)
+_rate_limiter = RateLimiter()
+
+
+def configure_transport(backend: str = BACKEND_REQUESTS,
+                        max_connections: int = 20,
+                        max_keepalive: int = 10,
+                        keepalive_expiry: float = 30.0,
+                        http2: Optional[bool] = None,
+                        timeout: float = 30.0) -> None:
+    """
+    Configure the shared connection pools used by PooledTransportMixin clients.
+
+    Args:
+        backend: "requests" (default) or "httpx"
+        max_connections: Maximum open connections per API host
+        max_keepalive: Maximum idle keep-alive connections kept per API host (httpx only;
+            the requests backend keeps up to max_connections alive)
+        keepalive_expiry: Seconds an idle connection is kept before closing (httpx only)
+        http2: Enable HTTP/2 (httpx only). None enables it when the 'h2' package is installed
+        timeout: Per-request timeout in seconds (httpx only; requests keeps the SDK default)
+    """
+    backend = (backend or BACKEND_REQUESTS).lower()
+    if backend not in (BACKEND_REQUESTS, BACKEND_HTTPX):
+        raise ValueError(f"Unsupported HTTP backend: {backend}. Must be 'requests' or 'httpx'.")
+    if backend == BACKEND_HTTPX and importlib.util.find_spec("httpx") is None:
+        raise ValueError("The 'httpx' HTTP backend requires the httpx package to be installed.")
+
+    h2_available = importlib.util.find_spec("h2") is not None
+    if http2 is None:
+        http2 = h2_available
+    elif http2 and not h2_available:
+        raise ValueError("HTTP/2 requires the 'h2' package (pip install 'httpx[http2]').")
+
+    with _pools_lock:
+        _settings.backend = backend
+        _settings.max_connections = max(1, max_connections)
+        _settings.max_keepalive = max(0, min(max_keepalive, max_connections))
+        _settings.keepalive_expiry = keepalive_expiry
+        _settings.http2 = bool(http2) and backend == BACKEND_HTTPX
+        _settings.timeout = timeout
+        # Pools created under the previous settings are closed and rebuilt lazily
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def configure_rate_limits(limiter: RateLimiter) -> None:
+    """Install the rate limiter consulted before every pooled HTTP request."""
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """The rate limiter currently used by PooledTransportMixin clients."""
+    return _rate_limiter
+
+
+def get_pool(url: str) -> "HostConnectionPool":
+    """Get (or lazily create) the shared connection pool for the host of a URL."""
+    host = urlsplit(url).netloc
+    pool = _pools.get(host)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(host)
+            if pool is None:
+                pool = HostConnectionPool(host, _settings)
+                _pools[host] = pool
+    return pool
+
+
+def transport_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get statistics for every shared connection pool.
+
+    Returns:
+        Dictionary keyed by API host with request counters and connection usage
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.host: pool.stats() for pool in pools}
+
+
+class HostConnectionPool:
+    """A size-bounded keep-alive connection pool shared by all clients of one API host."""
+
+    def __init__(self, host: str, settings: _TransportSettings):
+        self.host = host
+        self.backend = settings.backend
+        self.http2 = settings.http2
+        self.max_connections = settings.max_connections
+        self.max_keepalive = settings.max_keepalive
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+
+        if self.backend == BACKEND_HTTPX:
+            import httpx
+
+            self._client = httpx.Client(
+                http2=self.http2,
+                timeout=settings.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.max_connections,
+                    max_keepalive_connections=settings.max_keepalive,
+                    keepalive_expiry=settings.keepalive_expiry,
+                ),
+            )
+        else:
+            from requests import Session
+            from requests.adapters import HTTPAdapter
+
+            # pool_block makes callers wait for a free connection instead of
+            # opening throwaway sockets once the pool is exhausted
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.max_connections,
+                                  pool_block=True)
+            self._client = Session()
+            self._client.mount("https://", adapter)
+            self._client.mount("http://", adapter)
+
+    def request(self, method: str, url: str, opts: Dict[str, Any]) -> Any:
+        """Send one request through the pool, translating SDK request options as needed."""
+        with self._lock:
+            self.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            if self.backend == BACKEND_HTTPX:
+                return self._client.request(method, url, **self._httpx_options(opts))
+            return self._client.request(method, url, **opts)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.requests += 1
+                self.total_seconds += time.perf_counter() - started_at
+
+    @staticmethod
+    def _httpx_options(opts: Dict[str, Any]) -> Dict[str, Any]:
+        converted = {"headers": opts.get("headers"),
+                     "follow_redirects": opts.get("allow_redirects", False)}
+        params = opts.get("params")
+        if isinstance(params, dict):
+            # requests drops None-valued params; httpx would send them as empty strings
+            params = {k: v for k, v in params.items() if v is not None}
+        if params:
+            converted["params"] = params
+        if opts.get("json") is not None:
+            converted["json"] = opts["json"]
+        return converted
+
+    def http_error(self, response: Any) -> Exception:
+        """Build the backend's HTTP error object for a failed response."""
+        if self.backend == BACKEND_HTTPX:
+            import httpx
+
+            return httpx.HTTPStatusError(
+                f"{response.status_code} error for url: {response.request.url}",
+                request=response.request,
+                response=response,
+            )
+        from requests.exceptions import HTTPError
+
+        return HTTPError(f"{response.status_code} error for url: {response.url}", response=response)
+
+    def _connection_counts(self) -> Dict[str, int]:
+        try:
+            if self.backend == BACKEND_HTTPX:
+                connections = self._client._transport._pool.connections
+                idle = sum(1 for conn in connections if conn.is_idle())
+                return {"open": len(connections), "idle": idle}
+            open_connections = 0
+            idle = 0
+            # The same adapter is mounted for both schemes, so count it once
+            adapters = {id(adapter): adapter for adapter in self._client.adapters.values()}
+            for adapter in adapters.values():
+                for pool in adapter.poolmanager.pools._container.values():
+                    if pool.pool is None:
+                        continue
+                    # The urllib3 queue holds idle connections plus None placeholders
+                    # for slots that are free; checked-out slots are missing from it
+                    pooled = list(pool.pool.queue)
+                    pool_idle = sum(1 for conn in pooled if conn is not None)
+                    idle += pool_idle
+                    open_connections += pool_idle + (pool.pool.maxsize - len(pooled))
+            return {"open": open_connections, "idle": idle}
+        except Exception:
+            # Pool internals are not part of either library's public API
+            return {"open": -1, "idle": -1}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "backend": self.backend,
+                "http2": self.http2,
+                "max_connections": self.max_connections,
+                "max_keepalive": self.max_keepalive,
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "avg_ms": (self.total_seconds / self.requests * 1000) if self.requests else 0.0,
+            }
+        counters.update(self._connection_counts())
+        return counters
+
+    def close(self) -> None:
+        try:
+            self._client.close()
+        except Exception:
+            pass
+
+
+class PooledTransportMixin:
+    """
+    Routes an alpaca-py REST client's HTTP requests through the shared per-host pools.
+
+    Overrides RESTClient._one_request, the single point where the SDK touches its
+    requests.Session. Every request first takes a token from the rate limiter bucket
+    of the client's API family. Responses with a retryable status (429, 504) are
+    retried here with jittered backoff that honors Retry-After, replacing the SDK's
+    fixed sleep; all other errors keep the SDK's semantics.
+    """
+
+    # API family whose request budget this client draws from
+    rate_limit_family = FAMILY_TRADING
+
+    def _request_priority(self, method: str) -> int:
+        if self.rate_limit_family != FAMILY_TRADING:
+            return PRIORITY_DATA
+        # Non-GET trading requests place, replace or cancel orders and close positions
+        return PRIORITY_TRADING if method.upper() == "GET" else PRIORITY_ORDERS
+
+    def _one_request(self, method: str, url: str, opts: dict, retry: int) -> dict:
+        pool = get_pool(url)
+        limiter = _rate_limiter
+        family = self.rate_limit_family
+        priority = self._request_priority(method)
+
+        tracer = get_tracer()
+        attempt = 0
+        while True:
+            waited = limiter.acquire(family, priority)
+            with tracer.span(f"HTTP {method.upper()}", KIND_CLIENT, **{
+                    "http.request.method": method.upper(),
+                    "url.full": url,
+                    "server.address": pool.host,
+                    "http.request.resend_count": attempt or None,
+                    "alpaca.rate_limit.wait_ms": round(waited * 1000, 3) if waited else None}) as span:
+                response = pool.request(method, url, opts)
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status_code)
+            limiter.observe(family, response.headers)
+            if response.status_code == 429:
+                limiter.record_rate_limited(family)
+            if response.status_code not in self._retry_codes or attempt >= retry:
+                break
+            time.sleep(limiter.backoff(family, attempt, retry_after_seconds(response.headers)))
+            attempt += 1
+
+        if response.status_code >= 400:
+            raise APIError(response.text, pool.http_error(response))
+
+        if response.text != "":
+            return response.json()
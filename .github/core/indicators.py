@@ -0,0 +1,219 @@
+# indicators.py
+#
+# Vectorized technical indicators over bar arrays
+# Location: /.github/core/indicators.py
+# Purpose: Computes SMA, EMA, RSI, ATR and VWAP for a whole bar series with NumPy
+#          (cumulative sums for rolling windows, blockwise closed-form recurrences
+#          for exponential smoothing) so a request never loops over bars in Python.
+
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# Indicator name -> default period (None for indicators without a period)
+DEFAULT_PERIODS: Dict[str, Optional[int]] = {
+    "sma": 20,
+    "ema": 20,
+    "rsi": 14,
+    "atr": 14,
+    "vwap": None,
+}
+
+_SPEC = re.compile(r"^\s*([a-z]+)\s*(?:[:(_]\s*(\d+)\s*\)?)?\s*$")
+# Exponential smoothing runs in blocks short enough that decay**-k stays below ~1e200
+_MAX_DECAY_EXPONENT = 460.0
+# Session boundaries for intraday VWAP: US market days in UTC shifted back 5 hours, so
+# pre-market (04:00 ET) through after-hours (20:00 ET) fall on one calendar day
+_SESSION_OFFSET_NS = 5 * 3600 * 10**9
+_DAY_NS = 86400 * 10**9
+
+
+class IndicatorSpec(NamedTuple):
+    """One requested indicator."""
+    name: str
+    period: Optional[int]
+
+    @property
+    def label(self) -> str:
+        """Column label, e.g. "sma_20" or "vwap"."""
+        return self.name if self.period is None else f"{self.name}_{self.period}"
+
+
+def parse_indicator_specs(specs: Sequence[str]) -> List[IndicatorSpec]:
+    """
+    Parse indicator requests like "sma:20", "ema(50)", "rsi" or "vwap".
+
+    Raises:
+        ValueError: With a user-facing message for unknown names or invalid periods
+    """
+    parsed: List[IndicatorSpec] = []
+    for raw in specs:
+        match = _SPEC.match(str(raw).lower())
+        if not match or match.group(1) not in DEFAULT_PERIODS:
+            raise ValueError(f"Invalid indicator: {raw}. Use name or name:period with name one of: "
+                             f"{', '.join(DEFAULT_PERIODS)} (e.g. 'sma:20', 'rsi:14', 'vwap').")
+        name, period = match.group(1), match.group(2)
+        default = DEFAULT_PERIODS[name]
+        if default is None:
+            if period is not None:
+                raise ValueError(f"Invalid indicator: {raw}. {name} does not take a period.")
+            spec = IndicatorSpec(name, None)
+        else:
+            spec = IndicatorSpec(name, int(period) if period is not None else default)
+            if spec.period < 1:
+                raise ValueError(f"Invalid indicator: {raw}. The period must be at least 1.")
+        if spec not in parsed:
+            parsed.append(spec)
+    return parsed
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average; the first period - 1 values are NaN."""
+    out = np.full(len(values), np.nan)
+    if period > len(values):
+        return out
+    # Summing offsets from the first value keeps the running total small, which keeps
+    # the differences of cumulative sums accurate over long series
+    base = float(values[0])
+    sums = np.cumsum(values - base, dtype=np.float64)
+    out[period - 1] = sums[period - 1]
+    out[period:] = sums[period:] - sums[:-period]
+    out[period - 1:] = out[period - 1:] / period + base
+    return out
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """
+    y[i] = (1 - alpha) * y[i - 1] + alpha * values[i] with y[-1] = seed.
+
+    Within a block y[k] = d**k * (seed + alpha * sum(values[j] / d**j, j <= k)) with
+    d = 1 - alpha, which is a cumulative sum; blocks are sized so that d**-k cannot
+    overflow, leaving one NumPy pass per block instead of one Python step per bar.
+    """
+    decay = 1.0 - alpha
+    out = np.empty(len(values))
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    block = max(1, int(_MAX_DECAY_EXPONENT / -math.log(decay)))
+    powers_full = decay ** np.arange(1, min(block, len(values)) + 1, dtype=np.float64)
+    previous = seed
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        powers = powers_full[:len(chunk)]
+        smoothed = powers * (previous + alpha * np.cumsum(chunk / powers))
+        out[start:start + len(chunk)] = smoothed
+        previous = smoothed[-1]
+    return out
+
+
+def _seeded_smoothing(values: np.ndarray, period: int, alpha: float, offset: int = 0) -> np.ndarray:
+    """Exponential smoothing seeded with the mean of the first period values after offset."""
+    out = np.full(len(values), np.nan)
+    first = offset + period - 1
+    if first >= len(values):
+        return out
+    seed = float(np.mean(values[offset:first + 1]))
+    out[first] = seed
+    out[first + 1:] = _smooth(values[first + 1:], alpha, seed)
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average (alpha = 2 / (period + 1)), seeded with the SMA of the first period values."""
+    return _seeded_smoothing(values, period, 2.0 / (period + 1))
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's relative strength index; the first period values are NaN."""
+    out = np.full(len(close), np.nan)
+    if period >= len(close):
+        return out
+    change = np.diff(close)
+    gains = np.maximum(change, 0.0)
+    losses = np.maximum(-change, 0.0)
+    avg_gain = _seeded_smoothing(gains, period, 1.0 / period)
+    avg_loss = _seeded_smoothing(losses, period, 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # No losses: 100 (or 50 when the price did not move at all)
+    values = np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), values)
+    values[np.isnan(avg_gain)] = np.nan
+    out[1:] = values
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first bar has no previous close and uses high - low."""
+    ranges = high - low
+    if len(close) > 1:
+        previous = close[:-1]
+        ranges[1:] = np.maximum(ranges[1:], np.maximum(np.abs(high[1:] - previous),
+                                                       np.abs(low[1:] - previous)))
+    return ranges
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's average true range, seeded with the mean true range of bars 1..period."""
+    return _seeded_smoothing(true_range(high, low, close), period, 1.0 / period, offset=1)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price (high + low + close) / 3.
+
+    With timestamps (UTC epoch nanoseconds) the average restarts every US market
+    session, as for intraday charts; without them it is anchored at the first bar.
+    """
+    weighted = np.cumsum((high + low + close) / 3.0 * volume, dtype=np.float64)
+    volumes = np.cumsum(volume, dtype=np.float64)
+    if timestamps is not None and len(timestamps):
+        session = (timestamps - _SESSION_OFFSET_NS) // _DAY_NS
+        starts = np.flatnonzero(np.diff(session)) + 1
+        if len(starts):
+            # Subtract the running totals at the end of the previous session
+            boundary = np.zeros(len(session), dtype=np.intp)
+            boundary[starts] = starts
+            boundary = np.maximum.accumulate(boundary)
+            has_previous = boundary > 0
+            index = boundary[has_previous] - 1
+            weighted[has_previous] -= weighted[index]
+            volumes[has_previous] -= volumes[index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(volumes > 0, weighted / volumes, np.nan)
+
+
+def compute(bars: np.ndarray, specs: Sequence[IndicatorSpec], intraday: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Compute indicators for a bar array in one pass over the columns.
+
+    Args:
+        bars: Structured array with timestamp (UTC ns), open, high, low, close and volume
+            fields (e.g. bar_store.BAR_DTYPE rows), sorted by timestamp
+        specs: Indicators from parse_indicator_specs
+        intraday: Restart VWAP at every market session
+
+    Returns:
+        Indicator label -> float64 array aligned with bars (NaN during warm-up)
+    """
+    close = np.ascontiguousarray(bars["close"], dtype=np.float64)
+    high = np.ascontiguousarray(bars["high"], dtype=np.float64)
+    low = np.ascontiguousarray(bars["low"], dtype=np.float64)
+    results: Dict[str, np.ndarray] = {}
+    for spec in specs:
+        if spec.name == "sma":
+            results[spec.label] = sma(close, spec.period)
+        elif spec.name == "ema":
+            results[spec.label] = ema(close, spec.period)
+        elif spec.name == "rsi":
+            results[spec.label] = rsi(close, spec.period)
+        elif spec.name == "atr":
+            results[spec.label] = atr(high, low, close, spec.period)
+        elif spec.name == "vwap":
+            volume = np.ascontiguousarray(bars["volume"], dtype=np.float64)
+            timestamps = np.asarray(bars["timestamp"]) if intraday else None
+            results[spec.label] = vwap(high, low, close, volume, timestamps)
+    return results
@@ -0,0 +1,327 @@
+# metrics.py
+#
+# Prometheus-style instrumentation for the MCP tools
+# Location: /.github/core/metrics.py
+# Purpose: Records per-tool latency, time spent waiting on Alpaca SDK calls, local
+#          (parsing/formatting) time, response size, errors by exception class and
+#          in-flight calls, and renders them in the Prometheus text exposition format
+#          for a /metrics route or a periodically rewritten file.
+
+import atexit
+import contextvars
+import functools
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Histogram buckets (upper bounds) for durations in seconds and response sizes in bytes
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class for a labelled metric family."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Tuple[str, ...]) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Tuple[str, ...], amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str], lock: threading.Lock,
+                 buckets: Sequence[float] = DURATION_BUCKETS):
+        super().__init__(name, help_text, labelnames, lock)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """A set of metric families rendered together."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames, self._lock))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames, self._lock))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, self._lock, buckets))
+
+    def _add(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for metric in self._metrics:
+                lines.extend(metric.header())
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Atomically replace path with the rendered metrics."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class _ToolCall:
+    """Upstream wait intervals recorded while one tool call runs."""
+
+    __slots__ = ("tool", "intervals")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.intervals: List[Tuple[float, float]] = []
+
+    def upstream_seconds(self) -> float:
+        # Union of the intervals, so SDK calls gathered in parallel are counted once
+        total = 0.0
+        end = -math.inf
+        for started, finished in sorted(self.intervals):
+            if finished <= end:
+                continue
+            total += finished - max(started, end)
+            end = finished
+        return total
+
+
+_current_call: contextvars.ContextVar[Optional[_ToolCall]] = contextvars.ContextVar(
+    "alpaca_mcp_tool_call", default=None)
+
+
+class ToolMetrics:
+    """
+    Metric families for the MCP tools and the SDK calls they make.
+
+    Tools are wrapped by instrument_tools; SDKExecutor reports each SDK call to
+    observe_upstream, which attributes it to the tool call running in the same
+    asyncio context.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.calls = r.counter("alpaca_mcp_tool_calls_total", "Tool calls started.", ("tool",))
+        self.in_flight = r.gauge("alpaca_mcp_tool_in_flight", "Tool calls currently running.", ("tool",))
+        self.duration = r.histogram("alpaca_mcp_tool_duration_seconds",
+                                    "Total tool call latency.", ("tool",))
+        self.upstream = r.histogram("alpaca_mcp_tool_upstream_seconds",
+                                    "Time a tool call waited on Alpaca SDK calls (queueing included).",
+                                    ("tool",))
+        self.formatting = r.histogram("alpaca_mcp_tool_format_seconds",
+                                      "Time a tool call spent outside SDK calls (parsing and formatting).",
+                                      ("tool",))
+        self.response_bytes = r.histogram("alpaca_mcp_tool_response_bytes",
+                                          "Size of tool responses in UTF-8 bytes.", ("tool",),
+                                          buckets=BYTES_BUCKETS)
+        self.errors = r.counter("alpaca_mcp_tool_errors_total",
+                                "Errors by tool, source (upstream SDK call or tool) and exception class.",
+                                ("tool", "source", "exception"))
+        self.sdk_duration = r.histogram("alpaca_mcp_sdk_call_seconds",
+                                        "Alpaca SDK call latency by client lane (queueing included).",
+                                        ("client",))
+        self._dump_thread: Optional[threading.Thread] = None
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap an async tool function so every call is measured."""
+        tool = fn.__name__
+        labels = (tool,)
+
+        @functools.wraps(fn)
+        async def measured(*args: Any, **kwargs: Any) -> Any:
+            call = _ToolCall(tool)
+            token = _current_call.set(call)
+            self.calls.inc(labels)
+            self.in_flight.inc(labels)
+            started = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as exc:
+                self.errors.inc((tool, "tool", type(exc).__name__))
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                upstream = min(call.upstream_seconds(), elapsed)
+                self.in_flight.dec(labels)
+                self.duration.observe(labels, elapsed)
+                self.upstream.observe(labels, upstream)
+                self.formatting.observe(labels, elapsed - upstream)
+                _current_call.reset(token)
+            self.response_bytes.observe(labels, len(str(result).encode("utf-8")) if result is not None else 0)
+            return result
+
+        return measured
+
+    def observe_upstream(self, client: str, started: float, finished: float,
+                         error: Optional[BaseException]) -> None:
+        """SDKExecutor observer: record one SDK call (perf_counter timestamps)."""
+        self.sdk_duration.observe((client,), finished - started)
+        call = _current_call.get()
+        if call is not None:
+            call.intervals.append((started, finished))
+        if error is not None:
+            self.errors.inc((call.tool if call is not None else "", "upstream", type(error).__name__))
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    def start_file_dump(self, path: str, interval: float = 15.0) -> None:
+        """
+        Rewrite path with the current metrics every interval seconds and at exit.
+
+        Meant for the stdio transport, where there is no HTTP server to scrape;
+        point a node_exporter textfile collector at the file or read it directly.
+        """
+        if self._dump_thread is not None:
+            return
+
+        def _dump() -> None:
+            try:
+                self.registry.write(path)
+            except OSError:
+                pass
+
+        def _loop() -> None:
+            while True:
+                time.sleep(interval)
+                _dump()
+
+        atexit.register(_dump)
+        self._dump_thread = threading.Thread(target=_loop, name="metrics-dump", daemon=True)
+        self._dump_thread.start()
+
+
+def instrument_tools(server: Any, *wrappers: Callable[[Callable[..., Any]], Callable[..., Any]]) -> None:
+    """
+    Make server.tool() wrap every tool registered afterwards with the given wrappers.
+
+    The first wrapper is outermost (e.g. ToolMetrics.instrument, then Tracer.instrument).
+    FastMCP reads a tool's name, docstring and signature through functools.wraps'
+    __wrapped__, so the tool schema is unchanged.
+    """
+    register = server.tool
+
+    @functools.wraps(register)
+    def tool(*args: Any, **kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        decorator = register(*args, **kwargs)
+
+        def wrap(fn: Callable[..., Any]) -> Callable[..., Any]:
+            wrapped = fn
+            for wrapper in reversed(wrappers):
+                wrapped = wrapper(wrapped)
+            decorator(wrapped)
+            # Module-level names keep pointing at the undecorated function, as with FastMCP
+            return fn
+
+        return wrap
+
+    server.tool = tool
@@ -0,0 +1,229 @@
+# option_chain.py
+#
+# In-memory option chain indexed by expiration and strike
+# Location: /.github/core/option_chain.py
+# Purpose: Joins option contracts with their market snapshots into NumPy columns
+#          sorted by (expiration, strike, type), so chain queries (strike windows,
+#          nearest-to-the-money strikes per expiration, delta bands, liquidity
+#          filters) are binary searches and array masks instead of per-contract loops.
+
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from option_pricing import greeks, implied_volatility, mid_price, years_to_expiration
+
+# Output columns, in order, for OptionChain.records
+COLUMNS = ("symbol", "expiration", "type", "strike", "bid", "ask", "last", "iv",
+           "delta", "gamma", "theta", "vega", "open_interest")
+
+
+def _number(value: Any) -> float:
+    # Contract fields such as open_interest arrive as strings; missing values become NaN
+    if value is None or value == "":
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class OptionChain:
+    """
+    Option contracts for one underlying with their latest quotes, IV and Greeks.
+
+    Rows are sorted by expiration, then strike, then calls before puts. Each
+    expiration is a contiguous block, and strikes within a block are sorted, so an
+    expiration range or a strike window maps to slices found by np.searchsorted.
+    """
+
+    def __init__(self, underlying: str, contracts: Sequence[Any], snapshots: Dict[str, Any],
+                 underlying_price: Optional[float] = None):
+        """
+        Build the chain.
+
+        Args:
+            underlying: Underlying symbol
+            contracts: SDK OptionContract models (from get_option_contracts pages)
+            snapshots: Option symbol -> SDK OptionsSnapshot (missing symbols get NaN market data)
+            underlying_price: Latest underlying price, used for moneyness
+        """
+        self.underlying = underlying
+        self.underlying_price = underlying_price
+        self.created_at = time.time()
+
+        rows = []
+        for contract in contracts:
+            snapshot = snapshots.get(contract.symbol)
+            quote = getattr(snapshot, "latest_quote", None)
+            trade = getattr(snapshot, "latest_trade", None)
+            feed_greeks = getattr(snapshot, "greeks", None)
+            rows.append((
+                contract.symbol,
+                contract.expiration_date,
+                str(getattr(contract.type, "value", contract.type)) == "call",
+                _number(contract.strike_price),
+                _number(getattr(quote, "bid_price", None)),
+                _number(getattr(quote, "ask_price", None)),
+                _number(getattr(trade, "price", None)),
+                _number(getattr(snapshot, "implied_volatility", None)),
+                _number(getattr(feed_greeks, "delta", None)),
+                _number(getattr(feed_greeks, "gamma", None)),
+                _number(getattr(feed_greeks, "theta", None)),
+                _number(getattr(feed_greeks, "vega", None)),
+                _number(contract.open_interest),
+            ))
+
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        symbols = np.array(columns[0], dtype=object)
+        expiration = np.array(columns[1], dtype="datetime64[D]")
+        is_call = np.array(columns[2], dtype=bool)
+        strike = np.array(columns[3], dtype=np.float64)
+        # Sort by expiration, then strike, then calls first
+        order = np.lexsort((~is_call, strike, expiration))
+        self.symbols = symbols[order]
+        self.expiration = expiration[order]
+        self.is_call = is_call[order]
+        self.strike = strike[order]
+        self.bid, self.ask, self.last, self.iv, self.delta, self.gamma, self.theta, self.vega, \
+            self.open_interest = (np.array(column, dtype=np.float64)[order] for column in columns[4:])
+
+        # Rows whose IV/Greeks were computed by fill_greeks rather than supplied by the feed
+        self.local_greeks = np.zeros(len(self.symbols), dtype=bool)
+
+        # Expiration index: block i covers rows [_starts[i], _starts[i + 1])
+        self.expirations, starts = np.unique(self.expiration, return_index=True)
+        self._starts = np.append(starts, len(self.symbols))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the chain was built."""
+        return time.time() - self.created_at
+
+    def fill_greeks(self, rate: float, dividend_yield: float = 0.0) -> int:
+        """
+        Compute IV and Greeks locally for contracts the feed returned without them.
+
+        IV supplied by the feed is kept; otherwise it is solved from the quote midpoint
+        (or last trade). Needs the underlying price.
+
+        Returns:
+            Number of contracts that received local values
+        """
+        if self.underlying_price is None:
+            return 0
+        rows = np.flatnonzero(np.isnan(self.delta) | np.isnan(self.iv))
+        if not len(rows):
+            return 0
+        is_call, strike = self.is_call[rows], self.strike[rows]
+        years = years_to_expiration(self.expiration[rows])
+        iv = self.iv[rows]
+        missing_iv = np.isnan(iv)
+        if missing_iv.any():
+            premium = mid_price(self.bid[rows], self.ask[rows], self.last[rows])
+            solved = implied_volatility(premium, is_call, self.underlying_price, strike, years,
+                                        rate, dividend_yield)
+            iv = np.where(missing_iv, solved, iv)
+        values = greeks(is_call, self.underlying_price, strike, years, rate, dividend_yield, iv)
+        filled = ~np.isnan(values["delta"])
+        self.iv[rows] = iv
+        for name in ("delta", "gamma", "theta", "vega"):
+            column = getattr(self, name)
+            column[rows] = np.where(np.isnan(column[rows]), values[name], column[rows])
+        self.local_greeks[rows] = filled
+        return int(filled.sum())
+
+    def _candidate_rows(self, expiration_gte: Optional[date], expiration_lte: Optional[date],
+                        strike_gte: Optional[float], strike_lte: Optional[float],
+                        max_expirations: Optional[int]) -> np.ndarray:
+        """Rows inside the expiration range and strike window, found through the index."""
+        first = 0 if expiration_gte is None else int(np.searchsorted(
+            self.expirations, np.datetime64(expiration_gte, "D"), side="left"))
+        last = len(self.expirations) if expiration_lte is None else int(np.searchsorted(
+            self.expirations, np.datetime64(expiration_lte, "D"), side="right"))
+        if max_expirations is not None:
+            last = min(last, first + max_expirations)
+        blocks = []
+        for block in range(first, last):
+            lo, hi = int(self._starts[block]), int(self._starts[block + 1])
+            strikes = self.strike[lo:hi]
+            start = lo if strike_gte is None else lo + int(np.searchsorted(strikes, strike_gte, side="left"))
+            stop = hi if strike_lte is None else lo + int(np.searchsorted(strikes, strike_lte, side="right"))
+            if start < stop:
+                blocks.append(np.arange(start, stop))
+        return np.concatenate(blocks) if blocks else np.empty(0, dtype=np.intp)
+
+    def query(self, contract_type: Optional[str] = None, expiration_gte: Optional[date] = None,
+              expiration_lte: Optional[date] = None, max_expirations: Optional[int] = None,
+              strike_gte: Optional[float] = None, strike_lte: Optional[float] = None,
+              strikes_per_expiration: Optional[int] = None, delta_min: Optional[float] = None,
+              delta_max: Optional[float] = None, min_open_interest: Optional[float] = None,
+              max_spread_pct: Optional[float] = None) -> np.ndarray:
+        """
+        Rows matching every given filter, in chain order.
+
+        Args:
+            contract_type: "call" or "put"
+            expiration_gte / expiration_lte: Expiration range
+            max_expirations: Only the first N expirations in the range
+            strike_gte / strike_lte: Strike window
+            strikes_per_expiration: After the other filters, keep the N strikes nearest
+                the underlying price in each expiration
+            delta_min / delta_max: Band on the absolute delta (puts match by |delta|)
+            min_open_interest: Minimum open interest
+            max_spread_pct: Maximum bid/ask spread as a percent of the midpoint
+
+        Returns:
+            Row indices into the chain's columns
+        """
+        rows = self._candidate_rows(expiration_gte, expiration_lte, strike_gte, strike_lte, max_expirations)
+        mask = np.ones(len(rows), dtype=bool)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if contract_type is not None:
+                mask &= self.is_call[rows] == (contract_type == "call")
+            if delta_min is not None or delta_max is not None:
+                delta = np.abs(self.delta[rows])
+                if delta_min is not None:
+                    mask &= delta >= delta_min
+                if delta_max is not None:
+                    mask &= delta <= delta_max
+            if min_open_interest is not None:
+                mask &= self.open_interest[rows] >= min_open_interest
+            if max_spread_pct is not None:
+                bid, ask = self.bid[rows], self.ask[rows]
+                mask &= (bid > 0) & ((ask - bid) / ((ask + bid) / 2.0) * 100.0 <= max_spread_pct)
+        rows = rows[mask]
+        if strikes_per_expiration is not None and self.underlying_price is not None and len(rows):
+            rows = self._nearest_strikes(rows, strikes_per_expiration)
+        return rows
+
+    def _nearest_strikes(self, rows: np.ndarray, count: int) -> np.ndarray:
+        """Keep rows whose strike is among the count nearest the money within its expiration."""
+        expiration_code = np.searchsorted(self.expirations, self.expiration[rows])
+        strikes, strike_code = np.unique(self.strike[rows], return_inverse=True)
+        pair = expiration_code * len(strikes) + strike_code.reshape(-1)
+        pairs, first_row = np.unique(pair, return_index=True)
+        pair_expiration = expiration_code[first_row]
+        distance = np.abs(strikes[pairs % len(strikes)] - self.underlying_price)
+        # Rank strikes by distance within each expiration
+        order = np.lexsort((distance, pair_expiration))
+        grouped = pair_expiration[order]
+        group_start = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+        keep = pairs[order[rank < count]]
+        return rows[np.isin(pair, keep)]
+
+    def records(self, rows: np.ndarray) -> List[Tuple[Any, ...]]:
+        """Plain-value tuples (in COLUMNS order) for the given rows."""
+        types = np.where(self.is_call[rows], "call", "put")
+        return list(zip(
+            self.symbols[rows].tolist(), self.expiration[rows].tolist(), types.tolist(),
+            *(column[rows].tolist() for column in (
+                self.strike, self.bid, self.ask, self.last, self.iv, self.delta,
+                self.gamma, self.theta, self.vega, self.open_interest))
+        ))
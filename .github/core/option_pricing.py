@@ -0,0 +1,229 @@
+# option_pricing.py
+#
+# Vectorized Black-Scholes pricing, Greeks and implied volatility
+# Location: /.github/core/option_pricing.py
+# Purpose: Computes implied volatility (safeguarded Newton with a bisection fallback)
+#          and delta/gamma/theta/vega/rho for whole arrays of option contracts from
+#          quotes, underlying price, rate and dividend yield, so missing Greeks can be
+#          filled and chains analysed locally without extra API calls.
+#
+# Prices are European (Black-Scholes-Merton with a continuous dividend yield); for
+# American equity options this is the usual approximation quoted by data vendors.
+# Theta is per calendar day; vega and rho are per 1 percentage point.
+
+import re
+from datetime import date, datetime, time as dt_time, timezone
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+# Implied volatility search range (annualized)
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 5.0
+_DAYS_PER_YEAR = 365.0
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+# OCC option symbol: root, expiration YYMMDD, C/P, strike * 1000 (8 digits)
+_OCC_SYMBOL = re.compile(r"^([A-Z][A-Z0-9.]{0,5}?)(\d{6})([CP])(\d{8})$")
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal density."""
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal distribution function, accurate to double precision.
+
+    Hart's rational approximation (as popularized by Graeme West), evaluated for the
+    whole array with np.where instead of per-element branches.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    xa = np.abs(x)
+    e = np.exp(-0.5 * xa * xa)
+    # |x| < 7.07: ratio of polynomials
+    num = ((((((3.52624965998911e-02 * xa + 0.700383064443688) * xa + 6.37396220353165) * xa
+              + 33.912866078383) * xa + 112.079291497871) * xa + 221.213596169931) * xa
+           + 220.206867912376)
+    den = (((((((8.83883476483184e-02 * xa + 1.75566716318264) * xa + 16.064177579207) * xa
+               + 86.7807322029461) * xa + 296.564248779674) * xa + 637.333633378831) * xa
+            + 793.826512519948) * xa + 440.413735824752)
+    near = e * num / den
+    # Larger |x|: continued fraction
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = xa + 1.0 / (xa + 2.0 / (xa + 3.0 / (xa + 4.0 / (xa + 0.65))))
+        far = e / frac / 2.506628274631
+    tail = np.where(xa < 7.07106781186547, near, far)
+    tail = np.where(xa > 37.0, 0.0, tail)
+    return np.where(x > 0.0, 1.0 - tail, tail)
+
+
+def _d1_d2(spot, strike, years, rate, dividend_yield, volatility):
+    vol_sqrt_t = volatility * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * volatility * volatility) * years) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def price(is_call: np.ndarray, spot: np.ndarray, strike: np.ndarray, years: np.ndarray,
+          rate: float, dividend_yield: float, volatility: np.ndarray) -> np.ndarray:
+    """Black-Scholes-Merton option value."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1, d2 = _d1_d2(spot, strike, years, rate, dividend_yield, volatility)
+        forward = spot * np.exp(-dividend_yield * years)
+        discounted = strike * np.exp(-rate * years)
+        call = forward * norm_cdf(d1) - discounted * norm_cdf(d2)
+        put = discounted * norm_cdf(-d2) - forward * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def greeks(is_call: np.ndarray, spot: np.ndarray, strike: np.ndarray, years: np.ndarray,
+           rate: float, dividend_yield: float, volatility: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Delta, gamma, theta (per day), vega and rho (per 1 percentage point).
+
+    Returns:
+        Greek name -> array; NaN where volatility or time to expiration is not positive
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_t = np.sqrt(years)
+        d1, d2 = _d1_d2(spot, strike, years, rate, dividend_yield, volatility)
+        carry = np.exp(-dividend_yield * years)
+        discount = np.exp(-rate * years)
+        pdf = norm_pdf(d1)
+        sign = np.where(is_call, 1.0, -1.0)
+        cdf_d1 = norm_cdf(sign * d1)
+        cdf_d2 = norm_cdf(sign * d2)
+        decay = -spot * carry * pdf * volatility / (2.0 * sqrt_t)
+        result = {
+            "delta": sign * carry * cdf_d1,
+            "gamma": carry * pdf / (spot * volatility * sqrt_t),
+            "theta": (decay - sign * rate * strike * discount * cdf_d2
+                      + sign * dividend_yield * spot * carry * cdf_d1) / _DAYS_PER_YEAR,
+            "vega": spot * carry * pdf * sqrt_t / 100.0,
+            "rho": sign * strike * years * discount * cdf_d2 / 100.0,
+        }
+    invalid = ~((volatility > 0) & (years > 0))
+    for values in result.values():
+        values[invalid] = np.nan
+    return result
+
+
+def implied_volatility(option_price: np.ndarray, is_call: np.ndarray, spot: np.ndarray,
+                       strike: np.ndarray, years: np.ndarray, rate: float = 0.0,
+                       dividend_yield: float = 0.0, tolerance: float = 1e-8,
+                       max_iterations: int = 100) -> np.ndarray:
+    """
+    Implied volatility for every contract at once.
+
+    Each contract keeps a bracket [low, high] that always contains the root (the
+    price is increasing in volatility). A Newton step is taken when it stays inside
+    the bracket and vega is usable, otherwise the bracket is bisected, so deep
+    in/out-of-the-money contracts converge as reliably as Brent's method while
+    at-the-money ones converge quadratically. Only unconverged contracts are
+    re-evaluated each iteration.
+
+    Returns:
+        Annualized volatility; NaN when the price is outside the no-arbitrage bounds,
+        inputs are missing or the solver did not converge
+    """
+    target, is_call, spot, strike, years = np.broadcast_arrays(
+        np.asarray(option_price, dtype=np.float64), np.asarray(is_call, dtype=bool),
+        np.asarray(spot, dtype=np.float64), np.asarray(strike, dtype=np.float64),
+        np.asarray(years, dtype=np.float64))
+    result = np.full(target.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        forward = spot * np.exp(-dividend_yield * years)
+        discounted = strike * np.exp(-rate * years)
+        lower = np.maximum(np.where(is_call, forward - discounted, discounted - forward), 0.0)
+        upper = np.where(is_call, forward, discounted)
+        valid = (years > 0) & (spot > 0) & (strike > 0) & (target > lower) & (target < upper)
+    active = np.flatnonzero(valid)
+    if not len(active):
+        return result
+
+    price_a, call_a, spot_a, strike_a, years_a = (
+        values[active] for values in (target, is_call, spot, strike, years))
+    low = np.full(len(active), MIN_VOLATILITY)
+    high = np.full(len(active), MAX_VOLATILITY)
+    # Brenner-Subrahmanyam starting point, clipped into the bracket
+    sigma = np.clip(price_a / spot_a * np.sqrt(2.0 * np.pi / years_a), 0.05, 1.0)
+
+    for _ in range(max_iterations):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            diff = price(call_a, spot_a, strike_a, years_a, rate, dividend_yield, sigma) - price_a
+            hit = np.abs(diff) <= tolerance
+            high = np.where(diff > 0, sigma, high)
+            low = np.where(diff < 0, sigma, low)
+            d1, _ = _d1_d2(spot_a, strike_a, years_a, rate, dividend_yield, sigma)
+            vega = spot_a * np.exp(-dividend_yield * years_a) * norm_pdf(d1) * np.sqrt(years_a)
+            newton = sigma - diff / vega
+        use_newton = (vega > 1e-12) & (newton > low) & (newton < high)
+        step = np.where(use_newton, newton, 0.5 * (low + high))
+        # A collapsed bracket is converged too (the price is flat in volatility at this precision)
+        done = hit | ((high - low) <= 1e-12 * high)
+        solved = np.where(hit, sigma, step)
+        sigma = step
+        if done.any():
+            result[active[done]] = solved[done]
+            keep = ~done
+            active, price_a, call_a, spot_a, strike_a, years_a, low, high, sigma = (
+                values[keep] for values in (active, price_a, call_a, spot_a, strike_a, years_a, low, high, sigma))
+            if not len(active):
+                break
+    return result
+
+
+def mid_price(bid: np.ndarray, ask: np.ndarray, last: Optional[np.ndarray] = None) -> np.ndarray:
+    """Quote midpoint where both sides are quoted, else the last trade price (or NaN)."""
+    bid = np.asarray(bid, dtype=np.float64)
+    ask = np.asarray(ask, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        quoted = (bid > 0) & (ask >= bid)
+    fallback = np.full(bid.shape, np.nan) if last is None else np.asarray(last, dtype=np.float64)
+    return np.where(quoted, 0.5 * (bid + ask), fallback)
+
+
+def years_to_expiration(expirations: np.ndarray, now: Optional[datetime] = None) -> np.ndarray:
+    """
+    Years (365-day) from now until 16:00 New York time on each expiration date.
+
+    Args:
+        expirations: datetime64[D] array (or anything np.asarray converts to one)
+        now: Current time (default: datetime.now(timezone.utc))
+    """
+    from zoneinfo import ZoneInfo
+
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    expirations = np.asarray(expirations, dtype="datetime64[D]")
+    # The close falls at 20:00 or 21:00 UTC depending on daylight saving time
+    unique, inverse = np.unique(expirations, return_inverse=True)
+    new_york = ZoneInfo("America/New_York")
+    closes = np.array([
+        datetime.combine(day.item(), dt_time(16), new_york).timestamp() if not np.isnat(day) else np.nan
+        for day in unique
+    ], dtype=np.float64)
+    seconds = closes[inverse.reshape(expirations.shape)] - now.timestamp()
+    return seconds / (_DAYS_PER_YEAR * 86400.0)
+
+
+class OccSymbol(NamedTuple):
+    """Components of an OCC option symbol."""
+    root: str
+    expiration: date
+    is_call: bool
+    strike: float
+
+
+def parse_occ_symbol(symbol: str) -> Optional[OccSymbol]:
+    """Parse an OCC option symbol such as "AAPL250613P00205000"; None if it is not one."""
+    match = _OCC_SYMBOL.match(symbol.strip().upper())
+    if not match:
+        return None
+    root, expiration, kind, strike = match.groups()
+    try:
+        expires = datetime.strptime(expiration, "%y%m%d").date()
+    except ValueError:
+        return None
+    return OccSymbol(root, expires, kind == "C", int(strike) / 1000.0)
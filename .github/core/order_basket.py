@@ -0,0 +1,88 @@
+# order_basket.py
+#
+# Order basket normalization and deterministic client order IDs
+# Location: /.github/core/order_basket.py
+# Purpose: Normalizes the per-order dictionaries of a bulk order request and derives a
+#          deterministic client_order_id for each order, so resubmitting the same basket
+#          (after a timeout or a partial failure) is rejected by the API as a duplicate
+#          instead of placing the orders twice.
+
+import hashlib
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Order fields accepted in a basket entry, with their aliases
+ORDER_FIELDS = ("symbol", "side", "quantity", "order_type", "time_in_force", "limit_price",
+                "stop_price", "trail_price", "trail_percent", "extended_hours", "client_order_id")
+_ALIASES = {"qty": "quantity", "type": "order_type", "tif": "time_in_force"}
+# Alpaca rejects a reused client_order_id with this message (HTTP 422)
+DUPLICATE_CLIENT_ORDER_ID = "client_order_id must be unique"
+# Maximum client_order_id length accepted by the API
+MAX_CLIENT_ORDER_ID_LENGTH = 128
+
+
+def normalize_order(entry: Any, defaults: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Normalize one basket entry.
+
+    Keys are matched case-insensitively (qty, type and tif are accepted as aliases),
+    symbol and side are upper/lower-cased, and missing fields take the basket defaults.
+
+    Returns:
+        (order fields, error message or None)
+    """
+    if not isinstance(entry, dict):
+        return {}, f"Order must be an object with symbol, side and quantity, got {type(entry).__name__}."
+    order = dict(defaults)
+    unknown = []
+    for key, value in entry.items():
+        name = _ALIASES.get(str(key).lower(), str(key).lower())
+        if name in ORDER_FIELDS:
+            order[name] = value
+        else:
+            unknown.append(str(key))
+    if unknown:
+        return order, f"Unknown order field: {', '.join(unknown)}. Valid fields: {', '.join(ORDER_FIELDS)}."
+    for name in ("symbol", "side", "quantity"):
+        if order.get(name) in (None, ""):
+            return order, f"Missing required field: {name}."
+    order["symbol"] = str(order["symbol"]).strip().upper()
+    order["side"] = str(order["side"]).strip().lower()
+    try:
+        order["quantity"] = float(order["quantity"])
+    except (TypeError, ValueError):
+        return order, f"Invalid quantity: {order['quantity']}."
+    if order["quantity"] <= 0:
+        return order, f"Invalid quantity: {order['quantity']:g}. Must be greater than 0."
+    cid = order.get("client_order_id")
+    if cid is not None and not 0 < len(str(cid)) <= MAX_CLIENT_ORDER_ID_LENGTH:
+        return order, f"client_order_id must be 1-{MAX_CLIENT_ORDER_ID_LENGTH} characters."
+    return order, None
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def client_order_ids(orders: Sequence[Dict[str, Any]], batch_id: Optional[str] = None,
+                     trading_day: Optional[date] = None) -> List[str]:
+    """
+    Deterministic client_order_id for every order of a basket.
+
+    Each ID is "<batch>-<position>-<order hash>". Without a batch_id the batch part is
+    a hash of the whole basket and the trading day, so the same basket submitted
+    twice on one day gets the same IDs while the same rebalance on another day does
+    not. Orders that already carry a client_order_id keep it.
+
+    Args:
+        orders: Normalized orders (from normalize_order)
+        batch_id: Caller-chosen basket identifier (at most 64 characters are used)
+        trading_day: Day mixed into the generated batch hash (default: today)
+    """
+    specs = [{name: order.get(name) for name in ORDER_FIELDS if name != "client_order_id"} for order in orders]
+    batch = (str(batch_id)[:64] if batch_id
+             else "bkt" + _digest([str(trading_day or date.today()), specs])[:12])
+    return [order.get("client_order_id") or f"{batch}-{position}-{_digest(spec)[:8]}"
+            for position, (order, spec) in enumerate(zip(orders, specs))]
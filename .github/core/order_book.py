@@ -0,0 +1,173 @@
+# order_book.py
+#
+# Compact level 2 order books
+# Location: /.github/core/order_book.py
+# Purpose: Keeps the bid and ask levels of an order book in sorted NumPy arrays,
+#          applies the full snapshots and incremental updates of the crypto orderbook
+#          feed with vectorized merges, and answers depth, mid-price and fill-price
+#          questions from the arrays without rebuilding per-level objects.
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+_EMPTY = np.empty(0)
+
+
+def levels_from_raw(levels: Optional[List[Dict[str, Any]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Prices and sizes of raw orderbook levels ({"p": price, "s": size}, as sent by the API)."""
+    if not levels:
+        return _EMPTY, _EMPTY
+    count = len(levels)
+    price = np.fromiter((level["p"] for level in levels), dtype=np.float64, count=count)
+    size = np.fromiter((level["s"] for level in levels), dtype=np.float64, count=count)
+    return price, size
+
+
+def _merge(keys: np.ndarray, sizes: np.ndarray, update_keys: np.ndarray,
+           update_sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply level updates to one side (keys ascending, best level first).
+
+    A size of 0 removes the level. When a key is repeated in one update, the last
+    occurrence wins. Returns new arrays; the inputs are not modified.
+    """
+    if not len(update_keys):
+        return keys, sizes
+    # np.unique keeps the first occurrence, so look at the update back to front
+    update_keys, first = np.unique(update_keys[::-1], return_index=True)
+    update_sizes = update_sizes[::-1][first]
+    position = np.searchsorted(keys, update_keys)
+    found = position < len(keys)
+    found[found] = keys[position[found]] == update_keys[found]
+    sizes = sizes.copy()
+    sizes[position[found]] = update_sizes[found]
+    added = ~found & (update_sizes > 0)
+    if added.any():
+        keys = np.insert(keys, position[added], update_keys[added])
+        sizes = np.insert(sizes, position[added], update_sizes[added])
+    if (update_sizes[found] <= 0).any():
+        keep = sizes > 0
+        keys, sizes = keys[keep], sizes[keep]
+    return keys, sizes
+
+
+class BookSide(NamedTuple):
+    """One side of a book, best level first."""
+    price: np.ndarray
+    size: np.ndarray
+
+
+class L2Book:
+    """
+    Order book for one symbol as two pairs of sorted arrays.
+
+    Bids are keyed by their negated price so that index 0 is the best level on both
+    sides and one merge routine serves both. Every change publishes a new state
+    tuple instead of editing arrays in place, so readers on other threads always
+    see a consistent book without locking.
+    """
+
+    def __init__(self):
+        # (bid keys, bid sizes, ask keys, ask sizes)
+        self._state: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] = (_EMPTY, _EMPTY, _EMPTY, _EMPTY)
+        self.timestamp: Any = None
+        self.updates = 0
+
+    def reset(self, bids: Tuple[np.ndarray, np.ndarray], asks: Tuple[np.ndarray, np.ndarray],
+              timestamp: Any = None) -> None:
+        """Replace the whole book with a snapshot ((prices, sizes) per side, any order)."""
+        bid_keys, bid_sizes = _merge(_EMPTY, _EMPTY, -bids[0], bids[1])
+        ask_keys, ask_sizes = _merge(_EMPTY, _EMPTY, asks[0], asks[1])
+        self._state = (bid_keys, bid_sizes, ask_keys, ask_sizes)
+        self.timestamp = timestamp
+        self.updates += 1
+
+    def update(self, bids: Tuple[np.ndarray, np.ndarray], asks: Tuple[np.ndarray, np.ndarray],
+               timestamp: Any = None) -> None:
+        """Apply changed levels ((prices, sizes) per side; size 0 removes a level)."""
+        bid_keys, bid_sizes, ask_keys, ask_sizes = self._state
+        bid_keys, bid_sizes = _merge(bid_keys, bid_sizes, -bids[0], bids[1])
+        ask_keys, ask_sizes = _merge(ask_keys, ask_sizes, asks[0], asks[1])
+        self._state = (bid_keys, bid_sizes, ask_keys, ask_sizes)
+        self.timestamp = timestamp
+        self.updates += 1
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "L2Book":
+        """Book from a raw orderbook message or REST record ("b" bids, "a" asks, "t" time)."""
+        book = cls()
+        book.reset(levels_from_raw(raw.get("b")), levels_from_raw(raw.get("a")), raw.get("t"))
+        return book
+
+    def apply_raw(self, raw: Dict[str, Any]) -> None:
+        """Apply a raw orderbook message: a snapshot when "r" is set, otherwise an update."""
+        apply = self.reset if raw.get("r") else self.update
+        apply(levels_from_raw(raw.get("b")), levels_from_raw(raw.get("a")), raw.get("t"))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def sides(self, depth: Optional[int] = None) -> Tuple[BookSide, BookSide]:
+        """(bids, asks), best level first, limited to depth levels per side."""
+        bid_keys, bid_sizes, ask_keys, ask_sizes = self._state
+        return (BookSide(-bid_keys[:depth], bid_sizes[:depth]),
+                BookSide(ask_keys[:depth], ask_sizes[:depth]))
+
+    def levels(self) -> Tuple[int, int]:
+        """Number of (bid, ask) levels."""
+        return len(self._state[0]), len(self._state[2])
+
+    def best(self) -> Tuple[Optional[float], Optional[float]]:
+        """(best bid, best ask); None for an empty side."""
+        bid_keys, _, ask_keys, _ = self._state
+        return (float(-bid_keys[0]) if len(bid_keys) else None,
+                float(ask_keys[0]) if len(ask_keys) else None)
+
+    def mid(self) -> Optional[float]:
+        """Mid price, or None unless both sides have levels."""
+        bid, ask = self.best()
+        return (bid + ask) / 2 if bid is not None and ask is not None else None
+
+    def depth_within(self, bps: float) -> Tuple[float, float]:
+        """Bid and ask size resting within bps basis points of the mid price."""
+        mid = self.mid()
+        if mid is None:
+            return 0.0, 0.0
+        bid_keys, bid_sizes, ask_keys, ask_sizes = self._state
+        band = mid * bps / 10_000
+        bid_end = np.searchsorted(bid_keys, -(mid - band), side="right")
+        ask_end = np.searchsorted(ask_keys, mid + band, side="right")
+        return float(bid_sizes[:bid_end].sum()), float(ask_sizes[:ask_end].sum())
+
+    def fill_price(self, side: str, qty: Optional[float] = None,
+                   notional: Optional[float] = None) -> Tuple[Optional[float], float]:
+        """
+        Average price of an immediate fill against the visible book.
+
+        Args:
+            side: "buy" (walks the asks) or "sell" (walks the bids)
+            qty: Quantity to fill
+            notional: Amount to spend or receive, when qty is not given
+
+        Returns:
+            (average fill price or None when nothing can fill, quantity filled); the
+            quantity is short of qty when the visible book is not deep enough
+        """
+        bids, asks = self.sides()
+        price, size = asks if side == "buy" else bids
+        if not len(price):
+            return None, 0.0
+        if qty is not None:
+            amount, value = size, qty
+        else:
+            amount, value = price * size, notional or 0.0
+        # Levels are taken whole until the running total passes the target, then partially
+        before = np.cumsum(amount) - amount
+        taken = np.clip(value - before, 0.0, amount)
+        filled_size = taken if qty is not None else taken / price
+        filled = float(filled_size.sum())
+        if not filled > 0:
+            return None, 0.0
+        return float(price @ filled_size) / filled, filled
@@ -0,0 +1,501 @@
+# order_mirror.py
+#
+# Local order and fill mirror fed by the trade updates stream
+# Location: /.github/core/order_mirror.py
+# Purpose: Subscribes to the TradingStream trade_updates channel on a background thread
+#          and keeps every order (indexed by id, client_order_id, symbol and status) and
+#          recent fills in memory, optionally persisted to SQLite, with periodic REST
+#          reconciliation, so order and position queries are answered locally instead of
+#          polling the REST API.
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from streaming import StreamRunner
+
+# Statuses after which an order no longer changes (the REST API's "closed" orders)
+CLOSED_STATUSES = frozenset({"filled", "canceled", "expired", "replaced", "rejected", "done_for_day"})
+# Trade update events that report an execution
+FILL_EVENTS = frozenset({"fill", "partial_fill"})
+# Maximum page size of the REST order listing
+ORDERS_PAGE_LIMIT = 500
+# Pages overlap by this much so orders sharing the boundary timestamp are not skipped
+ORDERS_PAGE_OVERLAP = timedelta(seconds=1)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS orders (id TEXT PRIMARY KEY, client_order_id TEXT, symbol TEXT,"
+    " status TEXT, updated_at TEXT, data TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS fills (execution_id TEXT PRIMARY KEY, order_id TEXT, symbol TEXT,"
+    " side TEXT, event TEXT, price REAL, qty REAL, position_qty REAL, timestamp TEXT)",
+)
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Naive datetimes (e.g. parsed tool arguments) are taken as UTC, like the REST API does
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _submitted(order: Any) -> datetime:
+    return _utc(order.submitted_at or order.created_at) or _EPOCH
+
+
+class Fill(NamedTuple):
+    """One execution reported by a fill or partial_fill trade update."""
+    execution_id: str
+    order_id: str
+    symbol: str
+    side: str
+    event: str
+    price: Optional[float]
+    qty: Optional[float]
+    position_qty: Optional[float]
+    timestamp: datetime
+
+
+class OrderMirror:
+    """
+    In-memory mirror of the account's orders and fills.
+
+    Trade updates replace the mirrored order by id (an update older than the mirrored
+    copy, by updated_at, is ignored), so the mirror stays current while the stream is
+    connected. A reconciliation thread loads all open orders and the most recent closed
+    orders over REST whenever the stream (re)connects and every reconcile_interval
+    seconds after that, which repairs anything missed while disconnected. Failed
+    reconciliations are retried with exponential backoff, so an API outage or a
+    rejected key does not spend the trading request budget order placement needs.
+
+    Queries return None when the mirror cannot answer them completely (stream down, not
+    yet reconciled, or a listing reaching further back than the reconciled history), so
+    callers fall back to REST.
+    """
+
+    def __init__(self, stream: Any, fetch_orders: Callable[[str, int, Optional[datetime]], List[Any]],
+                 fetch_order: Callable[[str], Any], decode_order: Optional[Callable[[str], Any]] = None,
+                 db_path: Optional[str] = None, history: int = ORDERS_PAGE_LIMIT,
+                 reconcile_interval: float = 60.0, position_max_age: float = 10.0,
+                 max_fills: int = 10000, backoff_base: float = 1.0, backoff_max: float = 300.0):
+        """
+        Initialize the mirror.
+
+        Args:
+            stream: A TradingStream instance (not yet running)
+            fetch_orders: Callable(status, limit, until) returning SDK Orders newest first,
+                for status "open" or "closed" (until: only orders submitted before it)
+            fetch_order: Callable(order_id) returning one SDK Order
+            decode_order: Callable(json text) returning an SDK Order; needed to reload
+                orders persisted in db_path
+            db_path: SQLite file persisting orders and fills across restarts (None: memory only)
+            history: Closed orders loaded per reconciliation (API maximum: 500)
+            reconcile_interval: Seconds between REST reconciliations while connected
+            position_max_age: Seconds a positions snapshot is served before it is refetched
+            max_fills: Fills kept in memory
+            backoff_base: Seconds before retrying after a failed reconciliation, doubled
+                on every consecutive failure
+            backoff_max: Upper bound in seconds for the retry delay
+        """
+        self.runner = StreamRunner(stream, "trade-updates")
+        self._fetch_orders = fetch_orders
+        self._fetch_order = fetch_order
+        self._decode_order = decode_order
+        self.db_path = db_path
+        self.history = max(1, min(ORDERS_PAGE_LIMIT, history))
+        self.reconcile_interval = reconcile_interval
+        self.position_max_age = position_max_age
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.RLock()
+        self._orders: Dict[str, Any] = {}
+        self._by_client_id: Dict[str, str] = {}
+        self._by_symbol: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        # Submission time as a POSIX timestamp per order id (sorting aware datetimes is slow)
+        self._submitted_at: Dict[str, float] = {}
+        self._fills: deque = deque(maxlen=max_fills)
+        self._fill_ids: Set[str] = set()
+        # Oldest submission time the mirror is known to hold every order from (None: all history)
+        self._covered_since: Optional[float] = 0.0
+        self._synced = False
+        self._reconciled_at = 0.0
+        # Failed reconciliations in a row, and the monotonic time before which none is retried
+        self._failures = 0
+        self._retry_at = 0.0
+        self._positions: Optional[List[Any]] = None
+        self._positions_at = 0.0
+        self._position_generation = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.events = 0
+        self.reconciliations = 0
+        self.reconcile_errors = 0
+        self.last_error: Optional[str] = None
+        self.hits = 0
+        self.fallbacks = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Open the database, subscribe to trade updates and start the reconciliation thread."""
+        if self._thread is not None:
+            return
+        if self.db_path:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+            self._db.commit()
+        self.runner.stream.subscribe_trade_updates(self._on_trade_update)
+        self.runner.start()
+        self._thread = threading.Thread(target=self._run, name="order-mirror", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        self._load()
+        connection = None
+        while True:
+            connection = self._step(connection)
+            time.sleep(0.5)
+
+    def _step(self, connection: Any) -> Any:
+        """One pass of the reconciliation loop; returns the websocket the mirror is synced on."""
+        # A new websocket object means the stream reconnected, possibly between two checks
+        current = getattr(self.runner.stream, "_ws", None)
+        if not self.runner.is_connected() or current is not connection:
+            # Updates may be missed while disconnected; reconcile again once reconnected
+            self._synced = False
+            return current if self.runner.is_connected() else None
+        now = time.monotonic()
+        due = not self._synced or now - self._reconciled_at >= self.reconcile_interval
+        if due and now >= self._retry_at:
+            try:
+                self.reconcile()
+            except Exception as e:
+                self.reconcile_errors += 1
+                self.last_error = str(e)
+                self._failures += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (self._failures - 1))
+                self._retry_at = time.monotonic() + delay
+            else:
+                self._failures = 0
+                self._retry_at = 0.0
+        return connection
+
+    def ready(self) -> bool:
+        """Whether the stream is connected and the mirror has been reconciled since it connected."""
+        return self._synced and self.runner.is_connected()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    async def _on_trade_update(self, update: Any) -> None:
+        try:
+            self.apply(update)
+        except Exception as e:
+            # The update is lost; serve nothing until the next reconciliation repairs it
+            self._synced = False
+            self.last_error = str(e)
+
+    def apply(self, update: Any) -> None:
+        """Apply one TradeUpdate (runs on the stream thread)."""
+        event = str(_value(update.event))
+        fill = None
+        with self._lock:
+            self.events += 1
+            changed = self._upsert(update.order)
+            if event in FILL_EVENTS:
+                self._position_generation += 1
+                self._positions = None
+                order = update.order
+                fill = Fill(
+                    execution_id=str(update.execution_id or f"{order.id}:{update.timestamp.isoformat()}"),
+                    order_id=str(order.id),
+                    symbol=order.symbol,
+                    side=str(_value(order.side)),
+                    event=event,
+                    price=update.price,
+                    qty=update.qty,
+                    position_qty=update.position_qty,
+                    timestamp=_utc(update.timestamp),
+                )
+                if not self._add_fill(fill):
+                    fill = None
+            if self._db is not None:
+                self._persist([update.order] if changed else [], [fill] if fill else [])
+
+    def _upsert(self, order: Any) -> bool:
+        """Insert or replace an order unless the mirrored copy is newer; returns whether it changed."""
+        key = str(order.id)
+        current = self._orders.get(key)
+        if current is not None:
+            if current.updated_at and order.updated_at and _utc(order.updated_at) < _utc(current.updated_at):
+                return False
+            self._unindex(key, current)
+        self._orders[key] = order
+        self._submitted_at[key] = _submitted(order).timestamp()
+        if order.client_order_id:
+            self._by_client_id[order.client_order_id] = key
+        self._by_symbol.setdefault(order.symbol, set()).add(key)
+        self._by_status.setdefault(str(_value(order.status)), set()).add(key)
+        return True
+
+    def _unindex(self, key: str, order: Any) -> None:
+        self._by_symbol.get(order.symbol, set()).discard(key)
+        self._by_status.get(str(_value(order.status)), set()).discard(key)
+
+    def _add_fill(self, fill: Fill) -> bool:
+        if fill.execution_id in self._fill_ids:
+            return False
+        if len(self._fills) == self._fills.maxlen:
+            self._fill_ids.discard(self._fills[0].execution_id)
+        self._fills.append(fill)
+        self._fill_ids.add(fill.execution_id)
+        return True
+
+    def reconcile(self) -> None:
+        """
+        Reload open orders and the most recent closed orders over REST.
+
+        Orders the mirror holds as open that are in neither listing are fetched by id.
+        Called by the reconciliation thread; safe to call directly.
+        """
+        # Note the connection state first: updates received from here on are in the mirror
+        connected = self.runner.is_connected()
+        listed: Dict[str, Any] = {}
+        until = None
+        while True:
+            page = self._fetch_orders("open", ORDERS_PAGE_LIMIT, until)
+            new = [order for order in page if str(order.id) not in listed]
+            listed.update((str(order.id), order) for order in new)
+            # A page with nothing new means a full page shares the overlap; paging cannot advance
+            if len(page) < ORDERS_PAGE_LIMIT or not new:
+                break
+            oldest = min(_submitted(order) for order in page)
+            # Overlap the boundary so orders sharing its timestamp are not skipped, unless the
+            # page did not get past the previous boundary (a page's worth of orders share it)
+            stuck = until is not None and oldest + ORDERS_PAGE_OVERLAP >= until
+            until = oldest if stuck else oldest + ORDERS_PAGE_OVERLAP
+        open_orders = list(listed.values())
+        closed = self._fetch_orders("closed", self.history, None)
+
+        seen = set(listed) | {str(order.id) for order in closed}
+        with self._lock:
+            stale = [key for status, keys in self._by_status.items() if status not in CLOSED_STATUSES
+                     for key in keys if key not in seen]
+        refreshed = []
+        for key in stale:
+            try:
+                refreshed.append(self._fetch_order(key))
+            except Exception:
+                pass
+
+        with self._lock:
+            changed = [order for order in open_orders + closed + refreshed if self._upsert(order)]
+            covered = None if len(closed) < self.history else min(_submitted(order) for order in closed).timestamp()
+            if self._synced and connected:
+                # Still continuously connected: what was covered before stays covered
+                covered = None if covered is None or self._covered_since is None \
+                    else min(covered, self._covered_since)
+            self._covered_since = covered
+            self._reconciled_at = time.monotonic()
+            self._synced = connected
+            self.reconciliations += 1
+            if self._db is not None:
+                self._persist(changed, [])
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _persist(self, orders: Iterable[Any], fills: Iterable[Fill]) -> None:
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?)",
+                [(str(o.id), o.client_order_id, o.symbol, str(_value(o.status)),
+                  _utc(o.updated_at).isoformat() if o.updated_at else None, o.model_dump_json())
+                 for o in orders])
+            self._db.executemany(
+                "INSERT OR IGNORE INTO fills VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(f.execution_id, f.order_id, f.symbol, f.side, f.event, f.price, f.qty,
+                  f.position_qty, f.timestamp.isoformat()) for f in fills])
+            self._db.commit()
+        except sqlite3.Error as e:
+            self.last_error = f"database: {e}"
+
+    def _load(self) -> None:
+        """Load persisted orders and the latest fills (they are served once reconciled)."""
+        if self._db is None or self._decode_order is None:
+            return
+        with self._lock:
+            try:
+                rows = self._db.execute("SELECT data FROM orders").fetchall()
+                fills = self._db.execute(
+                    "SELECT * FROM (SELECT * FROM fills ORDER BY timestamp DESC LIMIT ?) ORDER BY timestamp",
+                    (self._fills.maxlen,)).fetchall()
+            except sqlite3.Error as e:
+                self.last_error = f"database: {e}"
+                return
+            for (data,) in rows:
+                try:
+                    self._upsert(self._decode_order(data))
+                except Exception:
+                    continue
+            for row in fills:
+                self._add_fill(Fill(*row[:8], datetime.fromisoformat(row[8])))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _answer(self, result: Any) -> Any:
+        if result is None:
+            self.fallbacks += 1
+        else:
+            self.hits += 1
+        return result
+
+    def get(self, order_id: Optional[str] = None, client_order_id: Optional[str] = None) -> Optional[Any]:
+        """Order by id or client_order_id, or None if not ready or not mirrored."""
+        if not self.ready():
+            return self._answer(None)
+        with self._lock:
+            key = str(order_id) if order_id else self._by_client_id.get(client_order_id or "")
+            return self._answer(self._orders.get(key) if key else None)
+
+    def query(self, status: str = "all", limit: int = 50, after: Optional[datetime] = None,
+              until: Optional[datetime] = None, direction: str = "desc", side: Optional[str] = None,
+              symbols: Optional[Iterable[str]] = None) -> Optional[List[Any]]:
+        """
+        Orders matching the filters, with the REST listing's semantics.
+
+        Args:
+            status: "open", "closed" or "all"
+            limit: Maximum number of orders
+            after / until: Only orders submitted strictly after / before these times
+            direction: "desc" (newest first) or "asc" by submission time
+            side: "buy" or "sell"
+            symbols: Only these symbols
+
+        Returns:
+            Matching orders, or None when the mirror cannot answer completely
+        """
+        if not self.ready():
+            return self._answer(None)
+        after = _utc(after).timestamp() if after is not None else None
+        until = _utc(until).timestamp() if until is not None else None
+        with self._lock:
+            if status in ("open", "closed"):
+                closed = status == "closed"
+                keys = set().union(*(ids for name, ids in self._by_status.items()
+                                     if (name in CLOSED_STATUSES) == closed))
+            else:
+                keys = self._orders.keys()
+            if symbols:
+                keys = set().union(*(self._by_symbol.get(symbol, set()) for symbol in symbols)).intersection(keys)
+            rows = []
+            for key in keys:
+                submitted = self._submitted_at[key]
+                if (after is not None and submitted <= after) or (until is not None and submitted >= until):
+                    continue
+                order = self._orders[key]
+                if side is not None and str(_value(order.side)) != side:
+                    continue
+                rows.append((submitted, order))
+            covered = self._covered_since
+
+        rows.sort(key=itemgetter(0), reverse=direction != "asc")
+        if status != "open" and covered is not None and (after is None or after < covered):
+            # Orders submitted before the covered window may be missing from the mirror
+            if direction == "asc":
+                return self._answer(None)
+            inside = [order for submitted, order in rows if submitted >= covered]
+            if len(inside) < limit:
+                return self._answer(None)
+            return self._answer(inside[:limit])
+        return self._answer([order for _, order in rows[:limit]])
+
+    def fills(self, symbols: Optional[Iterable[str]] = None, limit: int = 50) -> List[Fill]:
+        """Most recent fills first, optionally for some symbols only."""
+        wanted = set(symbols) if symbols else None
+        with self._lock:
+            result = []
+            for fill in reversed(self._fills):
+                if wanted is None or fill.symbol in wanted:
+                    result.append(fill)
+                    if len(result) >= limit:
+                        break
+        return result
+
+    # ------------------------------------------------------------------
+    # Positions
+    # ------------------------------------------------------------------
+
+    @property
+    def position_generation(self) -> int:
+        """Counter bumped on every fill; pass it to store_positions with a REST snapshot."""
+        return self._position_generation
+
+    def positions(self) -> Optional[List[Any]]:
+        """The stored positions snapshot, or None if stale, invalidated by a fill or not ready."""
+        with self._lock:
+            fresh = (self._positions is not None and self.ready()
+                     and time.monotonic() - self._positions_at <= self.position_max_age)
+            return self._answer(list(self._positions) if fresh else None)
+
+    def store_positions(self, positions: Iterable[Any], generation: int) -> None:
+        """
+        Keep a REST positions snapshot.
+
+        Args:
+            positions: SDK Position models
+            generation: position_generation read before the snapshot was requested; the
+                snapshot is dropped if a fill arrived in the meantime
+        """
+        with self._lock:
+            if generation == self._position_generation:
+                self._positions = list(positions)
+                self._positions_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection, size and hit/fallback counters."""
+        with self._lock:
+            open_orders = sum(len(keys) for status, keys in self._by_status.items()
+                              if status not in CLOSED_STATUSES)
+            return {
+                "running": self.runner.is_alive(),
+                "connected": self.runner.is_connected(),
+                "synced": self._synced,
+                "orders": len(self._orders),
+                "open_orders": open_orders,
+                "fills": len(self._fills),
+                "events": self.events,
+                "reconciliations": self.reconciliations,
+                "reconcile_errors": self.reconcile_errors,
+                "consecutive_errors": self._failures,
+                "retry_in": max(0.0, self._retry_at - time.monotonic()) if self._failures else None,
+                "last_reconcile_age": time.monotonic() - self._reconciled_at if self._reconciled_at else None,
+                "covered_since": (datetime.fromtimestamp(self._covered_since, timezone.utc)
+                                  if self._covered_since is not None else None),
+                "persistent": self._db is not None,
+                "hits": self.hits,
+                "fallbacks": self.fallbacks,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,252 @@
+# portfolio_risk.py
+#
+# Vectorized portfolio risk aggregation
+# Location: /.github/core/portfolio_risk.py
+# Purpose: Turns account positions plus batched market prices into per-leg arrays and
+#          computes delta-adjusted and beta-weighted exposure, option Greeks in dollars,
+#          concentration by underlying or sector, and full-revaluation scenario P/L on a
+#          price x volatility shock grid, all with NumPy instead of per-position loops.
+
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from option_pricing import greeks, implied_volatility, parse_occ_symbol, price, years_to_expiration
+
+# Contract multiplier for US equity options
+OPTION_MULTIPLIER = 100.0
+# Lowest volatility used when a scenario shifts IV down
+_MIN_SCENARIO_VOLATILITY = 0.01
+_DAY_NS = 86_400 * 10**9
+
+
+class Legs(NamedTuple):
+    """One array entry per position."""
+    symbol: np.ndarray        # position symbol
+    underlying: np.ndarray    # underlying symbol (the symbol itself for stocks and crypto)
+    is_option: np.ndarray
+    is_call: np.ndarray
+    quantity: np.ndarray      # signed: negative for short positions
+    multiplier: np.ndarray
+    spot: np.ndarray          # underlying price
+    strike: np.ndarray
+    years: np.ndarray         # time to expiration
+    iv: np.ndarray            # option implied volatility (NaN when unknown)
+    market_value: np.ndarray
+
+
+def _number(value: Any) -> float:
+    if value is None or value == "":
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def build_legs(positions: Sequence[Any], prices: Dict[str, float], option_snapshots: Dict[str, Any],
+               rate: float, dividend_yield: float, now: Optional[datetime] = None) -> Legs:
+    """
+    Combine positions with batched prices.
+
+    Args:
+        positions: SDK Position models
+        prices: Underlying symbol -> latest price (falls back to the position's current price)
+        option_snapshots: Option symbol -> SDK OptionsSnapshot (IV is solved from the
+            position's price when the snapshot has none)
+        rate: Risk-free rate for solving missing IV
+        dividend_yield: Dividend yield for solving missing IV
+        now: Valuation time (default: now)
+    """
+    rows = []
+    for position in positions:
+        symbol = position.symbol
+        quantity = abs(_number(position.qty))
+        if str(getattr(position.side, "value", position.side)).lower() == "short" or _number(position.qty) < 0:
+            quantity = -quantity
+        current = _number(position.current_price)
+        contract = parse_occ_symbol(symbol) if "option" in str(getattr(position.asset_class, "value",
+                                                                       position.asset_class)) else None
+        if contract is None:
+            spot = prices.get(symbol, current)
+            rows.append((symbol, symbol, False, False, quantity, 1.0, spot, np.nan, None, np.nan,
+                         _number(position.market_value)))
+            continue
+        snapshot = option_snapshots.get(symbol)
+        rows.append((symbol, contract.root, True, contract.is_call, quantity, OPTION_MULTIPLIER,
+                     prices.get(contract.root, np.nan), contract.strike, contract.expiration,
+                     _number(getattr(snapshot, "implied_volatility", None)), _number(position.market_value)))
+
+    count = len(rows)
+    columns = list(zip(*rows)) if rows else [()] * 11
+    expirations = np.array([np.datetime64("NaT") if value is None else np.datetime64(value, "D")
+                            for value in columns[8]], dtype="datetime64[D]")
+    legs = Legs(
+        symbol=np.array(columns[0], dtype=object).reshape(count),
+        underlying=np.array(columns[1], dtype=object).reshape(count),
+        is_option=np.array(columns[2], dtype=bool).reshape(count),
+        is_call=np.array(columns[3], dtype=bool).reshape(count),
+        quantity=np.array(columns[4], dtype=np.float64).reshape(count),
+        multiplier=np.array(columns[5], dtype=np.float64).reshape(count),
+        spot=np.array(columns[6], dtype=np.float64).reshape(count),
+        strike=np.array(columns[7], dtype=np.float64).reshape(count),
+        years=np.where(np.isnat(expirations), np.nan, years_to_expiration(expirations, now)) if count
+        else np.empty(0),
+        iv=np.array(columns[9], dtype=np.float64).reshape(count),
+        market_value=np.array(columns[10], dtype=np.float64).reshape(count),
+    )
+
+    # Options without a feed IV: solve it from the position's per-share price
+    missing = np.flatnonzero(legs.is_option & np.isnan(legs.iv))
+    if len(missing):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            premium = np.abs(legs.market_value[missing] / (legs.quantity[missing] * legs.multiplier[missing]))
+        legs.iv[missing] = implied_volatility(premium, legs.is_call[missing], legs.spot[missing],
+                                              legs.strike[missing], legs.years[missing], rate, dividend_yield)
+    return legs
+
+
+def leg_exposures(legs: Legs, rate: float, dividend_yield: float) -> Dict[str, np.ndarray]:
+    """
+    Per-leg exposures in dollars.
+
+    Returns:
+        delta_dollars (share-equivalent exposure * underlying price), gamma_1pct (change in
+        delta dollars for a +1% underlying move), theta (per day), vega (per volatility
+        point) and priced (False for options without a usable IV, whose Greeks are 0)
+    """
+    size = legs.quantity * legs.multiplier
+    option_greeks = greeks(legs.is_call, legs.spot, legs.strike, legs.years, rate, dividend_yield, legs.iv)
+    priced = ~legs.is_option | ~np.isnan(option_greeks["delta"])
+    # Options without IV fall back to intrinsic delta (1 in the money, 0 out of it)
+    intrinsic_delta = np.where(legs.is_call, 1.0 * (legs.spot > legs.strike), -1.0 * (legs.spot < legs.strike))
+    delta = np.where(legs.is_option, np.where(priced, option_greeks["delta"], intrinsic_delta), 1.0)
+    gamma = np.where(legs.is_option & priced, option_greeks["gamma"], 0.0)
+    return {
+        "delta_dollars": size * delta * legs.spot,
+        "gamma_1pct": size * gamma * legs.spot * legs.spot * 0.01,
+        "theta": size * np.where(legs.is_option & priced, option_greeks["theta"], 0.0),
+        "vega": size * np.where(legs.is_option & priced, option_greeks["vega"], 0.0),
+        "priced": priced,
+    }
+
+
+def scenario_pnl(legs: Legs, price_shocks: Sequence[float], vol_shocks: Sequence[float], rate: float,
+                 dividend_yield: float, betas: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Full-revaluation P/L for every leg under every (price, volatility) shock.
+
+    Args:
+        legs: Portfolio legs
+        price_shocks: Relative underlying moves (0.05 for +5%)
+        vol_shocks: Absolute IV shifts (0.05 for +5 volatility points)
+        rate: Risk-free rate
+        dividend_yield: Dividend yield
+        betas: Per-leg beta; when given, each underlying moves beta * shock (a benchmark
+            move) instead of the shock itself (legs with unknown beta move by the shock)
+
+    Returns:
+        Array of shape (legs, price shocks, vol shocks); options are repriced with
+        Black-Scholes (intrinsic value when their IV is unknown)
+    """
+    moves = np.asarray(price_shocks, dtype=np.float64)[None, :, None]
+    shifts = np.asarray(vol_shocks, dtype=np.float64)[None, None, :]
+    if betas is not None:
+        moves = moves * np.where(np.isnan(betas), 1.0, betas)[:, None, None]
+    size = (legs.quantity * legs.multiplier)[:, None, None]
+    spot = legs.spot[:, None, None]
+    # (legs, price shocks, 1); volatility shocks broadcast along the last axis
+    shocked_spot = spot * (1.0 + moves)
+
+    pnl = np.repeat(size * (shocked_spot - spot), shifts.shape[2], axis=2)
+    options = np.flatnonzero(legs.is_option)
+    if len(options):
+        is_call = legs.is_call[options][:, None, None]
+        strike = legs.strike[options][:, None, None]
+        years = legs.years[options][:, None, None]
+        iv = legs.iv[options][:, None, None]
+        base_spot = spot[options]
+        new_spot = shocked_spot[options]
+        new_iv = np.maximum(iv + shifts, _MIN_SCENARIO_VOLATILITY)
+        base = price(is_call, base_spot, strike, years, rate, dividend_yield, iv)
+        shocked = price(is_call, new_spot, strike, years, rate, dividend_yield, new_iv)
+        intrinsic_base = np.maximum(np.where(is_call, base_spot - strike, strike - base_spot), 0.0)
+        intrinsic_new = np.maximum(np.where(is_call, new_spot - strike, strike - new_spot), 0.0)
+        model = np.isfinite(base) & np.isfinite(shocked)
+        change = np.where(model, shocked - base, intrinsic_new - intrinsic_base)
+        pnl[options] = size[options] * change
+    return pnl
+
+
+def betas(closes: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """
+    Beta of each row of closes against benchmark closes (same date columns).
+
+    Uses daily log returns over the dates where both have a price (missing prices
+    are NaN); rows with fewer than 20 overlapping returns get NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(closes), axis=1)
+        market = np.diff(np.log(benchmark))[None, :]
+        both = np.isfinite(returns) & np.isfinite(market)
+        count = both.sum(axis=1)
+        r = np.where(both, returns, 0.0)
+        m = np.where(both, market, 0.0)
+        mean_r = r.sum(axis=1) / count
+        mean_m = m.sum(axis=1) / count
+        covariance = (np.where(both, (r - mean_r[:, None]) * (m - mean_m[:, None]), 0.0)).sum(axis=1)
+        variance = (np.where(both, (m - mean_m[:, None]) ** 2, 0.0)).sum(axis=1)
+        result = covariance / variance
+    result[count < 20] = np.nan
+    return result
+
+
+def group_sum(keys: np.ndarray, values: Dict[str, np.ndarray]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Sum each value array by key (np.unique + np.bincount); keys come back sorted."""
+    names, inverse = np.unique(keys.astype(str), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    return names.tolist(), {name: np.bincount(inverse, weights=np.nan_to_num(column), minlength=len(names))
+                            for name, column in values.items()}
+
+
+def concentration(exposure: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Weights of each group in gross exposure and the Herfindahl index of those weights.
+
+    An HHI of 1 means everything is in one group; 1/N means N equal groups.
+    """
+    gross = np.abs(exposure)
+    total = gross.sum()
+    if total <= 0:
+        return np.zeros(len(exposure)), 0.0
+    weights = gross / total
+    return weights, float(np.sum(weights * weights))
+
+
+def aligned_closes(bars: Dict[str, np.ndarray], symbols: Sequence[str],
+                   benchmark: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Daily closes of symbols on the benchmark's trading days.
+
+    Args:
+        bars: Symbol -> bar_store.BAR_DTYPE array of daily bars
+        symbols: Row order of the result
+        benchmark: Symbol whose bar dates become the columns
+
+    Returns:
+        (closes of shape (symbols, days) with NaN where a symbol has no bar, benchmark closes)
+    """
+    reference = bars.get(benchmark)
+    if reference is None or not len(reference):
+        return np.full((len(symbols), 0), np.nan), np.empty(0)
+    days = reference["timestamp"] // _DAY_NS
+    closes = np.full((len(symbols), len(days)), np.nan)
+    for row, symbol in enumerate(symbols):
+        series = bars.get(symbol)
+        if series is None or not len(series):
+            continue
+        series_days = series["timestamp"] // _DAY_NS
+        index = np.minimum(np.searchsorted(series_days, days), len(series) - 1)
+        closes[row] = np.where(series_days[index] == days, series["close"][index], np.nan)
+    return closes, reference["close"].astype(np.float64)
@@ -0,0 +1,288 @@
+# rate_limiter.py
+#
+# Client-side request budget for the Alpaca REST APIs
+# Location: /.github/core/rate_limiter.py
+# Purpose: Keeps one token bucket per API family (trading, market data, corporate
+#          actions) so bursts of data calls cannot spend the quota order placement
+#          needs, serves waiting requests by priority, computes jittered backoff
+#          for 429 responses (honoring Retry-After) and records wait-time metrics.
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# API families with separate request budgets
+FAMILY_TRADING = "trading"
+FAMILY_MARKET_DATA = "market_data"
+FAMILY_CORPORATE_ACTIONS = "corporate_actions"
+
+# Request priorities; lower values are served first
+PRIORITY_ORDERS = 0      # Order placement, cancellation, position closes
+PRIORITY_TRADING = 1     # Account, position, order and asset reads
+PRIORITY_DATA = 2        # Market data
+
+PRIORITY_NAMES = {PRIORITY_ORDERS: "orders", PRIORITY_TRADING: "trading", PRIORITY_DATA: "data"}
+
+
+def retry_after_seconds(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds the server asked us to wait, from Retry-After or X-RateLimit-Reset.
+
+    Retry-After may be delta-seconds or an HTTP date; X-RateLimit-Reset is the
+    epoch second at which Alpaca refills the per-minute budget.
+    """
+    now = time.time() if now is None else now
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    reset = headers.get("X-RateLimit-Reset") or headers.get("x-ratelimit-reset")
+    if reset:
+        try:
+            return max(0.0, float(reset) - now)
+        except ValueError:
+            pass
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket for one API family, safe to use from threads and event loops.
+
+    Requests below PRIORITY_ORDERS may not take the last ``reserve`` tokens, and no
+    request may take a token while a higher-priority request is waiting for one.
+    """
+
+    def __init__(self, name: str, per_minute: float, reserve: int = 0):
+        self.name = name
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute)
+        self.rate = per_minute / 60.0
+        self.reserve = max(0, min(int(reserve), int(self.capacity) - 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        # Metrics
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.rate_limited = 0
+        self.retries = 0
+        self.wait_by_priority: Dict[int, float] = {}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, priority: int) -> float:
+        """Take a token and return 0, or return the seconds to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if any(count for level, count in self._waiting.items() if level < priority):
+                # Re-check soon; the higher-priority waiter takes the next token
+                return max(0.005, 1.0 / self.rate / 4) if self.rate > 0 else 0.05
+            floor = 1.0 + (self.reserve if priority > PRIORITY_ORDERS else 0)
+            if self._tokens >= floor:
+                self._tokens -= 1.0
+                return 0.0
+            return (floor - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+    def _wait_started(self, priority: int) -> None:
+        with self._lock:
+            self._waiting[priority] = self._waiting.get(priority, 0) + 1
+
+    def _wait_finished(self, priority: int, waited: Optional[float]) -> None:
+        with self._lock:
+            if waited is not None:
+                self._waiting[priority] -= 1
+                self.throttled += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                self.wait_by_priority[priority] = self.wait_by_priority.get(priority, 0.0) + waited
+            self.acquired += 1
+
+    def acquire(self, priority: int) -> float:
+        """Block the calling thread until a token is available; return seconds waited."""
+        delay = self.try_acquire(priority)
+        if delay <= 0:
+            self._wait_finished(priority, None)
+            return 0.0
+        started = time.monotonic()
+        self._wait_started(priority)
+        while delay > 0:
+            time.sleep(delay)
+            delay = self.try_acquire(priority)
+        waited = time.monotonic() - started
+        self._wait_finished(priority, waited)
+        return waited
+
+    async def acquire_async(self, priority: int) -> float:
+        """Wait on the event loop (without holding a thread) until a token is available."""
+        delay = self.try_acquire(priority)
+        if delay <= 0:
+            self._wait_finished(priority, None)
+            return 0.0
+        started = time.monotonic()
+        self._wait_started(priority)
+        try:
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.try_acquire(priority)
+        except BaseException:
+            with self._lock:
+                self._waiting[priority] -= 1
+            raise
+        waited = time.monotonic() - started
+        self._wait_finished(priority, waited)
+        return waited
+
+    def observe(self, remaining: Optional[int], reset_in: Optional[float]) -> None:
+        """Sync the bucket with the server's X-RateLimit-Remaining/Reset headers."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if remaining is not None and remaining < self._tokens:
+                self._tokens = float(remaining)
+            if remaining == 0 and reset_in:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + reset_in)
+
+    def count(self, counter: str) -> None:
+        """Increment a response counter ("rate_limited" or "retries")."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def block(self, seconds: float) -> None:
+        """Hold every request of this family for seconds (after a 429 response)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "per_minute": self.per_minute,
+                "reserve": self.reserve,
+                "tokens": self._tokens,
+                "waiting": sum(self._waiting.values()),
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "avg_wait_ms": (self.total_wait_seconds / self.throttled * 1000) if self.throttled else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "wait_ms_by_priority": {PRIORITY_NAMES.get(p, str(p)): s * 1000
+                                        for p, s in sorted(self.wait_by_priority.items())},
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+            }
+
+
+class RateLimiter:
+    """
+    Token buckets per API family plus the retry policy for rate-limited responses.
+
+    Families without a configured budget (or with a budget of 0) are not limited,
+    but their 429 retries still use the jittered backoff.
+    """
+
+    def __init__(self, per_minute: Optional[Dict[str, float]] = None, order_reserve: int = 0,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            per_minute: Requests per minute keyed by family (e.g. {"trading": 200})
+            order_reserve: Trading tokens only order requests may use
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for a single backoff delay
+        """
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: Dict[str, TokenBucket] = {}
+        for family, limit in (per_minute or {}).items():
+            if limit and limit > 0:
+                reserve = order_reserve if family == FAMILY_TRADING else 0
+                self._buckets[family] = TokenBucket(family, limit, reserve=reserve)
+        self._prepaid = threading.local()
+
+    def bucket(self, family: str) -> Optional[TokenBucket]:
+        return self._buckets.get(family)
+
+    def acquire(self, family: str, priority: int) -> float:
+        """
+        Take a token for one HTTP request, blocking the calling thread if needed.
+
+        A token pre-acquired by acquire_async for the current call (see run_prepaid)
+        is consumed instead, so the first request of an SDK call is not charged twice.
+        """
+        if getattr(self._prepaid, "family", None) == family:
+            self._prepaid.family = None
+            return 0.0
+        bucket = self._buckets.get(family)
+        return bucket.acquire(priority) if bucket else 0.0
+
+    async def acquire_async(self, family: str, priority: int) -> float:
+        """Take a token for an SDK call before it is dispatched to a worker thread."""
+        bucket = self._buckets.get(family)
+        return await bucket.acquire_async(priority) if bucket else 0.0
+
+    def run_prepaid(self, family: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn on this thread with one token already paid for family."""
+        self._prepaid.family = family if family in self._buckets else None
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._prepaid.family = None
+
+    def observe(self, family: str, headers: Mapping[str, str]) -> None:
+        """Feed X-RateLimit-Remaining/Reset response headers into the family's bucket."""
+        bucket = self._buckets.get(family)
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("x-ratelimit-remaining")
+        if bucket is None or remaining is None:
+            return
+        try:
+            remaining_count = int(remaining)
+        except ValueError:
+            return
+        bucket.observe(remaining_count, retry_after_seconds({"X-RateLimit-Reset": headers.get(
+            "X-RateLimit-Reset") or headers.get("x-ratelimit-reset") or ""}))
+
+    def backoff(self, family: str, attempt: int, retry_after: Optional[float]) -> float:
+        """
+        Delay before retry number attempt (0-based) of a rate-limited request.
+
+        Honors the server's Retry-After (plus jitter so parallel callers do not
+        retry in lockstep); otherwise uses exponential backoff with equal jitter.
+        The family's bucket is held for the same delay.
+        """
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        else:
+            ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        bucket = self._buckets.get(family)
+        if bucket is not None:
+            bucket.block(delay)
+            bucket.count("retries")
+        return delay
+
+    def record_rate_limited(self, family: str) -> None:
+        """Count a 429 response for family."""
+        bucket = self._buckets.get(family)
+        if bucket is not None:
+            bucket.count("rate_limited")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-family budget, wait-time and 429 counters."""
+        return {family: bucket.stats() for family, bucket in self._buckets.items()}
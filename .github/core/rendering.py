@@ -0,0 +1,588 @@
+# rendering.py
+#
+# Linear-time text rendering for tool output
+# Location: /.github/core/rendering.py
+# Purpose: Replaces repeated string concatenation in tool formatters with a buffered
+#          renderer and pre-compiled row templates per record type (orders, trades,
+#          bars, corporate actions, option snapshots), and serializes records as
+#          compact JSON, CSV or columnar JSON for the tools' structured output mode.
+
+import csv
+import io
+import json
+import string
+from functools import cached_property
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Field inclusion rules
+ALWAYS = None
+PRESENT = "present"      # include when the attribute exists (hasattr)
+TRUTHY = "truthy"        # include when the attribute exists and is truthy
+NOT_NONE = "not_none"    # include when the attribute is not None
+
+_MISSING = object()
+_FORMATTER = string.Formatter()
+
+Getter = Union[str, Callable[[Any], Any]]
+
+
+class Field:
+    """
+    One line (or fragment) of a row template.
+
+    Args:
+        template: str.format template with one positional slot per getter
+        *getters: Attribute names or callables producing the template values
+        when: Inclusion rule (ALWAYS, PRESENT, TRUTHY or NOT_NONE) checked on the first getter
+        convert: Optional callable applied to every value before formatting (e.g. float)
+    """
+
+    __slots__ = ("template", "getters", "when", "convert")
+
+    def __init__(self, template: str, *getters: Getter, when: Optional[str] = ALWAYS,
+                 convert: Optional[Callable[[Any], Any]] = None):
+        if when is not ALWAYS and not isinstance(getters[0], str):
+            raise ValueError("Conditional fields must test an attribute name")
+        self.template = template
+        self.getters = getters
+        self.when = when
+        self.convert = convert
+
+
+class RowTemplate:
+    """
+    A pre-compiled multi-field template for one record type.
+
+    The field list is compiled once into a Python function: consecutive
+    unconditional fields are fused into a single f-string, attribute getters
+    become direct attribute loads, and conditional fields become inline checks,
+    so rendering a record costs about as much as a hand-written formatter.
+    """
+
+    def __init__(self, fields: Sequence[Field]):
+        self.fields = tuple(fields)
+
+    @cached_property
+    def render(self) -> Callable[[Any], str]:
+        """Function rendering one record, compiled on first use to keep imports cheap."""
+        return self._compile()
+
+    def _compile(self) -> Callable[[Any], str]:
+        namespace: Dict[str, Any] = {"_MISSING": _MISSING, "_getattr": getattr}
+        body: List[str] = []
+        pending_template: List[str] = []
+        pending_args: List[str] = []
+
+        def constant(value: Any) -> str:
+            name = f"_c{len(namespace)}"
+            namespace[name] = value
+            return name
+
+        def expression(getter: Getter, convert: Optional[Callable[[Any], Any]]) -> str:
+            if isinstance(getter, str):
+                if not all(part.isidentifier() for part in getter.split(".")):
+                    raise ValueError(f"Invalid attribute name: {getter}")
+                expr = f"record.{getter}"
+            else:
+                expr = f"{constant(getter)}(record)"
+            return f"{constant(convert)}({expr})" if convert is not None else expr
+
+        def fstring(template: str, args: List[str]) -> str:
+            # Turn a str.format template plus argument expressions into f-string
+            # source, which CPython evaluates faster than a str.format call
+            pieces = []
+            args_iter = iter(args)
+            for literal, field_name, spec, conversion in _FORMATTER.parse(template):
+                if literal:
+                    pieces.append(repr(literal.replace("{", "{{").replace("}", "}}")))
+                if field_name is not None:
+                    if field_name:
+                        raise ValueError("Row templates use positional '{}' slots only")
+                    conv = f"!{conversion}" if conversion else ""
+                    fmt = f":{spec}" if spec else ""
+                    pieces.append("f'{" + next(args_iter) + conv + fmt + "}'")
+            return "f''" + "".join(" " + piece for piece in pieces)
+
+        def flush() -> None:
+            if pending_template:
+                body.append(f"    parts.append({fstring(''.join(pending_template), pending_args)})")
+                pending_template.clear()
+                pending_args.clear()
+
+        for field in self.fields:
+            if field.when is ALWAYS:
+                pending_template.append(field.template)
+                pending_args.extend(expression(g, field.convert) for g in field.getters)
+                continue
+            flush()
+            attr = field.getters[0]
+            body.append(f"    value = _getattr(record, {attr!r}, _MISSING)")
+            if field.when == PRESENT:
+                condition = "value is not _MISSING"
+            elif field.when == TRUTHY:
+                condition = "value is not _MISSING and value"
+            elif field.when == NOT_NONE:
+                condition = "value is not _MISSING and value is not None"
+            else:
+                raise ValueError(f"Unknown inclusion rule: {field.when}")
+            # The tested attribute is already loaded; reuse it as the first value
+            first = f"{constant(field.convert)}(value)" if field.convert is not None else "value"
+            args = [first] + [expression(g, field.convert) for g in field.getters[1:]]
+            body.append(f"    if {condition}:")
+            body.append(f"        parts.append({fstring(field.template, args)})")
+        flush()
+
+        if len(body) == 1 and body[0].startswith("    parts.append("):
+            # A single unconditional step needs no buffer: return the f-string directly
+            source = "def render(record):\n    return " + body[0][len("    parts.append("):-1] + "\n"
+        else:
+            source = "def render(record):\n    parts = []\n" + "\n".join(body) + "\n    return ''.join(parts)\n"
+        exec(compile(source, f"<RowTemplate {id(self):x}>", "exec"), namespace)
+        return namespace["render"]
+
+
+class Renderer:
+    """
+    Output buffer that collects fragments and joins them once.
+
+    Usage:
+        out = Renderer()
+        out.line("Orders:")
+        out.rows(ORDER_ROW, orders)
+        return out.render()
+    """
+
+    __slots__ = ("_parts",)
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def write(self, text: str) -> "Renderer":
+        """Append text as-is."""
+        self._parts.append(text)
+        return self
+
+    def line(self, text: str = "") -> "Renderer":
+        """Append text followed by a newline."""
+        self._parts.append(text)
+        self._parts.append("\n")
+        return self
+
+    def row(self, template: RowTemplate, record: Any) -> "Renderer":
+        """Append one record rendered with template."""
+        self._parts.append(template.render(record))
+        return self
+
+    def rows(self, template: RowTemplate, records: Iterable[Any]) -> "Renderer":
+        """Append every record rendered with template."""
+        self._parts.extend(map(template.render, records))
+        return self
+
+    def render(self) -> str:
+        """Join everything written so far."""
+        return "".join(self._parts)
+
+
+# ----------------------------------------------------------------------------
+# Row templates per record type
+# ----------------------------------------------------------------------------
+
+ORDER_ROW = RowTemplate([
+    Field("Symbol: {}\n", "symbol"),
+    Field("ID: {}\n", "id"),
+    Field("Type: {}\n", "type"),
+    Field("Side: {}\n", "side"),
+    Field("Quantity: {}\n", "qty"),
+    Field("Status: {}\n", "status"),
+    Field("Asset Class: {}\n", "asset_class"),
+    Field("Order Class: {}\n", "order_class"),
+    Field("Time In Force: {}\n", "time_in_force"),
+    Field("Extended Hours: {}\n", "extended_hours"),
+    Field("Submitted At: {}\n", "submitted_at"),
+    Field("Created At: {}\n", "created_at"),
+    Field("Updated At: {}\n", "updated_at"),
+    # Additional core fields (these are optional)
+    Field("Asset ID: {}\n", "asset_id", when=TRUTHY),
+    Field("Order Type: {}\n", "order_type", when=TRUTHY),
+    Field("Ratio Quantity: {}\n", "ratio_qty", when=TRUTHY),
+    # Optional fields that may not always be present
+    Field("Filled At: {}\n", "filled_at", when=TRUTHY),
+    Field("Filled Price: ${:.2f}\n", "filled_avg_price", when=TRUTHY, convert=float),
+    Field("Filled Quantity: {}\n", "filled_qty", when=TRUTHY),
+    Field("Limit Price: ${:.2f}\n", "limit_price", when=TRUTHY, convert=float),
+    Field("Stop Price: ${:.2f}\n", "stop_price", when=TRUTHY, convert=float),
+    Field("Trail Price: ${:.2f}\n", "trail_price", when=TRUTHY, convert=float),
+    Field("Trail Percent: {}%\n", "trail_percent", when=TRUTHY),
+    Field("Notional: ${:.2f}\n", "notional", when=TRUTHY, convert=float),
+    Field("Position Intent: {}\n", "position_intent", when=TRUTHY),
+    Field("Client Order ID: {}\n", "client_order_id", when=TRUTHY),
+    Field("Canceled At: {}\n", "canceled_at", when=TRUTHY),
+    Field("Expired At: {}\n", "expired_at", when=TRUTHY),
+    Field("Expires At: {}\n", "expires_at", when=TRUTHY),
+    Field("Failed At: {}\n", "failed_at", when=TRUTHY),
+    Field("Replaced At: {}\n", "replaced_at", when=TRUTHY),
+    Field("Replaced By: {}\n", "replaced_by", when=TRUTHY),
+    Field("Replaces: {}\n", "replaces", when=TRUTHY),
+    Field("Legs: {}\n", "legs", when=TRUTHY),
+    Field("HWM: {}\n", "hwm", when=TRUTHY),
+    Field("-----------------------------------\n"),
+])
+
+# order_mirror.Fill records
+FILL_ROW = RowTemplate([
+    Field("{} {} {} {} @ ${:.2f} ({}, position {})\n", "timestamp", "side", "qty", "symbol",
+          lambda fill: float(fill.price or 0), "event", "position_qty"),
+])
+
+STOCK_TRADE_ROW = RowTemplate([
+    Field("""
+                    Time: {}
+                    Price: ${:.6f}
+                    Size: {}
+                    Exchange: {}
+                    ID: {}
+                    Conditions: {}
+                    -------------------
+                    """, "timestamp", lambda trade: float(trade.price), "size", "exchange", "id",
+          "conditions"),
+])
+
+CRYPTO_QUOTE_ROW = RowTemplate([
+    Field("Time: {}, Bid: ${:.6f} (Size: {:.6f}), Ask: ${:.6f} (Size: {:.6f})\n",
+          lambda quote: quote.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+          "bid_price", "bid_size", "ask_price", "ask_size"),
+])
+
+CORPORATE_ACTION_ROW = RowTemplate([
+    Field("\nSymbol: {}\n" + "-" * 15 + "\n", lambda action: getattr(action, "symbol", "Unknown")),
+    Field("Type: {}\n", "corporate_action_type", when=PRESENT),
+    Field("Ex Date: {}\n", "ex_date", when=TRUTHY),
+    Field("Record Date: {}\n", "record_date", when=TRUTHY),
+    Field("Payable Date: {}\n", "payable_date", when=TRUTHY),
+    Field("Process Date: {}\n", "process_date", when=TRUTHY),
+    # Cash dividend specific fields
+    Field("Rate: ${:.6f}\n", "rate", when=TRUTHY),
+    Field("Foreign: {}, Special: {}\n", "foreign", lambda action: getattr(action, "special", None),
+          when=PRESENT),
+    # Split specific fields
+    Field("Old Rate: {}\n", "old_rate", when=TRUTHY),
+    Field("New Rate: {}\n", "new_rate", when=TRUTHY),
+    # Due bill dates
+    Field("Due Bill On Date: {}\n", "due_bill_on_date", when=TRUTHY),
+    Field("Due Bill Off Date: {}\n", "due_bill_off_date", when=TRUTHY),
+    Field("\n"),
+])
+
+_SNAPSHOT_TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f %Z'
+
+OPTION_QUOTE_ROW = RowTemplate([
+    Field("Latest Quote:\n"
+          "  Bid Price: ${:.6f}\n"
+          "  Bid Size: {}\n"
+          "  Bid Exchange: {}\n"
+          "  Ask Price: ${:.6f}\n"
+          "  Ask Size: {}\n"
+          "  Ask Exchange: {}\n",
+          "bid_price", "bid_size", "bid_exchange", "ask_price", "ask_size", "ask_exchange"),
+    Field("  Conditions: {}\n", "conditions", when=TRUTHY),
+    Field("  Tape: {}\n", "tape", when=TRUTHY),
+    Field("  Timestamp: {}\n", lambda quote: quote.timestamp.strftime(_SNAPSHOT_TIME_FORMAT)),
+])
+
+OPTION_TRADE_ROW = RowTemplate([
+    Field("Latest Trade:\n"
+          "  Price: ${:.6f}\n"
+          "  Size: {}\n",
+          "price", "size"),
+    Field("  Exchange: {}\n", "exchange", when=TRUTHY),
+    Field("  Conditions: {}\n", "conditions", when=TRUTHY),
+    Field("  Tape: {}\n", "tape", when=TRUTHY),
+    Field("  Trade ID: {}\n", "id", when=TRUTHY),
+    Field("  Timestamp: {}\n", lambda trade: trade.timestamp.strftime(_SNAPSHOT_TIME_FORMAT)),
+])
+
+OPTION_GREEKS_ROW = RowTemplate([
+    Field("Greeks:\n"
+          "  Delta: {:.4f}\n"
+          "  Gamma: {:.4f}\n"
+          "  Rho: {:.4f}\n"
+          "  Theta: {:.4f}\n"
+          "  Vega: {:.4f}\n",
+          "delta", "gamma", "rho", "theta", "vega"),
+])
+
+_BAR_ROW_TEMPLATES = {}
+
+
+def bar_row_template(intraday: bool, decimals: int = 2) -> RowTemplate:
+    """
+    Get the row template for OHLCV bars.
+
+    Args:
+        intraday: Show full timestamps (minute/hour bars) instead of dates
+        decimals: Price precision (2 for stocks, 6 for crypto)
+
+    Returns:
+        Cached RowTemplate rendering "Time: ..., Open: $..., ..., Volume: ..." lines
+    """
+    key = (intraday, decimals)
+    template = _BAR_ROW_TEMPLATES.get(key)
+    if template is None:
+        if intraday:
+            time_getter = lambda bar: bar.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            time_getter = lambda bar: bar.timestamp.date()
+        price = f"{{:.{decimals}f}}"
+        template = RowTemplate([
+            Field(f"Time: {{}}, Open: ${price}, High: ${price}, Low: ${price}, Close: ${price}, Volume: {{}}\n",
+                  time_getter, "open", "high", "low", "close", "volume"),
+        ])
+        _BAR_ROW_TEMPLATES[key] = template
+    return template
+
+
+# ----------------------------------------------------------------------------
+# Structured output (JSON / CSV / columnar)
+# ----------------------------------------------------------------------------
+
+FORMAT_TEXT = "text"
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+FORMAT_COLUMNAR = "columnar"
+OUTPUT_FORMATS = (FORMAT_TEXT, FORMAT_JSON, FORMAT_CSV, FORMAT_COLUMNAR)
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def _plain(value: Any) -> Any:
+    """Convert SDK values (datetimes, enums, UUIDs, lists) to JSON/CSV friendly values."""
+    # Exact class check: str-based SDK enums must go through .value below
+    if value.__class__ in _PLAIN_TYPES:
+        if isinstance(value, float) and value != value:
+            return None
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    enum_value = getattr(value, "value", _MISSING)
+    if enum_value is not _MISSING:
+        return enum_value
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    return str(value)
+
+
+class RecordSchema:
+    """
+    Column layout for structured output of one record type.
+
+    Columns are (name, getter) pairs. A getter is a dotted attribute path, which
+    yields None if any step is missing or None, or a callable. Like RowTemplate,
+    the extractor is compiled once into a function returning a tuple per record.
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, Getter]]):
+        self.names = tuple(name for name, _ in columns)
+        self.columns = tuple(columns)
+        for _, getter in self.columns:
+            if isinstance(getter, str) and not all(part.isidentifier() for part in getter.split(".")):
+                raise ValueError(f"Invalid attribute path: {getter}")
+
+    @cached_property
+    def extract(self) -> Callable[[Any], Tuple[Any, ...]]:
+        """Function returning one tuple of plain values per record, compiled on first use."""
+        namespace: Dict[str, Any] = {"_getattr": getattr, "_plain": _plain, "_PLAIN": _PLAIN_TYPES}
+        lines = []
+        values = []
+        for index, (_, getter) in enumerate(self.columns):
+            if isinstance(getter, str):
+                expr = "record"
+                for part in getter.split("."):
+                    expr = f"_getattr({expr}, {part!r}, None)"
+            else:
+                namespace[f"_f{index}"] = getter
+                expr = f"_f{index}(record)"
+            values.append(f"_v{index}")
+            lines.append(f"    _v{index} = {expr}")
+        # Plain values (the common case) skip the conversion call; NaN fails v == v
+        converted = ", ".join(f"{v} if {v}.__class__ in _PLAIN and {v} == {v} else _plain({v})" for v in values)
+        source = "def extract(record):\n" + "\n".join(lines) + f"\n    return ({converted},)\n"
+        exec(compile(source, f"<RecordSchema {id(self):x}>", "exec"), namespace)
+        return namespace["extract"]
+
+    def project(self, names: Sequence[str]) -> "RecordSchema":
+        """
+        Schema with only the named columns, in the given order.
+
+        Raises:
+            ValueError: If a name is not one of this schema's columns
+        """
+        columns = dict(self.columns)
+        unknown = [name for name in names if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. "
+                             f"Must be any of: {', '.join(self.names)}")
+        return RecordSchema([(name, columns[name]) for name in names])
+
+    def rows(self, records: Iterable[Any]) -> List[Tuple[Any, ...]]:
+        """Extract one tuple of plain values per record."""
+        return list(map(self.extract, records))
+
+
+def serialize(records: Iterable[Any], schema: RecordSchema, output_format: str) -> str:
+    """
+    Serialize records in a compact machine-readable format.
+
+    Args:
+        records: SDK models (or any objects) to serialize
+        schema: Column layout for the record type
+        output_format: "json" (array of objects), "csv" (header + rows) or
+            "columnar" (JSON object mapping each column to an array of values)
+
+    Returns:
+        Serialized string
+    """
+    rows = schema.rows(records)
+    if output_format == FORMAT_JSON:
+        names = schema.names
+        return json.dumps([dict(zip(names, row)) for row in rows], separators=(",", ":"))
+    if output_format == FORMAT_COLUMNAR:
+        columns = list(zip(*rows)) if rows else [()] * len(schema.names)
+        return json.dumps({name: list(column) for name, column in zip(schema.names, columns)},
+                          separators=(",", ":"))
+    if output_format == FORMAT_CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(schema.names)
+        # List values (e.g. trade conditions) become one ';'-separated cell
+        writer.writerows(
+            tuple(";".join(map(str, v)) if isinstance(v, list) else v for v in row) for row in rows
+        )
+        return buffer.getvalue()
+    raise ValueError(f"Unsupported output format: {output_format}")
+
+
+def check_output_format(output_format: str) -> Optional[str]:
+    """Return an error message if output_format is not supported, else None."""
+    if output_format not in OUTPUT_FORMATS:
+        return f"Invalid format: {output_format}. Must be one of: {', '.join(OUTPUT_FORMATS)}."
+    return None
+
+
+# Record schemas for structured output
+
+POSITION_SCHEMA = RecordSchema([
+    ("symbol", "symbol"), ("asset_class", "asset_class"), ("side", "side"), ("qty", "qty"),
+    ("qty_available", "qty_available"), ("avg_entry_price", "avg_entry_price"),
+    ("current_price", "current_price"), ("market_value", "market_value"),
+    ("cost_basis", "cost_basis"), ("unrealized_pl", "unrealized_pl"),
+    ("unrealized_plpc", "unrealized_plpc"), ("change_today", "change_today"),
+])
+
+QUOTE_SCHEMA = RecordSchema([
+    ("symbol", "symbol"), ("timestamp", "timestamp"), ("bid_price", "bid_price"),
+    ("bid_size", "bid_size"), ("bid_exchange", "bid_exchange"), ("ask_price", "ask_price"),
+    ("ask_size", "ask_size"), ("ask_exchange", "ask_exchange"), ("conditions", "conditions"),
+])
+
+TRADE_SCHEMA = RecordSchema([
+    ("symbol", "symbol"), ("timestamp", "timestamp"), ("price", "price"), ("size", "size"),
+    ("exchange", "exchange"), ("id", "id"), ("conditions", "conditions"), ("tape", "tape"),
+])
+
+BAR_SCHEMA = RecordSchema([
+    ("symbol", "symbol"), ("timestamp", "timestamp"), ("open", "open"), ("high", "high"),
+    ("low", "low"), ("close", "close"), ("volume", "volume"), ("trade_count", "trade_count"),
+    ("vwap", "vwap"),
+])
+
+STOCK_SNAPSHOT_SCHEMA = RecordSchema([
+    ("symbol", "symbol"),
+    ("quote_time", "latest_quote.timestamp"), ("bid_price", "latest_quote.bid_price"),
+    ("bid_size", "latest_quote.bid_size"), ("ask_price", "latest_quote.ask_price"),
+    ("ask_size", "latest_quote.ask_size"),
+    ("trade_time", "latest_trade.timestamp"), ("trade_price", "latest_trade.price"),
+    ("trade_size", "latest_trade.size"),
+    ("minute_close", "minute_bar.close"), ("minute_volume", "minute_bar.volume"),
+    ("daily_open", "daily_bar.open"), ("daily_high", "daily_bar.high"),
+    ("daily_low", "daily_bar.low"), ("daily_close", "daily_bar.close"),
+    ("daily_volume", "daily_bar.volume"), ("prev_close", "previous_daily_bar.close"),
+])
+
+ORDER_SCHEMA = RecordSchema([
+    ("id", "id"), ("client_order_id", "client_order_id"), ("symbol", "symbol"),
+    ("asset_class", "asset_class"), ("side", "side"), ("type", "type"), ("qty", "qty"),
+    ("notional", "notional"), ("filled_qty", "filled_qty"),
+    ("filled_avg_price", "filled_avg_price"), ("limit_price", "limit_price"),
+    ("stop_price", "stop_price"), ("trail_price", "trail_price"),
+    ("trail_percent", "trail_percent"), ("status", "status"),
+    ("time_in_force", "time_in_force"), ("order_class", "order_class"),
+    ("extended_hours", "extended_hours"), ("submitted_at", "submitted_at"),
+    ("filled_at", "filled_at"), ("canceled_at", "canceled_at"),
+])
+
+# order_mirror.Fill records
+FILL_SCHEMA = RecordSchema([
+    ("timestamp", "timestamp"), ("symbol", "symbol"), ("side", "side"), ("event", "event"),
+    ("qty", "qty"), ("price", "price"), ("position_qty", "position_qty"),
+    ("order_id", "order_id"), ("execution_id", "execution_id"),
+])
+
+# Every Asset field; get_all_assets projects it onto the fields a caller asks for
+ASSET_FIELDS_SCHEMA = RecordSchema([
+    ("symbol", "symbol"), ("name", "name"), ("exchange", "exchange"),
+    ("asset_class", "asset_class"), ("status", "status"), ("tradable", "tradable"),
+    ("marginable", "marginable"), ("shortable", "shortable"),
+    ("easy_to_borrow", "easy_to_borrow"), ("fractionable", "fractionable"),
+    ("id", "id"), ("min_order_size", "min_order_size"),
+    ("min_trade_increment", "min_trade_increment"), ("price_increment", "price_increment"),
+    ("maintenance_margin_requirement", "maintenance_margin_requirement"),
+    ("attributes", "attributes"),
+])
+
+ASSET_SCHEMA = ASSET_FIELDS_SCHEMA.project([
+    "symbol", "name", "exchange", "asset_class", "status", "tradable",
+    "marginable", "shortable", "easy_to_borrow", "fractionable",
+])
+
+CALENDAR_SCHEMA = RecordSchema([
+    ("date", "date"), ("open", "open"), ("close", "close"),
+])
+
+CORPORATE_ACTION_SCHEMA = RecordSchema([
+    ("action_type", "action_type"), ("id", "id"), ("symbol", "symbol"),
+    ("corporate_action_type", "corporate_action_type"), ("ex_date", "ex_date"),
+    ("record_date", "record_date"), ("payable_date", "payable_date"),
+    ("process_date", "process_date"), ("rate", "rate"), ("special", "special"),
+    ("foreign", "foreign"), ("old_rate", "old_rate"), ("new_rate", "new_rate"),
+    ("due_bill_on_date", "due_bill_on_date"), ("due_bill_off_date", "due_bill_off_date"),
+])
+
+OPTION_CONTRACT_SCHEMA = RecordSchema([
+    ("symbol", "symbol"), ("underlying_symbol", "underlying_symbol"), ("type", "type"),
+    ("style", "style"), ("strike_price", "strike_price"),
+    ("expiration_date", "expiration_date"), ("status", "status"), ("tradable", "tradable"),
+    ("open_interest", "open_interest"), ("close_price", "close_price"),
+    ("close_price_date", "close_price_date"),
+])
+
+OPTION_SNAPSHOT_SCHEMA = RecordSchema([
+    ("symbol", "symbol"),
+    ("bid_price", "latest_quote.bid_price"), ("bid_size", "latest_quote.bid_size"),
+    ("ask_price", "latest_quote.ask_price"), ("ask_size", "latest_quote.ask_size"),
+    ("quote_time", "latest_quote.timestamp"),
+    ("trade_price", "latest_trade.price"), ("trade_size", "latest_trade.size"),
+    ("trade_time", "latest_trade.timestamp"),
+    ("implied_volatility", "implied_volatility"),
+    ("delta", "greeks.delta"), ("gamma", "greeks.gamma"), ("theta", "greeks.theta"),
+    ("vega", "greeks.vega"), ("rho", "greeks.rho"),
+])
+
+# Rows of option_chain.OptionChain.records (tuples in option_chain.COLUMNS order)
+OPTION_CHAIN_SCHEMA = RecordSchema([
+    (name, itemgetter(index)) for index, name in enumerate((
+        "symbol", "expiration", "type", "strike", "bid_price", "ask_price", "last_price",
+        "implied_volatility", "delta", "gamma", "theta", "vega", "open_interest"))
+])
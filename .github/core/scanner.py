@@ -0,0 +1,172 @@
+# scanner.py
+#
+# Vectorized market scanner over stock snapshots
+# Location: /.github/core/scanner.py
+# Purpose: Turns a batch of SDK Snapshot models into NumPy columns (price, gap,
+#          relative volume, spread, ...), evaluates screening conditions such as
+#          "gap_pct > 2" over all symbols at once and ranks the matches.
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Raw snapshot fields copied into columns: column -> (snapshot attribute, model field)
+_RAW_FIELDS: Tuple[Tuple[str, str, str], ...] = (
+    ("price", "latest_trade", "price"),
+    ("bid", "latest_quote", "bid_price"),
+    ("ask", "latest_quote", "ask_price"),
+    ("open", "daily_bar", "open"),
+    ("high", "daily_bar", "high"),
+    ("low", "daily_bar", "low"),
+    ("close", "daily_bar", "close"),
+    ("volume", "daily_bar", "volume"),
+    ("vwap", "daily_bar", "vwap"),
+    ("minute_volume", "minute_bar", "volume"),
+    ("prev_close", "previous_daily_bar", "close"),
+    ("prev_volume", "previous_daily_bar", "volume"),
+)
+
+# Metrics usable in conditions and sort_by, with a short description for error messages
+METRICS: Dict[str, str] = {
+    "price": "latest trade price (daily close when there is no trade)",
+    "bid": "best bid",
+    "ask": "best ask",
+    "spread_bps": "bid/ask spread in basis points of the midpoint",
+    "open": "today's open",
+    "high": "today's high",
+    "low": "today's low",
+    "prev_close": "previous session's close",
+    "gap_pct": "today's open vs previous close, in percent",
+    "change_pct": "price vs previous close, in percent",
+    "intraday_pct": "price vs today's open, in percent",
+    "range_pct": "today's high - low as a percent of the previous close",
+    "volume": "today's volume",
+    "prev_volume": "previous session's volume",
+    "volume_ratio": "today's volume / previous session's volume",
+    "minute_volume": "volume of the latest minute bar",
+    "dollar_volume": "price * today's volume",
+    "vwap": "today's VWAP",
+    "vwap_dist_pct": "price vs today's VWAP, in percent",
+}
+
+_OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+_CONDITION = re.compile(r"^\s*([a-z_]+)\s*(>=|<=|==|!=|>|<)\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)\s*$")
+
+
+class Condition(NamedTuple):
+    """One screening condition, e.g. gap_pct > 2."""
+    metric: str
+    operator: str
+    value: float
+
+    def __str__(self) -> str:
+        return f"{self.metric} {self.operator} {self.value:g}"
+
+
+def parse_conditions(conditions: Sequence[str]) -> List[Condition]:
+    """
+    Parse conditions like "gap_pct > 2" or "spread_bps<=20".
+
+    Raises:
+        ValueError: With a user-facing message for unknown metrics or malformed conditions
+    """
+    parsed = []
+    for raw in conditions:
+        match = _CONDITION.match(str(raw).lower())
+        if not match:
+            raise ValueError(f"Invalid condition: {raw}. Use '<metric> <op> <number>' with op one of "
+                             f"{', '.join(_OPERATORS)} (e.g. 'gap_pct > 2', 'volume_ratio >= 1.5').")
+        metric, operator, value = match.groups()
+        check_metric(metric)
+        parsed.append(Condition(metric, operator, float(value)))
+    return parsed
+
+
+def check_metric(metric: str) -> None:
+    """Raise ValueError listing the available metrics if metric is unknown."""
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}. Available metrics: {', '.join(METRICS)}.")
+
+
+def _field(snapshot: Any, part: str, field: str) -> float:
+    value = getattr(getattr(snapshot, part, None), field, None)
+    return np.nan if value is None else value
+
+
+def snapshot_table(snapshots: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Build metric columns for a list of SDK Snapshot models.
+
+    Missing parts of a snapshot (no trade today, no previous bar, ...) become NaN,
+    and NaN fails every condition.
+
+    Returns:
+        Metric name -> float64 array aligned with snapshots
+    """
+    raw = np.array([[_field(snapshot, part, field) for _, part, field in _RAW_FIELDS]
+                    for snapshot in snapshots], dtype=np.float64).reshape(len(snapshots), len(_RAW_FIELDS))
+    table = {name: raw[:, index] for index, (name, _, _) in enumerate(_RAW_FIELDS)}
+
+    price = np.where(np.isnan(table["price"]), table["close"], table["price"])
+    bid, ask = table["bid"], table["ask"]
+    prev_close = table["prev_close"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # One-sided or crossed books have no meaningful spread
+        valid_book = (bid > 0) & (ask >= bid)
+        mid = (bid + ask) / 2.0
+        table["spread_bps"] = np.where(valid_book, (ask - bid) / mid * 1e4, np.nan)
+        table["price"] = price
+        table["gap_pct"] = (table["open"] / prev_close - 1.0) * 100.0
+        table["change_pct"] = (price / prev_close - 1.0) * 100.0
+        table["intraday_pct"] = (price / table["open"] - 1.0) * 100.0
+        table["range_pct"] = (table["high"] - table["low"]) / prev_close * 100.0
+        table["volume_ratio"] = table["volume"] / table["prev_volume"]
+        table["dollar_volume"] = price * table["volume"]
+        table["vwap_dist_pct"] = (price / table["vwap"] - 1.0) * 100.0
+    # Division by a zero previous close/volume/VWAP gives +-inf; treat it as missing
+    for name, column in table.items():
+        column[np.isinf(column)] = np.nan
+    del table["close"]
+    return table
+
+
+def scan(table: Dict[str, np.ndarray], conditions: Sequence[Condition], sort_by: Optional[str] = None,
+         ascending: bool = False, top: Optional[int] = None) -> Tuple[np.ndarray, int]:
+    """
+    Evaluate conditions over every row and rank the matches.
+
+    Args:
+        table: Columns from snapshot_table
+        conditions: Conditions that must all hold
+        sort_by: Metric to rank by (default: the first condition's metric, else change_pct)
+        ascending: Rank smallest first instead of largest first
+        top: Maximum rows to return (None for all matches)
+
+    Returns:
+        (row indices of the ranked matches, total number of matches)
+    """
+    rows = len(next(iter(table.values()))) if table else 0
+    mask = np.ones(rows, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        for condition in conditions:
+            column = table[condition.metric]
+            # Comparisons with NaN are False except !=, so missing values are excluded explicitly
+            mask &= _OPERATORS[condition.operator](column, condition.value) & ~np.isnan(column)
+    matches = np.flatnonzero(mask)
+
+    sort_by = sort_by or (conditions[0].metric if conditions else "change_pct")
+    keys = table[sort_by][matches]
+    # NaN keys sort last in either direction; the stable sort keeps ties in input order
+    order = np.argsort(keys if ascending else -keys, kind="stable")
+    ranked = matches[order]
+    if top is not None:
+        ranked = ranked[:top]
+    return ranked, len(matches)
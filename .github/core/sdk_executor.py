@@ -0,0 +1,228 @@
+# sdk_executor.py
+#
+# Non-blocking dispatch layer for synchronous Alpaca SDK calls
+# Location: /.github/core/sdk_executor.py
+# Purpose: Runs blocking alpaca-py client methods on a shared thread pool so the
+#          FastMCP event loop stays responsive, with per-client concurrency caps
+#          optional rate-limit pre-acquisition by priority, and queue-depth statistics.
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _ClientLane:
+    """Concurrency cap (per event loop) and counters for a single SDK client."""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        # One semaphore per event loop: asyncio primitives bind to the first loop that waits on them
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # Created inside the loop that waits on it, so a later asyncio.run() (CLI, tests)
+        # gets its own semaphore instead of one bound to a closed loop
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            with self._semaphores_lock:
+                semaphore = self._semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = asyncio.Semaphore(self.limit)
+                    self._semaphores[loop] = semaphore
+        return semaphore
+
+    def snapshot(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": (self.total_wait_seconds / finished * 1000) if finished else 0.0,
+            "avg_run_ms": (self.total_run_seconds / finished * 1000) if finished else 0.0,
+        }
+
+
+class SDKExecutor:
+    """
+    Dispatches blocking SDK calls to a shared thread pool.
+
+    Every call is routed through a named lane (e.g. "trading", "stock_data") that
+    caps how many calls for that client may run at once, so a slow bars download
+    cannot starve quote lookups made by other sessions.
+
+    With a rate limiter, calls on routed lanes wait for a request token on the event
+    loop before taking a worker thread, so throttled calls queue by priority without
+    holding threads that higher-priority calls need.
+    """
+
+    def __init__(self, max_workers: int = 16,
+                 client_limits: Optional[Dict[str, int]] = None,
+                 default_limit: int = 4,
+                 rate_limiter: Optional[Any] = None,
+                 lane_routes: Optional[Dict[str, Tuple[str, int]]] = None,
+                 observer: Optional[Callable[[str, float, float, Optional[BaseException]], None]] = None,
+                 tracer: Optional[Any] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Size of the shared worker thread pool
+            client_limits: Per-client concurrency caps keyed by lane name
+            default_limit: Cap used for lanes without an explicit limit
+            rate_limiter: Optional RateLimiter charged once per call before dispatch
+            lane_routes: (API family, priority) per lane name for the rate limiter
+            observer: Optional callback(lane, queued_at, finished_at, error) invoked on the
+                event loop after every call, with time.perf_counter timestamps
+            tracer: Optional Tracer recording a span per call under the current trace
+        """
+        self.max_workers = max(1, max_workers)
+        self.default_limit = max(1, default_limit)
+        self._client_limits = dict(client_limits or {})
+        self._rate_limiter = rate_limiter
+        self._lane_routes = dict(lane_routes or {})
+        self._observer = observer
+        self._tracer = tracer
+        self._lanes: Dict[str, _ClientLane] = {}
+        self._lanes_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="alpaca-sdk",
+                    )
+        return self._pool
+
+    def _get_lane(self, client: str) -> _ClientLane:
+        lane = self._lanes.get(client)
+        if lane is None:
+            with self._lanes_lock:
+                lane = self._lanes.get(client)
+                if lane is None:
+                    limit = self._client_limits.get(client, self.default_limit)
+                    lane = _ClientLane(client, max(1, limit))
+                    self._lanes[client] = lane
+        return lane
+
+    async def run(self, client: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking SDK method without blocking the event loop.
+
+        Args:
+            client: Lane name used for the concurrency cap (e.g. "trading")
+            fn: The blocking callable, usually a bound SDK client method
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Whatever fn returns; exceptions raised by fn propagate unchanged
+        """
+        if self._tracer is None or self._tracer.current_span() is None:
+            return await self._run(client, fn, *args, **kwargs)
+        with self._tracer.span(f"sdk {client}.{getattr(fn, '__name__', 'call')}", upstream=True,
+                               **{"alpaca.sdk.client": client}):
+            return await self._run(client, fn, *args, **kwargs)
+
+    def run_sync(self, client: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking SDK method through its lane from a thread with no running event loop.
+
+        For background threads (e.g. the order mirror's reconciliation) so their calls
+        still pay the rate limiter and show up in the lane statistics. Arguments and
+        result are as for run().
+        """
+        return asyncio.run(self.run(client, fn, *args, **kwargs))
+
+    async def _run(self, client: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        lane = self._get_lane(client)
+        loop = asyncio.get_running_loop()
+        semaphore = lane.get_semaphore(loop)
+
+        queued_at = time.perf_counter()
+        lane.waiting += 1
+        lane.max_waiting = max(lane.max_waiting, lane.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            lane.waiting -= 1
+
+        call = functools.partial(fn, *args, **kwargs)
+        route = self._lane_routes.get(client) if self._rate_limiter is not None else None
+        if route is not None:
+            family, priority = route
+            try:
+                await self._rate_limiter.acquire_async(family, priority)
+            except BaseException:
+                semaphore.release()
+                raise
+            # The token pays for the call's first HTTP request on the worker thread
+            call = functools.partial(self._rate_limiter.run_prepaid, family, fn, *args, **kwargs)
+        if self._tracer is not None and self._tracer.current_span() is not None:
+            # run_in_executor does not carry context variables; the HTTP spans made on the
+            # worker thread need the current span as their parent
+            call = functools.partial(contextvars.copy_context().run, call)
+
+        started_at = time.perf_counter()
+        lane.total_wait_seconds += started_at - queued_at
+        lane.in_flight += 1
+        try:
+            result = await loop.run_in_executor(self._get_pool(), call)
+            lane.completed += 1
+        except BaseException as exc:
+            lane.failed += 1
+            self._observe(client, queued_at, exc)
+            raise
+        finally:
+            lane.in_flight -= 1
+            lane.total_run_seconds += time.perf_counter() - started_at
+            semaphore.release()
+        self._observe(client, queued_at, None)
+        return result
+
+    def _observe(self, client: str, queued_at: float, error: Optional[BaseException]) -> None:
+        if self._observer is not None:
+            try:
+                self._observer(client, queued_at, time.perf_counter(), error)
+            except Exception:
+                # Instrumentation must never fail an SDK call
+                pass
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-client queue and concurrency statistics.
+
+        Returns:
+            Dictionary keyed by lane name with in-flight, queue depth and timing counters
+        """
+        with self._lanes_lock:
+            lanes = list(self._lanes.values())
+        return {lane.name: lane.snapshot() for lane in lanes}
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the worker pool (a new one is created on next use)."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
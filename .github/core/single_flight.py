@@ -0,0 +1,118 @@
+# single_flight.py
+#
+# Request coalescing for identical concurrent SDK calls
+# Location: /.github/core/single_flight.py
+# Purpose: Lets concurrent tool calls that ask for the same data (same endpoint and
+#          normalized request parameters) share one upstream request and its result,
+#          and counts how many calls were coalesced per endpoint.
+
+import asyncio
+import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def request_key(value: Any) -> Hashable:
+    """
+    Hashable, order-insensitive key for SDK request parameters.
+
+    Request models are reduced to their fields, symbol lists to a sorted set (so
+    ["SPY", "AAPL"] and ["AAPL", "SPY"] coalesce), enums to their values and
+    TimeFrame objects to their string form ("1Day"). Fields left at None are
+    dropped, so they match requests that never set them.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), request_key(v)) for k, v in value.items() if v is not None))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [request_key(item) for item in value]
+        if all(isinstance(item, str) for item in items):
+            return tuple(sorted(set(items)))
+        return tuple(items)
+    if hasattr(value, "model_dump"):
+        # pydantic request models (StockBarsRequest, OptionSnapshotRequest, ...)
+        return (type(value).__name__, request_key(dict(value)))
+    if hasattr(value, "amount") and hasattr(value, "unit"):
+        # TimeFrame has no __eq__/__hash__, but its value string identifies it
+        return str(getattr(value, "value", f"{value.amount}{value.unit}"))
+    return repr(value)
+
+
+class _FlightCounters:
+    """Counters for one coalescing namespace (usually one SDK method)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.upstream = 0
+        self.coalesced = 0
+        self.in_flight = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "upstream": self.upstream,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent callers with the same key.
+
+    Only calls that overlap in time are merged; once the upstream call finishes its
+    result is not reused, so this never serves stale data. A caller that is
+    cancelled does not cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._counters: Dict[str, _FlightCounters] = {}
+
+    async def do(self, namespace: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() unless an identical call is already in flight, then await that one.
+
+        Args:
+            namespace: Counter group (e.g. "get_stock_snapshot")
+            key: Hashable identity of the request within the namespace
+            fn: Zero-argument coroutine function performing the upstream call
+
+        Returns:
+            The (possibly shared) result of fn; exceptions are shared the same way
+        """
+        counters = self._counters.get(namespace)
+        if counters is None:
+            counters = self._counters[namespace] = _FlightCounters()
+        counters.calls += 1
+
+        flight_key = (namespace, key)
+        flight = self._flights.get(flight_key)
+        if flight is not None:
+            counters.coalesced += 1
+            return await asyncio.shield(flight)
+
+        counters.upstream += 1
+        counters.in_flight += 1
+        flight = asyncio.ensure_future(fn())
+        self._flights[flight_key] = flight
+
+        def _land(done: "asyncio.Future[Any]") -> None:
+            counters.in_flight -= 1
+            if not done.cancelled():
+                # Mark the exception retrieved even if every caller was cancelled
+                done.exception()
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+        flight.add_done_callback(_land)
+        return await asyncio.shield(flight)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-namespace call, upstream request and coalesced-call counters."""
+        return {name: counters.snapshot() for name, counters in sorted(self._counters.items())}
@@ -0,0 +1,646 @@
+# streaming.py
+#
+# Background websocket subscribers and live market data caches
+# Location: /.github/core/streaming.py
+# Purpose: Runs alpaca-py websocket streams on a daemon thread and keeps the latest
+#          quote/trade/minute bar (and, for crypto, the level 2 order book) per
+#          subscribed symbol in memory so tools can answer without a REST round-trip.
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from order_book import L2Book
+
+
+class StreamRunner:
+    """
+    Runs an alpaca-py websocket stream (StockDataStream, TradingStream, ...) on a
+    background daemon thread.
+
+    alpaca-py streams do not connect until at least one handler is registered, so
+    callers register their subscriptions first and then call start().
+    """
+
+    def __init__(self, stream: Any, name: str):
+        self.stream = stream
+        self.name = name
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the stream thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-stream",
+                                            daemon=True)
+            self.started_at = time.time()
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self.stream.run()
+        except Exception:
+            # The stream logs its own errors; a dead thread is reported via is_alive()
+            pass
+
+    def is_alive(self) -> bool:
+        """Whether the stream thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_connected(self) -> bool:
+        """Whether the websocket is currently connected and authenticated."""
+        return self.is_alive() and bool(getattr(self.stream, "_running", False))
+
+    def stop(self) -> None:
+        """Ask the stream to disconnect; the thread exits once the stream loop returns."""
+        if self.is_alive():
+            try:
+                self.stream.stop()
+            except Exception:
+                pass
+
+
+class LatestStockDataCache:
+    """
+    In-memory table of the latest quote, trade and minute bar per symbol, fed by a
+    StockDataStream.
+
+    Reads return None when a symbol is not subscribed or its last update is older
+    than the allowed age, so callers can fall back to REST.
+    """
+
+    def __init__(self, stream: Any, feed: Optional[str] = None, max_symbols: int = 30,
+                 quote_max_age: float = 5.0, bar_max_age: float = 90.0):
+        """
+        Initialize the cache.
+
+        Args:
+            stream: A StockDataStream instance (not yet running)
+            feed: Data feed the stream is connected to (e.g. "iex"); lookups for other feeds miss
+            max_symbols: Maximum number of symbols to subscribe (plan connection limits)
+            quote_max_age: Seconds after which a cached quote or trade is considered stale
+            bar_max_age: Seconds after which a cached minute bar is considered stale
+        """
+        self.runner = StreamRunner(stream, "stock-data")
+        self.feed = feed
+        self.max_symbols = max_symbols
+        self.quote_max_age = quote_max_age
+        self.bar_max_age = bar_max_age
+        self._symbols: set = set()
+        self._subscribe_lock = threading.Lock()
+        self._quotes: Dict[str, Tuple[Any, float]] = {}
+        self._trades: Dict[str, Tuple[Any, float]] = {}
+        self._bars: Dict[str, Tuple[Any, float]] = {}
+        self.messages = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    # ------------------------------------------------------------------
+    # Stream handlers (run on the stream thread's event loop)
+    # ------------------------------------------------------------------
+
+    async def _on_quote(self, quote: Any) -> None:
+        self._quotes[quote.symbol] = (quote, time.monotonic())
+        self.messages += 1
+
+    async def _on_trade(self, trade: Any) -> None:
+        self._trades[trade.symbol] = (trade, time.monotonic())
+        self.messages += 1
+
+    async def _on_bar(self, bar: Any) -> None:
+        self._bars[bar.symbol] = (bar, time.monotonic())
+        self.messages += 1
+
+    # ------------------------------------------------------------------
+    # Subscription management
+    # ------------------------------------------------------------------
+
+    def subscribe(self, symbols: Iterable[str]) -> List[str]:
+        """
+        Subscribe quotes, trades and minute bars for symbols and start the stream.
+
+        Blocks while the subscribe message is sent, so call it off the event loop.
+
+        Args:
+            symbols: Symbols to subscribe
+
+        Returns:
+            List of symbols newly subscribed (bounded by max_symbols)
+        """
+        with self._subscribe_lock:
+            room = self.max_symbols - len(self._symbols)
+            new_symbols = [s for s in dict.fromkeys(symbols) if s not in self._symbols][:max(0, room)]
+            if not new_symbols:
+                return []
+            stream = self.runner.stream
+            stream.subscribe_quotes(self._on_quote, *new_symbols)
+            stream.subscribe_trades(self._on_trade, *new_symbols)
+            stream.subscribe_bars(self._on_bar, *new_symbols)
+            self._symbols.update(new_symbols)
+            self.runner.start()
+            return new_symbols
+
+    def wants(self, symbol: str) -> bool:
+        """Whether symbol is not yet subscribed and there is room to subscribe it."""
+        return symbol not in self._symbols and len(self._symbols) < self.max_symbols
+
+    def serves(self, feed: Any = None, currency: Any = None) -> bool:
+        """Whether a request for the given feed/currency can be answered from the stream."""
+        if currency is not None and str(getattr(currency, "value", currency)).upper() != "USD":
+            return False
+        if feed is None:
+            return True
+        return str(getattr(feed, "value", feed)).lower() == (self.feed or "").lower()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _lookup(self, table: Dict[str, Tuple[Any, float]], symbol: str, max_age: float) -> Optional[Any]:
+        entry = table.get(symbol)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, received_at = entry
+        if time.monotonic() - received_at > max_age or not self.runner.is_connected():
+            self.stale += 1
+            return None
+        self.hits += 1
+        return value
+
+    def get_quote(self, symbol: str) -> Optional[Any]:
+        """Latest streamed quote for symbol, or None on miss/staleness."""
+        return self._lookup(self._quotes, symbol, self.quote_max_age)
+
+    def get_trade(self, symbol: str) -> Optional[Any]:
+        """Latest streamed trade for symbol, or None on miss/staleness."""
+        return self._lookup(self._trades, symbol, self.quote_max_age)
+
+    def get_bar(self, symbol: str) -> Optional[Any]:
+        """Latest streamed minute bar for symbol, or None on miss/staleness."""
+        return self._lookup(self._bars, symbol, self.bar_max_age)
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscription, connection and hit/miss counters."""
+        return {
+            "running": self.runner.is_alive(),
+            "connected": self.runner.is_connected(),
+            "feed": self.feed,
+            "symbols": len(self._symbols),
+            "max_symbols": self.max_symbols,
+            "messages": self.messages,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+        }
+
+
+class LatestCryptoDataCache:
+    """
+    In-memory latest quote, latest trade and level 2 order book per symbol, fed by a
+    CryptoDataStream created with raw_data=True.
+
+    Raw messages are stored as received and only decoded into SDK models when read,
+    and order book messages are applied to an L2Book with array merges, so a busy
+    book costs no per-level model parsing. Quote and trade reads return None when
+    the symbol is not subscribed or the last update is too old. Book reads return
+    None unless the book was reset by a full snapshot on the current connection:
+    updates missed while disconnected would otherwise leave it silently wrong.
+    """
+
+    def __init__(self, stream: Any, decode_quote: Callable[[Dict[str, Any]], Any],
+                 decode_trade: Callable[[Dict[str, Any]], Any], feed: Optional[str] = None,
+                 max_symbols: int = 30, quote_max_age: float = 10.0):
+        """
+        Initialize the cache.
+
+        Args:
+            stream: A CryptoDataStream instance with raw_data=True (not yet running)
+            decode_quote: Callable(raw quote message) returning a Quote model
+            decode_trade: Callable(raw trade message) returning a Trade model
+            feed: Crypto feed the stream is connected to (e.g. "us"); lookups for other feeds miss
+            max_symbols: Maximum number of symbols to subscribe
+            quote_max_age: Seconds after which a cached quote or trade is considered stale
+        """
+        self.runner = StreamRunner(stream, "crypto-data")
+        self.decode_quote = decode_quote
+        self.decode_trade = decode_trade
+        self.feed = feed
+        self.max_symbols = max_symbols
+        self.quote_max_age = quote_max_age
+        self._symbols: set = set()
+        self._subscribe_lock = threading.Lock()
+        self._quotes: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._trades: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        # symbol -> (book, websocket the snapshot arrived on)
+        self._books: Dict[str, Tuple[L2Book, Any]] = {}
+        self.messages = 0
+        self.book_updates = 0
+        self.book_errors = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    # ------------------------------------------------------------------
+    # Stream handlers (run on the stream thread's event loop)
+    # ------------------------------------------------------------------
+
+    async def _on_quote(self, raw: Dict[str, Any]) -> None:
+        self._quotes[raw["S"]] = (raw, time.monotonic())
+        self.messages += 1
+
+    async def _on_trade(self, raw: Dict[str, Any]) -> None:
+        self._trades[raw["S"]] = (raw, time.monotonic())
+        self.messages += 1
+
+    async def _on_orderbook(self, raw: Dict[str, Any]) -> None:
+        self.messages += 1
+        symbol = raw["S"]
+        connection = getattr(self.runner.stream, "_ws", None)
+        try:
+            if raw.get("r"):
+                self._books[symbol] = (L2Book.from_raw(raw), connection)
+            else:
+                entry = self._books.get(symbol)
+                # Updates only make sense on top of a snapshot from this connection
+                if entry is None or entry[1] is not connection:
+                    return
+                entry[0].apply_raw(raw)
+            self.book_updates += 1
+        except Exception:
+            self.book_errors += 1
+            self._books.pop(symbol, None)
+
+    # ------------------------------------------------------------------
+    # Subscription management
+    # ------------------------------------------------------------------
+
+    def subscribe(self, symbols: Iterable[str]) -> List[str]:
+        """
+        Subscribe quotes, trades and order books for symbols and start the stream.
+
+        Blocks while the subscribe message is sent, so call it off the event loop.
+
+        Args:
+            symbols: Symbols to subscribe (e.g. "BTC/USD")
+
+        Returns:
+            List of symbols newly subscribed (bounded by max_symbols)
+        """
+        with self._subscribe_lock:
+            room = self.max_symbols - len(self._symbols)
+            new_symbols = [s for s in dict.fromkeys(symbols) if s not in self._symbols][:max(0, room)]
+            if not new_symbols:
+                return []
+            stream = self.runner.stream
+            stream.subscribe_quotes(self._on_quote, *new_symbols)
+            stream.subscribe_trades(self._on_trade, *new_symbols)
+            stream.subscribe_orderbooks(self._on_orderbook, *new_symbols)
+            self._symbols.update(new_symbols)
+            self.runner.start()
+            return new_symbols
+
+    def wants(self, symbol: str) -> bool:
+        """Whether symbol is not yet subscribed and there is room to subscribe it."""
+        return symbol not in self._symbols and len(self._symbols) < self.max_symbols
+
+    def serves(self, feed: Any = None) -> bool:
+        """Whether a request for the given feed can be answered from the stream."""
+        if feed is None:
+            return True
+        return str(getattr(feed, "value", feed)).lower() == (self.feed or "").lower()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _lookup(self, table: Dict[str, Tuple[Dict[str, Any], float]], symbol: str,
+                decode: Callable[[Dict[str, Any]], Any]) -> Optional[Any]:
+        entry = table.get(symbol)
+        if entry is None:
+            self.misses += 1
+            return None
+        raw, received_at = entry
+        if time.monotonic() - received_at > self.quote_max_age or not self.runner.is_connected():
+            self.stale += 1
+            return None
+        self.hits += 1
+        return decode(raw)
+
+    def get_quote(self, symbol: str) -> Optional[Any]:
+        """Latest streamed quote for symbol, or None on miss/staleness."""
+        return self._lookup(self._quotes, symbol, self.decode_quote)
+
+    def get_trade(self, symbol: str) -> Optional[Any]:
+        """Latest streamed trade for symbol, or None on miss/staleness."""
+        return self._lookup(self._trades, symbol, self.decode_trade)
+
+    def get_book(self, symbol: str) -> Optional[L2Book]:
+        """
+        Live order book for symbol, or None when it is not subscribed or not in sync.
+
+        Books have no maximum age: a quiet book is unchanged, not stale, as long as
+        the connection its snapshot arrived on is still the current one.
+        """
+        entry = self._books.get(symbol)
+        if entry is None:
+            self.misses += 1
+            return None
+        book, connection = entry
+        if not self.runner.is_connected() or getattr(self.runner.stream, "_ws", None) is not connection:
+            self.stale += 1
+            return None
+        self.hits += 1
+        return book
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscription, connection and hit/miss counters."""
+        return {
+            "running": self.runner.is_alive(),
+            "connected": self.runner.is_connected(),
+            "feed": self.feed,
+            "symbols": len(self._symbols),
+            "max_symbols": self.max_symbols,
+            "books": len(self._books),
+            "messages": self.messages,
+            "book_updates": self.book_updates,
+            "book_errors": self.book_errors,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+        }
+
+
+def _unix_nanos(value: Any) -> int:
+    """Nanoseconds since the epoch of a raw stream time (msgpack Timestamp or datetime)."""
+    if hasattr(value, "to_unix_nano"):
+        return value.to_unix_nano()
+    return int(value.timestamp() * 1e9) if value is not None else 0
+
+
+class LatestOptionDataCache:
+    """
+    Latest quote and trade per option contract in a preallocated table, fed by an
+    OptionDataStream created with raw_data=True.
+
+    Every subscribed contract owns one row of fixed-size NumPy columns, found through
+    an OCC symbol -> row index dict, so a stream message is a handful of scalar
+    writes and memory is fixed by max_symbols. Contracts are subscribed on first
+    request and unsubscribed once idle for idle_seconds (or earlier, least recently
+    used first, when the table is full), which keeps the subscription inside the
+    connection's symbol limit while a strategy's working set stays live.
+    """
+
+    _FLOAT_COLUMNS = ("bid_price", "bid_size", "ask_price", "ask_size", "quote_received",
+                      "trade_price", "trade_size", "trade_received", "last_used")
+    _TIME_COLUMNS = ("quote_time", "trade_time")
+    _OBJECT_COLUMNS = ("bid_exchange", "ask_exchange", "quote_condition", "trade_exchange", "trade_conditions")
+
+    def __init__(self, stream: Any, decode_quote: Callable[[Dict[str, Any]], Any],
+                 decode_trade: Callable[[Dict[str, Any]], Any], feed: Optional[str] = None,
+                 max_symbols: int = 200, quote_max_age: float = 15.0, idle_seconds: float = 300.0,
+                 min_idle: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            stream: An OptionDataStream instance with raw_data=True (not yet running)
+            decode_quote: Callable(raw quote dict) returning a Quote model
+            decode_trade: Callable(raw trade dict) returning a Trade model
+            feed: Options feed the stream is connected to (e.g. "indicative"); lookups for other feeds miss
+            max_symbols: Table rows, i.e. the most contracts subscribed at once (plan connection limits)
+            quote_max_age: Seconds after which a cached quote or trade is considered stale
+            idle_seconds: Contracts not requested for this long are unsubscribed
+            min_idle: Seconds a contract must go unrequested before a full table may evict it
+        """
+        self.runner = StreamRunner(stream, "option-data")
+        self.decode_quote = decode_quote
+        self.decode_trade = decode_trade
+        self.feed = feed
+        self.max_symbols = max_symbols
+        self.quote_max_age = quote_max_age
+        self.idle_seconds = idle_seconds
+        self.min_idle = min_idle
+        self._columns: Dict[str, np.ndarray] = {}
+        for name in self._FLOAT_COLUMNS:
+            self._columns[name] = np.full(max_symbols, np.nan)
+        for name in self._TIME_COLUMNS:
+            self._columns[name] = np.zeros(max_symbols, dtype=np.int64)
+        for name in self._OBJECT_COLUMNS:
+            self._columns[name] = np.empty(max_symbols, dtype=object)
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = list(range(max_symbols - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._subscribe_lock = threading.Lock()
+        self._janitor: Optional[threading.Thread] = None
+        self.messages = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.subscribed = 0
+        self.unsubscribed = 0
+
+    # ------------------------------------------------------------------
+    # Stream handlers (run on the stream thread's event loop)
+    # ------------------------------------------------------------------
+
+    async def _on_quote(self, raw: Dict[str, Any]) -> None:
+        self.messages += 1
+        columns = self._columns
+        with self._lock:
+            row = self._rows.get(raw["S"])
+            if row is None:
+                return
+            columns["bid_price"][row] = raw.get("bp") or 0.0
+            columns["bid_size"][row] = raw.get("bs") or 0.0
+            columns["ask_price"][row] = raw.get("ap") or 0.0
+            columns["ask_size"][row] = raw.get("as") or 0.0
+            columns["quote_time"][row] = _unix_nanos(raw.get("t"))
+            columns["bid_exchange"][row] = raw.get("bx")
+            columns["ask_exchange"][row] = raw.get("ax")
+            columns["quote_condition"][row] = raw.get("c")
+            columns["quote_received"][row] = time.monotonic()
+
+    async def _on_trade(self, raw: Dict[str, Any]) -> None:
+        self.messages += 1
+        columns = self._columns
+        with self._lock:
+            row = self._rows.get(raw["S"])
+            if row is None:
+                return
+            columns["trade_price"][row] = raw.get("p") or 0.0
+            columns["trade_size"][row] = raw.get("s") or 0.0
+            columns["trade_time"][row] = _unix_nanos(raw.get("t"))
+            columns["trade_exchange"][row] = raw.get("x")
+            columns["trade_conditions"][row] = raw.get("c")
+            columns["trade_received"][row] = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Subscription management
+    # ------------------------------------------------------------------
+
+    def _clear_row(self, row: int) -> None:
+        for name in self._FLOAT_COLUMNS:
+            self._columns[name][row] = np.nan
+        for name in self._TIME_COLUMNS:
+            self._columns[name][row] = 0
+        for name in self._OBJECT_COLUMNS:
+            self._columns[name][row] = None
+
+    def _unsubscribe(self, symbols: List[str]) -> None:
+        """Unsubscribe symbols and free their rows (call with _subscribe_lock held)."""
+        if not symbols:
+            return
+        stream = self.runner.stream
+        stream.unsubscribe_quotes(*symbols)
+        stream.unsubscribe_trades(*symbols)
+        with self._lock:
+            for symbol in symbols:
+                row = self._rows.pop(symbol)
+                self._clear_row(row)
+                self._free.append(row)
+        self.unsubscribed += len(symbols)
+
+    def _idle(self, min_idle: float) -> List[str]:
+        """Subscribed symbols not requested for min_idle seconds, least recently used first."""
+        now = time.monotonic()
+        last_used = self._columns["last_used"]
+        with self._lock:
+            entries = [(last_used[row], symbol) for symbol, row in self._rows.items()
+                       if now - last_used[row] >= min_idle]
+        return [symbol for _, symbol in sorted(entries)]
+
+    def subscribe(self, symbols: Iterable[str]) -> List[str]:
+        """
+        Subscribe quotes and trades for option contracts and start the stream.
+
+        When the table is full, contracts idle for at least min_idle seconds are
+        unsubscribed to make room, least recently used first. Blocks while the
+        (un)subscribe messages are sent, so call it off the event loop.
+
+        Args:
+            symbols: OCC option symbols (e.g. "AAPL250620C00200000")
+
+        Returns:
+            List of symbols newly subscribed (bounded by max_symbols)
+        """
+        with self._subscribe_lock:
+            wanted = [s for s in dict.fromkeys(symbols) if s not in self._rows]
+            shortfall = len(wanted) - len(self._free)
+            if shortfall > 0:
+                self._unsubscribe(self._idle(self.min_idle)[:shortfall])
+            new_symbols = wanted[:len(self._free)]
+            if not new_symbols:
+                return []
+            now = time.monotonic()
+            with self._lock:
+                for symbol in new_symbols:
+                    row = self._free.pop()
+                    self._rows[symbol] = row
+                    self._columns["last_used"][row] = now
+            stream = self.runner.stream
+            stream.subscribe_quotes(self._on_quote, *new_symbols)
+            stream.subscribe_trades(self._on_trade, *new_symbols)
+            self.subscribed += len(new_symbols)
+            self.runner.start()
+            self._start_janitor()
+            return new_symbols
+
+    def _start_janitor(self) -> None:
+        if self._janitor is None and self.idle_seconds > 0:
+            self._janitor = threading.Thread(target=self._sweep_forever, name="option-data-janitor", daemon=True)
+            self._janitor.start()
+
+    def _sweep_forever(self) -> None:
+        while True:
+            time.sleep(max(1.0, min(self.idle_seconds / 4, 30.0)))
+            try:
+                self.sweep()
+            except Exception:
+                # A failed unsubscribe is retried on the next sweep
+                pass
+
+    def sweep(self) -> List[str]:
+        """Unsubscribe contracts not requested for idle_seconds; returns the symbols dropped."""
+        with self._subscribe_lock:
+            idle = self._idle(self.idle_seconds)
+            self._unsubscribe(idle)
+            return idle
+
+    def wants(self, symbol: str) -> bool:
+        """Whether symbol is not yet subscribed (room is made on subscribe when possible)."""
+        return symbol not in self._rows
+
+    def serves(self, feed: Any = None) -> bool:
+        """Whether a request for the given feed can be answered from the stream."""
+        if feed is None:
+            return True
+        return str(getattr(feed, "value", feed)).lower() == (self.feed or "").lower()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _lookup(self, symbol: str, received_column: str, fields: Tuple[Tuple[str, str], ...],
+                decode: Callable[[Dict[str, Any]], Any], time_column: str) -> Optional[Any]:
+        columns = self._columns
+        with self._lock:
+            row = self._rows.get(symbol)
+            if row is None:
+                self.misses += 1
+                return None
+            # A request keeps the contract subscribed even when it has to be answered over REST
+            columns["last_used"][row] = time.monotonic()
+            received_at = columns[received_column][row]
+            if np.isnan(received_at):
+                self.misses += 1
+                return None
+            if time.monotonic() - received_at > self.quote_max_age or not self.runner.is_connected():
+                self.stale += 1
+                return None
+            raw = {key: columns[name][row] for key, name in fields}
+            raw["t"] = datetime.fromtimestamp(int(columns[time_column][row]) / 1e9, tz=timezone.utc)
+        self.hits += 1
+        raw["S"] = symbol
+        return decode(raw)
+
+    def get_quote(self, symbol: str) -> Optional[Any]:
+        """
+        Latest streamed quote for symbol, or None on miss/staleness.
+
+        decode_quote receives the raw quote keys (S, t, bp, bs, ap, as, bx, ax, c), with
+        "t" as a UTC datetime.
+        """
+        return self._lookup(symbol, "quote_received", (
+            ("bp", "bid_price"), ("bs", "bid_size"), ("ap", "ask_price"), ("as", "ask_size"),
+            ("bx", "bid_exchange"), ("ax", "ask_exchange"), ("c", "quote_condition")),
+            self.decode_quote, "quote_time")
+
+    def get_trade(self, symbol: str) -> Optional[Any]:
+        """Latest streamed trade for symbol (decoded from raw keys S, t, p, s, x, c), or None."""
+        return self._lookup(symbol, "trade_received", (
+            ("p", "trade_price"), ("s", "trade_size"), ("x", "trade_exchange"), ("c", "trade_conditions")),
+            self.decode_trade, "trade_time")
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscription, connection and hit/miss counters."""
+        return {
+            "running": self.runner.is_alive(),
+            "connected": self.runner.is_connected(),
+            "feed": self.feed,
+            "symbols": len(self._rows),
+            "max_symbols": self.max_symbols,
+            "subscribed": self.subscribed,
+            "unsubscribed": self.unsubscribed,
+            "messages": self.messages,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+        }
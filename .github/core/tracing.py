@@ -0,0 +1,374 @@
+# tracing.py
+#
+# Sampled per-call tracing for the MCP tools
+# Location: /.github/core/tracing.py
+# Purpose: Records a trace per sampled tool call with child spans for parameter
+#          parsing, SDK calls, the HTTP requests they make and result formatting,
+#          and exports them as OpenTelemetry (OTLP/JSON) spans to a JSON Lines file
+#          or an OTLP/HTTP collector without requiring the OpenTelemetry SDK.
+
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SERVICE_NAME = "alpaca-mcp-server"
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+            if value is not None]
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "status_message")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: int = KIND_INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None, start_ns: Optional[int] = None):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+        self.attributes["exception.type"] = type(exc).__name__
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in the OTLP/JSON encoding."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _Trace:
+    """Per-trace state shared by the spans of one tool call."""
+
+    __slots__ = ("root", "last_upstream_end_ns")
+
+    def __init__(self, root: Span):
+        self.root = root
+        self.last_upstream_end_ns: Optional[int] = None
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "alpaca_mcp_span", default=None)
+_current_trace: contextvars.ContextVar[Optional[_Trace]] = contextvars.ContextVar(
+    "alpaca_mcp_trace", default=None)
+
+
+def _resource_spans(spans: Sequence[Span]) -> Dict[str, Any]:
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+        "scopeSpans": [{"scope": {"name": SERVICE_NAME},
+                        "spans": [span.to_otlp() for span in spans]}],
+    }]}
+
+
+class FileSpanExporter:
+    """Appends finished spans to a file, one OTLP/JSON span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        lines = "".join(json.dumps(span.to_otlp(), separators=(",", ":")) + "\n" for span in spans)
+        with self._lock:
+            self._handle.write(lines)
+            self._handle.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+
+class OTLPHttpSpanExporter:
+    """
+    Sends spans to an OTLP/HTTP collector (JSON encoding) from a background thread.
+
+    Spans are batched and posted every interval seconds or when batch_size spans are
+    queued; when the collector is unreachable the batch is dropped, never retried
+    on the request path.
+    """
+
+    def __init__(self, endpoint: str, headers: Optional[Dict[str, str]] = None,
+                 batch_size: int = 256, interval: float = 5.0, timeout: float = 5.0,
+                 max_queue: int = 8192):
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else endpoint + "/v1/traces"
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: List[Span] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            room = self.max_queue - len(self._queue)
+            if room < len(spans):
+                self.dropped += len(spans) - max(room, 0)
+                spans = spans[:max(room, 0)]
+            self._queue.extend(spans)
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._queue = self._queue, []
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            body = json.dumps(_resource_spans(chunk), separators=(",", ":")).encode("utf-8")
+            request = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+            except Exception:
+                self.dropped += len(chunk)
+
+    def shutdown(self) -> None:
+        self.flush()
+
+
+class Tracer:
+    """
+    Creates sampled traces and their child spans.
+
+    The sampling decision is made once per tool call; a child span is only
+    recorded under a sampled trace, so unsampled calls pay for one ContextVar
+    lookup per instrumented operation. A tracer without exporters is disabled.
+    """
+
+    def __init__(self, sample_ratio: float = 1.0, exporters: Sequence[Any] = ()):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_ratio: Fraction of tool calls traced (0 to 1)
+            exporters: Objects with export(spans) and shutdown() receiving finished traces
+        """
+        self.sample_ratio = max(0.0, min(1.0, sample_ratio))
+        self.exporters = list(exporters)
+        self.enabled = bool(self.exporters) and self.sample_ratio > 0
+        self.sampled = 0
+        self.skipped = 0
+        # Finished spans per open trace id, exported together when the root span ends
+        self._pending: Dict[str, List[Span]] = {}
+        self._lock = threading.Lock()
+        if self.exporters:
+            atexit.register(self.shutdown)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        with self._lock:
+            pending = self._pending.get(span.trace_id)
+            if pending is not None:
+                pending.append(span)
+                return
+        # The trace was already exported (e.g. a shared SDK call outlived its tool call)
+        self._export([span])
+
+    def _export(self, spans: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception:
+                pass
+
+    def _export_trace(self, trace_id: str) -> None:
+        with self._lock:
+            spans = self._pending.pop(trace_id, [])
+        self._export(spans)
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: int = KIND_INTERNAL, upstream: bool = False,
+             **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Time a block as a child of the current span; yields None outside a sampled trace.
+
+        Args:
+            name: Span name
+            kind: OTLP span kind (KIND_CLIENT for outgoing requests)
+            upstream: Marks an SDK call; the derived "format" span starts after the last one
+            **attributes: Span attributes
+        """
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(parent.trace_id, parent.span_id, name, kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+            trace = _current_trace.get()
+            if upstream and trace is not None:
+                trace.last_upstream_end_ns = max(trace.last_upstream_end_ns or 0, span.end_ns)
+
+    def traced(self, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator recording a span per call of a synchronous helper (no-op when disabled)."""
+        def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+            if not self.enabled:
+                return fn
+            span_name = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_span.get() is None:
+                    return fn(*args, **kwargs)
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap an async tool function so sampled calls record a trace.
+
+        Besides the root span, a "format" span is derived covering the time from the
+        end of the last SDK call (or the start of the call) to the tool's return,
+        i.e. the result formatting that follows the upstream request.
+        """
+        tool = fn.__name__
+
+        @functools.wraps(fn)
+        async def traced_tool(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is not None or random.random() >= self.sample_ratio:
+                self.skipped += 1
+                return await fn(*args, **kwargs)
+            self.sampled += 1
+            root = Span(f"{random.getrandbits(128):032x}", None, f"tool {tool}", KIND_SERVER,
+                        {"mcp.tool.name": tool})
+            trace = _Trace(root)
+            with self._lock:
+                self._pending[root.trace_id] = []
+            span_token = _current_span.set(root)
+            trace_token = _current_trace.set(trace)
+            result = None
+            try:
+                result = await fn(*args, **kwargs)
+                return result
+            except BaseException as exc:
+                root.record_exception(exc)
+                raise
+            finally:
+                _current_trace.reset(trace_token)
+                _current_span.reset(span_token)
+                format_span = Span(root.trace_id, root.span_id, "format",
+                                   attributes={"alpaca.span.derived": True},
+                                   start_ns=trace.last_upstream_end_ns or root.start_ns)
+                if result is not None:
+                    size = len(str(result).encode("utf-8"))
+                    format_span.set_attribute("mcp.tool.response_bytes", size)
+                    root.set_attribute("mcp.tool.response_bytes", size)
+                self._finish(format_span)
+                self._finish(root)
+                self._export_trace(root.trace_id)
+
+        return traced_tool
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "sample_ratio": self.sample_ratio,
+                "sampled": self.sampled, "skipped": self.skipped}
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.shutdown()
+            except Exception:
+                pass
+
+
+# Tracer used by code that cannot take one as a parameter (the SDK HTTP transport)
+_tracer = Tracer()
+
+
+def configure_tracing(tracer: Tracer) -> None:
+    """Install the process-wide tracer."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer (disabled until configure_tracing is called)."""
+    return _tracer
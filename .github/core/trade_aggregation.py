@@ -0,0 +1,272 @@
+# trade_aggregation.py
+#
+# Streaming aggregation of raw trades into custom bars and volume profiles
+# Location: /.github/core/trade_aggregation.py
+# Purpose: Folds pages of raw trade records into time, tick, volume and dollar bars
+#          and price-level volume profiles with NumPy group reductions, keeping only
+#          the aggregates, so memory and output scale with the number of bars or
+#          price levels instead of the number of trades.
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BAR_TYPES = ("time", "tick", "volume", "dollar")
+
+# One completed bar; key orders bars (time bucket, or running bar number)
+BAR_DTYPE = np.dtype([
+    ("key", np.int64), ("start", np.int64), ("end", np.int64), ("open", np.float64),
+    ("high", np.float64), ("low", np.float64), ("close", np.float64), ("volume", np.float64),
+    ("notional", np.float64), ("trades", np.int64),
+])
+
+_INTERVAL = re.compile(r"^\s*(\d+)\s*([a-z]+)\s*$", re.IGNORECASE)
+_UNIT_SECONDS = {
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hour": 3600, "hours": 3600,
+    "d": 86400, "day": 86400, "days": 86400,
+}
+
+
+def parse_interval(text: str) -> int:
+    """
+    Parse a bar interval such as "30Sec", "5Min", "1Hour" or "1Day" into nanoseconds.
+
+    Raises:
+        ValueError: If the interval is not a positive amount of seconds, minutes, hours or days
+    """
+    match = _INTERVAL.match(str(text))
+    unit = match and _UNIT_SECONDS.get(match.group(2).lower())
+    if not unit or int(match.group(1)) < 1:
+        raise ValueError(f"Invalid interval: {text}. Use e.g. 30Sec, 5Min, 1Hour or 1Day.")
+    return int(match.group(1)) * unit * 10**9
+
+
+def trade_arrays(records: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Columns of raw trade records ("t" RFC 3339 time, "p" price, "s" size).
+
+    Returns:
+        (timestamps as int64 nanoseconds since the epoch (UTC), prices, sizes)
+    """
+    count = len(records)
+    # The API sends UTC times with a "Z" suffix; NumPy parses the rest, nanoseconds included
+    stamps = np.array([record["t"].rstrip("Z") for record in records], dtype="datetime64[ns]").view(np.int64)
+    price = np.fromiter((record["p"] for record in records), dtype=np.float64, count=count)
+    size = np.fromiter((record.get("s") or 0.0 for record in records), dtype=np.float64, count=count)
+    return stamps, price, size
+
+
+class BarAccumulator:
+    """
+    Builds bars from trades that arrive in time order, one page at a time.
+
+    Each trade gets a non-decreasing bar key: its time bucket (time bars) or the
+    number of bars completed before it (tick, volume and dollar bars, where a bar
+    closes with the trade that reaches the threshold). A page is reduced to one row
+    per key with np.*.reduceat; only the last bar of a page stays open, to be merged
+    with the first bar of the next page if they share a key.
+    """
+
+    def __init__(self, bar_type: str, size: float):
+        """
+        Args:
+            bar_type: "time", "tick", "volume" or "dollar"
+            size: Interval in nanoseconds (time), trades per bar (tick), shares per
+                bar (volume) or notional per bar (dollar)
+        """
+        if bar_type not in BAR_TYPES:
+            raise ValueError(f"Invalid bar type: {bar_type}. Must be one of: {', '.join(BAR_TYPES)}.")
+        if not size > 0:
+            raise ValueError("Bar size must be greater than 0.")
+        self.bar_type = bar_type
+        self.size = size
+        self.trades = 0
+        self._running = 0.0          # trades, shares or notional before the current page
+        self._done: List[np.ndarray] = []
+        self._open: Optional[np.ndarray] = None   # last bar, still growing (1-element array)
+
+    def _keys(self, stamps: np.ndarray, price: np.ndarray, size: np.ndarray) -> np.ndarray:
+        if self.bar_type == "time":
+            return stamps // int(self.size)
+        if self.bar_type == "tick":
+            amount = np.ones(len(stamps))
+        elif self.bar_type == "volume":
+            amount = size
+        else:
+            amount = price * size
+        # Amount accumulated before each trade decides which bar the trade belongs to
+        before = self._running + np.cumsum(amount) - amount
+        self._running += float(amount.sum())
+        return np.floor(before / self.size).astype(np.int64)
+
+    def add(self, stamps: np.ndarray, price: np.ndarray, size: np.ndarray) -> None:
+        """Fold one page of trades (arrays from trade_arrays, in time order) into the bars."""
+        if not len(stamps):
+            return
+        self.trades += len(stamps)
+        keys = self._keys(stamps, price, size)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)] - 1
+        bars = np.empty(len(starts), dtype=BAR_DTYPE)
+        bars["key"] = keys[starts]
+        bars["start"] = stamps[starts]
+        bars["end"] = stamps[ends]
+        bars["open"] = price[starts]
+        bars["close"] = price[ends]
+        bars["high"] = np.maximum.reduceat(price, starts)
+        bars["low"] = np.minimum.reduceat(price, starts)
+        bars["volume"] = np.add.reduceat(size, starts)
+        bars["notional"] = np.add.reduceat(price * size, starts)
+        bars["trades"] = np.diff(np.r_[starts, len(keys)])
+
+        if self._open is not None:
+            if self._open["key"][0] == bars["key"][0]:
+                previous = self._open[0]
+                bars["start"][0], bars["open"][0] = previous["start"], previous["open"]
+                bars["high"][0] = max(bars["high"][0], previous["high"])
+                bars["low"][0] = min(bars["low"][0], previous["low"])
+                bars["volume"][0] += previous["volume"]
+                bars["notional"][0] += previous["notional"]
+                bars["trades"][0] += previous["trades"]
+            else:
+                self._done.append(self._open)
+        self._done.append(bars[:-1])
+        self._open = bars[-1:].copy()
+
+    def bars(self) -> np.ndarray:
+        """Every bar so far (the last one may still be growing), as a BAR_DTYPE array."""
+        parts = self._done + ([self._open] if self._open is not None else [])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=BAR_DTYPE)
+
+    def bucket_start(self, bars: np.ndarray) -> np.ndarray:
+        """Bar start times: the bucket boundary for time bars, the first trade otherwise."""
+        return bars["key"] * int(self.size) if self.bar_type == "time" else bars["start"]
+
+
+def auto_price_step(price: float) -> float:
+    """A price level size of about 0.1% of the price, rounded down to a power of ten (min 0.0001)."""
+    if not price > 0:
+        return 0.01
+    return max(1e-4, 10.0 ** math.floor(math.log10(price * 0.001)))
+
+
+class VolumeProfile:
+    """
+    Volume and trade count per price level, in a growable array indexed by level.
+
+    Level i covers prices rounding to (base + i) * step, so a page is added with one
+    np.bincount and the array is only reallocated when prices leave its range.
+    """
+
+    def __init__(self, step: Optional[float] = None):
+        """
+        Args:
+            step: Price level size (None: chosen from the first trade with auto_price_step)
+        """
+        if step is not None and not step > 0:
+            raise ValueError("Price step must be greater than 0.")
+        self.step = step
+        self.trades = 0
+        self.total_volume = 0.0
+        self.total_notional = 0.0
+        self._base = 0
+        self._volume = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.int64)
+
+    def add(self, price: np.ndarray, size: np.ndarray) -> None:
+        """Fold one page of trade prices and sizes into the profile."""
+        if not len(price):
+            return
+        if self.step is None:
+            self.step = auto_price_step(float(price[0]))
+        levels = np.rint(price / self.step).astype(np.int64)
+        low, high = int(levels.min()), int(levels.max())
+        if not len(self._volume):
+            self._base = low
+        if low < self._base or high >= self._base + len(self._volume):
+            # Grow with headroom on both sides so a drifting price does not reallocate every page
+            new_base = min(low, self._base)
+            new_top = max(high + 1, self._base + len(self._volume))
+            pad = max(16, (new_top - new_base) // 4)
+            new_base = new_base - pad if low < self._base else new_base
+            new_top = new_top + pad if high >= self._base + len(self._volume) else new_top
+            volume = np.zeros(new_top - new_base)
+            count = np.zeros(new_top - new_base, dtype=np.int64)
+            offset = self._base - new_base
+            volume[offset:offset + len(self._volume)] = self._volume
+            count[offset:offset + len(self._count)] = self._count
+            self._base, self._volume, self._count = new_base, volume, count
+        index = levels - self._base
+        self._volume += np.bincount(index, weights=size, minlength=len(self._volume))
+        self._count += np.bincount(index, minlength=len(self._count))
+        self.trades += len(price)
+        self.total_volume += float(size.sum())
+        self.total_notional += float(price @ size)
+
+    def levels(self, step_multiple: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Price levels that traded, lowest first.
+
+        Args:
+            step_multiple: Merge this many adjacent levels into one (coarser output)
+
+        Returns:
+            (level prices, volumes, trade counts)
+        """
+        traded = np.flatnonzero(self._count)
+        if not len(traded):
+            return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+        first, last = traded[0], traded[-1] + 1
+        absolute = np.arange(first, last) + self._base
+        groups = np.floor_divide(absolute, step_multiple)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        volume = np.add.reduceat(self._volume[first:last], starts)
+        count = np.add.reduceat(self._count[first:last], starts)
+        keep = count > 0
+        prices = groups[starts] * step_multiple * self.step
+        return prices[keep], volume[keep], count[keep]
+
+    def step_multiple_for(self, max_levels: int) -> int:
+        """Smallest 1-2-5 multiple of the level size that yields at most max_levels levels."""
+        traded = np.flatnonzero(self._count)
+        span = int(traded[-1] - traded[0] + 1) if len(traded) else 0
+        scale = 1
+        while True:
+            for factor in (1, 2, 5):
+                if math.ceil(span / (factor * scale)) <= max_levels:
+                    return factor * scale
+            scale *= 10
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.total_notional / self.total_volume if self.total_volume else None
+
+
+def value_area(prices: np.ndarray, volume: np.ndarray, fraction: float = 0.7) -> Tuple[float, float, float]:
+    """
+    Point of control and value area of a volume profile.
+
+    Starting from the highest-volume level, the area grows one level at a time
+    toward the side with more volume until it holds fraction of the total volume.
+
+    Returns:
+        (point of control price, value area low, value area high)
+    """
+    poc = int(np.argmax(volume))
+    target = fraction * float(volume.sum())
+    low = high = poc
+    inside = float(volume[poc])
+    while inside < target and (low > 0 or high < len(volume) - 1):
+        below = volume[low - 1] if low > 0 else -1.0
+        above = volume[high + 1] if high < len(volume) - 1 else -1.0
+        if above >= below:
+            high += 1
+            inside += float(above)
+        else:
+            low -= 1
+            inside += float(below)
+    return float(prices[poc]), float(prices[low]), float(prices[high])
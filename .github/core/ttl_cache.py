@@ -0,0 +1,174 @@
+# ttl_cache.py
+#
+# Size-bounded TTL caches for slowly changing Alpaca reference data
+# Location: /.github/core/ttl_cache.py
+# Purpose: Provides a pluggable cache backend interface, an in-memory LRU backend
+#          with per-entry expiry, and an endpoint-aware wrapper with per-endpoint
+#          TTLs, invalidation hooks and hit/miss counters.
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Sentinel distinguishing "not cached" from a cached None
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """
+    Interface for cache storage backends used by EndpointCache.
+
+    Implementations must be thread-safe; SDK calls complete on worker threads.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or MISSING."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        """Remove key; return True if it was present."""
+
+    @abstractmethod
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key matching predicate; return the number removed."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries (expired ones may still be counted)."""
+
+
+class LRUTTLCache(CacheBackend):
+    """In-memory LRU cache where each entry carries its own expiry time."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = max(1, maxsize)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._entries.pop(key, MISSING) is not MISSING
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            doomed = [key for key in self._entries if predicate(key)]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class EndpointCache:
+    """
+    Caches API results per endpoint, each with its own TTL.
+
+    Keys are stored as (endpoint, key) in the backend so a whole endpoint can be
+    invalidated at once. A TTL of 0 disables caching for that endpoint.
+    """
+
+    def __init__(self, ttls: Dict[str, float], backend: Optional[CacheBackend] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttls: Default TTL in seconds per endpoint name (e.g. {"clock": 5})
+            backend: Storage backend (defaults to an in-memory LRUTTLCache)
+        """
+        self.ttls = dict(ttls)
+        self.backend = backend or LRUTTLCache()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                endpoint, {"hits": 0, "misses": 0, "invalidations": 0})
+            counters[counter] += 1
+
+    def enabled(self, endpoint: str) -> bool:
+        """Whether caching is enabled (TTL > 0) for endpoint."""
+        return self.ttls.get(endpoint, 0) > 0
+
+    def get(self, endpoint: str, key: Hashable) -> Any:
+        """Return the cached value or MISSING, updating hit/miss counters."""
+        if not self.enabled(endpoint):
+            return MISSING
+        value = self.backend.get((endpoint, key))
+        self._count(endpoint, "misses" if value is MISSING else "hits")
+        return value
+
+    def set(self, endpoint: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value, using the endpoint's TTL unless a (shorter) ttl is given."""
+        default_ttl = self.ttls.get(endpoint, 0)
+        ttl = default_ttl if ttl is None else min(ttl, default_ttl)
+        if ttl > 0:
+            self.backend.set((endpoint, key), value, ttl)
+
+    def invalidate(self, endpoint: Optional[str] = None, key: Hashable = MISSING) -> int:
+        """
+        Invalidation hook: drop cached entries.
+
+        Args:
+            endpoint: Endpoint to invalidate; None invalidates every endpoint
+            key: A single key within endpoint to invalidate; omitted drops the whole endpoint
+
+        Returns:
+            Number of entries removed
+        """
+        if endpoint is None:
+            removed = self.backend.delete_where(lambda _: True)
+        elif key is not MISSING:
+            removed = int(self.backend.delete((endpoint, key)))
+        else:
+            removed = self.backend.delete_where(lambda k: k[0] == endpoint)
+        for name in ([endpoint] if endpoint else list(self.ttls)):
+            self._count(name, "invalidations")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint TTL and hit/miss counters plus backend size."""
+        with self._lock:
+            endpoints = {
+                name: {"ttl": ttl, **self._counters.get(
+                    name, {"hits": 0, "misses": 0, "invalidations": 0})}
+                for name, ttl in self.ttls.items()
+            }
+        result: Dict[str, Any] = {"entries": len(self.backend), "endpoints": endpoints}
+        if isinstance(self.backend, LRUTTLCache):
+            result["maxsize"] = self.backend.maxsize
+            result["evictions"] = self.backend.evictions
+            result["expirations"] = self.backend.expirations
+        return result
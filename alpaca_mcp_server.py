@@ -2,39 +2,36 @@ import os
 import re
 import sys
 import time
+import asyncio
+from operator import itemgetter
+from types import SimpleNamespace
 import argparse
 from datetime import datetime, timedelta, date
-from typing import Dict, Any, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 
-from alpaca.common.enums import SupportedCurrencies
+from mcp.server.fastmcp import Context, FastMCP
+
+# Configure Python path for local imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+github_core_path = os.path.join(current_dir, '.github', 'core')
+if github_core_path not in sys.path:
+    sys.path.insert(0, github_core_path)
+# Import the lazy client registry and the loader for dependency-free SDK modules
+from client_registry import ClientRegistry, sdk_module
+
+# Enums, timeframes and exceptions are loaded without the alpaca.data / alpaca.trading
+# package initializers (historical clients, request models, pandas), so the imports
+# below are cheap. Clients and request models are imported by the code that uses them.
+for _sdk_leaf in ("alpaca.common.enums", "alpaca.common.exceptions", "alpaca.data.enums",
+                  "alpaca.data.timeframe", "alpaca.trading.enums"):
+    sdk_module(_sdk_leaf)
+
+from alpaca.common.enums import Sort, SupportedCurrencies
 from alpaca.common.exceptions import APIError
 from alpaca.data.enums import DataFeed, OptionsFeed, CorporateActionsType, CryptoFeed
-from alpaca.data.historical.option import OptionHistoricalDataClient
-from alpaca.data.historical.stock import StockHistoricalDataClient
-from alpaca.data.historical.corporate_actions import CorporateActionsClient
-from alpaca.data.historical.crypto import CryptoHistoricalDataClient
-from alpaca.data.live.stock import StockDataStream
-from alpaca.data.requests import (
-    OptionLatestQuoteRequest,
-    OptionSnapshotRequest,
-    Sort,
-    StockBarsRequest,
-    StockLatestBarRequest,
-    StockLatestQuoteRequest,
-    StockLatestTradeRequest,
-    StockSnapshotRequest,
-    StockTradesRequest,
-    OptionChainRequest,
-    CorporateActionsRequest,
-    CryptoBarsRequest,
-    CryptoQuoteRequest,
-    CryptoLatestQuoteRequest
-)
-
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
-from alpaca.trading.client import TradingClient
 from alpaca.trading.enums import (
     AssetStatus,
     ContractType,
@@ -45,38 +42,46 @@ from alpaca.trading.enums import (
     QueryOrderStatus,
     TimeInForce,
 )
-from alpaca.trading.models import Order
-from alpaca.trading.requests import (
-    ClosePositionRequest,
-    CreateWatchlistRequest,
-    GetAssetsRequest,
-    GetCalendarRequest,
-    GetOptionContractsRequest,
-    GetOrdersRequest,
-    LimitOrderRequest,
-    MarketOrderRequest,
-    OptionLegRequest,
-    StopLimitOrderRequest,
-    StopOrderRequest,
-    TrailingStopOrderRequest,
-    UpdateWatchlistRequest,
-)
 
-from mcp.server.fastmcp import FastMCP
+if TYPE_CHECKING:
+    from alpaca.trading.models import Order
+    from alpaca.trading.requests import MarketOrderRequest, OptionLegRequest
+    import numpy as np
+    from history_stream import HistoryDigest
 
-# Configure Python path for local imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-github_core_path = os.path.join(current_dir, '.github', 'core')
-if github_core_path not in sys.path:
-    sys.path.insert(0, github_core_path)
 # Import the UserAgentMixin
 from user_agent_mixin import UserAgentMixin
-# Define new classes using the mixin
-class TradingClientSigned(UserAgentMixin, TradingClient): pass
-class StockHistoricalDataClientSigned(UserAgentMixin, StockHistoricalDataClient): pass
-class OptionHistoricalDataClientSigned(UserAgentMixin, OptionHistoricalDataClient): pass
-class CorporateActionsClientSigned(UserAgentMixin, CorporateActionsClient): pass
-class CryptoHistoricalDataClientSigned(UserAgentMixin, CryptoHistoricalDataClient): pass
+# Import the thread-pool dispatch layer for blocking SDK calls
+from sdk_executor import SDKExecutor
+# Import the shared per-host connection pools
+from http_transport import PooledTransportMixin, configure_transport, transport_stats
+# Import the per-family request budget and 429 backoff policy
+from http_transport import configure_rate_limits
+from rate_limiter import (RateLimiter, FAMILY_TRADING, FAMILY_MARKET_DATA, FAMILY_CORPORATE_ACTIONS,
+                          PRIORITY_ORDERS, PRIORITY_TRADING, PRIORITY_DATA)
+# Import the TTL cache for slowly changing reference data
+from ttl_cache import MISSING, EndpointCache, LRUTTLCache
+# Import the Prometheus-style tool and SDK call metrics
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, ToolMetrics, instrument_tools
+# Import the sampled tracing (OTLP/JSON spans to a file or collector)
+from tracing import FileSpanExporter, OTLPHttpSpanExporter, Tracer, configure_tracing
+# Import the single-flight layer that merges identical concurrent requests
+from single_flight import SingleFlight, request_key
+# Import the symbol-sorted asset table used to filter and paginate get_all_assets
+from asset_index import AssetIndex, decode_cursor, encode_cursor
+# Import the buffered renderer and row templates used by tool formatters
+from rendering import (Renderer, ORDER_ROW, FILL_ROW, STOCK_TRADE_ROW, CRYPTO_QUOTE_ROW, CORPORATE_ACTION_ROW,
+                       OPTION_QUOTE_ROW, OPTION_TRADE_ROW, OPTION_GREEKS_ROW, bar_row_template)
+# Import the structured (JSON/CSV/columnar) output serializer and record schemas
+from rendering import (serialize, check_output_format, RecordSchema, POSITION_SCHEMA, QUOTE_SCHEMA,
+                       TRADE_SCHEMA, BAR_SCHEMA, STOCK_SNAPSHOT_SCHEMA, ORDER_SCHEMA,
+                       ASSET_SCHEMA, ASSET_FIELDS_SCHEMA, CALENDAR_SCHEMA, CORPORATE_ACTION_SCHEMA,
+                       OPTION_CONTRACT_SCHEMA, OPTION_SNAPSHOT_SCHEMA, OPTION_CHAIN_SCHEMA, FILL_SCHEMA)
+
+def _signed(client_class: type, family: str) -> type:
+    """Define the signed variant of an SDK client class using the mixins."""
+    return type(f"{client_class.__name__}Signed", (UserAgentMixin, PooledTransportMixin, client_class),
+                {"__module__": __name__, "rate_limit_family": family})
 
 def detect_pycharm_environment():
     """
@@ -148,8 +153,137 @@ TRADE_API_URL = os.getenv("TRADE_API_URL")
 TRDE_API_WSS = os.getenv("TRDE_API_WSS")
 DATA_API_URL = os.getenv("DATA_API_URL")
 STREAM_DATA_WSS = os.getenv("STREAM_DATA_WSS")
+CRYPTO_STREAM_DATA_WSS = os.getenv("CRYPTO_STREAM_DATA_WSS")
+OPTION_STREAM_DATA_WSS = os.getenv("OPTION_STREAM_DATA_WSS")
 DEBUG = os.getenv("DEBUG", "False")
 
+# .env files generated by 'alpaca-mcp init' store unset endpoints as the string "None"
+if STREAM_DATA_WSS in ("", "None"):
+    STREAM_DATA_WSS = None
+if CRYPTO_STREAM_DATA_WSS in ("", "None"):
+    CRYPTO_STREAM_DATA_WSS = None
+if OPTION_STREAM_DATA_WSS in ("", "None"):
+    OPTION_STREAM_DATA_WSS = None
+if TRDE_API_WSS in ("", "None"):
+    TRDE_API_WSS = None
+if TRADE_API_URL in ("", "None"):
+    TRADE_API_URL = None
+if DATA_API_URL in ("", "None"):
+    DATA_API_URL = None
+
+# Live stock quote cache fed by the StockDataStream websocket (opt-in)
+STREAM_QUOTES = os.getenv("ALPACA_STREAM_QUOTES", "False").lower() in ['true', '1', 'yes', 'on']
+STREAM_FEED = os.getenv("ALPACA_STREAM_FEED", "iex").lower()
+STREAM_SYMBOLS = [s.strip().upper() for s in os.getenv("ALPACA_STREAM_SYMBOLS", "").split(",") if s.strip()]
+STREAM_MAX_SYMBOLS = int(os.getenv("ALPACA_STREAM_MAX_SYMBOLS", "30"))
+STREAM_QUOTE_MAX_AGE = float(os.getenv("ALPACA_STREAM_QUOTE_MAX_AGE", "5"))
+STREAM_BAR_MAX_AGE = float(os.getenv("ALPACA_STREAM_BAR_MAX_AGE", "90"))
+
+# Live crypto quote/trade/order book cache fed by the CryptoDataStream websocket (opt-in)
+CRYPTO_STREAM = os.getenv("ALPACA_CRYPTO_STREAM", "False").lower() in ['true', '1', 'yes', 'on']
+CRYPTO_STREAM_FEED = os.getenv("ALPACA_CRYPTO_STREAM_FEED", "us").lower()
+CRYPTO_STREAM_SYMBOLS = [s.strip().upper() for s in os.getenv("ALPACA_CRYPTO_STREAM_SYMBOLS", "").split(",") if s.strip()]
+CRYPTO_STREAM_MAX_SYMBOLS = int(os.getenv("ALPACA_CRYPTO_STREAM_MAX_SYMBOLS", "30"))
+CRYPTO_STREAM_QUOTE_MAX_AGE = float(os.getenv("ALPACA_CRYPTO_STREAM_QUOTE_MAX_AGE", "10"))
+
+# Live option contract quote/trade table fed by the OptionDataStream websocket (opt-in)
+OPTION_STREAM = os.getenv("ALPACA_OPTION_STREAM", "False").lower() in ['true', '1', 'yes', 'on']
+OPTION_STREAM_FEED = os.getenv("ALPACA_OPTION_STREAM_FEED", "indicative").lower()
+OPTION_STREAM_MAX_SYMBOLS = int(os.getenv("ALPACA_OPTION_STREAM_MAX_SYMBOLS", "200"))
+OPTION_STREAM_QUOTE_MAX_AGE = float(os.getenv("ALPACA_OPTION_STREAM_QUOTE_MAX_AGE", "15"))
+OPTION_STREAM_IDLE_SECONDS = float(os.getenv("ALPACA_OPTION_STREAM_IDLE_SECONDS", "300"))
+
+# Persistent on-disk bar store for get_stock_bars/get_crypto_bars history (opt-in)
+BAR_STORE = os.getenv("ALPACA_BAR_STORE", "False").lower() in ['true', '1', 'yes', 'on']
+BAR_STORE_DIR = os.getenv("ALPACA_BAR_STORE_DIR", os.path.join("~", ".cache", "alpaca-mcp", "bars"))
+BAR_STORE_RETENTION_DAYS = float(os.getenv("ALPACA_BAR_STORE_RETENTION_DAYS", "0"))
+BAR_STORE_SETTLE_SECONDS = float(os.getenv("ALPACA_BAR_STORE_SETTLE_SECONDS", "900"))
+
+# Local order/fill mirror fed by the TradingStream trade_updates websocket (opt-in)
+ORDER_MIRROR = os.getenv("ALPACA_ORDER_MIRROR", "False").lower() in ['true', '1', 'yes', 'on']
+ORDER_MIRROR_DB = os.getenv("ALPACA_ORDER_MIRROR_DB", "")
+ORDER_MIRROR_HISTORY = int(os.getenv("ALPACA_ORDER_MIRROR_HISTORY", "500"))
+ORDER_MIRROR_RECONCILE_INTERVAL = float(os.getenv("ALPACA_ORDER_MIRROR_RECONCILE_INTERVAL", "60"))
+ORDER_MIRROR_POSITION_MAX_AGE = float(os.getenv("ALPACA_ORDER_MIRROR_POSITION_MAX_AGE", "10"))
+
+# Per-tool latency/error metrics, served on /metrics (http transport) or written to a file (stdio)
+METRICS = os.getenv("ALPACA_METRICS", "True").lower() in ['true', '1', 'yes', 'on']
+METRICS_FILE = os.getenv("ALPACA_METRICS_FILE", "")
+METRICS_DUMP_INTERVAL = float(os.getenv("ALPACA_METRICS_DUMP_INTERVAL", "15"))
+
+# Sampled per-call tracing: spans go to a JSON Lines file and/or an OTLP/HTTP collector
+TRACING = os.getenv("ALPACA_TRACING", "False").lower() in ['true', '1', 'yes', 'on']
+TRACE_SAMPLE_RATIO = float(os.getenv("ALPACA_TRACE_SAMPLE_RATIO", "1.0"))
+TRACE_FILE = os.getenv("ALPACA_TRACE_FILE", "")
+TRACE_OTLP_ENDPOINT = os.getenv("ALPACA_TRACE_OTLP_ENDPOINT", "")
+
+# Share one upstream request among identical concurrent market data / reference data calls
+COALESCE_REQUESTS = os.getenv("ALPACA_COALESCE_REQUESTS", "True").lower() in ['true', '1', 'yes', 'on']
+
+# Page size for get_all_assets when the caller does not pass a limit
+ASSETS_PAGE_SIZE = max(1, int(os.getenv("ALPACA_ASSETS_PAGE_SIZE", "100")))
+
+# Multi-symbol bar requests made by get_stock_bars_batch
+BARS_BATCH_SIZE = max(1, int(os.getenv("ALPACA_BARS_BATCH_SIZE", "100")))
+BARS_BATCH_CONCURRENCY = max(1, int(os.getenv("ALPACA_BARS_BATCH_CONCURRENCY", "4")))
+
+# Multi-symbol snapshot requests made by scan_stocks
+SNAPSHOT_BATCH_SIZE = max(1, int(os.getenv("ALPACA_SNAPSHOT_BATCH_SIZE", "200")))
+SNAPSHOT_BATCH_CONCURRENCY = max(1, int(os.getenv("ALPACA_SNAPSHOT_BATCH_CONCURRENCY", "4")))
+
+# Contracts per page when get_option_chain pages through get_option_contracts (API maximum: 10000)
+OPTION_CONTRACTS_PAGE_SIZE = max(1, min(10000, int(os.getenv("ALPACA_OPTION_CONTRACTS_PAGE_SIZE", "10000"))))
+
+# Tick-level history (get_stock_trades, get_crypto_quotes) is paged lazily; at most this many
+# records per symbol are returned (the first and last half) along with statistics over all of them
+HISTORY_MAX_ROWS = max(2, int(os.getenv("ALPACA_HISTORY_MAX_ROWS", "1000")))
+# Records per request when paging tick-level history (API maximum: 10000)
+HISTORY_PAGE_SIZE = max(1, min(10000, int(os.getenv("ALPACA_HISTORY_PAGE_SIZE", "10000"))))
+
+# Local Black-Scholes IV/Greeks for option snapshots and chains the feed returns without them
+LOCAL_GREEKS = os.getenv("ALPACA_LOCAL_GREEKS", "True").lower() in ['true', '1', 'yes', 'on']
+RISK_FREE_RATE = float(os.getenv("ALPACA_RISK_FREE_RATE", "0.04"))
+DIVIDEND_YIELD = float(os.getenv("ALPACA_DIVIDEND_YIELD", "0.0"))
+
+# Thread-pool dispatch configuration for blocking SDK calls
+SDK_MAX_WORKERS = int(os.getenv("ALPACA_SDK_MAX_WORKERS", "16"))
+SDK_DEFAULT_CONCURRENCY = int(os.getenv("ALPACA_SDK_DEFAULT_CONCURRENCY", "4"))
+SDK_CLIENT_CONCURRENCY = {
+    "trading": int(os.getenv("ALPACA_SDK_TRADING_CONCURRENCY", "4")),
+    "stock_data": int(os.getenv("ALPACA_SDK_STOCK_DATA_CONCURRENCY", "6")),
+    "crypto_data": int(os.getenv("ALPACA_SDK_CRYPTO_DATA_CONCURRENCY", "4")),
+    "option_data": int(os.getenv("ALPACA_SDK_OPTION_DATA_CONCURRENCY", "4")),
+    "corporate_actions": int(os.getenv("ALPACA_SDK_CORPORATE_ACTIONS_CONCURRENCY", "2")),
+    "orders": int(os.getenv("ALPACA_SDK_ORDERS_CONCURRENCY", "4")),
+}
+
+# Client-side request budgets per API family (requests per minute; 0 disables limiting)
+RATE_LIMITS = {
+    FAMILY_TRADING: float(os.getenv("ALPACA_RATE_LIMIT_TRADING", "200")),
+    FAMILY_MARKET_DATA: float(os.getenv("ALPACA_RATE_LIMIT_MARKET_DATA", "200")),
+    FAMILY_CORPORATE_ACTIONS: float(os.getenv("ALPACA_RATE_LIMIT_CORPORATE_ACTIONS", "200")),
+}
+RATE_LIMIT_ORDER_RESERVE = int(os.getenv("ALPACA_RATE_LIMIT_ORDER_RESERVE", "10"))
+RETRY_BACKOFF_BASE = float(os.getenv("ALPACA_RETRY_BACKOFF_BASE", "1.0"))
+RETRY_BACKOFF_MAX = float(os.getenv("ALPACA_RETRY_BACKOFF_MAX", "30"))
+
+# Shared HTTP connection pool configuration (one pool per API host)
+HTTP_BACKEND = os.getenv("ALPACA_HTTP_BACKEND", "requests")
+HTTP_MAX_CONNECTIONS = int(os.getenv("ALPACA_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("ALPACA_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("ALPACA_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2 = os.getenv("ALPACA_HTTP2", "auto").lower()
+
+# Reference data cache configuration (TTL in seconds per endpoint; 0 disables caching)
+CACHE_MAX_ENTRIES = int(os.getenv("ALPACA_CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTLS = {
+    "clock": float(os.getenv("ALPACA_CACHE_TTL_CLOCK", "5")),
+    "calendar": float(os.getenv("ALPACA_CACHE_TTL_CALENDAR", "21600")),
+    "asset": float(os.getenv("ALPACA_CACHE_TTL_ASSET", "21600")),
+    "assets": float(os.getenv("ALPACA_CACHE_TTL_ASSETS", "21600")),
+    "option_chain": float(os.getenv("ALPACA_CACHE_TTL_OPTION_CHAIN", "15")),
+}
+
 # Initialize FastMCP server with intelligent log level detection
 is_pycharm = detect_pycharm_environment()
 log_level = "ERROR" if is_pycharm else "INFO"
@@ -162,6 +296,26 @@ if not is_pycharm and __name__ == "__main__":
 
 mcp = FastMCP("alpaca-trading", log_level=log_level)
 
+# Spans are only recorded when tracing is enabled and an exporter is configured
+span_exporters = []
+if TRACING and TRACE_FILE:
+    span_exporters.append(FileSpanExporter(os.path.expanduser(TRACE_FILE)))
+if TRACING and TRACE_OTLP_ENDPOINT:
+    span_exporters.append(OTLPHttpSpanExporter(TRACE_OTLP_ENDPOINT))
+tracer = Tracer(sample_ratio=TRACE_SAMPLE_RATIO, exporters=span_exporters)
+configure_tracing(tracer)
+
+# Every tool registered below is timed (and traced when sampled); SDK calls are
+# attributed to the tool that made them
+tool_metrics = ToolMetrics()
+tool_wrappers = []
+if METRICS:
+    tool_wrappers.append(tool_metrics.instrument)
+if tracer.enabled:
+    tool_wrappers.append(tracer.instrument)
+if tool_wrappers:
+    instrument_tools(mcp, *tool_wrappers)
+
 
 # Check if keys are available
 if not TRADE_API_KEY or not TRADE_API_SECRET:
@@ -170,23 +324,629 @@ if not TRADE_API_KEY or not TRADE_API_SECRET:
 # Convert string to boolean
 ALPACA_PAPER_TRADE_BOOL = ALPACA_PAPER_TRADE.lower() not in ['false', '0', 'no', 'off']
 
-# Initialize clients
+# Configure the shared connection pools before any client sends a request
+configure_transport(
+    backend=HTTP_BACKEND,
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive=HTTP_MAX_KEEPALIVE,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    http2=None if HTTP2 == "auto" else HTTP2 in ['true', '1', 'yes', 'on']
+)
+
+# One limiter shared by the HTTP transport (per request) and the SDK executor (per call)
+rate_limiter = RateLimiter(
+    RATE_LIMITS,
+    order_reserve=RATE_LIMIT_ORDER_RESERVE,
+    backoff_base=RETRY_BACKOFF_BASE,
+    backoff_max=RETRY_BACKOFF_MAX
+)
+configure_rate_limits(rate_limiter)
+
+# Clients are created on first use so importing this module (and starting the stdio
+# server) does not pay for the SDK's client, request-model and pandas imports
+def _create_trading_client():
+    from alpaca.trading.client import TradingClient
+    return _signed(TradingClient, FAMILY_TRADING)(
+        TRADE_API_KEY, TRADE_API_SECRET, paper=ALPACA_PAPER_TRADE_BOOL, url_override=TRADE_API_URL)
+
+def _create_stock_historical_data_client():
+    from alpaca.data.historical.stock import StockHistoricalDataClient
+    return _signed(StockHistoricalDataClient, FAMILY_MARKET_DATA)(
+        TRADE_API_KEY, TRADE_API_SECRET, url_override=DATA_API_URL)
+
+def _create_stock_data_stream_client():
+    from alpaca.data.live.stock import StockDataStream
+    return StockDataStream(TRADE_API_KEY, TRADE_API_SECRET, feed=DataFeed(STREAM_FEED),
+                           url_override=STREAM_DATA_WSS)
+
+def _create_crypto_data_stream_client():
+    from alpaca.data.live.crypto import CryptoDataStream
+    # Raw messages: the cache decodes quotes and trades on read and applies books as arrays
+    return CryptoDataStream(TRADE_API_KEY, TRADE_API_SECRET, raw_data=True, feed=CryptoFeed(CRYPTO_STREAM_FEED),
+                            url_override=CRYPTO_STREAM_DATA_WSS)
+
+def _create_option_data_stream_client():
+    from alpaca.data.live.option import OptionDataStream
+    # Raw messages: the cache writes fields straight into its table
+    return OptionDataStream(TRADE_API_KEY, TRADE_API_SECRET, raw_data=True, feed=OptionsFeed(OPTION_STREAM_FEED),
+                            url_override=OPTION_STREAM_DATA_WSS)
+
+def _create_trading_stream_client():
+    from alpaca.trading.stream import TradingStream
+    return TradingStream(TRADE_API_KEY, TRADE_API_SECRET, paper=ALPACA_PAPER_TRADE_BOOL,
+                         url_override=TRDE_API_WSS)
+
+def _create_option_historical_data_client():
+    from alpaca.data.historical.option import OptionHistoricalDataClient
+    return _signed(OptionHistoricalDataClient, FAMILY_MARKET_DATA)(
+        api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET, url_override=DATA_API_URL)
+
+def _create_corporate_actions_client():
+    from alpaca.data.historical.corporate_actions import CorporateActionsClient
+    return _signed(CorporateActionsClient, FAMILY_CORPORATE_ACTIONS)(
+        api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET, url_override=DATA_API_URL)
+
+def _create_crypto_historical_data_client():
+    from alpaca.data.historical.crypto import CryptoHistoricalDataClient
+    return _signed(CryptoHistoricalDataClient, FAMILY_MARKET_DATA)(
+        api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET, url_override=DATA_API_URL)
+
+clients = ClientRegistry()
 # For trading
-trade_client = TradingClientSigned(TRADE_API_KEY, TRADE_API_SECRET, paper=ALPACA_PAPER_TRADE_BOOL)
+trade_client = clients.register("trading", _create_trading_client)
 # For historical market data
-stock_historical_data_client = StockHistoricalDataClientSigned(TRADE_API_KEY, TRADE_API_SECRET)
+stock_historical_data_client = clients.register("stock_data", _create_stock_historical_data_client)
 # For streaming market data
-stock_data_stream_client = StockDataStream(TRADE_API_KEY, TRADE_API_SECRET, url_override=STREAM_DATA_WSS)
+stock_data_stream_client = clients.register("stock_stream", _create_stock_data_stream_client)
+# For streaming crypto market data and order books
+crypto_data_stream_client = clients.register("crypto_stream", _create_crypto_data_stream_client)
+# For streaming option contract quotes and trades
+option_data_stream_client = clients.register("option_stream", _create_option_data_stream_client)
+# For streaming order updates
+trading_stream_client = clients.register("trading_stream", _create_trading_stream_client)
 # For option historical data
-option_historical_data_client = OptionHistoricalDataClientSigned(api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET)
+option_historical_data_client = clients.register("option_data", _create_option_historical_data_client)
 # For corporate actions data
-corporate_actions_client = CorporateActionsClientSigned(api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET)
+corporate_actions_client = clients.register("corporate_actions", _create_corporate_actions_client)
 # For crypto historical data
-crypto_historical_data_client = CryptoHistoricalDataClientSigned(api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET)
+crypto_historical_data_client = clients.register("crypto_data", _create_crypto_historical_data_client)
+
+# REST clients built on a background thread once the server starts (the stream only when enabled)
+PREWARM_CLIENTS = os.getenv("ALPACA_PREWARM_CLIENTS", "True").lower() in ['true', '1', 'yes', 'on']
+
+def start_client_prewarm() -> None:
+    """Construct the REST clients in the background if ALPACA_PREWARM_CLIENTS is enabled."""
+    if PREWARM_CLIENTS:
+        clients.prewarm(("trading", "stock_data", "option_data", "corporate_actions", "crypto_data"))
+
+def start_metrics_dump() -> None:
+    """Periodically write the metrics to ALPACA_METRICS_FILE (for stdio, where /metrics is not served)."""
+    if METRICS and METRICS_FILE:
+        tool_metrics.start_file_dump(os.path.expanduser(METRICS_FILE), interval=METRICS_DUMP_INTERVAL)
+
+# All blocking SDK calls are dispatched through this executor so the event loop stays free
+# Order placement and cancellation use their own "orders" lane so they never queue behind reads
+sdk_executor = SDKExecutor(
+    max_workers=SDK_MAX_WORKERS,
+    client_limits=SDK_CLIENT_CONCURRENCY,
+    default_limit=SDK_DEFAULT_CONCURRENCY,
+    rate_limiter=rate_limiter,
+    lane_routes={
+        "orders": (FAMILY_TRADING, PRIORITY_ORDERS),
+        "trading": (FAMILY_TRADING, PRIORITY_TRADING),
+        "stock_data": (FAMILY_MARKET_DATA, PRIORITY_DATA),
+        "crypto_data": (FAMILY_MARKET_DATA, PRIORITY_DATA),
+        "option_data": (FAMILY_MARKET_DATA, PRIORITY_DATA),
+        "corporate_actions": (FAMILY_CORPORATE_ACTIONS, PRIORITY_DATA),
+    },
+    observer=tool_metrics.observe_upstream if METRICS else None,
+    tracer=tracer if tracer.enabled else None
+)
+
+# Concurrent identical read calls (e.g. several sessions asking for SPY's snapshot) share one request
+coalescer = SingleFlight()
+
+# Assets, market clock and calendar change at most a few times a day; cache the SDK objects
+reference_cache = EndpointCache(CACHE_TTLS, backend=LRUTTLCache(maxsize=CACHE_MAX_ENTRIES))
+
+# Downloaded bar history kept on disk so repeat queries only fetch missing ranges (None when disabled)
+bar_store = None
+if BAR_STORE:
+    from bar_store import BarStore
+    bar_store = BarStore(
+        BAR_STORE_DIR,
+        retention_days=BAR_STORE_RETENTION_DAYS,
+        settle_seconds=BAR_STORE_SETTLE_SECONDS
+    )
+
+# Latest quote/trade/minute bar table fed by the stock data stream (None when disabled)
+stock_data_cache = None
+if STREAM_QUOTES:
+    from streaming import LatestStockDataCache
+    stock_data_cache = LatestStockDataCache(
+        stock_data_stream_client,
+        feed=STREAM_FEED,
+        max_symbols=STREAM_MAX_SYMBOLS,
+        quote_max_age=STREAM_QUOTE_MAX_AGE,
+        bar_max_age=STREAM_BAR_MAX_AGE
+    )
+
+def _decode_stream_record(model: Any, raw: Dict[str, Any]) -> Any:
+    """SDK model from a raw stream message (msgpack timestamps become datetimes)."""
+    record = dict(raw)
+    if hasattr(record.get("t"), "to_datetime"):
+        record["t"] = record["t"].to_datetime()
+    return model(record["S"], record)
+
+def _decode_stream_quote(raw: Dict[str, Any]) -> Any:
+    from alpaca.data.models import Quote
+    return _decode_stream_record(Quote, raw)
+
+def _decode_stream_trade(raw: Dict[str, Any]) -> Any:
+    from alpaca.data.models import Trade
+    return _decode_stream_record(Trade, raw)
+
+# Latest crypto quote/trade and live L2 order books fed by the crypto data stream (None when disabled)
+crypto_data_cache = None
+if CRYPTO_STREAM:
+    from streaming import LatestCryptoDataCache
+    crypto_data_cache = LatestCryptoDataCache(
+        crypto_data_stream_client,
+        decode_quote=_decode_stream_quote,
+        decode_trade=_decode_stream_trade,
+        feed=CRYPTO_STREAM_FEED,
+        max_symbols=CRYPTO_STREAM_MAX_SYMBOLS,
+        quote_max_age=CRYPTO_STREAM_QUOTE_MAX_AGE
+    )
+
+# Latest quote/trade per option contract, subscribed on first request and dropped when idle (None when disabled)
+option_data_cache = None
+if OPTION_STREAM:
+    from streaming import LatestOptionDataCache
+    option_data_cache = LatestOptionDataCache(
+        option_data_stream_client,
+        decode_quote=_decode_stream_quote,
+        decode_trade=_decode_stream_trade,
+        feed=OPTION_STREAM_FEED,
+        max_symbols=OPTION_STREAM_MAX_SYMBOLS,
+        quote_max_age=OPTION_STREAM_QUOTE_MAX_AGE,
+        idle_seconds=OPTION_STREAM_IDLE_SECONDS
+    )
+
+def start_streams() -> None:
+    """Subscribe the configured startup symbols and start the enabled market data streams."""
+    if stock_data_cache is not None and STREAM_SYMBOLS:
+        stock_data_cache.subscribe(STREAM_SYMBOLS)
+    if crypto_data_cache is not None and CRYPTO_STREAM_SYMBOLS:
+        crypto_data_cache.subscribe(CRYPTO_STREAM_SYMBOLS)
+
+# Reconciliation runs on the mirror's thread; its REST calls go through the trading lane
+# so they are charged to the trading rate limit like every other trading read
+def _fetch_mirror_orders(status: str, limit: int, until: Optional[datetime]) -> List[Any]:
+    from alpaca.trading.requests import GetOrdersRequest
+    return sdk_executor.run_sync("trading", trade_client.get_orders, GetOrdersRequest(
+        status=QueryOrderStatus(status), limit=limit, until=until, direction=Sort.DESC, nested=False))
+
+def _fetch_mirror_order(order_id: str) -> Any:
+    return sdk_executor.run_sync("trading", trade_client.get_order_by_id, order_id)
+
+def _decode_mirror_order(data: str) -> Any:
+    from alpaca.trading.models import Order
+    return Order.model_validate_json(data)
+
+# Orders and fills mirrored from trade updates with periodic REST reconciliation (None when disabled)
+order_mirror = None
+if ORDER_MIRROR:
+    from order_mirror import OrderMirror
+    order_mirror = OrderMirror(
+        trading_stream_client,
+        _fetch_mirror_orders,
+        _fetch_mirror_order,
+        decode_order=_decode_mirror_order,
+        db_path=os.path.expanduser(ORDER_MIRROR_DB) if ORDER_MIRROR_DB else None,
+        history=ORDER_MIRROR_HISTORY,
+        reconcile_interval=ORDER_MIRROR_RECONCILE_INTERVAL,
+        position_max_age=ORDER_MIRROR_POSITION_MAX_AGE
+    )
+
+def start_order_mirror() -> None:
+    """Connect the trade updates stream and start reconciling if ALPACA_ORDER_MIRROR is enabled."""
+    if order_mirror is not None:
+        order_mirror.start()
+
+# References to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks = set()
+
+# ----------------------------------------------------------------------------
+# Reference data cache helpers
+# ----------------------------------------------------------------------------
+async def _cached_trading_call(endpoint: str, key: Any, fn: Any, *args: Any,
+                               ttl_for: Optional[Any] = None) -> Any:
+    """
+    Run a trading client call through the reference data cache.
+
+    Args:
+        endpoint: Cache endpoint name (selects the TTL, e.g. "clock")
+        key: Hashable cache key identifying the request parameters
+        fn: Bound trading client method
+        *args: Positional arguments for fn
+        ttl_for: Optional callable returning a (shorter) TTL for a fetched value
+
+    Returns:
+        The cached or freshly fetched SDK result
+    """
+    value = reference_cache.get(endpoint, key)
+    if value is not MISSING:
+        return value
+    if COALESCE_REQUESTS:
+        value = await coalescer.do(endpoint, key, lambda: sdk_executor.run("trading", fn, *args))
+    else:
+        value = await sdk_executor.run("trading", fn, *args)
+    reference_cache.set(endpoint, key, value, ttl=ttl_for(value) if ttl_for else None)
+    return value
+
+
+async def _shared_call(client: str, fn: Any, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a read-only SDK call, sharing it with identical calls already in flight.
+
+    Args:
+        client: SDK executor lane (e.g. "stock_data")
+        fn: Bound SDK client method
+        *args: Positional arguments for fn (usually a request model)
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        The SDK result, possibly shared with concurrent callers (treat it as read-only)
+    """
+    if not COALESCE_REQUESTS:
+        return await sdk_executor.run(client, fn, *args, **kwargs)
+    key = (client, request_key(args), request_key(kwargs))
+    return await coalescer.do(fn.__name__, key, lambda: sdk_executor.run(client, fn, *args, **kwargs))
+
+
+async def _get_all_positions() -> List[Any]:
+    """All open positions, served from the order mirror's snapshot while it is fresh."""
+    if order_mirror is None:
+        return await sdk_executor.run("trading", trade_client.get_all_positions)
+    positions = order_mirror.positions()
+    if positions is None:
+        generation = order_mirror.position_generation
+        positions = await sdk_executor.run("trading", trade_client.get_all_positions)
+        order_mirror.store_positions(positions, generation)
+    return positions
+
+
+def _fetch_asset_index(filter_params: Any) -> AssetIndex:
+    """Fetch the asset list and index it (runs on an SDK worker thread)."""
+    return AssetIndex(trade_client.get_all_assets(filter_params))
+
+
+def _clock_ttl(clock: Any) -> float:
+    """Seconds until the next market open/close, so a cached clock never spans a transition."""
+    transition = clock.next_close if clock.is_open else clock.next_open
+    remaining = (transition - clock.timestamp).total_seconds()
+    return max(0.0, remaining)
+
+
+async def _fetch_all_option_contracts(request: Any) -> List[Any]:
+    """Fetch every page of an option contracts query, following next_page_token."""
+    contracts: List[Any] = []
+    while True:
+        response = await _shared_call("trading", trade_client.get_option_contracts, request)
+        contracts.extend(response.option_contracts or [])
+        if not response.next_page_token:
+            return contracts
+        request = request.model_copy(update={"page_token": response.next_page_token})
+
+
+async def _get_option_chain(underlying: str, expiration_lte: date, feed: Optional[OptionsFeed]) -> Any:
+    """
+    Build (or reuse from the reference cache) the option chain for one underlying.
+
+    Contracts, chain snapshots and the underlying's latest trade are fetched
+    concurrently; concurrent builds of the same chain share one set of requests.
+
+    Args:
+        underlying: Underlying symbol
+        expiration_lte: Latest expiration to include
+        feed: Options data feed for the snapshots
+
+    Returns:
+        option_chain.OptionChain
+    """
+    from alpaca.data.requests import OptionChainRequest, StockLatestTradeRequest
+    from alpaca.trading.requests import GetOptionContractsRequest
+    from option_chain import OptionChain
+
+    key = (underlying, expiration_lte.isoformat(), request_key(feed))
+    chain = reference_cache.get("option_chain", key)
+    if chain is not MISSING:
+        return chain
+
+    async def build() -> Any:
+        today = date.today()
+        contracts_request = GetOptionContractsRequest(
+            underlying_symbols=[underlying],
+            expiration_date_gte=today,
+            expiration_date_lte=expiration_lte,
+            limit=OPTION_CONTRACTS_PAGE_SIZE
+        )
+        snapshots_request = OptionChainRequest(
+            underlying_symbol=underlying,
+            feed=feed,
+            expiration_date_gte=today,
+            expiration_date_lte=expiration_lte
+        )
+        price_request = StockLatestTradeRequest(symbol_or_symbols=underlying)
+        contracts, snapshots, trades = await asyncio.gather(
+            _fetch_all_option_contracts(contracts_request),
+            _shared_call("option_data", option_historical_data_client.get_option_chain, snapshots_request),
+            _shared_call("stock_data", stock_historical_data_client.get_stock_latest_trade, price_request),
+            return_exceptions=True
+        )
+        for result in (contracts, snapshots):
+            if isinstance(result, BaseException):
+                raise result
+        # Index underlyings and symbols without stock trades still get a chain, just no moneyness
+        trade = None if isinstance(trades, BaseException) else trades.get(underlying)
+        price = float(trade.price) if trade is not None else None
+
+        def assemble() -> Any:
+            chain = OptionChain(underlying, contracts, snapshots, price)
+            if LOCAL_GREEKS:
+                chain.fill_greeks(RISK_FREE_RATE, DIVIDEND_YIELD)
+            return chain
+
+        return await asyncio.to_thread(assemble)
+
+    chain = await coalescer.do("option_chain", key, build) if COALESCE_REQUESTS else await build()
+    reference_cache.set("option_chain", key, chain)
+    return chain
+
+
+async def _local_option_greeks(snapshots: Dict[str, Any], symbols: List[str]) -> Dict[str, Any]:
+    """
+    Compute IV and Greeks for option snapshots returned without them.
+
+    The underlying prices for all affected contracts come from one multi-symbol
+    latest-trade request, and the contracts are solved together with the vectorized
+    Black-Scholes module. IV supplied by the feed is kept.
+
+    Args:
+        snapshots: Option symbol -> SDK OptionsSnapshot
+        symbols: Option symbols to consider
+
+    Returns:
+        Option symbol -> namespace with implied_volatility and greeks (delta, gamma, rho,
+        theta, vega); contracts that cannot be priced are left out
+    """
+    import numpy as np
+    from alpaca.data.requests import StockLatestTradeRequest
+    from option_pricing import greeks, implied_volatility, mid_price, parse_occ_symbol, years_to_expiration
+
+    wanted = []
+    for symbol in symbols:
+        snapshot = snapshots.get(symbol)
+        if snapshot is None or (snapshot.greeks is not None and snapshot.implied_volatility is not None):
+            continue
+        contract = parse_occ_symbol(symbol)
+        if contract is not None:
+            wanted.append((symbol, snapshot, contract))
+    if not wanted:
+        return {}
+
+    roots = sorted({contract.root for _, _, contract in wanted})
+    try:
+        trades = await _shared_call("stock_data", stock_historical_data_client.get_stock_latest_trade,
+                                    StockLatestTradeRequest(symbol_or_symbols=roots))
+    except Exception:
+        return {}
+
+    def number(value: Any) -> float:
+        return np.nan if value is None else float(value)
+
+    spot = np.array([number(getattr(trades.get(contract.root), "price", None)) for _, _, contract in wanted])
+    is_call = np.array([contract.is_call for _, _, contract in wanted])
+    strike = np.array([contract.strike for _, _, contract in wanted])
+    years = years_to_expiration(np.array([contract.expiration for _, _, contract in wanted], dtype="datetime64[D]"))
+    iv = np.array([number(snapshot.implied_volatility) for _, snapshot, _ in wanted])
+    missing_iv = np.isnan(iv)
+    if missing_iv.any():
+        quotes = [snapshot.latest_quote for _, snapshot, _ in wanted]
+        premium = mid_price(
+            np.array([number(getattr(quote, "bid_price", None)) for quote in quotes]),
+            np.array([number(getattr(quote, "ask_price", None)) for quote in quotes]),
+            np.array([number(getattr(snapshot.latest_trade, "price", None)) for _, snapshot, _ in wanted])
+        )
+        iv = np.where(missing_iv, implied_volatility(premium, is_call, spot, strike, years,
+                                                     RISK_FREE_RATE, DIVIDEND_YIELD), iv)
+    values = greeks(is_call, spot, strike, years, RISK_FREE_RATE, DIVIDEND_YIELD, iv)
+
+    local = {}
+    for index, (symbol, snapshot, _) in enumerate(wanted):
+        if np.isnan(values["delta"][index]):
+            continue
+        local[symbol] = SimpleNamespace(
+            implied_volatility=float(iv[index]),
+            greeks=snapshot.greeks or SimpleNamespace(**{name: float(column[index]) for name, column in values.items()})
+        )
+    return local
+
+# ----------------------------------------------------------------------------
+# Bar store helpers
+# ----------------------------------------------------------------------------
+_TIMEFRAME_UNIT_SECONDS = {
+    TimeFrameUnit.Minute: 60,
+    TimeFrameUnit.Hour: 3600,
+    TimeFrameUnit.Day: 86400,
+    TimeFrameUnit.Week: 7 * 86400,
+    TimeFrameUnit.Month: 31 * 86400,
+}
+
+
+async def _read_bar_store(client: str, fetch: Any, request_class: Any, symbol: str,
+                          timeframe_obj: TimeFrame, feed: str, start_time: datetime,
+                          end_time: datetime, limit: Optional[int] = None,
+                          request_fields: Optional[Dict[str, Any]] = None, **fetch_kwargs: Any) -> Any:
+    """
+    Read bars for one symbol from the on-disk store, fetching only missing ranges.
+
+    Args:
+        client: SDK executor lane (e.g. "stock_data")
+        fetch: Bound historical data client method (e.g. get_stock_bars)
+        request_class: Bars request model (StockBarsRequest or CryptoBarsRequest)
+        symbol: Symbol to fetch
+        timeframe_obj: Bar timeframe
+        feed: Feed name used in the store key
+        start_time: Window start
+        end_time: Window end
+        limit: Maximum number of bars to return from the start of the window
+        request_fields: Extra fields for the bars request (e.g. stock feed); they must
+            match what feed names in the store key
+        **fetch_kwargs: Extra keyword arguments for fetch (e.g. crypto feed)
+
+    Returns:
+        Structured array of bar_store.BAR_DTYPE rows
+    """
+    key = (symbol, timeframe_obj.value, feed)
+    missing = bar_store.missing_ranges(key, start_time, end_time)
+    if missing:
+        responses = await asyncio.gather(*[
+            _shared_call(client, fetch, request_class(
+                symbol_or_symbols=symbol,
+                timeframe=timeframe_obj,
+                start=range_start,
+                end=range_end,
+                **(request_fields or {})
+            ), **fetch_kwargs)
+            for range_start, range_end in missing
+        ])
+        fetched = [bar for response in responses for bar in response.data.get(symbol, [])]
+        bar_seconds = _TIMEFRAME_UNIT_SECONDS[timeframe_obj.unit_value] * timeframe_obj.amount
+        await asyncio.to_thread(bar_store.write, key, fetched, missing, bar_seconds)
+    return await asyncio.to_thread(bar_store.read, key, start_time, end_time, limit)
+
+
+async def _get_bars_from_store(client: str, fetch: Any, request_class: Any, symbol: str,
+                               timeframe_obj: TimeFrame, feed: str, start_time: datetime,
+                               end_time: datetime, limit: Optional[int] = None,
+                               **fetch_kwargs: Any) -> List[Any]:
+    """
+    Serve bars for one symbol from the on-disk store (arguments as for _read_bar_store).
+
+    Returns:
+        List of bars (BarRow tuples with the same fields as the SDK Bar model)
+    """
+    stored = await _read_bar_store(client, fetch, request_class, symbol, timeframe_obj, feed,
+                                   start_time, end_time, limit, **fetch_kwargs)
+    return list(bar_store.rows(stored, symbol))
+
+# ----------------------------------------------------------------------------
+# History paging helpers
+# ----------------------------------------------------------------------------
+async def _read_pages(client: str, fetch_client: Any, path: str, request: Any, key: str, consume: Any) -> int:
+    """
+    Page through a market data endpoint, handing every page to consume before requesting the next.
+
+    One page is requested at a time on the client's executor lane, so memory does not
+    grow with the window.
+
+    Args:
+        client: SDK executor lane (e.g. "stock_data")
+        fetch_client: SDK data client whose get method performs the requests
+        path: Endpoint path, e.g. "/stocks/trades"
+        request: SDK request model (its limit caps the total across pages)
+        key: Response field holding the records, e.g. "trades"
+        consume: Coroutine function(raw page) awaited for each page (symbol -> raw records)
+
+    Returns:
+        Number of pages read
+    """
+    from history_stream import iter_pages, next_page
+    pages = iter_pages(fetch_client.get, path, request.to_request_fields(), key,
+                       limit=request.limit, page_size=HISTORY_PAGE_SIZE)
+    count = 0
+    while True:
+        page = await sdk_executor.run(client, next_page, pages)
+        if page is None:
+            return count
+        count += 1
+        await consume(page)
+
+
+async def _read_history(client: str, fetch_client: Any, path: str, request: Any, key: str, stats_class: Any,
+                        max_rows: int, on_page: Any = None) -> "HistoryDigest":
+    """
+    Page through a trades/quotes endpoint into a bounded HistoryDigest.
+
+    Args:
+        client / fetch_client / path / request / key: As for _read_pages
+        stats_class: TradeStats or QuoteStats
+        max_rows: Records kept per symbol
+        on_page: Optional coroutine function(raw page, digest) awaited after each page
+    """
+    from history_stream import HistoryDigest
+    digest = HistoryDigest(stats_class, max_rows)
+
+    async def consume(page: Dict[str, List[Dict[str, Any]]]) -> None:
+        digest.add(page)
+        if on_page is not None:
+            await on_page(page, digest)
+
+    await _read_pages(client, fetch_client, path, request, key, consume)
+    return digest
+
+
+def _history_chunk_sender(ctx: Optional[Context], decode: Any, render: Any, total: Optional[int]) -> Any:
+    """
+    on_page callback for _read_history that sends every page as an MCP progress notification.
+
+    Args:
+        ctx: Tool context (None, or a request without a progress token, sends nothing)
+        decode: Callable(symbol, raw record) returning the SDK model
+        render: Callable(list of models) returning the chunk text
+        total: Expected record count, if known (the request limit)
+    """
+    try:
+        meta = ctx.request_context.meta if ctx is not None else None
+    except ValueError:
+        # Called outside an MCP request
+        meta = None
+    if meta is None or meta.progressToken is None:
+        return None
+
+    async def send(page: Dict[str, List[Dict[str, Any]]], digest: "HistoryDigest") -> None:
+        records = [decode(symbol, raw) for symbol, raws in page.items() for raw in raws]
+        await ctx.report_progress(digest.count, total, render(records))
+
+    return send
+
+
+def _history_summary(noun: str, symbol: str, digest: "HistoryDigest", descending: bool) -> List[str]:
+    """Text lines describing what was left out of a symbol's history and the statistics over all of it."""
+    if not digest.truncated(symbol):
+        return []
+    rows = digest.rows[symbol]
+    stats = digest.stats[symbol].summary(descending=descending)
+    lines = ["", f"Summary ({stats['count']:,} {noun}, {stats['start']} to {stats['end']}):"]
+    if "vwap" in stats:
+        lines.append(f"  Open: ${stats['open']:.4f}, High: ${stats['high']:.4f}, Low: ${stats['low']:.4f}, "
+                     f"Close: ${stats['close']:.4f}")
+        lines.append(f"  Volume: {stats['volume']:,.0f}"
+                     + (f", VWAP: ${stats['vwap']:.4f}" if stats['vwap'] is not None else ""))
+    elif stats["avg_spread"] is not None:
+        lines.append(f"  Lowest Bid: ${stats['low_bid']:.6f}, Highest Ask: ${stats['high_ask']:.6f}")
+        lines.append(f"  Average Spread: ${stats['avg_spread']:.6f}, Average Midpoint: ${stats['avg_mid']:.6f}")
+    lines.append(f"Showing the first {len(rows.head):,} and last {len(rows.tail):,} of {rows.count:,} {noun} "
+                 f"({rows.omitted:,} omitted). Raise max_rows, narrow the window or use stream_chunks "
+                 f"to receive the rest.")
+    return lines
 
 # ----------------------------------------------------------------------------
 # Centralized date parsing helpers
 # ----------------------------------------------------------------------------
+@tracer.traced()
 def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
     """Parse an ISO-like datetime string into a datetime.
 
@@ -220,6 +980,59 @@ def _parse_date_ymd(value: str) -> date:
     return datetime.strptime(value, '%Y-%m-%d').date()
 
 
+def _resolve_stock_bar_window(timeframe: str, days: int, limit: Optional[int],
+                              start: Optional[str], end: Optional[str]) -> Tuple[TimeFrame, datetime, datetime]:
+    """
+    Parse a stock bars timeframe and resolve the request window.
+
+    Without an explicit start, intraday requests with a limit look back limit bars
+    and everything else looks back the given number of days.
+
+    Returns:
+        Tuple of (TimeFrame, start datetime, end datetime)
+
+    Raises:
+        ValueError: With a user-facing message if the timeframe or a time is invalid
+    """
+    timeframe_obj = parse_timeframe_with_enums(timeframe)
+    if timeframe_obj is None:
+        raise ValueError(f"Invalid timeframe '{timeframe}'. Supported formats: 1Min, 2Min, 4Min, 5Min, 15Min, 30Min, 1Hour, 2Hour, 4Hour, 1Day, 1Week, 1Month, etc.")
+    
+    # Parse start/end times or calculate from days
+    start_time = None
+    end_time = None
+    
+    if start:
+        try:
+            start_time = _parse_iso_datetime(start)
+        except ValueError:
+            raise ValueError(f"Invalid start time format '{start}'. Use ISO format like '2023-01-01T09:30:00' or '2023-01-01'")
+            
+    if end:
+        try:
+            end_time = _parse_iso_datetime(end)
+        except ValueError:
+            raise ValueError(f"Invalid end time format '{end}'. Use ISO format like '2023-01-01T16:00:00' or '2023-01-01'")
+    
+    # If no start/end provided, calculate from days parameter OR limit+timeframe
+    if not start_time:
+        if limit and timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]:
+            # Calculate based on limit and timeframe for intraday data
+            if timeframe_obj.unit_value == TimeFrameUnit.Minute:
+                minutes_back = limit * timeframe_obj.amount
+                start_time = datetime.now() - timedelta(minutes=minutes_back)
+            elif timeframe_obj.unit_value == TimeFrameUnit.Hour:
+                hours_back = limit * timeframe_obj.amount
+                start_time = datetime.now() - timedelta(hours=hours_back)
+        else:
+            # Fall back to days parameter for daily+ timeframes
+            start_time = datetime.now() - timedelta(days=days)
+    if not end_time:
+        end_time = datetime.now()
+    
+    return timeframe_obj, start_time, end_time
+
+
 def _month_name_to_number(name: str) -> int:
     """Convert month name to month number. Accepts full and abbreviated names."""
     try:
@@ -249,7 +1062,7 @@ async def get_account_info() -> str:
             - Pattern Day Trader Status
             - Day Trades Remaining
     """
-    account = trade_client.get_account()
+    account = await sdk_executor.run("trading", trade_client.get_account)
     
     info = f"""
             Account Information:
@@ -269,10 +1082,13 @@ async def get_account_info() -> str:
     return info
 
 @mcp.tool()
-async def get_positions() -> str:
+async def get_positions(format: str = "text") -> str:
     """
     Retrieves and formats all current positions in the portfolio.
     
+    Args:
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
     Returns:
         str: Formatted string containing details of all open positions including:
             - Symbol
@@ -282,7 +1098,14 @@ async def get_positions() -> str:
             - Current Price
             - Unrealized P/L
     """
-    positions = trade_client.get_all_positions()
+    format_error = check_output_format(format)
+    if format_error:
+        return format_error
+    
+    positions = await _get_all_positions()
+    
+    if format != "text":
+        return serialize(positions, POSITION_SCHEMA, format)
     
     if not positions:
         return "No open positions found."
@@ -312,7 +1135,12 @@ async def get_open_position(symbol: str) -> str:
         str: Formatted string containing the position details or an error message
     """
     try:
-        position = trade_client.get_open_position(symbol)
+        position = None
+        positions = order_mirror.positions() if order_mirror is not None else None
+        if positions is not None:
+            position = next((p for p in positions if p.symbol == symbol), None)
+        if position is None:
+            position = await sdk_executor.run("trading", trade_client.get_open_position, symbol)
         
         # Check if it's an options position by looking for the options symbol pattern
         is_option = len(symbol) > 6 and any(c in symbol for c in ['C', 'P'])
@@ -332,17 +1160,294 @@ async def get_open_position(symbol: str) -> str:
     except Exception as e:
         return f"Error fetching position: {str(e)}"
 
+@mcp.tool()
+async def get_portfolio_risk(
+    price_shocks: Optional[List[float]] = None,
+    vol_shocks: Optional[List[float]] = None,
+    beta_benchmark: Optional[str] = "SPY",
+    beta_days: int = 365,
+    beta_scaled_shocks: bool = False,
+    sectors: Optional[Dict[str, str]] = None,
+    feed: Optional[DataFeed] = None,
+    format: str = "text"
+) -> str:
+    """
+    Summarizes portfolio risk: exposures, option Greeks in dollars, concentration and scenario P/L.
+    
+    Positions are fetched once, underlyings and option legs are priced with batched
+    multi-symbol snapshot requests, betas come from daily bars of all underlyings
+    and the benchmark, and every figure is computed for all positions at once.
+    Options are valued with Black-Scholes; IV missing from the feed is solved from
+    the position's price.
+    
+    Args:
+        price_shocks (Optional[List[float]]): Underlying moves in percent (default: [-10, -5, -2, 2, 5, 10])
+        vol_shocks (Optional[List[float]]): Implied volatility shifts in volatility points (default: [-5, 0, 5])
+        beta_benchmark (Optional[str]): Benchmark for betas and beta-weighted delta (default: "SPY"; None to skip)
+        beta_days (int): Calendar days of daily bars used for betas (default: 365)
+        beta_scaled_shocks (bool): Treat price shocks as benchmark moves, moving each underlying
+            by beta * shock (default: False, every underlying moves by the shock)
+        sectors (Optional[Dict[str, str]]): Underlying symbol -> sector for sector concentration
+            (e.g., {"AAPL": "Technology", "XOM": "Energy"}); unmapped underlyings are "Other"
+        feed (Optional[DataFeed]): The stock data feed for underlying prices and bars (optional)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for per-underlying
+            exposure records (plus a TOTAL row) with scenario P/L at unchanged volatility
+    
+    Returns:
+        str: Compact risk summary with exposure by underlying, concentration and a scenario P/L grid
+    """
+    import numpy as np
+    from alpaca.data.requests import OptionSnapshotRequest, StockBarsRequest, StockSnapshotRequest
+    from bar_store import to_array
+    from option_pricing import parse_occ_symbol
+    from portfolio_risk import (aligned_closes, betas, build_legs, concentration, group_sum,
+                                leg_exposures, scenario_pnl)
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        price_shocks = sorted(set(float(s) for s in ([-10, -5, -2, 2, 5, 10] if price_shocks is None else price_shocks)))
+        vol_shocks = sorted(set(float(s) for s in ([-5, 0, 5] if vol_shocks is None else vol_shocks)) | {0.0})
+        if not price_shocks:
+            return "Error: price_shocks must contain at least one move."
+        if price_shocks[0] <= -100:
+            return "Error: price_shocks must be greater than -100 (percent)."
+        if beta_days < 30:
+            return "Error: beta_days must be at least 30."
+        benchmark = beta_benchmark.strip().upper() if beta_benchmark and beta_benchmark.strip() else None
+        
+        started = time.perf_counter()
+        positions, account = await asyncio.gather(
+            _get_all_positions(),
+            sdk_executor.run("trading", trade_client.get_account)
+        )
+        
+        def asset_class(position: Any) -> str:
+            return str(getattr(position.asset_class, "value", position.asset_class))
+        
+        option_symbols = [p.symbol for p in positions if "option" in asset_class(p)]
+        equities = sorted({p.symbol for p in positions if asset_class(p) == "us_equity"}
+                          | {contract.root for contract in map(parse_occ_symbol, option_symbols) if contract})
+        semaphore = asyncio.Semaphore(SNAPSHOT_BATCH_CONCURRENCY)
+        
+        async def fetch_batches(lane: str, fetch: Any, make_request: Any, symbols: List[str],
+                                batch_size: int, unwrap: Any = None) -> Dict[str, Any]:
+            async def fetch_batch(batch: List[str]) -> Dict[str, Any]:
+                async with semaphore:
+                    result = await _shared_call(lane, fetch, make_request(batch))
+                    return unwrap(result) if unwrap else result
+            merged: Dict[str, Any] = {}
+            for result in await asyncio.gather(*[fetch_batch(symbols[i:i + batch_size])
+                                                 for i in range(0, len(symbols), batch_size)]):
+                merged.update(result)
+            return merged
+        
+        async def fetch_daily_bars() -> Dict[str, Any]:
+            symbols = list(dict.fromkeys(equities + [benchmark]))
+            timeframe_obj, start_time, end_time = _resolve_stock_bar_window("1Day", beta_days, None, None, None)
+            if bar_store is not None:
+                # Bars from another feed are stored under their own key
+                arrays = await asyncio.gather(*[_read_bar_store(
+                    "stock_data", stock_historical_data_client.get_stock_bars, StockBarsRequest,
+                    symbol, timeframe_obj, feed.value if feed else "default", start_time, end_time,
+                    request_fields={"feed": feed} if feed else None
+                ) for symbol in symbols])
+                return dict(zip(symbols, arrays))
+            bars = await fetch_batches(
+                "stock_data", stock_historical_data_client.get_stock_bars,
+                lambda batch: StockBarsRequest(symbol_or_symbols=batch, timeframe=timeframe_obj,
+                                               start=start_time, end=end_time, feed=feed),
+                symbols, BARS_BATCH_SIZE, unwrap=lambda response: response.data)
+            return {symbol: to_array(bar_list) for symbol, bar_list in bars.items()}
+        
+        async def nothing() -> Dict[str, Any]:
+            return {}
+        
+        # Betas are optional: a failed bars request leaves them unknown instead of failing the summary
+        stock_snapshots, option_snapshots, daily_bars = await asyncio.gather(
+            fetch_batches("stock_data", stock_historical_data_client.get_stock_snapshot,
+                          lambda batch: StockSnapshotRequest(symbol_or_symbols=batch, feed=feed),
+                          equities, SNAPSHOT_BATCH_SIZE),
+            # The option snapshot endpoint accepts at most 100 symbols per request
+            fetch_batches("option_data", option_historical_data_client.get_option_snapshot,
+                          lambda batch: OptionSnapshotRequest(symbol_or_symbols=batch),
+                          option_symbols, min(SNAPSHOT_BATCH_SIZE, 100)),
+            fetch_daily_bars() if benchmark and positions else nothing(),
+            return_exceptions=True
+        )
+        for result in (stock_snapshots, option_snapshots):
+            if isinstance(result, BaseException):
+                raise result
+        beta_error = str(daily_bars) if isinstance(daily_bars, BaseException) else None
+        if beta_error:
+            daily_bars = {}
+        
+        prices = {}
+        for symbol, snapshot in stock_snapshots.items():
+            trade_price = getattr(getattr(snapshot, "latest_trade", None), "price", None)
+            close = getattr(getattr(snapshot, "daily_bar", None), "close", None)
+            if trade_price or close:
+                prices[symbol] = float(trade_price or close)
+        legs = build_legs(positions, prices, option_snapshots, RISK_FREE_RATE, DIVIDEND_YIELD)
+        exposures = leg_exposures(legs, RISK_FREE_RATE, DIVIDEND_YIELD)
+        
+        underlyings = sorted(set(legs.underlying.tolist()))
+        underlying_beta = np.full(len(underlyings), np.nan)
+        if benchmark and daily_bars:
+            closes, benchmark_closes = aligned_closes(daily_bars, underlyings, benchmark)
+            if len(benchmark_closes) > 1:
+                underlying_beta = betas(closes, benchmark_closes)
+        leg_beta = underlying_beta[np.searchsorted(underlyings, legs.underlying.astype(str))] if len(legs.symbol) \
+            else np.empty(0)
+        # Unknown betas count as 1 in beta-weighted figures
+        beta_delta = exposures["delta_dollars"] * np.where(np.isnan(leg_beta), 1.0, leg_beta)
+        pnl = scenario_pnl(legs, np.array(price_shocks) / 100.0, np.array(vol_shocks) / 100.0,
+                           RISK_FREE_RATE, DIVIDEND_YIELD, betas=leg_beta if beta_scaled_shocks else None)
+        flat_vol = vol_shocks.index(0.0)
+        
+        values = {
+            "market_value": legs.market_value,
+            "delta_dollars": exposures["delta_dollars"],
+            "beta_delta_dollars": beta_delta,
+            "gamma_1pct": exposures["gamma_1pct"],
+            "theta": exposures["theta"],
+            "vega": exposures["vega"],
+        }
+        values.update({f"pnl_{shock:+g}pct": pnl[:, index, flat_vol] for index, shock in enumerate(price_shocks)})
+        names, sums = group_sum(legs.underlying, values)
+        weights, hhi = concentration(sums["delta_dollars"])
+        totals = {name: float(column.sum()) + 0.0 for name, column in sums.items()}
+        elapsed = time.perf_counter() - started
+        
+        if format != "text":
+            columns = list(values)
+            records = [(name, float(beta)) + tuple(float(sums[column][row]) for column in columns) + (float(weights[row]),)
+                       for row, (name, beta) in enumerate(zip(names, underlying_beta.tolist()))]
+            if records:
+                records.append(("TOTAL", np.nan) + tuple(totals[column] for column in columns) + (1.0,))
+            schema = RecordSchema([("underlying", itemgetter(0)), ("beta", itemgetter(1))]
+                                  + [(column, itemgetter(index + 2)) for index, column in enumerate(columns)]
+                                  + [("weight", itemgetter(len(columns) + 2))])
+            return serialize(records, schema, format)
+        
+        if not positions:
+            return "No open positions found."
+        
+        def money(value: float) -> str:
+            value = value + 0.0
+            return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+        
+        equity = float(account.equity or 0)
+        market_value = np.nan_to_num(legs.market_value)
+        long_value = float(market_value[market_value > 0].sum())
+        short_value = float(market_value[market_value < 0].sum())
+        net_delta = totals["delta_dollars"]
+        out = Renderer()
+        out.line(f"Portfolio Risk ({len(positions)} positions, {len(names)} underlyings, {elapsed:.2f}s):")
+        out.line("---------------------------------------------------")
+        out.line(f"Equity: {money(equity)} | Long: {money(long_value)} | Short: {money(short_value)} | "
+                 f"Gross: {money(long_value - short_value)} | Net: {money(long_value + short_value)}")
+        delta_pct = f" ({net_delta / equity * 100:.1f}% of equity)" if equity else ""
+        out.line(f"Net delta: {money(net_delta)}{delta_pct}")
+        if benchmark:
+            known = int(np.isfinite(underlying_beta).sum())
+            out.line(f"Beta-weighted delta ({benchmark}): {money(totals['beta_delta_dollars'])} "
+                     f"(betas for {known}/{len(names)} underlyings from {beta_days} days of daily bars; others use 1.0)")
+            if beta_error:
+                out.line(f"Betas unavailable: {beta_error}")
+        out.line(f"Gamma: {money(totals['gamma_1pct'])} delta per 1% move | Theta: {money(totals['theta'])}/day | "
+                 f"Vega: {money(totals['vega'])} per vol point")
+        out.line()
+        
+        out.line("Exposure by underlying (weight = share of |delta $|):")
+        out.line("Underlying | Market Value | Delta $ | Beta | Beta Delta $ | Gamma $/1% | Theta $/day | Vega $/pt | Weight")
+        for row in np.argsort(-weights, kind="stable").tolist():
+            beta = underlying_beta[row]
+            out.line(" | ".join([
+                names[row], money(sums["market_value"][row]), money(sums["delta_dollars"][row]),
+                f"{beta:.2f}" if beta == beta else "n/a", money(sums["beta_delta_dollars"][row]),
+                money(sums["gamma_1pct"][row]), money(sums["theta"][row]), money(sums["vega"][row]),
+                f"{weights[row] * 100:.1f}%"
+            ]))
+        if names:
+            largest = int(np.argmax(weights))
+            out.line(f"Concentration: HHI {hhi:.3f} (~{1 / hhi:.1f} effective underlyings), "
+                     f"largest {names[largest]} at {weights[largest] * 100:.1f}%" if hhi else
+                     "Concentration: no delta exposure")
+        if sectors:
+            sector_map = {symbol.strip().upper(): sector for symbol, sector in sectors.items()}
+            sector_names, sector_sums = group_sum(
+                np.array([sector_map.get(name, "Other") for name in legs.underlying.tolist()], dtype=object),
+                {"delta_dollars": exposures["delta_dollars"]})
+            sector_weights, sector_hhi = concentration(sector_sums["delta_dollars"])
+            out.line("By sector: " + ", ".join(
+                f"{sector_names[row]} {money(sector_sums['delta_dollars'][row])} ({sector_weights[row] * 100:.1f}%)"
+                for row in np.argsort(-sector_weights, kind="stable").tolist()) + f"; HHI {sector_hhi:.3f}")
+        out.line()
+        
+        move = f"{benchmark} moves, scaled by beta" if beta_scaled_shocks and benchmark else "underlying moves"
+        out.line(f"Scenario P/L ({move}; rows are IV shifts in vol points):")
+        out.line(" | ".join(["IV \\ Move"] + [f"{shock:+g}%" for shock in price_shocks]))
+        grid = pnl.sum(axis=0)
+        for index, shift in enumerate(vol_shocks):
+            out.line(" | ".join([f"{shift:+g}"] + [money(value) for value in grid[:, index].tolist()]))
+        
+        unpriced = legs.symbol[~exposures["priced"]].tolist()
+        if unpriced:
+            out.line()
+            more = f" and {len(unpriced) - 10} more" if len(unpriced) > 10 else ""
+            out.write(f"No usable IV for {len(unpriced)} option legs (intrinsic delta and value used): "
+                      f"{', '.join(unpriced[:10])}{more}")
+        return out.render()
+    except Exception as e:
+        return f"Error computing portfolio risk: {str(e)}"
+
 # ============================================================================
 # Stock Market Data Tools
 # ============================================================================
 
+async def _subscribe_in_background(lane: str, cache: Any, symbols: List[str]) -> None:
+    """Subscribe symbols on a data stream, ignoring failures (REST stays the fallback)."""
+    try:
+        await sdk_executor.run(lane, cache.subscribe, symbols)
+    except Exception:
+        pass
+
+def _subscribe_later(lane: str, cache: Any, symbols: List[str]) -> None:
+    """Start a background subscription without waiting for it."""
+    task = asyncio.ensure_future(_subscribe_in_background(lane, cache, symbols))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def _get_streamed_stock_data(kind: str, symbol: str, feed=None, currency=None):
+    """
+    Look up the latest streamed quote, trade or minute bar for a symbol.
+
+    Args:
+        kind (str): One of 'quote', 'trade' or 'bar'
+        symbol (str): Stock ticker symbol
+        feed: Requested data feed (the stream only serves its own feed)
+        currency: Requested currency (the stream only serves USD)
+
+    Returns:
+        The cached SDK model, or None when the caller should fall back to REST.
+        Symbols that are not yet subscribed are subscribed in the background.
+    """
+    if stock_data_cache is None or not stock_data_cache.serves(feed, currency):
+        return None
+    if stock_data_cache.wants(symbol):
+        _subscribe_later("stock_stream", stock_data_cache, [symbol])
+        return None
+    return getattr(stock_data_cache, f"get_{kind}")(symbol)
+
 @mcp.tool()
-async def get_stock_quote(symbol: str) -> str:
+async def get_stock_quote(symbol: str, format: str = "text") -> str:
     """
     Retrieves and formats the latest quote for a stock.
     
     Args:
         symbol (str): Stock ticker symbol (e.g., AAPL, MSFT)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing:
@@ -352,12 +1457,23 @@ async def get_stock_quote(symbol: str) -> str:
             - Bid Size
             - Timestamp
     """
+    from alpaca.data.requests import StockLatestQuoteRequest
     try:
-        request_params = StockLatestQuoteRequest(symbol_or_symbols=symbol)
-        quotes = stock_historical_data_client.get_stock_latest_quote(request_params)
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
         
-        if symbol in quotes:
-            quote = quotes[symbol]
+        # Serve from the live stream when possible, otherwise fetch over REST
+        quote = await _get_streamed_stock_data("quote", symbol)
+        if quote is None:
+            request_params = StockLatestQuoteRequest(symbol_or_symbols=symbol)
+            quotes = await _shared_call("stock_data", stock_historical_data_client.get_stock_latest_quote, request_params)
+            quote = quotes.get(symbol)
+        
+        if format != "text":
+            return serialize([quote] if quote is not None else [], QUOTE_SCHEMA, format)
+        
+        if quote is not None:
             return f"""
                     Latest Quote for {symbol}:
                     ------------------------
@@ -379,7 +1495,8 @@ async def get_stock_bars(
     timeframe: str = "1Day",
     limit: Optional[int] = None,
     start: Optional[str] = None,
-    end: Optional[str] = None
+    end: Optional[str] = None,
+    format: str = "text"
 ) -> str:
     """
     Retrieves and formats historical price bars for a stock with configurable timeframe and time range.
@@ -397,77 +1514,279 @@ async def get_stock_bars(
         limit (Optional[int]): Maximum number of bars to return (optional)
         start (Optional[str]): Start time in ISO format (e.g., "2023-01-01T09:30:00" or "2023-01-01")
         end (Optional[str]): End time in ISO format (e.g., "2023-01-01T16:00:00" or "2023-01-01")
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing historical price data with timestamps, OHLCV data
     """
+    from alpaca.data.requests import StockBarsRequest
     try:
-        # Parse timeframe string to TimeFrame object
-        timeframe_obj = parse_timeframe_with_enums(timeframe)
-        if timeframe_obj is None:
-            return f"Error: Invalid timeframe '{timeframe}'. Supported formats: 1Min, 2Min, 4Min, 5Min, 15Min, 30Min, 1Hour, 2Hour, 4Hour, 1Day, 1Week, 1Month, etc."
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
         
-        # Parse start/end times or calculate from days
-        start_time = None
-        end_time = None
+        # Parse timeframe and resolve the start/end window
+        try:
+            timeframe_obj, start_time, end_time = _resolve_stock_bar_window(timeframe, days, limit, start, end)
+        except ValueError as e:
+            return f"Error: {str(e)}"
         
-        if start:
-            try:
-                start_time = _parse_iso_datetime(start)
-            except ValueError:
-                return f"Error: Invalid start time format '{start}'. Use ISO format like '2023-01-01T09:30:00' or '2023-01-01'"
-                
-        if end:
-            try:
-                end_time = _parse_iso_datetime(end)
-            except ValueError:
-                return f"Error: Invalid end time format '{end}'. Use ISO format like '2023-01-01T16:00:00' or '2023-01-01'"
+        if bar_store is not None:
+            bar_list = await _get_bars_from_store(
+                "stock_data", stock_historical_data_client.get_stock_bars, StockBarsRequest,
+                symbol, timeframe_obj, "default", start_time, end_time, limit
+            )
+        else:
+            request_params = StockBarsRequest(
+                symbol_or_symbols=symbol,
+                timeframe=timeframe_obj,
+                start=start_time,
+                end=end_time,
+                limit=limit
+            )
+            bars = await _shared_call("stock_data", stock_historical_data_client.get_stock_bars, request_params)
+            bar_list = bars.data.get(symbol, [])
         
-        # If no start/end provided, calculate from days parameter OR limit+timeframe
-        if not start_time:
-            if limit and timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]:
-                # Calculate based on limit and timeframe for intraday data
-                if timeframe_obj.unit_value == TimeFrameUnit.Minute:
-                    minutes_back = limit * timeframe_obj.amount
-                    start_time = datetime.now() - timedelta(minutes=minutes_back)
-                elif timeframe_obj.unit_value == TimeFrameUnit.Hour:
-                    hours_back = limit * timeframe_obj.amount
-                    start_time = datetime.now() - timedelta(hours=hours_back)
-            else:
-                # Fall back to days parameter for daily+ timeframes
-                start_time = datetime.now() - timedelta(days=days)
-        if not end_time:
-            end_time = datetime.now()
+        if format != "text":
+            return serialize(bar_list, BAR_SCHEMA, format)
         
-        request_params = StockBarsRequest(
-            symbol_or_symbols=symbol,
-            timeframe=timeframe_obj,
-            start=start_time,
-            end=end_time,
-            limit=limit
-        )
+        if bar_list:
+            time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
+            out = Renderer()
+            out.line(f"Historical Data for {symbol} ({timeframe} bars, {time_range}):")
+            out.line("---------------------------------------------------")
+            
+            # Intraday bars show full timestamps, daily+ bars show dates
+            intraday = timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]
+            out.rows(bar_row_template(intraday, decimals=2), bar_list)
+            return out.render()
+        else:
+            return f"No historical data found for {symbol} with {timeframe} timeframe in the specified time range."
+    except Exception as e:
+        return f"Error fetching historical data for {symbol}: {str(e)}"
+
+@mcp.tool()
+async def get_stock_bars_batch(
+    symbols: List[str],
+    days: int = 5,
+    timeframe: str = "1Day",
+    limit: Optional[int] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    format: str = "text"
+) -> str:
+    """
+    Retrieves historical price bars for many stocks at once using multi-symbol requests.
+    
+    Symbols are grouped into batches (ALPACA_BARS_BATCH_SIZE per request) and batches
+    are fetched concurrently, so scanning a large watchlist costs a handful of requests
+    instead of one per symbol. With the bar store enabled, bars are read per symbol from
+    the store like get_stock_bars, so only ranges not yet on disk are downloaded.
+    
+    Args:
+        symbols (List[str]): Stock ticker symbols (e.g., ["AAPL", "MSFT", "NVDA"])
+        days (int): Number of days to look back (default: 5, ignored if start/end provided)
+        timeframe (str): Bar timeframe, same formats as get_stock_bars (default: "1Day")
+        limit (Optional[int]): Maximum number of bars to return per symbol (optional)
+        start (Optional[str]): Start time in ISO format (e.g., "2023-01-01T09:30:00" or "2023-01-01")
+        end (Optional[str]): End time in ISO format (e.g., "2023-01-01T16:00:00" or "2023-01-01")
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Formatted OHLCV bars grouped by symbol, listing symbols with no data
+    """
+    from alpaca.data.requests import StockBarsRequest
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
         
-        bars = stock_historical_data_client.get_stock_bars(request_params)
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        if not symbols:
+            return "Error: No symbols provided."
         
-        if bars[symbol]:
-            time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
-            result = f"Historical Data for {symbol} ({timeframe} bars, {time_range}):\n"
-            result += "---------------------------------------------------\n"
+        # Parse timeframe and resolve the start/end window
+        try:
+            timeframe_obj, start_time, end_time = _resolve_stock_bar_window(timeframe, days, limit, start, end)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        
+        semaphore = asyncio.Semaphore(BARS_BATCH_CONCURRENCY)
+        bars_by_symbol: Dict[str, List[Any]] = {}
+        if bar_store is not None:
+            # Same store as get_stock_bars: only ranges not yet on disk are fetched per symbol
+            async def read_stored(symbol: str) -> List[Any]:
+                async with semaphore:
+                    return await _get_bars_from_store(
+                        "stock_data", stock_historical_data_client.get_stock_bars, StockBarsRequest,
+                        symbol, timeframe_obj, "default", start_time, end_time, limit
+                    )
+            batches = []
+            stored = await asyncio.gather(*[read_stored(symbol) for symbol in symbols])
+            bars_by_symbol.update(zip(symbols, stored))
+        else:
+            # The API applies limit to the whole multi-symbol response, so it can only be sent
+            # with single-symbol requests; otherwise limit is enforced per symbol after the
+            # fetch. The SDK follows page tokens for us
+            batches = [symbols[i:i + BARS_BATCH_SIZE] for i in range(0, len(symbols), BARS_BATCH_SIZE)]
             
-            for bar in bars[symbol]:
-                # Format timestamp based on timeframe unit
-                if timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]:
-                    time_str = bar.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    time_str = bar.timestamp.date()
-                
-                result += f"Time: {time_str}, Open: ${bar.open:.2f}, High: ${bar.high:.2f}, Low: ${bar.low:.2f}, Close: ${bar.close:.2f}, Volume: {bar.volume}\n"
+            async def fetch_batch(batch: List[str]) -> Dict[str, List[Any]]:
+                async with semaphore:
+                    request_params = StockBarsRequest(
+                        symbol_or_symbols=batch,
+                        timeframe=timeframe_obj,
+                        start=start_time,
+                        end=end_time,
+                        limit=limit if len(batch) == 1 else None
+                    )
+                    bars = await _shared_call("stock_data", stock_historical_data_client.get_stock_bars, request_params)
+                    return bars.data
             
-            return result
+            for batch_data in await asyncio.gather(*[fetch_batch(batch) for batch in batches]):
+                bars_by_symbol.update(batch_data)
+        
+        if format != "text":
+            records = [bar for symbol in symbols for bar in (bars_by_symbol.get(symbol) or [])[:limit]]
+            return serialize(records, BAR_SCHEMA, format)
+        
+        intraday = timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]
+        time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
+        row_template = bar_row_template(intraday, decimals=2)
+        out = Renderer()
+        source = f"{len(batches)} requests" if batches else "bar store"
+        out.line(f"Historical Data for {len(symbols)} symbols ({timeframe} bars, {time_range}, {source}):")
+        out.line("===================================================")
+        missing = []
+        for symbol in symbols:
+            bar_list = bars_by_symbol.get(symbol) or []
+            if limit is not None:
+                bar_list = bar_list[:limit]
+            if not bar_list:
+                missing.append(symbol)
+                continue
+            out.line(f"{symbol}:")
+            out.line("---------------------------------------------------")
+            out.rows(row_template, bar_list)
+            out.line()
+        if missing:
+            out.write(f"No data found for: {', '.join(missing)}")
+        return out.render()
+    except Exception as e:
+        return f"Error fetching batched historical data: {str(e)}"
+
+@mcp.tool()
+async def compute_indicators(
+    symbol: str,
+    indicators: Optional[List[str]] = None,
+    timeframe: str = "1Day",
+    days: int = 365,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    tail: int = 1,
+    format: str = "text"
+) -> str:
+    """
+    Computes technical indicators for a stock over its historical bars.
+    
+    Bars are loaded once (from the bar store when enabled) and every indicator is
+    computed in one vectorized pass, so only the latest values (or a short tail)
+    are returned instead of the full bar history.
+    
+    Args:
+        symbol (str): Stock ticker symbol (e.g., AAPL, MSFT)
+        indicators (Optional[List[str]]): Indicators as name or name:period, with name one of
+            "sma", "ema", "rsi", "atr" or "vwap" (e.g., ["sma:50", "ema:20", "rsi:14", "atr", "vwap"]).
+            Defaults to ["sma:20", "ema:20", "rsi:14"]. VWAP restarts every session for
+            minute/hour bars and is anchored at the first bar otherwise.
+        timeframe (str): Bar timeframe, same formats as get_stock_bars (default: "1Day")
+        days (int): Number of days of history to load (default: 365, ignored if start/end provided);
+            indicators need at least period bars before they have a value
+        start (Optional[str]): Start time in ISO format (e.g., "2023-01-01T09:30:00" or "2023-01-01")
+        end (Optional[str]): End time in ISO format (e.g., "2023-01-01T16:00:00" or "2023-01-01")
+        tail (int): Number of most recent bars to return values for (default: 1)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Latest indicator values, or a table of the last tail bars with close and indicator values
+    """
+    from alpaca.data.requests import StockBarsRequest
+    from bar_store import from_ns, to_array
+    from indicators import compute, parse_indicator_specs
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if tail < 1:
+            return "Error: tail must be at least 1."
+        try:
+            specs = parse_indicator_specs(indicators or ["sma:20", "ema:20", "rsi:14"])
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        if not specs:
+            return "Error: No indicators requested."
+        
+        # Parse timeframe and resolve the start/end window
+        try:
+            timeframe_obj, start_time, end_time = _resolve_stock_bar_window(timeframe, days, None, start, end)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        
+        if bar_store is not None:
+            bars = await _read_bar_store(
+                "stock_data", stock_historical_data_client.get_stock_bars, StockBarsRequest,
+                symbol, timeframe_obj, "default", start_time, end_time
+            )
         else:
+            request_params = StockBarsRequest(
+                symbol_or_symbols=symbol,
+                timeframe=timeframe_obj,
+                start=start_time,
+                end=end_time
+            )
+            response = await _shared_call("stock_data", stock_historical_data_client.get_stock_bars, request_params)
+            bars = to_array(response.data.get(symbol, []))
+        
+        if not len(bars):
             return f"No historical data found for {symbol} with {timeframe} timeframe in the specified time range."
+        
+        intraday = timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]
+        values = await asyncio.to_thread(compute, bars, specs, intraday)
+        
+        # Only the tail leaves NumPy; tolist() yields plain floats for the formatters
+        labels = [spec.label for spec in specs]
+        last = bars[-tail:]
+        times = [from_ns(ts) for ts in last["timestamp"].tolist()]
+        closes = last["close"].tolist()
+        columns = [values[label][-tail:].tolist() for label in labels]
+        rows = list(zip(times, closes, *columns))
+        
+        if format != "text":
+            schema = RecordSchema(
+                [("symbol", lambda row: symbol), ("timestamp", itemgetter(0)), ("close", itemgetter(1))]
+                + [(label, itemgetter(index + 2)) for index, label in enumerate(labels)]
+            )
+            return serialize(rows, schema, format)
+        
+        time_format = "%Y-%m-%d %H:%M" if intraday else "%Y-%m-%d"
+        first_time = from_ns(int(bars["timestamp"][0])).strftime(time_format)
+        out = Renderer()
+        out.line(f"Indicators for {symbol} ({timeframe} bars, {len(bars)} bars from {first_time} to {times[-1].strftime(time_format)}):")
+        out.line("---------------------------------------------------")
+        if tail == 1:
+            out.line(f"As of {times[-1].strftime(time_format)}: close ${closes[-1]:.2f}")
+            for label, column in zip(labels, columns):
+                value = column[-1]
+                out.line(f"{label}: {value:.2f}" if value == value else f"{label}: n/a (not enough bars)")
+            return out.render()
+        
+        out.line(" | ".join(["Time", "Close"] + labels))
+        for row in rows:
+            cells = [row[0].strftime(time_format), f"{row[1]:.2f}"]
+            cells.extend(f"{value:.2f}" if value == value else "n/a" for value in row[2:])
+            out.line(" | ".join(cells))
+        return out.render()
     except Exception as e:
-        return f"Error fetching historical data for {symbol}: {str(e)}"
+        return f"Error computing indicators for {symbol}: {str(e)}"
 
 @mcp.tool()
 async def get_stock_trades(
@@ -477,67 +1796,287 @@ async def get_stock_trades(
     sort: Optional[Sort] = Sort.ASC,
     feed: Optional[DataFeed] = None,
     currency: Optional[SupportedCurrencies] = None,
-    asof: Optional[str] = None
+    asof: Optional[str] = None,
+    max_rows: Optional[int] = None,
+    stream_chunks: bool = False,
+    format: str = "text",
+    ctx: Context = None
 ) -> str:
     """
     Retrieves and formats historical trades for a stock.
     
+    The window is paged lazily. At most max_rows trades are returned (the first and
+    last half); longer histories also get open/high/low/close, volume and VWAP over
+    every trade in the window.
+    
     Args:
         symbol (str): Stock ticker symbol (e.g., 'AAPL', 'MSFT')
         days (int): Number of days to look back (default: 5)
-        limit (Optional[int]): Upper limit of number of data points to return
+        limit (Optional[int]): Upper limit of number of data points to read
         sort (Optional[Sort]): Chronological order of response (ASC or DESC)
         feed (Optional[DataFeed]): The stock data feed to retrieve from
         currency (Optional[SupportedCurrencies]): Currency for prices (default: USD)
         asof (Optional[str]): The asof date in YYYY-MM-DD format
+        max_rows (Optional[int]): Maximum trades to return (default: ALPACA_HISTORY_MAX_ROWS)
+        stream_chunks (bool): Also send every page of trades, in the requested format, as a
+            progress notification (needs a client that passes a progress token)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing trade history or an error message
     """
+    from alpaca.data.requests import StockTradesRequest
+    from alpaca.data.models import Trade
+    from history_stream import TradeStats
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if max_rows is not None and max_rows < 2:
+            return "Error: max_rows must be at least 2."
+        
         # Calculate start time based on days
         start_time = datetime.now() - timedelta(days=days)
         
-        # Create the request object with all available parameters
+        # Create the request object with all available parameters
+        request_params = StockTradesRequest(
+            symbol_or_symbols=symbol,
+            start=start_time,
+            end=datetime.now(),
+            limit=limit,
+            sort=sort,
+            feed=feed,
+            currency=currency,
+            asof=asof
+        )
+        
+        def render(trades: List[Any]) -> str:
+            if format != "text":
+                return serialize(trades, TRADE_SCHEMA, format)
+            out = Renderer()
+            out.rows(STOCK_TRADE_ROW, trades)
+            return out.render()
+        
+        # Pages are folded into a bounded digest as they arrive
+        send_chunk = _history_chunk_sender(ctx, Trade, render, limit) if stream_chunks else None
+        digest = await _read_history("stock_data", stock_historical_data_client, "/stocks/trades",
+                                     request_params, "trades", TradeStats, max_rows or HISTORY_MAX_ROWS,
+                                     on_page=send_chunk)
+        rows = digest.rows.get(symbol)
+        trades = [Trade(symbol, raw) for raw in rows.records()] if rows else []
+        
+        if format != "text":
+            return serialize(trades, TRADE_SCHEMA, format)
+        
+        if trades:
+            out = Renderer()
+            out.line(f"Historical Trades for {symbol} (Last {days} days):")
+            out.line("---------------------------------------------------")
+            head = len(rows.head)
+            out.rows(STOCK_TRADE_ROW, trades[:head])
+            if rows.omitted:
+                out.line(f"... {rows.omitted:,} trades omitted ...")
+            out.rows(STOCK_TRADE_ROW, trades[head:])
+            for line in _history_summary("trades", symbol, digest, sort == Sort.DESC):
+                out.line(line)
+            return out.render()
+        else:
+            return f"No trade data found for {symbol} in the last {days} days."
+    except Exception as e:
+        return f"Error fetching trades: {str(e)}"
+
+def _utc_datetimes(nanoseconds: "np.ndarray") -> List[datetime]:
+    """UTC datetimes (microsecond precision) from int64 nanoseconds since the epoch."""
+    from datetime import timezone
+    return [value.replace(tzinfo=timezone.utc)
+            for value in nanoseconds.astype("datetime64[ns]").astype("datetime64[us]").tolist()]
+
+@mcp.tool()
+async def aggregate_stock_trades(
+    symbol: str,
+    bar_type: str = "time",
+    bar_size: str = "5Min",
+    days: int = 1,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    feed: Optional[DataFeed] = None,
+    limit: Optional[int] = None,
+    price_step: Optional[float] = None,
+    max_levels: int = 50,
+    value_area_pct: float = 70,
+    max_bars: Optional[int] = None,
+    format: str = "text"
+) -> str:
+    """
+    Aggregates a stock's raw trades server-side into custom bars or a volume profile.
+    
+    Trades are read page by page and folded into the aggregate as they arrive; only the
+    bars or price levels are returned, so the response size does not depend on how many
+    trades the window holds.
+    
+    Args:
+        symbol (str): Stock ticker symbol (e.g., 'AAPL')
+        bar_type (str): "time", "tick", "volume", "dollar" or "profile" (volume at price)
+        bar_size (str): Bar size for the bar type - an interval like "30Sec", "5Min" or "1Hour" (time),
+            trades per bar (tick), shares per bar (volume) or traded value per bar (dollar); ignored for profile
+        days (int): Number of days to look back when start is not given (default: 1)
+        start (Optional[str]): Start time in ISO format (e.g., "2024-01-02T09:30:00" or "2024-01-02")
+        end (Optional[str]): End time in ISO format (default: now)
+        feed (Optional[DataFeed]): The stock data feed to retrieve from
+        limit (Optional[int]): Maximum number of trades to read
+        price_step (Optional[float]): Price level size for profile (default: about 0.1% of the price)
+        max_levels (int): Profile levels returned; adjacent levels are merged to fit (default: 50)
+        value_area_pct (float): Share of volume in the profile's value area (default: 70)
+        max_bars (Optional[int]): Most recent bars returned (default: ALPACA_HISTORY_MAX_ROWS)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: OHLC/volume/VWAP per bar, or volume per price level with the point of control and value area
+    """
+    import math
+    import numpy as np
+    from alpaca.data.requests import StockTradesRequest
+    from history_stream import TradeStats
+    from trade_aggregation import (BAR_TYPES, BarAccumulator, VolumeProfile, parse_interval, trade_arrays,
+                                   value_area)
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        bar_type = bar_type.strip().lower()
+        if bar_type != "profile" and bar_type not in BAR_TYPES:
+            return f"Error: Invalid bar_type: {bar_type}. Must be one of: {', '.join(BAR_TYPES + ('profile',))}."
+        if max_levels < 1:
+            return "Error: max_levels must be at least 1."
+        if not 0 < value_area_pct <= 100:
+            return "Error: value_area_pct must be between 0 and 100."
+        if max_bars is not None and max_bars < 1:
+            return "Error: max_bars must be at least 1."
+        
+        if bar_type == "profile":
+            try:
+                aggregator = VolumeProfile(price_step)
+            except ValueError as e:
+                return f"Error: {str(e)}"
+            label = "volume profile"
+        else:
+            try:
+                size = parse_interval(bar_size) if bar_type == "time" else float(bar_size)
+                aggregator = BarAccumulator(bar_type, size)
+            except ValueError as e:
+                return f"Error: {str(e)}"
+            label = f"{bar_size} {bar_type} bars"
+        
+        try:
+            start_time = _parse_iso_datetime(start) if start else datetime.now() - timedelta(days=days)
+            end_time = _parse_iso_datetime(end) if end else datetime.now()
+        except ValueError:
+            return "Error: Invalid start/end format. Use ISO format like '2024-01-02T09:30:00' or '2024-01-02'"
+        
+        # Bars need trades in time order
         request_params = StockTradesRequest(
             symbol_or_symbols=symbol,
             start=start_time,
-            end=datetime.now(),
+            end=end_time,
             limit=limit,
-            sort=sort,
-            feed=feed,
-            currency=currency,
-            asof=asof
+            sort=Sort.ASC,
+            feed=feed
         )
         
-        # Get the trades
-        trades = stock_historical_data_client.get_stock_trades(request_params)
+        stats = TradeStats()
+        
+        async def consume(page: Dict[str, List[Dict[str, Any]]]) -> None:
+            records = page.get(symbol)
+            if not records:
+                return
+            stats.add(records)
+            stamps, price, size = trade_arrays(records)
+            if bar_type == "profile":
+                aggregator.add(price, size)
+            else:
+                aggregator.add(stamps, price, size)
+        
+        started = time.perf_counter()
+        pages = await _read_pages("stock_data", stock_historical_data_client, "/stocks/trades",
+                                  request_params, "trades", consume)
+        elapsed = time.perf_counter() - started
+        summary = stats.summary()
         
-        if symbol in trades:
-            result = f"Historical Trades for {symbol} (Last {days} days):\n"
-            result += "---------------------------------------------------\n"
+        if bar_type == "profile":
+            multiple = aggregator.step_multiple_for(max_levels) if aggregator.trades else 1
+            prices, volume, counts = aggregator.levels(multiple)
+            step = (aggregator.step or 0.0) * multiple
+            decimals = max(2, -int(math.floor(math.log10(step)))) if step else 2
+            prices = np.round(prices, decimals)
+            total = float(volume.sum())
+            if len(prices):
+                poc, area_low, area_high = value_area(prices, volume, value_area_pct / 100.0)
+            in_area = (prices >= area_low) & (prices <= area_high) if len(prices) else np.empty(0, dtype=bool)
             
-            for trade in trades[symbol]:
-                result += f"""
-                    Time: {trade.timestamp}
-                    Price: ${float(trade.price):.6f}
-                    Size: {trade.size}
-                    Exchange: {trade.exchange}
-                    ID: {trade.id}
-                    Conditions: {trade.conditions}
-                    -------------------
-                    """
-            return result
-        else:
-            return f"No trade data found for {symbol} in the last {days} days."
+            if format != "text":
+                records = list(zip(prices.tolist(), volume.tolist(), (volume / total if total else volume).tolist(),
+                                   counts.tolist(), in_area.tolist()))
+                schema = RecordSchema([("price", itemgetter(0)), ("volume", itemgetter(1)), ("share", itemgetter(2)),
+                                       ("trades", itemgetter(3)), ("value_area", itemgetter(4))])
+                return serialize(records, schema, format)
+            
+            if not len(prices):
+                return f"No trade data found for {symbol} in the specified time range."
+            out = Renderer()
+            out.line(f"Volume Profile for {symbol} ({summary['start']} to {summary['end']}):")
+            out.line(f"Trades: {aggregator.trades:,} ({pages} pages, {elapsed:.2f}s), Volume: {total:,.0f}, "
+                     f"VWAP: ${aggregator.vwap:.4f}")
+            out.line(f"Point of Control: ${poc:.{decimals}f}, Value Area ({value_area_pct:g}%): "
+                     f"${area_low:.{decimals}f} - ${area_high:.{decimals}f}, Level Size: ${step:.{decimals}f}")
+            out.line("---------------------------------------------------")
+            out.line("Price | Volume | Share | Trades")
+            for price, level_volume, count, inside in zip(prices.tolist()[::-1], volume.tolist()[::-1],
+                                                          counts.tolist()[::-1], in_area.tolist()[::-1]):
+                marker = " *" if price == poc else (" +" if inside else "")
+                out.line(f"{price:.{decimals}f} | {level_volume:,.0f} | {level_volume / total * 100:.1f}% | "
+                         f"{count:,}{marker}")
+            out.write("* point of control, + value area")
+            return out.render()
+        
+        bars = aggregator.bars()
+        shown = bars[-(max_bars or HISTORY_MAX_ROWS):]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = shown["notional"] / shown["volume"]
+        bar_starts = _utc_datetimes(aggregator.bucket_start(shown))
+        bar_ends = _utc_datetimes(shown["end"])
+        
+        if format != "text":
+            records = list(zip(bar_starts, bar_ends, shown["open"].tolist(), shown["high"].tolist(),
+                               shown["low"].tolist(), shown["close"].tolist(), shown["volume"].tolist(),
+                               vwap.tolist(), shown["trades"].tolist()))
+            schema = RecordSchema([(name, itemgetter(index)) for index, name in enumerate(
+                ("start", "last_trade", "open", "high", "low", "close", "volume", "vwap", "trades"))])
+            return serialize(records, schema, format)
+        
+        if not len(bars):
+            return f"No trade data found for {symbol} in the specified time range."
+        out = Renderer()
+        out.line(f"Trade Bars for {symbol} ({label}, {summary['start']} to {summary['end']}):")
+        out.line(f"Trades: {aggregator.trades:,} ({pages} pages, {elapsed:.2f}s), Volume: {summary['volume']:,.0f}, "
+                 f"VWAP: ${summary['vwap']:.4f}, Bars: {len(bars):,}"
+                 + (f" (showing the last {len(shown):,})" if len(shown) < len(bars) else ""))
+        out.line("---------------------------------------------------")
+        out.line("Start | Open | High | Low | Close | Volume | VWAP | Trades")
+        for row, (bar_start, bar_vwap) in enumerate(zip(bar_starts, vwap.tolist())):
+            bar = shown[row]
+            out.line(f"{bar_start:%Y-%m-%d %H:%M:%S.%f}"[:-3] + f" | {bar['open']:.4f} | {bar['high']:.4f} | "
+                     f"{bar['low']:.4f} | {bar['close']:.4f} | {bar['volume']:,.0f} | {bar_vwap:.4f} | "
+                     f"{bar['trades']:,}")
+        return out.render()
     except Exception as e:
-        return f"Error fetching trades: {str(e)}"
+        return f"Error aggregating trades: {str(e)}"
 
 @mcp.tool()
 async def get_stock_latest_trade(
     symbol: str,
     feed: Optional[DataFeed] = None,
-    currency: Optional[SupportedCurrencies] = None
+    currency: Optional[SupportedCurrencies] = None,
+    format: str = "text"
 ) -> str:
     """Get the latest trade for a stock.
     
@@ -545,23 +2084,35 @@ async def get_stock_latest_trade(
         symbol: Stock ticker symbol (e.g., 'AAPL', 'MSFT')
         feed: The stock data feed to retrieve from (optional)
         currency: The currency for prices (optional, defaults to USD)
+        format: Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         A formatted string containing the latest trade details or an error message
     """
+    from alpaca.data.requests import StockLatestTradeRequest
     try:
-        # Create the request object with all available parameters
-        request_params = StockLatestTradeRequest(
-            symbol_or_symbols=symbol,
-            feed=feed,
-            currency=currency
-        )
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
+        # Serve from the live stream when possible, otherwise fetch over REST
+        trade = await _get_streamed_stock_data("trade", symbol, feed, currency)
+        if trade is None:
+            # Create the request object with all available parameters
+            request_params = StockLatestTradeRequest(
+                symbol_or_symbols=symbol,
+                feed=feed,
+                currency=currency
+            )
+            
+            # Get the latest trade
+            latest_trades = await _shared_call("stock_data", stock_historical_data_client.get_stock_latest_trade, request_params)
+            trade = latest_trades.get(symbol)
         
-        # Get the latest trade
-        latest_trades = stock_historical_data_client.get_stock_latest_trade(request_params)
+        if format != "text":
+            return serialize([trade] if trade is not None else [], TRADE_SCHEMA, format)
         
-        if symbol in latest_trades:
-            trade = latest_trades[symbol]
+        if trade is not None:
             return f"""
                 Latest Trade for {symbol}:
                 ---------------------------
@@ -581,7 +2132,8 @@ async def get_stock_latest_trade(
 async def get_stock_latest_bar(
     symbol: str,
     feed: Optional[DataFeed] = None,
-    currency: Optional[SupportedCurrencies] = None
+    currency: Optional[SupportedCurrencies] = None,
+    format: str = "text"
 ) -> str:
     """Get the latest minute bar for a stock.
     
@@ -589,23 +2141,35 @@ async def get_stock_latest_bar(
         symbol: Stock ticker symbol (e.g., 'AAPL', 'MSFT')
         feed: The stock data feed to retrieve from (optional)
         currency: The currency for prices (optional, defaults to USD)
+        format: Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         A formatted string containing the latest bar details or an error message
     """
+    from alpaca.data.requests import StockLatestBarRequest
     try:
-        # Create the request object with all available parameters
-        request_params = StockLatestBarRequest(
-            symbol_or_symbols=symbol,
-            feed=feed,
-            currency=currency
-        )
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
+        # Serve from the live stream when possible, otherwise fetch over REST
+        bar = await _get_streamed_stock_data("bar", symbol, feed, currency)
+        if bar is None:
+            # Create the request object with all available parameters
+            request_params = StockLatestBarRequest(
+                symbol_or_symbols=symbol,
+                feed=feed,
+                currency=currency
+            )
+            
+            # Get the latest bar
+            latest_bars = await _shared_call("stock_data", stock_historical_data_client.get_stock_latest_bar, request_params)
+            bar = latest_bars.get(symbol)
         
-        # Get the latest bar
-        latest_bars = stock_historical_data_client.get_stock_latest_bar(request_params)
+        if format != "text":
+            return serialize([bar] if bar is not None else [], BAR_SCHEMA, format)
         
-        if symbol in latest_bars:
-            bar = latest_bars[symbol]
+        if bar is not None:
             return f"""
                 Latest Minute Bar for {symbol}:
                 ---------------------------
@@ -625,7 +2189,7 @@ async def get_stock_latest_bar(
 # Stock Market Data Tools - Stock Snapshot Data with Helper Functions
 # ============================================================================
 
-def _format_ohlcv_bar(bar, bar_type: str, include_time: bool = True) -> str:
+def _format_ohlcv_bar(bar, bar_type: str, include_time: bool = True, decimals: int = 2) -> str:
     """Helper function to format OHLCV bar data consistently."""
     if not bar:
         return ""
@@ -634,23 +2198,23 @@ def _format_ohlcv_bar(bar, bar_type: str, include_time: bool = True) -> str:
     time_label = "Timestamp" if include_time else "Date"
     
     return f"""{bar_type}:
-  Open: ${bar.open:.2f}, High: ${bar.high:.2f}, Low: ${bar.low:.2f}, Close: ${bar.close:.2f}
+  Open: ${bar.open:.{decimals}f}, High: ${bar.high:.{decimals}f}, Low: ${bar.low:.{decimals}f}, Close: ${bar.close:.{decimals}f}
   Volume: {bar.volume:,}, {time_label}: {bar.timestamp.strftime(time_format)}
 
 """
 
-def _format_quote_data(quote) -> str:
+def _format_quote_data(quote, decimals: int = 2) -> str:
     """Helper function to format quote data consistently."""
     if not quote:
         return ""
     
     return f"""Latest Quote:
-  Bid: ${quote.bid_price:.2f} x {quote.bid_size}, Ask: ${quote.ask_price:.2f} x {quote.ask_size}
+  Bid: ${quote.bid_price:.{decimals}f} x {quote.bid_size}, Ask: ${quote.ask_price:.{decimals}f} x {quote.ask_size}
   Timestamp: {quote.timestamp.strftime('%Y-%m-%d %H:%M:%S %Z')}
 
 """
 
-def _format_trade_data(trade) -> str:
+def _format_trade_data(trade, decimals: int = 2) -> str:
     """Helper function to format trade data consistently."""
     if not trade:
         return ""
@@ -666,7 +2230,7 @@ def _format_trade_data(trade) -> str:
     optional_str = f", {', '.join(optional_fields)}" if optional_fields else ""
     
     return f"""Latest Trade:
-  Price: ${trade.price:.2f}, Size: {trade.size}{optional_str}
+  Price: ${trade.price:.{decimals}f}, Size: {trade.size}{optional_str}
   Timestamp: {trade.timestamp.strftime('%Y-%m-%d %H:%M:%S %Z')}
 
 """
@@ -675,7 +2239,8 @@ def _format_trade_data(trade) -> str:
 async def get_stock_snapshot(
     symbol_or_symbols: Union[str, List[str]], 
     feed: Optional[DataFeed] = None,
-    currency: Optional[SupportedCurrencies] = None
+    currency: Optional[SupportedCurrencies] = None,
+    format: str = "text"
 ) -> str:
     """
     Retrieves comprehensive snapshots of stock symbols including latest trade, quote, minute bar, daily bar, and previous daily bar.
@@ -684,6 +2249,7 @@ async def get_stock_snapshot(
         symbol_or_symbols: Single stock symbol or list of stock symbols (e.g., 'AAPL' or ['AAPL', 'MSFT'])
         feed: The stock data feed to retrieve from (optional)
         currency: The currency the data should be returned in (default: USD)
+        format: Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         Formatted string with comprehensive snapshots including:
@@ -693,10 +2259,20 @@ async def get_stock_snapshot(
         - daily_bar: Current day's OHLCV bar  
         - previous_daily_bar: Previous trading day's OHLCV bar
     """
+    from alpaca.data.requests import StockSnapshotRequest
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
         # Create and execute request
         request = StockSnapshotRequest(symbol_or_symbols=symbol_or_symbols, feed=feed, currency=currency)
-        snapshots = stock_historical_data_client.get_stock_snapshot(request)
+        snapshots = await _shared_call("stock_data", stock_historical_data_client.get_stock_snapshot, request)
+        
+        if format != "text":
+            symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
+            records = [snapshots[symbol] for symbol in symbols if snapshots.get(symbol)]
+            return serialize(records, STOCK_SNAPSHOT_SCHEMA, format)
         
         # Format response
         symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
@@ -748,6 +2324,154 @@ async def get_stock_snapshot(
     except Exception as e:
         return f"Error retrieving stock snapshots: {str(e)}"
 
+@mcp.tool()
+async def scan_stocks(
+    conditions: List[str],
+    symbols: Optional[List[str]] = None,
+    watchlist_id: Optional[str] = None,
+    exchange: Optional[str] = None,
+    symbol_prefix: Optional[str] = None,
+    attributes: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    ascending: bool = False,
+    top: int = 25,
+    feed: Optional[DataFeed] = None,
+    format: str = "text"
+) -> str:
+    """
+    Screens a universe of stocks with numeric conditions over their latest snapshots and ranks the matches.
+    
+    The universe is an explicit symbol list, a watchlist, or (when neither is given) the
+    active tradable US equities; any of them can be narrowed by exchange, symbol prefix
+    and attributes. Snapshots are fetched in batched multi-symbol requests
+    (ALPACA_SNAPSHOT_BATCH_SIZE per request) and conditions are evaluated for all
+    symbols at once, so thousands of symbols take a few seconds.
+    
+    Args:
+        conditions (List[str]): Conditions that must all hold, as "<metric> <op> <number>" with op one of
+            >, >=, <, <=, ==, != (e.g., ["gap_pct > 2", "volume_ratio >= 1.5", "spread_bps < 20"]).
+            Metrics: price, bid, ask, spread_bps, open, high, low, prev_close, gap_pct, change_pct,
+            intraday_pct, range_pct, volume, prev_volume, volume_ratio, minute_volume,
+            dollar_volume, vwap, vwap_dist_pct. Pass [] to rank the whole universe.
+        symbols (Optional[List[str]]): Explicit universe (e.g., ["AAPL", "MSFT", "NVDA"])
+        watchlist_id (Optional[str]): Scan the symbols of this watchlist
+        exchange (Optional[str]): Asset universe filter, e.g. "NASDAQ" or "NYSE" (also narrows symbols/watchlist_id)
+        symbol_prefix (Optional[str]): Asset universe filter on the symbol prefix (e.g., "A")
+        attributes (Optional[str]): Asset universe filter; comma-separated attributes, any of which match (e.g., "has_options")
+        sort_by (Optional[str]): Metric to rank by (default: the first condition's metric, else change_pct)
+        ascending (bool): Rank smallest values first (default: False, largest first)
+        top (int): Number of ranked matches to return (default: 25)
+        feed (Optional[DataFeed]): The stock data feed to retrieve from (optional)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Ranked matches with the metrics used in the conditions and ranking
+    """
+    from alpaca.data.requests import StockSnapshotRequest
+    from scanner import check_metric, parse_conditions, scan, snapshot_table
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if top < 1:
+            return "Error: top must be at least 1."
+        if symbols and watchlist_id:
+            return "Error: Provide either symbols or watchlist_id, not both."
+        try:
+            parsed = parse_conditions(conditions)
+            if sort_by:
+                sort_by = sort_by.strip().lower()
+                check_metric(sort_by)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+        
+        started = time.perf_counter()
+        asset_filters = "".join(
+            f", {label} {value}" for label, value in
+            (("exchange", exchange), ("prefix", symbol_prefix), ("attributes", attributes)) if value)
+        
+        async def filtered_rows(**constraints: Any) -> Tuple[Any, List[int]]:
+            from alpaca.trading.requests import GetAssetsRequest
+            index = await _cached_trading_call("assets", "us_equity", _fetch_asset_index,
+                                               GetAssetsRequest(asset_class="us_equity"))
+            return index, index.query(
+                symbol_prefix=symbol_prefix,
+                attributes=[a.strip() for a in attributes.split(",") if a.strip()] if attributes else None,
+                exchange=exchange,
+                **constraints
+            )
+        
+        if symbols or watchlist_id:
+            if symbols:
+                universe = "symbol list"
+            else:
+                watchlist = await _shared_call("trading", trade_client.get_watchlist_by_id, watchlist_id)
+                symbols = [asset.symbol for asset in (watchlist.assets or [])]
+                universe = f"watchlist {watchlist.name}"
+            if asset_filters:
+                # The asset filters narrow an explicit universe too
+                index, rows = await filtered_rows()
+                allowed = {index.assets[row].symbol for row in rows}
+                symbols = [s for s in symbols if s and s.strip().upper() in allowed]
+                universe += asset_filters
+        else:
+            index, rows = await filtered_rows(status="active", tradable=True)
+            symbols = [index.assets[row].symbol for row in rows]
+            universe = "active US equities" + asset_filters
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        if not symbols:
+            return f"Error: The universe ({universe}) has no symbols."
+        
+        batches = [symbols[i:i + SNAPSHOT_BATCH_SIZE] for i in range(0, len(symbols), SNAPSHOT_BATCH_SIZE)]
+        semaphore = asyncio.Semaphore(SNAPSHOT_BATCH_CONCURRENCY)
+        
+        async def fetch_batch(batch: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                request = StockSnapshotRequest(symbol_or_symbols=batch, feed=feed)
+                return await _shared_call("stock_data", stock_historical_data_client.get_stock_snapshot, request)
+        
+        snapshots: Dict[str, Any] = {}
+        for batch_snapshots in await asyncio.gather(*[fetch_batch(batch) for batch in batches]):
+            snapshots.update(batch_snapshots)
+        found = [symbol for symbol in symbols if snapshots.get(symbol) is not None]
+        table = snapshot_table([snapshots[symbol] for symbol in found])
+        ranked, matched = scan(table, parsed, sort_by, ascending, top)
+        elapsed = time.perf_counter() - started
+        
+        # Columns: price, then the metrics the conditions and ranking refer to
+        sort_metric = sort_by or (parsed[0].metric if parsed else "change_pct")
+        metrics = list(dict.fromkeys(["price", sort_metric] + [c.metric for c in parsed]))
+        records = list(zip([found[row] for row in ranked.tolist()],
+                           *[table[metric][ranked].tolist() for metric in metrics]))
+        
+        if format != "text":
+            schema = RecordSchema([("symbol", itemgetter(0))]
+                                  + [(metric, itemgetter(index + 1)) for index, metric in enumerate(metrics)])
+            return serialize(records, schema, format)
+        
+        out = Renderer()
+        out.line(f"Scan of {len(symbols)} symbols ({universe}, {len(batches)} requests, {elapsed:.2f}s):")
+        out.line(f"Conditions: {', '.join(str(c) for c in parsed) or 'none'}")
+        out.line(f"Ranked by {sort_metric} ({'ascending' if ascending else 'descending'}); "
+                 f"{matched} matched, showing {len(records)}")
+        out.line("---------------------------------------------------")
+        if records:
+            out.line(" | ".join(["#", "Symbol"] + metrics))
+            for rank, record in enumerate(records, 1):
+                cells = [str(rank), record[0]]
+                cells.extend(f"{value:,.2f}" if value == value else "n/a" for value in record[1:])
+                out.line(" | ".join(cells))
+        else:
+            out.line("No symbols matched the conditions.")
+        missing = [symbol for symbol in symbols if snapshots.get(symbol) is None]
+        if missing:
+            out.line()
+            more = f" and {len(missing) - 20} more" if len(missing) > 20 else ""
+            out.write(f"No snapshot data for: {', '.join(missing[:20])}{more}")
+        return out.render()
+    except Exception as e:
+        return f"Error scanning stocks: {str(e)}"
+
 # ============================================================================
 # CryptoMarket Data Tools
 # ============================================================================
@@ -760,7 +2484,8 @@ async def get_crypto_bars(
     limit: Optional[int] = None,
     start: Optional[str] = None,
     end: Optional[str] = None,
-    feed: CryptoFeed = CryptoFeed.US
+    feed: CryptoFeed = CryptoFeed.US,
+    format: str = "text"
 ) -> str:
     """
     Retrieves and formats historical price bars for a cryptocurrency with configurable timeframe and time range.
@@ -779,11 +2504,17 @@ async def get_crypto_bars(
         start (Optional[str]): Start time in ISO format (e.g., "2023-01-01T09:30:00" or "2023-01-01")
         end (Optional[str]): End time in ISO format (e.g., "2023-01-01T16:00:00" or "2023-01-01")
         feed (CryptoFeed): The crypto data feed to retrieve from (default: US)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing historical crypto price data with timestamps, OHLCV data
     """
+    from alpaca.data.requests import CryptoBarsRequest
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
         # Parse timeframe string to TimeFrame object
         timeframe_obj = parse_timeframe_with_enums(timeframe)
         if timeframe_obj is None:
@@ -829,31 +2560,36 @@ async def get_crypto_bars(
         if not end_time:
             end_time = datetime.now()
         
-        request_params = CryptoBarsRequest(
-            symbol_or_symbols=symbol,
-            timeframe=timeframe_obj,
-            start=start_time,
-            end=end_time,
-            limit=limit
-        )
+        if bar_store is not None and isinstance(symbol, str):
+            bar_list = await _get_bars_from_store(
+                "crypto_data", crypto_historical_data_client.get_crypto_bars, CryptoBarsRequest,
+                symbol, timeframe_obj, feed.value, start_time, end_time, limit, feed=feed
+            )
+        else:
+            request_params = CryptoBarsRequest(
+                symbol_or_symbols=symbol,
+                timeframe=timeframe_obj,
+                start=start_time,
+                end=end_time,
+                limit=limit
+            )
+            bars = await _shared_call("crypto_data", crypto_historical_data_client.get_crypto_bars, request_params, feed=feed)
+            symbols = [symbol] if isinstance(symbol, str) else symbol
+            bar_list = [bar for sym in symbols for bar in bars.data.get(sym, [])]
         
-        bars = crypto_historical_data_client.get_crypto_bars(request_params, feed=feed)
+        if format != "text":
+            return serialize(bar_list, BAR_SCHEMA, format)
         
-        if bars[symbol]:
+        if bar_list:
             time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
-            result = f"Historical Crypto Data for {symbol} ({timeframe} bars, {time_range}):\n"
-            result += "---------------------------------------------------\n"
+            out = Renderer()
+            out.line(f"Historical Crypto Data for {symbol} ({timeframe} bars, {time_range}):")
+            out.line("---------------------------------------------------")
             
-            for bar in bars[symbol]:
-                # Format timestamp based on timeframe unit
-                if timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]:
-                    time_str = bar.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    time_str = bar.timestamp.date()
-                
-                result += f"Time: {time_str}, Open: ${bar.open:.6f}, High: ${bar.high:.6f}, Low: ${bar.low:.6f}, Close: ${bar.close:.6f}, Volume: {bar.volume}\n"
-            
-            return result
+            # Intraday bars show full timestamps, daily+ bars show dates
+            intraday = timeframe_obj.unit_value in [TimeFrameUnit.Minute, TimeFrameUnit.Hour]
+            out.rows(bar_row_template(intraday, decimals=6), bar_list)
+            return out.render()
         else:
             return f"No historical crypto data found for {symbol} with {timeframe} timeframe in the specified time range."
     except Exception as e:
@@ -866,23 +2602,44 @@ async def get_crypto_quotes(
     limit: Optional[int] = None,
     start: Optional[str] = None,
     end: Optional[str] = None,
-    feed: CryptoFeed = CryptoFeed.US
+    feed: CryptoFeed = CryptoFeed.US,
+    max_rows: Optional[int] = None,
+    stream_chunks: bool = False,
+    format: str = "text",
+    ctx: Context = None
 ) -> str:
     """
     Retrieves and formats historical quote data for a cryptocurrency.
     
+    The window is paged lazily. At most max_rows quotes per symbol are returned (the
+    first and last half); longer histories also get the bid/ask range and average
+    spread over every quote in the window.
+    
     Args:
         symbol (Union[str, List[str]]): Crypto symbol(s) (e.g., 'BTC/USD', 'ETH/USD' or ['BTC/USD', 'ETH/USD'])
         days (int): Number of days to look back (default: 3, ignored if start/end provided)
-        limit (Optional[int]): Maximum number of quotes to return (optional)
+        limit (Optional[int]): Maximum number of quotes to read (optional)
         start (Optional[str]): Start time in ISO format (e.g., "2023-01-01T09:30:00" or "2023-01-01")
         end (Optional[str]): End time in ISO format (e.g., "2023-01-01T16:00:00" or "2023-01-01")
         feed (CryptoFeed): The crypto data feed to retrieve from (default: US)
+        max_rows (Optional[int]): Maximum quotes to return per symbol (default: ALPACA_HISTORY_MAX_ROWS)
+        stream_chunks (bool): Also send every page of quotes, in the requested format, as a
+            progress notification (needs a client that passes a progress token)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing historical crypto quote data with timestamps, bid/ask prices and sizes
     """
+    from alpaca.data.requests import CryptoQuoteRequest
+    from alpaca.data.models import Quote
+    from history_stream import QuoteStats
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if max_rows is not None and max_rows < 2:
+            return "Error: max_rows must be at least 2."
+        
         # Parse start/end times or calculate from days
         start_time = None
         end_time = None
@@ -912,24 +2669,332 @@ async def get_crypto_quotes(
             limit=limit
         )
         
-        quotes = crypto_historical_data_client.get_crypto_quotes(request_params, feed=feed)
+        def render(quotes: List[Any]) -> str:
+            if format != "text":
+                return serialize(quotes, QUOTE_SCHEMA, format)
+            out = Renderer()
+            out.rows(CRYPTO_QUOTE_ROW, quotes)
+            return out.render()
         
-        # Use the exact same simple pattern as crypto bars
-        if quotes[symbol]:
-            time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
-            result = f"Historical Crypto Quotes for {symbol} ({time_range}):\n"
-            result += "---------------------------------------------------\n"
-            
-            for quote in quotes[symbol]:
-                time_str = quote.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Include milliseconds
-                result += f"Time: {time_str}, Bid: ${quote.bid_price:.6f} (Size: {quote.bid_size:.6f}), Ask: ${quote.ask_price:.6f} (Size: {quote.ask_size:.6f})\n"
-            
-            return result
-        else:
-            return f"No historical crypto quotes found for {symbol} in the specified time range."
+        # Pages are folded into a bounded digest as they arrive
+        send_chunk = _history_chunk_sender(ctx, Quote, render, limit) if stream_chunks else None
+        digest = await _read_history("crypto_data", crypto_historical_data_client, f"/crypto/{feed.value}/quotes",
+                                     request_params, "quotes", QuoteStats, max_rows or HISTORY_MAX_ROWS,
+                                     on_page=send_chunk)
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        
+        if format != "text":
+            records = [Quote(sym, raw) for sym in symbols if sym in digest.rows
+                       for raw in digest.rows[sym].records()]
+            return serialize(records, QUOTE_SCHEMA, format)
+        
+        time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
+        out = Renderer()
+        for sym in symbols:
+            rows = digest.rows.get(sym)
+            if not rows or not rows.count:
+                message = f"No historical crypto quotes found for {sym} in the specified time range."
+                if isinstance(symbol, str):
+                    return message
+                out.line(message)
+                continue
+            out.line(f"Historical Crypto Quotes for {sym} ({time_range}):")
+            out.line("---------------------------------------------------")
+            out.rows(CRYPTO_QUOTE_ROW, [Quote(sym, raw) for raw in rows.head])
+            if rows.omitted:
+                out.line(f"... {rows.omitted:,} quotes omitted ...")
+            out.rows(CRYPTO_QUOTE_ROW, [Quote(sym, raw) for raw in rows.tail])
+            for line in _history_summary("quotes", sym, digest, False):
+                out.line(line)
+        return out.render()
     except Exception as e:
         return f"Error fetching historical crypto quotes for {symbol}: {str(e)}"
 
+async def _get_streamed_crypto_data(kind: str, symbol: str, feed=None):
+    """
+    Look up the latest streamed quote, trade or order book for a crypto symbol.
+
+    Args:
+        kind (str): One of 'quote', 'trade' or 'book'
+        symbol (str): Crypto symbol (e.g., 'BTC/USD')
+        feed: Requested crypto feed (the stream only serves its own feed)
+
+    Returns:
+        The cached SDK model (an L2Book for 'book'), or None when the caller should fall
+        back to REST. Symbols that are not yet subscribed are subscribed in the background.
+    """
+    if crypto_data_cache is None or not crypto_data_cache.serves(feed):
+        return None
+    if crypto_data_cache.wants(symbol):
+        _subscribe_later("crypto_stream", crypto_data_cache, [symbol])
+        return None
+    return getattr(crypto_data_cache, f"get_{kind}")(symbol)
+
+async def _get_crypto_latest(kind: str, symbols: List[str], feed: CryptoFeed) -> Dict[str, Any]:
+    """Latest quotes or trades per symbol: streamed where available, the rest in one REST request."""
+    from alpaca.data.requests import CryptoLatestQuoteRequest, CryptoLatestTradeRequest
+    latest = {}
+    for symbol in symbols:
+        value = await _get_streamed_crypto_data(kind, symbol, feed)
+        if value is not None:
+            latest[symbol] = value
+    missing = [symbol for symbol in symbols if symbol not in latest]
+    if missing:
+        if kind == "quote":
+            fetched = await _shared_call("crypto_data", crypto_historical_data_client.get_crypto_latest_quote,
+                                         CryptoLatestQuoteRequest(symbol_or_symbols=missing), feed=feed)
+        else:
+            fetched = await _shared_call("crypto_data", crypto_historical_data_client.get_crypto_latest_trade,
+                                         CryptoLatestTradeRequest(symbol_or_symbols=missing), feed=feed)
+        latest.update(fetched)
+    return latest
+
+def _stream_time(value: Any) -> Any:
+    """Time of a raw record: msgpack timestamps from the stream, RFC 3339 strings from REST."""
+    if hasattr(value, "to_datetime"):
+        return value.to_datetime()
+    if isinstance(value, str):
+        # datetime only keeps microseconds; the API sends nanoseconds
+        return _parse_iso_datetime(re.sub(r"(\.\d{6})\d+", r"\1", value))
+    return value
+
+@mcp.tool()
+async def get_crypto_latest_quote(
+    symbol: Union[str, List[str]],
+    feed: CryptoFeed = CryptoFeed.US,
+    format: str = "text"
+) -> str:
+    """
+    Retrieves the latest bid/ask quote for one or more cryptocurrencies.
+    
+    Args:
+        symbol (Union[str, List[str]]): Crypto symbol(s) (e.g., 'BTC/USD' or ['BTC/USD', 'ETH/USD'])
+        feed (CryptoFeed): The crypto data feed to retrieve from (default: US)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Bid and ask price and size, mid price and spread per symbol
+    """
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        quotes = await _get_crypto_latest("quote", symbols, feed)
+        
+        if format != "text":
+            return serialize([quotes[sym] for sym in symbols if sym in quotes], QUOTE_SCHEMA, format)
+        
+        if not quotes:
+            return f"No latest quote data found for {symbol}."
+        out = Renderer()
+        out.line("Latest Crypto Quotes:")
+        out.line("---------------------------------------------------")
+        out.line("Symbol | Bid | Bid Size | Ask | Ask Size | Mid | Spread (bps) | Time")
+        for sym in symbols:
+            quote = quotes.get(sym)
+            if quote is None:
+                out.line(f"{sym} | no data")
+                continue
+            mid = (quote.bid_price + quote.ask_price) / 2
+            spread = f"{(quote.ask_price - quote.bid_price) / mid * 10_000:.2f}" if mid > 0 else "-"
+            out.line(f"{sym} | {quote.bid_price:.6f} | {quote.bid_size:g} | {quote.ask_price:.6f} | "
+                     f"{quote.ask_size:g} | {mid:.6f} | {spread} | {quote.timestamp}")
+        return out.render()
+    except Exception as e:
+        return f"Error fetching latest crypto quote: {str(e)}"
+
+@mcp.tool()
+async def get_crypto_latest_trade(
+    symbol: Union[str, List[str]],
+    feed: CryptoFeed = CryptoFeed.US,
+    format: str = "text"
+) -> str:
+    """
+    Retrieves the latest trade for one or more cryptocurrencies.
+    
+    Args:
+        symbol (Union[str, List[str]]): Crypto symbol(s) (e.g., 'BTC/USD' or ['BTC/USD', 'ETH/USD'])
+        feed (CryptoFeed): The crypto data feed to retrieve from (default: US)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Price, size, ID and time of the latest trade per symbol
+    """
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        trades = await _get_crypto_latest("trade", symbols, feed)
+        
+        if format != "text":
+            return serialize([trades[sym] for sym in symbols if sym in trades], TRADE_SCHEMA, format)
+        
+        if not trades:
+            return f"No latest trade data found for {symbol}."
+        out = Renderer()
+        out.line("Latest Crypto Trades:")
+        out.line("---------------------------------------------------")
+        out.line("Symbol | Price | Size | ID | Time")
+        for sym in symbols:
+            trade = trades.get(sym)
+            if trade is None:
+                out.line(f"{sym} | no data")
+                continue
+            out.line(f"{sym} | {trade.price:.6f} | {trade.size:g} | {trade.id} | {trade.timestamp}")
+        return out.render()
+    except Exception as e:
+        return f"Error fetching latest crypto trade: {str(e)}"
+
+@mcp.tool()
+async def get_crypto_orderbook(
+    symbol: Union[str, List[str]],
+    depth: int = 10,
+    feed: CryptoFeed = CryptoFeed.US,
+    format: str = "text"
+) -> str:
+    """
+    Retrieves the level 2 order book for one or more cryptocurrencies.
+    
+    With ALPACA_CRYPTO_STREAM enabled, books of subscribed symbols are kept up to date
+    from the websocket and answered locally; otherwise the latest book is fetched over REST.
+    
+    Args:
+        symbol (Union[str, List[str]]): Crypto symbol(s) (e.g., 'BTC/USD' or ['BTC/USD', 'ETH/USD'])
+        depth (int): Price levels returned per side (default: 10)
+        feed (CryptoFeed): The crypto data feed to retrieve from (default: US)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Best bid/ask, mid, spread, resting size near the mid, top-of-book imbalance and the
+            top depth levels per side with cumulative size
+    """
+    import numpy as np
+    from order_book import L2Book
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if depth < 1:
+            return "Error: depth must be at least 1."
+        
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        books, sources = {}, {}
+        for sym in symbols:
+            book = await _get_streamed_crypto_data("book", sym, feed)
+            if book is not None:
+                books[sym], sources[sym] = book, "live stream"
+        missing = [sym for sym in symbols if sym not in books]
+        if missing:
+            # Raw REST response: books are built straight into arrays, without per-level models
+            response = await _shared_call("crypto_data", crypto_historical_data_client.get,
+                                          f"/crypto/{feed.value}/latest/orderbooks", {"symbols": ",".join(missing)})
+            for sym, raw in ((response or {}).get("orderbooks") or {}).items():
+                books[sym], sources[sym] = L2Book.from_raw(raw), "REST"
+        
+        if format != "text":
+            records = []
+            for sym in symbols:
+                if sym not in books:
+                    continue
+                for side, (price, size) in zip(("bid", "ask"), books[sym].sides(depth)):
+                    records.extend(zip([sym] * len(price), [side] * len(price), range(1, len(price) + 1),
+                                       price.tolist(), size.tolist(), np.cumsum(size).tolist()))
+            schema = RecordSchema([(name, itemgetter(index)) for index, name in enumerate(
+                ("symbol", "side", "level", "price", "size", "cumulative_size"))])
+            return serialize(records, schema, format)
+        
+        if not books:
+            return f"No order book data found for {symbol}."
+        out = Renderer()
+        for sym in symbols:
+            book = books.get(sym)
+            if book is None:
+                out.line(f"No order book data found for {sym}.")
+                out.line("")
+                continue
+            (bid_price, bid_size), (ask_price, ask_size) = book.sides(depth)
+            best_bid, best_ask = book.best()
+            mid = book.mid()
+            bid_levels, ask_levels = book.levels()
+            out.line(f"Order Book for {sym} ({sources[sym]}, as of {_stream_time(book.timestamp)}):")
+            out.line("---------------------------------------------------")
+            if mid is not None:
+                out.line(f"Best Bid: ${best_bid:.6f}, Best Ask: ${best_ask:.6f}, Mid: ${mid:.6f}, "
+                         f"Spread: ${best_ask - best_bid:.6f} ({(best_ask - best_bid) / mid * 10_000:.2f} bps)")
+                near = ", ".join(f"{bps} bps: {bid:g} / {ask:g}"
+                                 for bps, (bid, ask) in ((bps, book.depth_within(bps)) for bps in (10, 50, 100)))
+                out.line(f"Bid / Ask Size Within {near}")
+            shown_bid, shown_ask = float(bid_size.sum()), float(ask_size.sum())
+            imbalance = (shown_bid - shown_ask) / (shown_bid + shown_ask) if shown_bid + shown_ask else 0.0
+            out.line(f"Levels: {bid_levels} bids / {ask_levels} asks, Imbalance (top {depth}): {imbalance:+.2f}")
+            out.line("Level | Cum Bid Size | Bid Size | Bid | Ask | Ask Size | Cum Ask Size")
+            cum_bid, cum_ask = np.cumsum(bid_size), np.cumsum(ask_size)
+            for level in range(max(len(bid_price), len(ask_price))):
+                bid_cells = (f"{cum_bid[level]:g} | {bid_size[level]:g} | {bid_price[level]:.6f}"
+                             if level < len(bid_price) else "- | - | -")
+                ask_cells = (f"{ask_price[level]:.6f} | {ask_size[level]:g} | {cum_ask[level]:g}"
+                             if level < len(ask_price) else "- | - | -")
+                out.line(f"{level + 1} | {bid_cells} | {ask_cells}")
+            out.line("")
+        return out.render()
+    except Exception as e:
+        return f"Error fetching crypto order book: {str(e)}"
+
+@mcp.tool()
+async def get_crypto_snapshot(
+    symbol: Union[str, List[str]],
+    feed: CryptoFeed = CryptoFeed.US,
+    format: str = "text"
+) -> str:
+    """
+    Retrieves snapshots of cryptocurrencies: latest trade, quote, minute bar, daily bar and previous daily bar.
+    
+    Args:
+        symbol (Union[str, List[str]]): Crypto symbol(s) (e.g., 'BTC/USD' or ['BTC/USD', 'ETH/USD'])
+        feed (CryptoFeed): The crypto data feed to retrieve from (default: US)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Formatted snapshot per symbol
+    """
+    from alpaca.data.requests import CryptoSnapshotRequest
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        request = CryptoSnapshotRequest(symbol_or_symbols=symbols)
+        snapshots = await _shared_call("crypto_data", crypto_historical_data_client.get_crypto_snapshot, request, feed=feed)
+        
+        if format != "text":
+            records = [snapshots[sym] for sym in symbols if snapshots.get(sym)]
+            return serialize(records, STOCK_SNAPSHOT_SCHEMA, format)
+        
+        results = ["Crypto Snapshots:", "=" * 16, ""]
+        for sym in symbols:
+            snapshot = snapshots.get(sym)
+            if not snapshot:
+                results.append(f"No data available for {sym}\n")
+                continue
+            snapshot_data = [
+                f"Symbol: {sym}",
+                "-" * 15,
+                _format_quote_data(snapshot.latest_quote, decimals=6),
+                _format_trade_data(snapshot.latest_trade, decimals=6),
+                _format_ohlcv_bar(snapshot.minute_bar, "Latest Minute Bar", True, decimals=6),
+                _format_ohlcv_bar(snapshot.daily_bar, "Latest Daily Bar", False, decimals=6),
+                _format_ohlcv_bar(snapshot.previous_daily_bar, "Previous Daily Bar", False, decimals=6),
+            ]
+            results.extend(filter(None, snapshot_data))
+        return "\n".join(results)
+    except Exception as e:
+        return f"Error retrieving crypto snapshots: {str(e)}"
+
 # ============================================================================
 # Order Management Tools
 # ============================================================================
@@ -943,7 +3008,8 @@ async def get_orders(
     direction: Optional[str] = None,
     nested: Optional[bool] = None,
     side: Optional[str] = None,
-    symbols: Optional[List[str]] = None
+    symbols: Optional[List[str]] = None,
+    format: str = "text"
 ) -> str:
     """
     Retrieves and formats orders with the specified filters.
@@ -957,6 +3023,7 @@ async def get_orders(
         nested (Optional[bool]): Roll up multi-leg orders under legs field if True
         side (Optional[str]): Filter by order side (buy or sell)
         symbols (Optional[List[str]]): List of symbols to filter by
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing order details including:
@@ -969,7 +3036,12 @@ async def get_orders(
             - Submission Time
             - Fill Details (if applicable)
     """
+    from alpaca.trading.requests import GetOrdersRequest
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
         # Convert status string to enum
         if status.lower() == "open":
             query_status = QueryOrderStatus.OPEN
@@ -1012,93 +3084,253 @@ async def get_orders(
             except ValueError:
                 return f"Invalid 'until' timestamp format: {until}. Use ISO format like '2023-01-01T16:00:00'"
             
-        request_params = GetOrdersRequest(
-            status=query_status,
-            limit=limit,
-            after=after_dt,
-            until=until_dt,
-            direction=direction_enum,
-            nested=nested,
-            side=side_enum,
-            symbols=symbols
+        # Flat listings are answered by the order mirror when it holds every matching order
+        orders = None
+        if order_mirror is not None and not nested:
+            orders = order_mirror.query(
+                status=query_status.value,
+                limit=limit,
+                after=after_dt,
+                until=until_dt,
+                direction=direction_enum.value if direction_enum else "desc",
+                side=side_enum.value if side_enum else None,
+                symbols=symbols
+            )
+        
+        if orders is None:
+            request_params = GetOrdersRequest(
+                status=query_status,
+                limit=limit,
+                after=after_dt,
+                until=until_dt,
+                direction=direction_enum,
+                nested=nested,
+                side=side_enum,
+                symbols=symbols
+            )
+            orders = await sdk_executor.run("trading", trade_client.get_orders, request_params)
+        
+        if format != "text":
+            return serialize(orders, ORDER_SCHEMA, format)
+        
+        if not orders:
+            return f"No {status} orders found."
+        
+        out = Renderer()
+        out.line(f"{status.capitalize()} Orders (Last {len(orders)}):")
+        out.line("-----------------------------------")
+        out.rows(ORDER_ROW, orders)
+        return out.render()
+    except Exception as e:
+        return f"Error fetching orders: {str(e)}"
+
+@mcp.tool()
+async def get_order(order_id: Optional[str] = None, client_order_id: Optional[str] = None,
+                    format: str = "text") -> str:
+    """
+    Retrieves one order by its ID or by the client_order_id it was submitted with.
+    
+    Args:
+        order_id (Optional[str]): Order ID
+        client_order_id (Optional[str]): Client order ID (used when order_id is not given)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: Formatted order details or an error message
+    """
+    format_error = check_output_format(format)
+    if format_error:
+        return format_error
+    if not order_id and not client_order_id:
+        return "Error: Provide order_id or client_order_id."
+    try:
+        order = order_mirror.get(order_id, client_order_id) if order_mirror is not None else None
+        if order is None:
+            if order_id:
+                order = await sdk_executor.run("trading", trade_client.get_order_by_id, order_id)
+            else:
+                order = await sdk_executor.run("trading", trade_client.get_order_by_client_id, client_order_id)
+        
+        if format != "text":
+            return serialize([order], ORDER_SCHEMA, format)
+        
+        out = Renderer()
+        out.line("Order Details:")
+        out.line("-----------------------------------")
+        out.rows(ORDER_ROW, [order])
+        return out.render()
+    except Exception as e:
+        return f"Error fetching order: {str(e)}"
+
+@mcp.tool()
+async def get_fills(symbols: Optional[List[str]] = None, limit: int = 50, format: str = "text") -> str:
+    """
+    Retrieves recent fills (executions) recorded by the order mirror, newest first.
+    
+    Requires ALPACA_ORDER_MIRROR; fills are recorded from trade updates received
+    while the server is running (or persisted in ALPACA_ORDER_MIRROR_DB).
+    
+    Args:
+        symbols (Optional[List[str]]): Only fills for these symbols
+        limit (int): Maximum number of fills to return (default: 50)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: One line per fill (time, side, quantity, symbol, price, event, resulting position)
+    """
+    format_error = check_output_format(format)
+    if format_error:
+        return format_error
+    if order_mirror is None:
+        return "Error: Fills are recorded by the order mirror. Set ALPACA_ORDER_MIRROR=True to enable it."
+    if limit < 1:
+        return "Error: limit must be at least 1."
+    
+    fills = order_mirror.fills([s.upper() for s in symbols] if symbols else None, limit)
+    
+    if format != "text":
+        return serialize(fills, FILL_SCHEMA, format)
+    
+    if not fills:
+        return "No fills recorded."
+    
+    out = Renderer()
+    out.line(f"Recent Fills (Last {len(fills)}):")
+    out.line("-----------------------------------")
+    out.rows(FILL_ROW, fills)
+    return out.render()
+
+def _build_stock_order_request(
+    symbol: str,
+    side: str,
+    quantity: float,
+    order_type: str = "market",
+    time_in_force: Union[str, TimeInForce] = "day",
+    limit_price: float = None,
+    stop_price: float = None,
+    trail_price: float = None,
+    trail_percent: float = None,
+    extended_hours: bool = False,
+    client_order_id: str = None
+) -> Union[Any, str]:
+    """
+    Validate stock order parameters and build the matching Alpaca order request.
+
+    Shared by place_stock_order and place_stock_order_batch; arguments are as for
+    place_stock_order.
+
+    Returns:
+        Union[Any, str]: The order request model, or an error message string
+    """
+    from alpaca.trading.requests import (
+        LimitOrderRequest,
+        MarketOrderRequest,
+        StopLimitOrderRequest,
+        StopOrderRequest,
+        TrailingStopOrderRequest,
+    )
+    # Validate side
+    if side.lower() == "buy":
+        order_side = OrderSide.BUY
+    elif side.lower() == "sell":
+        order_side = OrderSide.SELL
+    else:
+        return f"Invalid order side: {side}. Must be 'buy' or 'sell'."
+
+    # Validate and convert time_in_force to enum
+    tif_enum = None
+    if isinstance(time_in_force, TimeInForce):
+        tif_enum = time_in_force
+    elif isinstance(time_in_force, str):
+        # Convert string to TimeInForce enum
+        time_in_force_upper = time_in_force.upper()
+        if time_in_force_upper == "DAY":
+            tif_enum = TimeInForce.DAY
+        elif time_in_force_upper == "GTC":
+            tif_enum = TimeInForce.GTC
+        elif time_in_force_upper == "OPG":
+            tif_enum = TimeInForce.OPG
+        elif time_in_force_upper == "CLS":
+            tif_enum = TimeInForce.CLS
+        elif time_in_force_upper == "IOC":
+            tif_enum = TimeInForce.IOC
+        elif time_in_force_upper == "FOK":
+            tif_enum = TimeInForce.FOK
+        else:
+            return f"Invalid time_in_force: {time_in_force}. Valid options are: DAY, GTC, OPG, CLS, IOC, FOK"
+    else:
+        return f"Invalid time_in_force type: {type(time_in_force)}. Must be string or TimeInForce enum."
+
+    # Validate order_type
+    order_type_upper = order_type.upper()
+    if order_type_upper == "MARKET":
+        order_data = MarketOrderRequest(
+            symbol=symbol,
+            qty=quantity,
+            side=order_side,
+            type=OrderType.MARKET,
+            time_in_force=tif_enum,
+            extended_hours=extended_hours,
+            client_order_id=client_order_id
+        )
+    elif order_type_upper == "LIMIT":
+        if limit_price is None:
+            return "limit_price is required for LIMIT orders."
+        order_data = LimitOrderRequest(
+            symbol=symbol,
+            qty=quantity,
+            side=order_side,
+            type=OrderType.LIMIT,
+            time_in_force=tif_enum,
+            limit_price=limit_price,
+            extended_hours=extended_hours,
+            client_order_id=client_order_id
+        )
+    elif order_type_upper == "STOP":
+        if stop_price is None:
+            return "stop_price is required for STOP orders."
+        order_data = StopOrderRequest(
+            symbol=symbol,
+            qty=quantity,
+            side=order_side,
+            type=OrderType.STOP,
+            time_in_force=tif_enum,
+            stop_price=stop_price,
+            extended_hours=extended_hours,
+            client_order_id=client_order_id
+        )
+    elif order_type_upper == "STOP_LIMIT":
+        if stop_price is None or limit_price is None:
+            return "Both stop_price and limit_price are required for STOP_LIMIT orders."
+        order_data = StopLimitOrderRequest(
+            symbol=symbol,
+            qty=quantity,
+            side=order_side,
+            type=OrderType.STOP_LIMIT,
+            time_in_force=tif_enum,
+            stop_price=stop_price,
+            limit_price=limit_price,
+            extended_hours=extended_hours,
+            client_order_id=client_order_id
         )
-        
-        orders = trade_client.get_orders(request_params)
-        
-        if not orders:
-            return f"No {status} orders found."
-        
-        result = f"{status.capitalize()} Orders (Last {len(orders)}):\n"
-        result += "-----------------------------------\n"
-        
-        for order in orders:
-            result += f"Symbol: {order.symbol}\n"
-            result += f"ID: {order.id}\n"
-            result += f"Type: {order.type}\n"
-            result += f"Side: {order.side}\n"
-            result += f"Quantity: {order.qty}\n"
-            result += f"Status: {order.status}\n"
-            result += f"Asset Class: {order.asset_class}\n"
-            result += f"Order Class: {order.order_class}\n"
-            result += f"Time In Force: {order.time_in_force}\n"
-            result += f"Extended Hours: {order.extended_hours}\n"
-            result += f"Submitted At: {order.submitted_at}\n"
-            result += f"Created At: {order.created_at}\n"
-            result += f"Updated At: {order.updated_at}\n"
-            
-            # Additional core fields (these are optional)
-            if hasattr(order, 'asset_id') and order.asset_id:
-                result += f"Asset ID: {order.asset_id}\n"
-            if hasattr(order, 'order_type') and order.order_type:
-                result += f"Order Type: {order.order_type}\n"
-            if hasattr(order, 'ratio_qty') and order.ratio_qty:
-                result += f"Ratio Quantity: {order.ratio_qty}\n"
-            
-            # Optional fields that may not always be present
-            if hasattr(order, 'filled_at') and order.filled_at:
-                result += f"Filled At: {order.filled_at}\n"
-            if hasattr(order, 'filled_avg_price') and order.filled_avg_price:
-                result += f"Filled Price: ${float(order.filled_avg_price):.2f}\n"
-            if hasattr(order, 'filled_qty') and order.filled_qty:
-                result += f"Filled Quantity: {order.filled_qty}\n"
-            if hasattr(order, 'limit_price') and order.limit_price:
-                result += f"Limit Price: ${float(order.limit_price):.2f}\n"
-            if hasattr(order, 'stop_price') and order.stop_price:
-                result += f"Stop Price: ${float(order.stop_price):.2f}\n"
-            if hasattr(order, 'trail_price') and order.trail_price:
-                result += f"Trail Price: ${float(order.trail_price):.2f}\n"
-            if hasattr(order, 'trail_percent') and order.trail_percent:
-                result += f"Trail Percent: {order.trail_percent}%\n"
-            if hasattr(order, 'notional') and order.notional:
-                result += f"Notional: ${float(order.notional):.2f}\n"
-            if hasattr(order, 'position_intent') and order.position_intent:
-                result += f"Position Intent: {order.position_intent}\n"
-            if hasattr(order, 'client_order_id') and order.client_order_id:
-                result += f"Client Order ID: {order.client_order_id}\n"
-            if hasattr(order, 'canceled_at') and order.canceled_at:
-                result += f"Canceled At: {order.canceled_at}\n"
-            if hasattr(order, 'expired_at') and order.expired_at:
-                result += f"Expired At: {order.expired_at}\n"
-            if hasattr(order, 'expires_at') and order.expires_at:
-                result += f"Expires At: {order.expires_at}\n"
-            if hasattr(order, 'failed_at') and order.failed_at:
-                result += f"Failed At: {order.failed_at}\n"
-            if hasattr(order, 'replaced_at') and order.replaced_at:
-                result += f"Replaced At: {order.replaced_at}\n"
-            if hasattr(order, 'replaced_by') and order.replaced_by:
-                result += f"Replaced By: {order.replaced_by}\n"
-            if hasattr(order, 'replaces') and order.replaces:
-                result += f"Replaces: {order.replaces}\n"
-            if hasattr(order, 'legs') and order.legs:
-                result += f"Legs: {order.legs}\n"
-            if hasattr(order, 'hwm') and order.hwm:
-                result += f"HWM: {order.hwm}\n"
-                
-            result += "-----------------------------------\n"
-            
-        return result
-    except Exception as e:
-        return f"Error fetching orders: {str(e)}"
+    elif order_type_upper == "TRAILING_STOP":
+        if trail_price is None and trail_percent is None:
+            return "Either trail_price or trail_percent is required for TRAILING_STOP orders."
+        order_data = TrailingStopOrderRequest(
+            symbol=symbol,
+            qty=quantity,
+            side=order_side,
+            type=OrderType.TRAILING_STOP,
+            time_in_force=tif_enum,
+            trail_price=trail_price,
+            trail_percent=trail_percent,
+            extended_hours=extended_hours,
+            client_order_id=client_order_id
+        )
+    else:
+        return f"Invalid order type: {order_type}. Must be one of: MARKET, LIMIT, STOP, STOP_LIMIT, TRAILING_STOP."
+
+    return order_data
 
 @mcp.tool()
 async def place_stock_order(
@@ -1135,109 +3367,15 @@ async def place_stock_order(
         str: Formatted string containing order details or error message.
     """
     try:
-        # Validate side
-        if side.lower() == "buy":
-            order_side = OrderSide.BUY
-        elif side.lower() == "sell":
-            order_side = OrderSide.SELL
-        else:
-            return f"Invalid order side: {side}. Must be 'buy' or 'sell'."
-
-        # Validate and convert time_in_force to enum
-        tif_enum = None
-        if isinstance(time_in_force, TimeInForce):
-            tif_enum = time_in_force
-        elif isinstance(time_in_force, str):
-            # Convert string to TimeInForce enum
-            time_in_force_upper = time_in_force.upper()
-            if time_in_force_upper == "DAY":
-                tif_enum = TimeInForce.DAY
-            elif time_in_force_upper == "GTC":
-                tif_enum = TimeInForce.GTC
-            elif time_in_force_upper == "OPG":
-                tif_enum = TimeInForce.OPG
-            elif time_in_force_upper == "CLS":
-                tif_enum = TimeInForce.CLS
-            elif time_in_force_upper == "IOC":
-                tif_enum = TimeInForce.IOC
-            elif time_in_force_upper == "FOK":
-                tif_enum = TimeInForce.FOK
-            else:
-                return f"Invalid time_in_force: {time_in_force}. Valid options are: DAY, GTC, OPG, CLS, IOC, FOK"
-        else:
-            return f"Invalid time_in_force type: {type(time_in_force)}. Must be string or TimeInForce enum."
-
-        # Validate order_type
-        order_type_upper = order_type.upper()
-        if order_type_upper == "MARKET":
-            order_data = MarketOrderRequest(
-                symbol=symbol,
-                qty=quantity,
-                side=order_side,
-                type=OrderType.MARKET,
-                time_in_force=tif_enum,
-                extended_hours=extended_hours,
-                client_order_id=client_order_id or f"order_{int(time.time())}"
-            )
-        elif order_type_upper == "LIMIT":
-            if limit_price is None:
-                return "limit_price is required for LIMIT orders."
-            order_data = LimitOrderRequest(
-                symbol=symbol,
-                qty=quantity,
-                side=order_side,
-                type=OrderType.LIMIT,
-                time_in_force=tif_enum,
-                limit_price=limit_price,
-                extended_hours=extended_hours,
-                client_order_id=client_order_id or f"order_{int(time.time())}"
-            )
-        elif order_type_upper == "STOP":
-            if stop_price is None:
-                return "stop_price is required for STOP orders."
-            order_data = StopOrderRequest(
-                symbol=symbol,
-                qty=quantity,
-                side=order_side,
-                type=OrderType.STOP,
-                time_in_force=tif_enum,
-                stop_price=stop_price,
-                extended_hours=extended_hours,
-                client_order_id=client_order_id or f"order_{int(time.time())}"
-            )
-        elif order_type_upper == "STOP_LIMIT":
-            if stop_price is None or limit_price is None:
-                return "Both stop_price and limit_price are required for STOP_LIMIT orders."
-            order_data = StopLimitOrderRequest(
-                symbol=symbol,
-                qty=quantity,
-                side=order_side,
-                type=OrderType.STOP_LIMIT,
-                time_in_force=tif_enum,
-                stop_price=stop_price,
-                limit_price=limit_price,
-                extended_hours=extended_hours,
-                client_order_id=client_order_id or f"order_{int(time.time())}"
-            )
-        elif order_type_upper == "TRAILING_STOP":
-            if trail_price is None and trail_percent is None:
-                return "Either trail_price or trail_percent is required for TRAILING_STOP orders."
-            order_data = TrailingStopOrderRequest(
-                symbol=symbol,
-                qty=quantity,
-                side=order_side,
-                type=OrderType.TRAILING_STOP,
-                time_in_force=tif_enum,
-                trail_price=trail_price,
-                trail_percent=trail_percent,
-                extended_hours=extended_hours,
-                client_order_id=client_order_id or f"order_{int(time.time())}"
-            )
-        else:
-            return f"Invalid order type: {order_type}. Must be one of: MARKET, LIMIT, STOP, STOP_LIMIT, TRAILING_STOP."
+        order_data = _build_stock_order_request(
+            symbol, side, quantity, order_type, time_in_force, limit_price, stop_price,
+            trail_price, trail_percent, extended_hours, client_order_id or f"order_{int(time.time())}"
+        )
+        if isinstance(order_data, str):
+            return order_data
 
         # Submit order
-        order = trade_client.submit_order(order_data)
+        order = await sdk_executor.run("orders", trade_client.submit_order, order_data)
         return f"""
                 Stock Order Placed Successfully:
                 --------------------------------
@@ -1280,6 +3418,182 @@ async def place_stock_order(
     except Exception as e:
         return f"Error placing order: {str(e)}"
 
+@mcp.tool()
+async def place_stock_order_batch(
+    orders: List[Dict[str, Any]],
+    order_type: str = "market",
+    time_in_force: str = "day",
+    extended_hours: bool = False,
+    batch_id: Optional[str] = None,
+    dry_run: bool = False,
+    format: str = "text"
+) -> str:
+    """
+    Places a basket of stock orders in one call, e.g. to rebalance a portfolio.
+    
+    The whole basket is validated first (same rules as place_stock_order); if any order
+    is invalid nothing is submitted. Orders are then submitted concurrently on the
+    orders lane (ALPACA_SDK_ORDERS_CONCURRENCY at a time, under the trading rate limit).
+    Every order gets a deterministic client_order_id derived from the basket, so
+    calling again with the same basket on the same day (e.g. after a timeout) does
+    not place orders twice: orders the API already has are reported as "duplicate"
+    with their current status, and only the missing ones are placed.
+    
+    Args:
+        orders (List[Dict[str, Any]]): Orders with keys symbol, side ("buy"/"sell"), quantity (or qty),
+            and optionally order_type, time_in_force, limit_price, stop_price, trail_price,
+            trail_percent, extended_hours and client_order_id
+            (e.g., [{"symbol": "AAPL", "side": "buy", "quantity": 10},
+                    {"symbol": "MSFT", "side": "sell", "qty": 5, "order_type": "limit", "limit_price": 410}])
+        order_type (str): Default order type for orders without one (default: "market")
+        time_in_force (str): Default time in force for orders without one (default: "day")
+        extended_hours (bool): Default extended hours flag for orders without one (default: False)
+        batch_id (Optional[str]): Basket identifier used as the client_order_id prefix; reuse it to
+            deduplicate resubmissions across days (default: a hash of the basket and the trading day)
+        dry_run (bool): Only validate the basket and show the client_order_ids (default: False)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Returns:
+        str: One row per order with the result (submitted, duplicate, failed), order status and IDs
+    """
+    from collections import Counter
+    from zoneinfo import ZoneInfo
+    from order_basket import DUPLICATE_CLIENT_ORDER_ID, client_order_ids, normalize_order
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if not orders:
+            return "Error: No orders provided."
+        
+        # Validate the whole basket before submitting anything
+        defaults = {"order_type": order_type, "time_in_force": time_in_force, "extended_hours": extended_hours}
+        normalized, errors = [], []
+        for entry in orders:
+            order, error = normalize_order(entry, defaults)
+            normalized.append(order)
+            errors.append(error)
+        ids = client_order_ids(normalized, batch_id, datetime.now(ZoneInfo("America/New_York")).date())
+        repeated = {cid for cid, count in Counter(ids).items() if count > 1}
+        requests = []
+        for index, order in enumerate(normalized):
+            request = None
+            if errors[index] is None and ids[index] in repeated:
+                errors[index] = f"client_order_id {ids[index]} is used by more than one order in the basket."
+            if errors[index] is None:
+                try:
+                    request = _build_stock_order_request(
+                        order["symbol"], order["side"], order["quantity"], str(order.get("order_type") or "market"),
+                        order.get("time_in_force") or "day", order.get("limit_price"), order.get("stop_price"),
+                        order.get("trail_price"), order.get("trail_percent"), bool(order.get("extended_hours")),
+                        ids[index]
+                    )
+                except Exception as e:
+                    request = f"Invalid order: {str(e)}"
+                if isinstance(request, str):
+                    errors[index], request = request, None
+            requests.append(request)
+        
+        invalid = [index for index, error in enumerate(errors) if error]
+        if invalid:
+            out = Renderer()
+            out.line(f"Basket rejected: {len(invalid)} of {len(orders)} orders are invalid; nothing was submitted.")
+            for index in invalid:
+                out.line(f"#{index + 1} {normalized[index].get('symbol') or '?'}: {errors[index]}")
+            return out.render()
+        
+        async def submit(request: Any) -> Tuple[str, Any, Optional[str]]:
+            try:
+                order = await sdk_executor.run("orders", trade_client.submit_order, request)
+                return "submitted", order, None
+            except APIError as api_error:
+                try:
+                    message = api_error.message
+                except Exception:
+                    message = str(api_error)
+                if DUPLICATE_CLIENT_ORDER_ID not in message:
+                    return "failed", None, message
+                # Placed by an earlier call with the same basket: report the existing order
+                try:
+                    order = await sdk_executor.run("trading", trade_client.get_order_by_client_id,
+                                                   request.client_order_id)
+                except Exception:
+                    order = None
+                return "duplicate", order, None
+            except Exception as e:
+                return "failed", None, str(e)
+        
+        started = time.perf_counter()
+        if dry_run:
+            results = [("valid", None, None)] * len(requests)
+        else:
+            results = await asyncio.gather(*[submit(request) for request in requests])
+        elapsed = time.perf_counter() - started
+        
+        def enum_value(value: Any) -> Any:
+            return getattr(value, "value", value)
+        
+        records = [
+            (index + 1, request.symbol, enum_value(request.side), request.qty, enum_value(request.type),
+             enum_value(request.time_in_force), request.client_order_id, result,
+             enum_value(order.status) if order is not None else None,
+             str(order.id) if order is not None else None, error)
+            for index, (request, (result, order, error)) in enumerate(zip(requests, results))
+        ]
+        
+        if format != "text":
+            schema = RecordSchema([(name, itemgetter(index)) for index, name in enumerate((
+                "index", "symbol", "side", "qty", "order_type", "time_in_force", "client_order_id",
+                "result", "status", "order_id", "error"))])
+            return serialize(records, schema, format)
+        
+        counts = Counter(record[7] for record in records)
+        out = Renderer()
+        if dry_run:
+            out.line(f"Basket of {len(records)} orders is valid (dry run, nothing submitted):")
+        else:
+            out.line(f"Basket of {len(records)} orders ({elapsed:.2f}s): {counts['submitted']} submitted, "
+                     f"{counts['duplicate']} duplicate (already placed), {counts['failed']} failed")
+        out.line("---------------------------------------------------")
+        out.line("# | Symbol | Side | Qty | Type | TIF | Result | Status | Order ID | Client Order ID")
+        for record in records:
+            index, symbol, side, qty, kind, tif, cid, result, status, order_id, error = record
+            result_text = f"failed: {error}" if error else result
+            out.line(" | ".join(str(cell) for cell in (
+                index, symbol, side, f"{qty:g}", kind, tif, result_text, status or "-", order_id or "-", cid)))
+        return out.render()
+    except Exception as e:
+        return f"Error placing order batch: {str(e)}"
+
+async def _crypto_order_context(symbol: str, side: str, qty: Optional[float], notional: Optional[float],
+                                limit_price: Optional[float]) -> List[str]:
+    """
+    Pricing context for a crypto order from the live order book: spread, and the estimated
+    fill of a market order or the limit price's distance from the mid. Only the local book
+    is used, so order placement never waits on market data; empty when there is no live book.
+    """
+    book = await _get_streamed_crypto_data("book", symbol)
+    mid = book.mid() if book is not None else None
+    if mid is None:
+        return []
+    bid, ask = book.best()
+    lines = [
+        "Market Context (live order book at submission):",
+        f"  Bid: ${bid:.6f}, Ask: ${ask:.6f}, Mid: ${mid:.6f}, Spread: {(ask - bid) / mid * 10_000:.2f} bps"
+    ]
+    if limit_price is not None:
+        lines.append(f"  Limit vs Mid: {(limit_price - mid) / mid * 10_000:+.2f} bps")
+        return lines
+    price, filled = book.fill_price(side, qty=qty, notional=notional)
+    if price is not None:
+        # Positive slippage is a worse price than the mid for either side
+        slippage = (price - mid) / mid * 10_000 * (1 if side == "buy" else -1)
+        lines.append(f"  Est. Fill: ${price:.6f} average over the visible book ({slippage:+.2f} bps vs mid)")
+        wanted = qty if qty is not None else notional / price
+        if filled < wanted * (1 - 1e-9):
+            lines.append(f"  Visible book only covers {filled:g} of {wanted:g}")
+    return lines
+
 @mcp.tool()
 async def place_crypto_order(
     symbol: str,
@@ -1306,6 +3620,7 @@ async def place_crypto_order(
     - Requests: [MarketOrderRequest](https://alpaca.markets/sdks/python/api_reference/trading/requests.html#marketorderrequest), [LimitOrderRequest](https://alpaca.markets/sdks/python/api_reference/trading/requests.html#limitorderrequest), [StopLimitOrderRequest](https://alpaca.markets/sdks/python/api_reference/trading/requests.html#stoplimitorderrequest)
     - Enums: [TimeInForce](https://alpaca.markets/sdks/python/api_reference/trading/enums.html#alpaca.trading.enums.TimeInForce)
     """
+    from alpaca.trading.requests import LimitOrderRequest, MarketOrderRequest, StopLimitOrderRequest
     try:
         # Validate side
         if side.lower() == "buy":
@@ -1381,9 +3696,10 @@ async def place_crypto_order(
         else:
             return "Invalid order type for crypto. Use: market, limit, stop_limit."
 
-        order = trade_client.submit_order(order_data)
+        context = await _crypto_order_context(symbol, order_side.value, qty, notional, limit_price)
+        order = await sdk_executor.run("orders", trade_client.submit_order, order_data)
 
-        return f"""
+        result = f"""
                 Crypto Order Placed Successfully:
                 -------------------------------
                 asset_class: {order.asset_class}
@@ -1422,6 +3738,8 @@ async def place_crypto_order(
                 type: {order.type}
                 updated_at: {order.updated_at}
                 """
+        # Context lines continue the block above at its indentation
+        return result + "".join(f"{line}\n                " for line in context)
     except Exception as e:
         return f"Error placing crypto order: {str(e)}"
 
@@ -1435,7 +3753,7 @@ async def cancel_all_orders() -> str:
     """
     try:
         # Cancel all orders
-        cancel_responses = trade_client.cancel_orders()
+        cancel_responses = await sdk_executor.run("orders", trade_client.cancel_orders)
         
         if not cancel_responses:
             return "No orders were found to cancel."
@@ -1470,7 +3788,7 @@ async def cancel_order_by_id(order_id: str) -> str:
     """
     try:
         # Cancel the specific order
-        response = trade_client.cancel_order_by_id(order_id)
+        response = await sdk_executor.run("orders", trade_client.cancel_order_by_id, order_id)
         
         # Format the response
         status = "Success" if response.status == 200 else "Failed"
@@ -1508,6 +3826,7 @@ async def close_position(symbol: str, qty: Optional[str] = None, percentage: Opt
     Returns:
         str: Formatted string containing position closure details or error message
     """
+    from alpaca.trading.requests import ClosePositionRequest
     try:
         # Create close position request if options are provided
         close_options = None
@@ -1518,7 +3837,7 @@ async def close_position(symbol: str, qty: Optional[str] = None, percentage: Opt
             )
         
         # Close the position
-        order = trade_client.close_position(symbol, close_options)
+        order = await sdk_executor.run("orders", trade_client.close_position, symbol, close_options)
         
         return f"""
                 Position Closed Successfully:
@@ -1559,7 +3878,7 @@ async def close_all_positions(cancel_orders: bool = False) -> str:
     """
     try:
         # Close all positions
-        close_responses = trade_client.close_all_positions(cancel_orders=cancel_orders)
+        close_responses = await sdk_executor.run("orders", trade_client.close_all_positions, cancel_orders=cancel_orders)
         
         if not close_responses:
             return "No positions were found to close."
@@ -1593,7 +3912,7 @@ async def exercise_options_position(symbol_or_contract_id: str) -> str:
         str: Success message or error details
     """
     try:
-        trade_client.exercise_options_position(symbol_or_contract_id=symbol_or_contract_id)
+        await sdk_executor.run("orders", trade_client.exercise_options_position, symbol_or_contract_id=symbol_or_contract_id)
         return f"Successfully submitted exercise request for option contract: {symbol_or_contract_id}"
     except Exception as e:
         return f"Error exercising option contract '{symbol_or_contract_id}': {str(e)}"
@@ -1620,7 +3939,7 @@ async def get_asset_info(symbol: str) -> str:
             - Trading Properties
     """
     try:
-        asset = trade_client.get_asset(symbol)
+        asset = await _cached_trading_call("asset", symbol.upper(), trade_client.get_asset, symbol)
         return f"""
                 Asset Information for {symbol}:
                 ----------------------------
@@ -1642,47 +3961,110 @@ async def get_all_assets(
     status: Optional[str] = None,
     asset_class: Optional[str] = None,
     exchange: Optional[str] = None,
-    attributes: Optional[str] = None
+    attributes: Optional[str] = None,
+    symbol_prefix: Optional[str] = None,
+    name_contains: Optional[str] = None,
+    tradable: Optional[bool] = None,
+    fractionable: Optional[bool] = None,
+    shortable: Optional[bool] = None,
+    marginable: Optional[bool] = None,
+    easy_to_borrow: Optional[bool] = None,
+    fields: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    format: str = "text"
 ) -> str:
     """
-    Get all available assets with optional filtering.
+    Get available assets with optional filtering, one page at a time.
     
     Args:
         status: Filter by asset status (e.g., 'active', 'inactive')
-        asset_class: Filter by asset class (e.g., 'us_equity', 'crypto')
+        asset_class: Filter by asset class (e.g., 'us_equity', 'crypto'; default: us_equity)
         exchange: Filter by exchange (e.g., 'NYSE', 'NASDAQ')
-        attributes: Comma-separated values to query for multiple attributes
+        attributes: Comma-separated attributes; assets with any of them match (e.g., 'has_options')
+        symbol_prefix: Only symbols starting with this prefix (e.g., 'A')
+        name_contains: Only assets whose name contains this text (case-insensitive)
+        tradable: Filter by whether the asset is tradable at Alpaca
+        fractionable: Filter by whether fractional shares are supported
+        shortable: Filter by whether the asset can be sold short
+        marginable: Filter by whether the asset is marginable
+        easy_to_borrow: Filter by whether the asset is easy to borrow
+        fields: Comma-separated fields to return (e.g., 'symbol,name,fractionable'; default: the standard set)
+        limit: Maximum assets per page (default: 100)
+        offset: Number of matching assets to skip
+        cursor: "Next cursor" value from the previous page; continues after its last asset
+        format: Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     """
+    from alpaca.trading.requests import GetAssetsRequest
     try:
-        # Create filter if any parameters are provided
-        filter_params = None
-        if any([status, asset_class, exchange, attributes]):
-            filter_params = GetAssetsRequest(
-                status=status,
-                asset_class=asset_class,
-                exchange=exchange,
-                attributes=attributes
-            )
-        
-        # Get all assets
-        assets = trade_client.get_all_assets(filter_params)
-        
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+
+        limit = ASSETS_PAGE_SIZE if limit is None else limit
+        if limit <= 0 or offset < 0:
+            return "Error: limit must be positive and offset must not be negative."
+
+        schema = ASSET_SCHEMA
+        if fields:
+            try:
+                schema = ASSET_FIELDS_SCHEMA.project([f.strip() for f in fields.split(",") if f.strip()])
+            except ValueError as e:
+                return f"Error: {e}"
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return f"Error: {e}"
+
+        # The full list for the asset class is fetched and indexed once; every other filter
+        # is applied to the cached index, so a query only visits the rows that can match
+        asset_class = asset_class.lower() if asset_class else None
+        filter_params = GetAssetsRequest(asset_class=asset_class) if asset_class else None
+        index = await _cached_trading_call("assets", asset_class, _fetch_asset_index, filter_params)
+        rows = index.query(
+            symbol_prefix=symbol_prefix,
+            name_contains=name_contains,
+            after=after,
+            attributes=[a.strip() for a in attributes.split(",") if a.strip()] if attributes else None,
+            status=status,
+            exchange=exchange,
+            tradable=tradable,
+            fractionable=fractionable,
+            shortable=shortable,
+            marginable=marginable,
+            easy_to_borrow=easy_to_borrow
+        )
+        total = len(rows)
+        assets = [index.assets[row] for row in rows[offset:offset + limit]]
+
+        if format != "text":
+            return serialize(assets, schema, format)
+
         if not assets:
             return "No assets found matching the criteria."
-        
+
         # Format the response
         response_parts = ["Available Assets:"]
         response_parts.append("-" * 30)
-        
+
         for asset in assets:
-            response_parts.append(f"Symbol: {asset.symbol}")
-            response_parts.append(f"Name: {asset.name}")
-            response_parts.append(f"Exchange: {asset.exchange}")
-            response_parts.append(f"Class: {asset.asset_class}")
-            response_parts.append(f"Status: {asset.status}")
-            response_parts.append(f"Tradable: {'Yes' if asset.tradable else 'No'}")
+            if fields:
+                response_parts.extend(f"{name}: {value}" for name, value in zip(schema.names, schema.extract(asset)))
+            else:
+                response_parts.append(f"Symbol: {asset.symbol}")
+                response_parts.append(f"Name: {asset.name}")
+                response_parts.append(f"Exchange: {asset.exchange}")
+                response_parts.append(f"Class: {asset.asset_class}")
+                response_parts.append(f"Status: {asset.status}")
+                response_parts.append(f"Tradable: {'Yes' if asset.tradable else 'No'}")
             response_parts.append("-" * 30)
-        
+
+        response_parts.append(f"Showing {offset + 1}-{offset + len(assets)} of {total} matching assets"
+                              + (f" after {after}" if after else ""))
+        if offset + limit < total:
+            response_parts.append(f"Next cursor: {encode_cursor(assets[-1].symbol)}")
+
         return "\n".join(response_parts)
         
     except Exception as e:
@@ -1704,9 +4086,10 @@ async def create_watchlist(name: str, symbols: List[str]) -> str:
     Returns:
         str: Confirmation message with watchlist creation status
     """
+    from alpaca.trading.requests import CreateWatchlistRequest
     try:
         watchlist_data = CreateWatchlistRequest(name=name, symbols=symbols)
-        watchlist = trade_client.create_watchlist(watchlist_data)
+        watchlist = await sdk_executor.run("trading", trade_client.create_watchlist, watchlist_data)
         return f"Watchlist '{name}' created successfully with {len(symbols)} symbols."
     except Exception as e:
         return f"Error creating watchlist: {str(e)}"
@@ -1715,7 +4098,7 @@ async def create_watchlist(name: str, symbols: List[str]) -> str:
 async def get_watchlists() -> str:
     """Get all watchlists for the account."""
     try:
-        watchlists = trade_client.get_watchlists()
+        watchlists = await sdk_executor.run("trading", trade_client.get_watchlists)
         result = "Watchlists:\n------------\n"
         for wl in watchlists:
             result += f"Name: {wl.name}\n"
@@ -1731,9 +4114,10 @@ async def get_watchlists() -> str:
 @mcp.tool()
 async def update_watchlist(watchlist_id: str, name: str = None, symbols: List[str] = None) -> str:
     """Update an existing watchlist."""
+    from alpaca.trading.requests import UpdateWatchlistRequest
     try:
         update_request = UpdateWatchlistRequest(name=name, symbols=symbols)
-        watchlist = trade_client.update_watchlist_by_id(watchlist_id, update_request)
+        watchlist = await sdk_executor.run("trading", trade_client.update_watchlist_by_id, watchlist_id, update_request)
         return f"Watchlist updated successfully: {watchlist.name}"
     except Exception as e:
         return f"Error updating watchlist: {str(e)}"
@@ -1755,7 +4139,7 @@ async def get_market_clock() -> str:
             - Next Close Time
     """
     try:
-        clock = trade_client.get_clock()
+        clock = await _cached_trading_call("clock", None, trade_client.get_clock, ttl_for=_clock_ttl)
         return f"""
                 Market Status:
                 -------------
@@ -1768,25 +4152,35 @@ async def get_market_clock() -> str:
         return f"Error fetching market clock: {str(e)}"
 
 @mcp.tool()
-async def get_market_calendar(start_date: str, end_date: str) -> str:
+async def get_market_calendar(start_date: str, end_date: str, format: str = "text") -> str:
     """
     Retrieves and formats market calendar for specified date range.
     
     Args:
         start_date (str): Start date in YYYY-MM-DD format
         end_date (str): End date in YYYY-MM-DD format
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing market calendar information
     """
+    from alpaca.trading.requests import GetCalendarRequest
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
         # Convert string dates to date objects
         start_dt = _parse_date_ymd(start_date)
         end_dt = _parse_date_ymd(end_date)
         
         # Create the request object with the correct parameters
         calendar_request = GetCalendarRequest(start=start_dt, end=end_dt)
-        calendar = trade_client.get_calendar(calendar_request)
+        calendar = await _cached_trading_call("calendar", (start_dt, end_dt),
+                                              trade_client.get_calendar, calendar_request)
+        
+        if format != "text":
+            return serialize(calendar, CALENDAR_SCHEMA, format)
         
         result = f"Market Calendar ({start_date} to {end_date}):\n----------------------------\n"
         for day in calendar:
@@ -1808,7 +4202,8 @@ async def get_corporate_announcements(
     cusips: Optional[List[str]] = None,
     ids: Optional[List[str]] = None,
     limit: Optional[int] = 1000,
-    sort: Optional[str] = "asc"
+    sort: Optional[str] = "asc",
+    format: str = "text"
 ) -> str:
     """
     Retrieves and formats corporate action announcements.
@@ -1836,6 +4231,7 @@ async def get_corporate_announcements(
         ids (Optional[List[str]]): Optional list of corporate action IDs (mutually exclusive with other filters)
         limit (Optional[int]): Maximum number of results to return (default: 1000)
         sort (Optional[str]): Sort order (asc or desc, default: asc)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing corporate announcement details
@@ -1845,7 +4241,12 @@ async def get_corporate_announcements(
         - CorporateActionsType Enum: https://alpaca.markets/sdks/python/api_reference/data/enums.html#corporateactionstype
         - CorporateActionsRequest: https://alpaca.markets/sdks/python/api_reference/data/corporate_actions/requests.html#corporateactionsrequest
     """
+    from alpaca.data.requests import CorporateActionsRequest
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
         request = CorporateActionsRequest(
             symbols=symbols,
             cusips=cusips,
@@ -1856,12 +4257,22 @@ async def get_corporate_announcements(
             limit=limit,
             sort=sort
         )
-        announcements = corporate_actions_client.get_corporate_actions(request)
+        announcements = await _shared_call("corporate_actions", corporate_actions_client.get_corporate_actions, request)
+        
+        if format != "text":
+            # Tag each action with its category (the response groups actions by type)
+            records = [
+                SimpleNamespace(action_type=action_type, **vars(action))
+                for action_type, actions_list in (announcements.data if announcements else {}).items()
+                for action in actions_list or []
+            ]
+            return serialize(records, CORPORATE_ACTION_SCHEMA, format)
         
         if not announcements or not announcements.data:
             return "No corporate announcements found for the specified criteria."
         
-        result = "Corporate Announcements:\n----------------------\n"
+        out = Renderer()
+        out.write("Corporate Announcements:\n----------------------\n")
         
         # The response.data contains action types as keys (e.g., 'cash_dividends', 'forward_splits')
         # Each value is a list of corporate actions
@@ -1869,54 +4280,10 @@ async def get_corporate_announcements(
             if not actions_list:
                 continue
                 
-            result += f"\n{action_type.replace('_', ' ').title()}:\n"
-            result += "=" * 30 + "\n"
-            
-            for action in actions_list:
-                # Group by symbol for better organization
-                symbol = getattr(action, 'symbol', 'Unknown')
-                result += f"\nSymbol: {symbol}\n"
-                result += "-" * 15 + "\n"
-                
-                # Display action details based on available attributes
-                if hasattr(action, 'corporate_action_type'):
-                    result += f"Type: {action.corporate_action_type}\n"
-                
-                if hasattr(action, 'ex_date') and action.ex_date:
-                    result += f"Ex Date: {action.ex_date}\n"
-                    
-                if hasattr(action, 'record_date') and action.record_date:
-                    result += f"Record Date: {action.record_date}\n"
-                    
-                if hasattr(action, 'payable_date') and action.payable_date:
-                    result += f"Payable Date: {action.payable_date}\n"
-                    
-                if hasattr(action, 'process_date') and action.process_date:
-                    result += f"Process Date: {action.process_date}\n"
-                
-                # Cash dividend specific fields
-                if hasattr(action, 'rate') and action.rate:
-                    result += f"Rate: ${action.rate:.6f}\n"
-                    
-                if hasattr(action, 'foreign') and hasattr(action, 'special'):
-                    result += f"Foreign: {action.foreign}, Special: {action.special}\n"
-                
-                # Split specific fields
-                if hasattr(action, 'old_rate') and action.old_rate:
-                    result += f"Old Rate: {action.old_rate}\n"
-                    
-                if hasattr(action, 'new_rate') and action.new_rate:
-                    result += f"New Rate: {action.new_rate}\n"
-                
-                # Due bill dates
-                if hasattr(action, 'due_bill_on_date') and action.due_bill_on_date:
-                    result += f"Due Bill On Date: {action.due_bill_on_date}\n"
-                    
-                if hasattr(action, 'due_bill_off_date') and action.due_bill_off_date:
-                    result += f"Due Bill Off Date: {action.due_bill_off_date}\n"
-                
-                result += "\n"
-        return result
+            out.line(f"\n{action_type.replace('_', ' ').title()}:")
+            out.line("=" * 30)
+            out.rows(CORPORATE_ACTION_ROW, actions_list)
+        return out.render()
     except Exception as e:
         return f"Error fetching corporate announcements: {str(e)}"
 
@@ -2033,7 +4400,8 @@ async def get_option_contracts(
     type: Optional[ContractType] = None,
     status: Optional[AssetStatus] = None,
     root_symbol: Optional[str] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    format: str = "text"
 ) -> str:
     """
     Retrieves option contracts - direct mapping to GetOptionContractsRequest.
@@ -2049,12 +4417,18 @@ async def get_option_contracts(
         status (Optional[AssetStatus]): "active" (default)
         root_symbol (Optional[str]): Root symbol filter
         limit (Optional[int]): Maximum number of contracts to return
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Examples:
         get_option_contracts("NVDA", expiration_expression="week of September 2, 2025")
         get_option_contracts("SPY", expiration_date_gte=date(2025,9,1), expiration_date_lte=date(2025,9,5))
     """
+    from alpaca.trading.requests import GetOptionContractsRequest
     try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
         # Handle natural language expression
         if expiration_expression:
             parsed = _parse_expiration_expression(expiration_expression)
@@ -2083,7 +4457,10 @@ async def get_option_contracts(
         )
         
         # Execute API call
-        response = trade_client.get_option_contracts(request)
+        response = await _shared_call("trading", trade_client.get_option_contracts, request)
+        
+        if format != "text":
+            return serialize(response.option_contracts if response else [], OPTION_CONTRACT_SCHEMA, format)
         
         if not response or not response.option_contracts:
             return f"No option contracts found for {underlying_symbol}."
@@ -2121,19 +4498,161 @@ async def get_option_contracts(
     except Exception as e:
         return f"Error: {str(e)}"
 
+@mcp.tool()
+async def get_option_chain(
+    underlying_symbol: str,
+    type: Optional[ContractType] = None,
+    min_days_to_expiration: int = 0,
+    max_days_to_expiration: int = 45,
+    max_expirations: Optional[int] = None,
+    strike_price_gte: Optional[float] = None,
+    strike_price_lte: Optional[float] = None,
+    strikes_per_expiration: Optional[int] = None,
+    delta_min: Optional[float] = None,
+    delta_max: Optional[float] = None,
+    min_open_interest: Optional[float] = None,
+    max_spread_pct: Optional[float] = None,
+    feed: Optional[OptionsFeed] = None,
+    format: str = "text"
+) -> str:
+    """
+    Retrieves an option chain with quotes, IV and Greeks, filtered in one call.
+    
+    The contracts (all pages) and their snapshots are fetched once per underlying and
+    expiration window, indexed by expiration and strike, and cached for
+    ALPACA_CACHE_TTL_OPTION_CHAIN seconds, so follow-up queries on the same chain
+    make no API requests.
+    
+    Args:
+        underlying_symbol (str): Underlying asset symbol (e.g., 'SPY', 'AAPL')
+        type (Optional[ContractType]): "call" or "put" (default: both)
+        min_days_to_expiration (int): Earliest expiration, in days from today (default: 0)
+        max_days_to_expiration (int): Latest expiration, in days from today (default: 45)
+        max_expirations (Optional[int]): Only the nearest N expirations in the window
+        strike_price_gte/lte (Optional[float]): Strike price range
+        strikes_per_expiration (Optional[int]): Keep the N strikes nearest the underlying price in each
+            expiration, after the other filters (e.g., 5 for "5 strikes around the money")
+        delta_min/delta_max (Optional[float]): Band on the absolute delta (e.g., 0.2 and 0.4; puts match by |delta|)
+        min_open_interest (Optional[float]): Minimum open interest
+        max_spread_pct (Optional[float]): Maximum bid/ask spread as a percent of the midpoint
+        feed (Optional[OptionsFeed]): The source feed of the data (opra or indicative)
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
+    
+    Examples:
+        get_option_chain("SPY", strikes_per_expiration=5, delta_min=0.2, delta_max=0.4)
+        get_option_chain("AAPL", type="put", max_expirations=2, min_open_interest=100)
+    """
+    from option_chain import COLUMNS
+    try:
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        if min_days_to_expiration < 0 or max_days_to_expiration < min_days_to_expiration:
+            return "Error: Expiration window must satisfy 0 <= min_days_to_expiration <= max_days_to_expiration."
+        for name, value in (("max_expirations", max_expirations), ("strikes_per_expiration", strikes_per_expiration)):
+            if value is not None and value < 1:
+                return f"Error: {name} must be at least 1."
+        
+        underlying_symbol = underlying_symbol.strip().upper()
+        today = date.today()
+        chain = await _get_option_chain(underlying_symbol, today + timedelta(days=max_days_to_expiration), feed)
+        contract_type = getattr(type, "value", type)
+        rows = chain.query(
+            contract_type=str(contract_type).lower() if contract_type else None,
+            expiration_gte=today + timedelta(days=min_days_to_expiration),
+            max_expirations=max_expirations,
+            strike_gte=strike_price_gte,
+            strike_lte=strike_price_lte,
+            strikes_per_expiration=strikes_per_expiration,
+            delta_min=delta_min,
+            delta_max=delta_max,
+            min_open_interest=min_open_interest,
+            max_spread_pct=max_spread_pct
+        )
+        records = chain.records(rows)
+        
+        if format != "text":
+            return serialize(records, OPTION_CHAIN_SCHEMA, format)
+        
+        if not len(chain):
+            return f"No option contracts found for {underlying_symbol} expiring within {max_days_to_expiration} days."
+        
+        price = f"${chain.underlying_price:.2f}" if chain.underlying_price is not None else "n/a"
+        out = Renderer()
+        out.line(f"Option Chain for {underlying_symbol} (underlying {price}, {len(chain)} contracts in "
+                 f"{len(chain.expirations)} expirations, data age {chain.age:.0f}s):")
+        local_count = int(chain.local_greeks[rows].sum())
+        out.line(f"Showing {len(records)} contracts"
+                 + (f" ({local_count} with IV/Greeks computed locally)" if local_count else ""))
+        if strikes_per_expiration is not None and chain.underlying_price is None:
+            out.line("Note: underlying price unavailable, strikes_per_expiration was not applied")
+        out.line("=" * 50)
+        
+        def cell(value: Optional[float], template: str = "{:.2f}") -> str:
+            return template.format(value) if value is not None and value == value else "-"
+        
+        current = None
+        for record in records:
+            row = dict(zip(COLUMNS, record))
+            if row["expiration"] != current:
+                current = row["expiration"]
+                out.line()
+                out.line(f"Expiration {current} ({(current - today).days} DTE):")
+                out.line("Strike | Type | Bid | Ask | Last | IV | Delta | Gamma | Theta | Vega | OI | Symbol")
+            out.line(" | ".join([
+                cell(row["strike"]), row["type"], cell(row["bid"]), cell(row["ask"]), cell(row["last"]),
+                cell(row["iv"], "{:.1%}"), cell(row["delta"], "{:.3f}"), cell(row["gamma"], "{:.4f}"),
+                cell(row["theta"], "{:.3f}"), cell(row["vega"], "{:.3f}"), cell(row["open_interest"], "{:,.0f}"),
+                row["symbol"]
+            ]))
+        if not records:
+            out.line("No contracts matched the filters.")
+        return out.render()
+    except Exception as e:
+        return f"Error retrieving option chain for {underlying_symbol}: {str(e)}"
+
+async def _get_streamed_option_data(kind: str, symbols: List[str], feed=None) -> Dict[str, Any]:
+    """
+    Look up the latest streamed quotes or trades for option contracts.
+
+    Args:
+        kind (str): 'quote' or 'trade'
+        symbols (List[str]): OCC option symbols
+        feed: Requested options feed (the stream only serves its own feed)
+
+    Returns:
+        Option symbol -> cached SDK model, for the contracts the stream can answer; the rest
+        should be fetched over REST. Contracts that are not yet subscribed are subscribed in
+        the background, all in one subscription.
+    """
+    if option_data_cache is None or not option_data_cache.serves(feed):
+        return {}
+    new_symbols = [symbol for symbol in symbols if option_data_cache.wants(symbol)]
+    if new_symbols:
+        _subscribe_later("option_stream", option_data_cache, new_symbols)
+    lookup = getattr(option_data_cache, f"get_{kind}")
+    found = {symbol: lookup(symbol) for symbol in symbols if symbol not in new_symbols}
+    return {symbol: value for symbol, value in found.items() if value is not None}
+
 @mcp.tool()
 async def get_option_latest_quote(
-    symbol: str,
-    feed: Optional[OptionsFeed] = None
+    symbol: Union[str, List[str]],
+    feed: Optional[OptionsFeed] = None,
+    format: str = "text"
 ) -> str:
     """
-    Retrieves and formats the latest quote for an option contract. This endpoint returns real-time
+    Retrieves and formats the latest quote for one or more option contracts. This endpoint returns real-time
     pricing and market data, including bid/ask prices, sizes, and exchange information.
     
+    With ALPACA_OPTION_STREAM enabled, requested contracts are subscribed on the options
+    stream and later requests are answered from memory.
+    
     Args:
-        symbol (str): The option contract symbol (e.g., 'AAPL230616C00150000')
+        symbol (Union[str, List[str]]): The option contract symbol(s) (e.g., 'AAPL230616C00150000'
+            or the legs of a spread)
         feed (Optional[OptionsFeed]): The source feed of the data (opra or indicative).
             Default: opra if the user has the options subscription, indicative otherwise.
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing the latest quote information including:
@@ -2148,20 +4667,32 @@ async def get_option_latest_quote(
         This endpoint returns real-time market data. For contract specifications and static data,
         use get_option_contracts instead.
     """
+    from alpaca.data.requests import OptionLatestQuoteRequest
     try:
-        # Create the request object
-        request = OptionLatestQuoteRequest(
-            symbol_or_symbols=symbol,
-            feed=feed
-        )
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
+        
+        # Serve from the live stream when possible, fetch the rest over REST in one request
+        symbols = [symbol] if isinstance(symbol, str) else symbol
+        quotes = await _get_streamed_option_data("quote", symbols, feed)
+        missing = [sym for sym in symbols if sym not in quotes]
+        if missing:
+            request = OptionLatestQuoteRequest(
+                symbol_or_symbols=missing,
+                feed=feed
+            )
+            quotes.update(await _shared_call("option_data", option_historical_data_client.get_option_latest_quote, request))
         
-        # Get the latest quote
-        quotes = option_historical_data_client.get_option_latest_quote(request)
+        if format != "text":
+            return serialize([quotes[sym] for sym in symbols if sym in quotes], QUOTE_SCHEMA, format)
         
-        if symbol in quotes:
-            quote = quotes[symbol]
+        def describe(sym: str) -> str:
+            if sym not in quotes:
+                return f"No quote data found for {sym}."
+            quote = quotes[sym]
             return f"""
-                Latest Quote for {symbol}:
+                Latest Quote for {sym}:
                 ------------------------
                 Ask Price: ${float(quote.ask_price):.2f}
                 Ask Size: {quote.ask_size}
@@ -2173,15 +4704,15 @@ async def get_option_latest_quote(
                 Tape: {quote.tape}
                 Timestamp: {quote.timestamp}
                 """
-        else:
-            return f"No quote data found for {symbol}."
+        
+        return "\n".join(describe(sym) for sym in symbols)
             
     except Exception as e:
         return f"Error fetching option quote: {str(e)}"
 
 
 @mcp.tool()
-async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Optional[OptionsFeed] = None) -> str:
+async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Optional[OptionsFeed] = None, format: str = "text") -> str:
     """
     Retrieves comprehensive snapshots of option contracts including latest trade, quote, implied volatility, and Greeks.
     This endpoint provides a complete view of an option's current market state and theoretical values.
@@ -2191,6 +4722,7 @@ async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Op
             (e.g., 'AAPL250613P00205000')
         feed (Optional[OptionsFeed]): The source feed of the data (opra or indicative).
             Default: opra if the user has the options subscription, indicative otherwise.
+        format (str): Output format - "text" (default), or "json", "csv" or "columnar" for compact machine-readable output
     
     Returns:
         str: Formatted string containing a comprehensive snapshot including:
@@ -2213,82 +4745,80 @@ async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Op
                 * Rho (interest rate sensitivity)
                 * Theta (time decay)
                 * Vega (volatility sensitivity)
+    
+    With ALPACA_OPTION_STREAM and ALPACA_LOCAL_GREEKS enabled, contracts with a live streamed
+    quote are answered from the stream, with IV and Greeks computed locally from the quote.
     """
+    from alpaca.data.models import OptionsSnapshot
+    from alpaca.data.requests import OptionSnapshotRequest
     try:
-        # Create snapshot request
-        request = OptionSnapshotRequest(
-            symbol_or_symbols=symbol_or_symbols,
-            feed=feed
-        )
+        format_error = check_output_format(format)
+        if format_error:
+            return format_error
         
-        # Get snapshots
-        snapshots = option_historical_data_client.get_option_snapshot(request)
+        symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
+        snapshots, local = {}, {}
+        if LOCAL_GREEKS:
+            # The stream has no IV or Greeks, so streamed contracts are only used when they can be priced
+            quotes = await _get_streamed_option_data("quote", symbols, feed)
+            trades = await _get_streamed_option_data("trade", list(quotes), feed) if quotes else {}
+            streamed = {sym: OptionsSnapshot.model_construct(symbol=sym, latest_quote=quote,
+                                                              latest_trade=trades.get(sym))
+                        for sym, quote in quotes.items()}
+            local = await _local_option_greeks(streamed, list(streamed)) if streamed else {}
+            snapshots = {sym: snapshot for sym, snapshot in streamed.items() if sym in local}
         
-        # Format the response
-        result = "Option Snapshots:\n"
-        result += "================\n\n"
+        missing = [sym for sym in symbols if sym not in snapshots]
+        if missing:
+            request = OptionSnapshotRequest(
+                symbol_or_symbols=missing,
+                feed=feed
+            )
+            fetched = await _shared_call("option_data", option_historical_data_client.get_option_snapshot, request)
+            snapshots.update(fetched)
+            # Fill IV/Greeks the feed left out (common on the indicative feed)
+            if LOCAL_GREEKS:
+                local.update(await _local_option_greeks(fetched, missing))
         
-        # Handle both single symbol and list of symbols
-        symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
+        if format != "text":
+            records = [snapshots[symbol] if symbol not in local else
+                       snapshots[symbol].model_copy(update=vars(local[symbol]))
+                       for symbol in symbols if snapshots.get(symbol) is not None]
+            return serialize(records, OPTION_SNAPSHOT_SCHEMA, format)
+        
+        # Format the response
+        out = Renderer()
+        out.write("Option Snapshots:\n")
+        out.write("================\n\n")
         
         for symbol in symbols:
             snapshot = snapshots.get(symbol)
             if snapshot is None:
-                result += f"No data available for {symbol}\n"
+                out.line(f"No data available for {symbol}")
                 continue
                 
-            result += f"Symbol: {symbol}\n"
-            result += "-----------------\n"
+            out.line(f"Symbol: {symbol}")
+            out.line("-----------------")
             
-            # Latest Quote
             if snapshot.latest_quote:
-                quote = snapshot.latest_quote
-                result += f"Latest Quote:\n"
-                result += f"  Bid Price: ${quote.bid_price:.6f}\n"
-                result += f"  Bid Size: {quote.bid_size}\n"
-                result += f"  Bid Exchange: {quote.bid_exchange}\n"
-                result += f"  Ask Price: ${quote.ask_price:.6f}\n"
-                result += f"  Ask Size: {quote.ask_size}\n"
-                result += f"  Ask Exchange: {quote.ask_exchange}\n"
-                if quote.conditions:
-                    result += f"  Conditions: {quote.conditions}\n"
-                if quote.tape:
-                    result += f"  Tape: {quote.tape}\n"
-                result += f"  Timestamp: {quote.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f %Z')}\n"
-            
-            # Latest Trade
+                out.row(OPTION_QUOTE_ROW, snapshot.latest_quote)
             if snapshot.latest_trade:
-                trade = snapshot.latest_trade
-                result += f"Latest Trade:\n"
-                result += f"  Price: ${trade.price:.6f}\n"
-                result += f"  Size: {trade.size}\n"
-                if trade.exchange:
-                    result += f"  Exchange: {trade.exchange}\n"
-                if trade.conditions:
-                    result += f"  Conditions: {trade.conditions}\n"
-                if trade.tape:
-                    result += f"  Tape: {trade.tape}\n"
-                if trade.id:
-                    result += f"  Trade ID: {trade.id}\n"
-                result += f"  Timestamp: {trade.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f %Z')}\n"
-            
-            # Implied Volatility
-            if snapshot.implied_volatility is not None:
-                result += f"Implied Volatility: {snapshot.implied_volatility:.2%}\n"
-            
-            # Greeks
-            if snapshot.greeks:
-                greeks = snapshot.greeks
-                result += f"Greeks:\n"
-                result += f"  Delta: {greeks.delta:.4f}\n"
-                result += f"  Gamma: {greeks.gamma:.4f}\n"
-                result += f"  Rho: {greeks.rho:.4f}\n"
-                result += f"  Theta: {greeks.theta:.4f}\n"
-                result += f"  Vega: {greeks.vega:.4f}\n"
+                out.row(OPTION_TRADE_ROW, snapshot.latest_trade)
+            if symbol in local:
+                out.line(f"Implied Volatility: {local[symbol].implied_volatility:.2%}"
+                         + (" (computed locally)" if snapshot.implied_volatility is None else ""))
+                out.row(OPTION_GREEKS_ROW, local[symbol].greeks)
+                if snapshot.greeks is None:
+                    out.line("  (Greeks computed locally with Black-Scholes)")
+            else:
+                if snapshot.implied_volatility is not None:
+                    out.line(f"Implied Volatility: {snapshot.implied_volatility:.2%}")
+                if snapshot.greeks:
+                    out.row(OPTION_GREEKS_ROW, snapshot.greeks)
             
-            result += "\n"
+            out.line()
         
-        return result
+        return out.render()
         
     except Exception as e:
         return f"Error retrieving option snapshots: {str(e)}"
@@ -2340,8 +4870,9 @@ def _convert_order_class_string(order_class: Optional[Union[str, OrderClass]]) -
     else:
         return f"Invalid order class type: {type(order_class)}. Must be string or OrderClass enum."
 
-def _process_option_legs(legs: List[Dict[str, Any]]) -> Union[List[OptionLegRequest], str]:
+def _process_option_legs(legs: List[Dict[str, Any]]) -> Union[List['OptionLegRequest'], str]:
     """Convert leg dictionaries to OptionLegRequest objects."""
+    from alpaca.trading.requests import OptionLegRequest
     order_legs = []
     for leg in legs:
         # Validate ratio_qty
@@ -2364,13 +4895,14 @@ def _process_option_legs(legs: List[Dict[str, Any]]) -> Union[List[OptionLegRequ
     return order_legs
 
 def _create_option_market_order_request(
-    order_legs: List[OptionLegRequest], 
+    order_legs: List['OptionLegRequest'], 
     order_class: OrderClass, 
     quantity: int,
     time_in_force: TimeInForce,
     extended_hours: bool
-) -> MarketOrderRequest:
+) -> 'MarketOrderRequest':
     """Create the appropriate MarketOrderRequest based on order class."""
+    from alpaca.trading.requests import MarketOrderRequest
     if order_class == OrderClass.MLEG:
         return MarketOrderRequest(
             qty=quantity,
@@ -2394,7 +4926,7 @@ def _create_option_market_order_request(
             type=OrderType.MARKET
         )
 
-def _format_option_order_response(order: Order, order_class: OrderClass, order_legs: List[OptionLegRequest]) -> str:
+def _format_option_order_response(order: 'Order', order_class: OrderClass, order_legs: List['OptionLegRequest']) -> str:
     """Format the successful order response."""
     result = f"""
             Option Market Order Placed Successfully:
@@ -2436,7 +4968,7 @@ def _format_option_order_response(order: Order, order_class: OrderClass, order_l
     
     return result
 
-def _analyze_option_strategy_type(order_legs: List[OptionLegRequest], order_class: OrderClass) -> tuple[bool, bool, bool]:
+def _analyze_option_strategy_type(order_legs: List['OptionLegRequest'], order_class: OrderClass) -> tuple[bool, bool, bool]:
     """Analyze the option strategy type for error handling."""
     is_short_straddle = False
     is_short_strangle = False
@@ -2549,7 +5081,7 @@ def _get_uncovered_options_error_message() -> str:
     - Ensure all positions are properly hedged
     """
 
-def _handle_option_api_error(error_message: str, order_legs: List[OptionLegRequest], order_class: OrderClass) -> str:
+def _handle_option_api_error(error_message: str, order_legs: List['OptionLegRequest'], order_class: OrderClass) -> str:
     """Handle API errors with specific option strategy analysis."""
     if "40310000" in error_message and "not eligible to trade uncovered option contracts" in error_message:
         is_short_straddle, is_short_strangle, is_short_calendar = _analyze_option_strategy_type(order_legs, order_class)
@@ -2646,6 +5178,7 @@ async def place_option_market_order(
         - Level 4: Uncovered options (naked calls/puts), Short Strangles, Short Straddles, Short Call Calendar Spread, etc.
         If you receive a permission error, please check your account's option trading level.
     """
+    from alpaca.trading.requests import OptionLegRequest
     # Initialize variables that might be used in exception handlers
     order_legs: List[OptionLegRequest] = []
     
@@ -2686,7 +5219,7 @@ async def place_option_market_order(
         )
         
         # Submit order
-        order = trade_client.submit_order(order_data)
+        order = await sdk_executor.run("orders", trade_client.submit_order, order_data)
         
         # Format and return response
         return _format_option_order_response(order, order_class, order_legs)
@@ -2706,6 +5239,219 @@ async def place_option_market_order(
         """
 
 
+# ============================================================================
+# Server Diagnostics Tools
+# ============================================================================
+
+@mcp.tool()
+async def get_server_stats() -> str:
+    """
+    Retrieves runtime statistics for the server's performance layers.
+
+    Returns:
+        str: Formatted string containing:
+            - SDK dispatch: concurrency limit, in-flight calls, queue depth and wait/run times per client
+            - SDK clients: whether each client has been created yet and its construction time
+            - Live stock data stream (if enabled): connection status, subscriptions and cache hits/misses
+            - Live crypto data stream (if enabled): connection status, subscriptions, order books and cache hits/misses
+            - Live option data stream (if enabled): connection status, contracts subscribed/dropped and cache hits/misses
+            - Reference data cache: TTL and hit/miss counters per endpoint
+            - Bar store (if enabled): on-disk footprint and full/partial/miss counts
+            - HTTP connection pools: open/idle connections, request counts and latency per API host
+            - Rate limits: request budget, throttled waits and 429 retries per API family
+            - Request coalescing: identical concurrent calls that shared one upstream request
+            - Tracing: sample ratio and number of traced calls (when enabled)
+    """
+    try:
+        executor_stats = sdk_executor.stats()
+        result = [
+            "Server Statistics:",
+            "==================",
+            f"SDK Worker Threads: {sdk_executor.max_workers}",
+            ""
+        ]
+        if not executor_stats:
+            result.append("No SDK calls dispatched yet.")
+        for client_name, lane in sorted(executor_stats.items()):
+            result.extend([
+                f"Client: {client_name}",
+                f"  Concurrency Limit: {lane['limit']}",
+                f"  In Flight: {lane['in_flight']}",
+                f"  Queue Depth: {lane['queue_depth']} (peak {lane['max_queue_depth']})",
+                f"  Completed: {lane['completed']}, Failed: {lane['failed']}",
+                f"  Avg Wait: {lane['avg_wait_ms']:.1f} ms, Avg Run: {lane['avg_run_ms']:.1f} ms",
+                "-" * 30
+            ])
+
+        result.extend(["", "SDK Clients:", "------------"])
+        for client_name, client in clients.stats().items():
+            status = f"created in {client['init_ms']:.1f} ms" if client["created"] else "not created"
+            result.append(f"  {client_name}: {status}")
+
+        if stock_data_cache is not None:
+            stream = stock_data_cache.stats()
+            result.extend([
+                "",
+                "Live Stock Data Stream:",
+                "-----------------------",
+                f"  Feed: {stream['feed']}, Connected: {'Yes' if stream['connected'] else 'No'}",
+                f"  Symbols: {stream['symbols']} / {stream['max_symbols']}, Messages: {stream['messages']}",
+                f"  Cache Hits: {stream['hits']}, Misses: {stream['misses']}, Stale: {stream['stale']}"
+            ])
+
+        if crypto_data_cache is not None:
+            stream = crypto_data_cache.stats()
+            result.extend([
+                "",
+                "Live Crypto Data Stream:",
+                "------------------------",
+                f"  Feed: {stream['feed']}, Connected: {'Yes' if stream['connected'] else 'No'}",
+                f"  Symbols: {stream['symbols']} / {stream['max_symbols']}, Order Books: {stream['books']}, "
+                f"Messages: {stream['messages']}",
+                f"  Book Updates: {stream['book_updates']} (errors: {stream['book_errors']})",
+                f"  Cache Hits: {stream['hits']}, Misses: {stream['misses']}, Stale: {stream['stale']}"
+            ])
+
+        if option_data_cache is not None:
+            stream = option_data_cache.stats()
+            result.extend([
+                "",
+                "Live Option Data Stream:",
+                "------------------------",
+                f"  Feed: {stream['feed']}, Connected: {'Yes' if stream['connected'] else 'No'}",
+                f"  Contracts: {stream['symbols']} / {stream['max_symbols']}, Subscribed: {stream['subscribed']}, "
+                f"Dropped When Idle: {stream['unsubscribed']}, Messages: {stream['messages']}",
+                f"  Cache Hits: {stream['hits']}, Misses: {stream['misses']}, Stale: {stream['stale']}"
+            ])
+
+        if order_mirror is not None:
+            mirror = order_mirror.stats()
+            age = mirror["last_reconcile_age"]
+            result.extend([
+                "",
+                "Order Mirror:",
+                "-------------",
+                f"  Connected: {'Yes' if mirror['connected'] else 'No'}, Synced: {'Yes' if mirror['synced'] else 'No'}, "
+                f"Persistent: {'Yes' if mirror['persistent'] else 'No'}",
+                f"  Orders: {mirror['orders']} ({mirror['open_orders']} open), Fills: {mirror['fills']}, "
+                f"Trade Updates: {mirror['events']}",
+                f"  Reconciliations: {mirror['reconciliations']} (errors: {mirror['reconcile_errors']}), "
+                f"Last: {f'{age:.0f}s ago' if age is not None else 'never'}",
+                f"  Served Locally: {mirror['hits']}, REST Fallbacks: {mirror['fallbacks']}"
+            ])
+            if mirror["retry_in"] is not None:
+                result.append(f"  Reconcile Backoff: {mirror['consecutive_errors']} failures in a row, "
+                              f"next attempt in {mirror['retry_in']:.0f}s")
+            if mirror["last_error"]:
+                result.append(f"  Last Error: {mirror['last_error']}")
+
+        flights = coalescer.stats()
+        if flights:
+            result.extend(["", "Request Coalescing:", "-------------------"])
+        for name, counters in flights.items():
+            result.append(
+                f"  {name}: Calls: {counters['calls']}, Upstream: {counters['upstream']}, "
+                f"Coalesced: {counters['coalesced']}, In Flight: {counters['in_flight']}"
+            )
+
+        if tracer.enabled:
+            trace_stats = tracer.stats()
+            result.extend([
+                "",
+                "Tracing:",
+                "--------",
+                f"  Sample Ratio: {trace_stats['sample_ratio']:g}, Traced Calls: {trace_stats['sampled']}, "
+                f"Not Sampled: {trace_stats['skipped']}"
+            ])
+
+        cache = reference_cache.stats()
+        result.extend([
+            "",
+            "Reference Data Cache:",
+            "--------------------",
+            f"  Entries: {cache['entries']} / {cache['maxsize']}, Evictions: {cache['evictions']}, Expirations: {cache['expirations']}"
+        ])
+        for endpoint, counters in cache["endpoints"].items():
+            ttl = f"{counters['ttl']:g}s" if counters['ttl'] > 0 else "disabled"
+            result.append(
+                f"  {endpoint}: TTL {ttl}, Hits: {counters['hits']}, Misses: {counters['misses']}, "
+                f"Invalidations: {counters['invalidations']}"
+            )
+
+        if bar_store is not None:
+            store = bar_store.stats()
+            result.extend([
+                "",
+                "Bar Store:",
+                "----------",
+                f"  Location: {store['root']} ({store['files']} files, {store['bytes'] / 1024:.1f} KiB)",
+                f"  Served From Disk: {store['hits']}, Partial: {store['partial_hits']}, Misses: {store['misses']}",
+                f"  Bars Read: {store['bars_read']}, Bars Fetched: {store['bars_fetched']}"
+            ])
+
+        limits = rate_limiter.stats()
+        if limits:
+            result.extend(["", "Rate Limits:", "------------"])
+        for family, bucket in limits.items():
+            waits = ", ".join(f"{name} {ms:.0f} ms" for name, ms in bucket["wait_ms_by_priority"].items())
+            result.extend([
+                f"Family: {family}",
+                f"  Budget: {bucket['per_minute']:g}/min (order reserve {bucket['reserve']}), "
+                f"Tokens: {bucket['tokens']:.1f}, Waiting: {bucket['waiting']}",
+                f"  Requests: {bucket['acquired']}, Throttled: {bucket['throttled']}",
+                f"  Avg Wait: {bucket['avg_wait_ms']:.1f} ms, Max Wait: {bucket['max_wait_ms']:.1f} ms",
+                f"  Total Wait by Priority: {waits or 'none'}",
+                f"  429 Responses: {bucket['rate_limited']}, Retries: {bucket['retries']}",
+                "-" * 30
+            ])
+
+        pool_stats = transport_stats()
+        if pool_stats:
+            result.extend(["", "HTTP Connection Pools:", "---------------------"])
+        for host, pool in sorted(pool_stats.items()):
+            result.extend([
+                f"Host: {host}",
+                f"  Backend: {pool['backend']} (HTTP/2: {'Yes' if pool['http2'] else 'No'})",
+                f"  Connections: {pool['open']} open, {pool['idle']} idle (max {pool['max_connections']})",
+                f"  Requests: {pool['requests']}, Errors: {pool['errors']}, In Flight: {pool['in_flight']}",
+                f"  Avg Latency: {pool['avg_ms']:.1f} ms",
+                "-" * 30
+            ])
+        return "\n".join(result)
+    except Exception as e:
+        return f"Error fetching server statistics: {str(e)}"
+
+@mcp.tool()
+async def clear_reference_cache(endpoint: Optional[str] = None) -> str:
+    """
+    Invalidates cached reference data so the next call fetches fresh values.
+    
+    Args:
+        endpoint (Optional[str]): Endpoint to clear ('clock', 'calendar', 'asset', 'assets' or 'option_chain').
+            Clears every endpoint when omitted.
+    
+    Returns:
+        str: Number of cache entries removed
+    """
+    try:
+        if endpoint is not None and endpoint not in reference_cache.ttls:
+            return f"Invalid endpoint: {endpoint}. Must be one of: {', '.join(reference_cache.ttls)}."
+        removed = reference_cache.invalidate(endpoint)
+        return f"Cleared {removed} cached entries for {endpoint or 'all endpoints'}."
+    except Exception as e:
+        return f"Error clearing reference cache: {str(e)}"
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Any) -> Any:
+    """Prometheus scrape endpoint (served by the http and sse transports only)."""
+    from starlette.responses import Response
+
+    if not METRICS:
+        return Response("Metrics are disabled (ALPACA_METRICS=False).\n", status_code=404)
+    return Response(tool_metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 # ============================================================================
 # Helper Functions and Utilities
 # ============================================================================
@@ -2713,6 +5459,7 @@ async def place_option_market_order(
 # for data parsing, validation, formatting, and other utility operations.
 # ============================================================================
 
+@tracer.traced()
 def parse_timeframe_with_enums(timeframe_str: str) -> Optional[TimeFrame]:
     """
     Parse timeframe string to Alpaca TimeFrame object using proper enumerations.
@@ -2837,6 +5584,12 @@ if __name__ == "__main__":
     
     # Setup transport configuration based on command line arguments
     transport_config = setup_transport_config(args)
+
+    # SDK imports and client construction overlap with the client's MCP handshake
+    start_client_prewarm()
+    start_metrics_dump()
+    start_streams()
+    start_order_mirror()
     
     try:
         # Run server with the specified transport
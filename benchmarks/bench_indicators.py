@@ -0,0 +1,135 @@
+# bench_indicators.py
+#
+# Technical indicator benchmark
+# Location: /benchmarks/bench_indicators.py
+# Purpose: Times the vectorized SMA/EMA/RSI/ATR/VWAP pass used by compute_indicators
+#          over up to 1M synthetic minute bars, compares it with per-bar Python loops
+#          and checks that both produce the same values.
+#
+# Usage: python benchmarks/bench_indicators.py [--bars 1000000] [--loop-bars 100000] [--repeat 3]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".github", "core"))
+
+from bar_store import BAR_DTYPE  # noqa: E402
+from indicators import compute, parse_indicator_specs  # noqa: E402
+
+SPECS = parse_indicator_specs(["sma:20", "ema:50", "rsi:14", "atr:14", "vwap"])
+
+
+def make_bars(n, seed=7):
+    # Random walk of minute bars, 390 per session starting 2024-01-02 14:30 UTC
+    rng = np.random.default_rng(seed)
+    bars = np.zeros(n, dtype=BAR_DTYPE)
+    index = np.arange(n)
+    session, minute = np.divmod(index, 390)
+    bars["timestamp"] = (1704205800 + session * 86400 + minute * 60) * 10**9
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.05, n))
+    spread = np.abs(rng.normal(0.0, 0.05, n))
+    bars["open"] = np.concatenate(([close[0]], close[:-1]))
+    bars["close"] = close
+    bars["high"] = np.maximum(bars["open"], close) + spread
+    bars["low"] = np.minimum(bars["open"], close) - spread
+    bars["volume"] = rng.integers(100, 10_000, n)
+    return bars
+
+
+def loop_indicators(bars):
+    # Straightforward per-bar implementations of the same definitions
+    closes = bars["close"].tolist()
+    highs = bars["high"].tolist()
+    lows = bars["low"].tolist()
+    volumes = bars["volume"].tolist()
+    days = (bars["timestamp"] // (86400 * 10**9)).tolist()
+    n = len(closes)
+    nan = float("nan")
+
+    sma = [nan] * n
+    window = 0.0
+    for i, close in enumerate(closes):
+        window += close
+        if i >= 20:
+            window -= closes[i - 20]
+        if i >= 19:
+            sma[i] = window / 20
+
+    ema = [nan] * n
+    alpha = 2.0 / 51
+    for i in range(49, n):
+        ema[i] = sum(closes[:50]) / 50 if i == 49 else ema[i - 1] + alpha * (closes[i] - ema[i - 1])
+
+    rsi = [nan] * n
+    avg_gain = avg_loss = 0.0
+    for i in range(1, n):
+        change = closes[i] - closes[i - 1]
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if i <= 14:
+            avg_gain += gain / 14
+            avg_loss += loss / 14
+        else:
+            avg_gain += (gain - avg_gain) / 14
+            avg_loss += (loss - avg_loss) / 14
+        if i >= 14:
+            rsi[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    atr = [nan] * n
+    value = 0.0
+    for i in range(1, n):
+        tr = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+        value = value + tr / 14 if i <= 14 else value + (tr - value) / 14
+        if i >= 14:
+            atr[i] = value
+
+    vwap = [nan] * n
+    weighted = volume = 0.0
+    for i in range(n):
+        if i and days[i] != days[i - 1]:
+            weighted = volume = 0.0
+        weighted += (highs[i] + lows[i] + closes[i]) / 3.0 * volumes[i]
+        volume += volumes[i]
+        vwap[i] = weighted / volume
+    return {"sma_20": sma, "ema_50": ema, "rsi_14": rsi, "atr_14": atr, "vwap": vwap}
+
+
+def best_of(fn, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--loop-bars", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bars = make_bars(args.bars)
+    vector_s = best_of(lambda data: compute(data, SPECS, intraday=True), bars, args.repeat)
+
+    sample = bars[:args.loop_bars]
+    loop_s = best_of(loop_indicators, sample, 1)
+    expected = loop_indicators(sample)
+    actual = compute(sample, SPECS, intraday=True)
+    max_error = max(float(np.nanmax(np.abs(actual[label] - np.array(values)) / np.abs(np.array(values))))
+                    for label, values in expected.items())
+
+    print(f"indicators: {', '.join(spec.label for spec in SPECS)}")
+    print(f"{'method':<12}{'bars':>10}{'total ms':>12}{'ns/bar':>10}")
+    print(f"{'vectorized':<12}{args.bars:>10}{vector_s * 1e3:>12.1f}{vector_s / args.bars * 1e9:>10.1f}")
+    print(f"{'loop':<12}{len(sample):>10}{loop_s * 1e3:>12.1f}{loop_s / len(sample) * 1e9:>10.1f}")
+    print(f"speedup per bar: {(loop_s / len(sample)) / (vector_s / args.bars):.1f}x, "
+          f"max relative difference vs loop: {max_error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# bench_rendering.py
+#
+# Rendering micro-benchmark
+# Location: /benchmarks/bench_rendering.py
+# Purpose: Compares the buffered Renderer + pre-compiled row templates against
+#          string concatenation for 100 to 100k trade and order rows, and checks
+#          that rendering time per row stays flat (linear scaling).
+#
+# Usage: python benchmarks/bench_rendering.py [--max-rows 100000] [--repeat 3]
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".github", "core"))
+
+from rendering import ORDER_ROW, STOCK_TRADE_ROW, Renderer  # noqa: E402
+
+
+def make_trades(n):
+    ts = datetime(2024, 1, 2, 15, 30, tzinfo=timezone.utc)
+    return [SimpleNamespace(timestamp=ts, price=100.0 + i * 0.01, size=100, exchange="V",
+                            id=i, conditions=["@"]) for i in range(n)]
+
+
+def make_orders(n):
+    ts = datetime(2024, 1, 2, 15, 30, tzinfo=timezone.utc)
+    return [SimpleNamespace(symbol="AAPL", id=f"order-{i}", type="limit", side="buy", qty="1",
+                            status="filled", asset_class="us_equity", order_class="simple",
+                            time_in_force="day", extended_hours=False, submitted_at=ts,
+                            created_at=ts, updated_at=ts, filled_at=ts, filled_avg_price="101.5",
+                            filled_qty="1", limit_price="102", client_order_id=f"c-{i}")
+            for i in range(n)]
+
+
+def concat_trades(trades):
+    # The formatter previously used by get_stock_trades
+    result = "Historical Trades for AAPL (Last 5 days):\n"
+    result += "---------------------------------------------------\n"
+    for trade in trades:
+        result += f"""
+                    Time: {trade.timestamp}
+                    Price: ${float(trade.price):.6f}
+                    Size: {trade.size}
+                    Exchange: {trade.exchange}
+                    ID: {trade.id}
+                    Conditions: {trade.conditions}
+                    -------------------
+                    """
+    return result
+
+
+def render_trades(trades):
+    out = Renderer()
+    out.line("Historical Trades for AAPL (Last 5 days):")
+    out.line("---------------------------------------------------")
+    out.rows(STOCK_TRADE_ROW, trades)
+    return out.render()
+
+
+def concat_orders(orders):
+    # The formatter previously used by get_orders
+    result = f"All Orders (Last {len(orders)}):\n"
+    result += "-----------------------------------\n"
+    for order in orders:
+        result += f"Symbol: {order.symbol}\n"
+        result += f"ID: {order.id}\n"
+        result += f"Type: {order.type}\n"
+        result += f"Side: {order.side}\n"
+        result += f"Quantity: {order.qty}\n"
+        result += f"Status: {order.status}\n"
+        result += f"Asset Class: {order.asset_class}\n"
+        result += f"Order Class: {order.order_class}\n"
+        result += f"Time In Force: {order.time_in_force}\n"
+        result += f"Extended Hours: {order.extended_hours}\n"
+        result += f"Submitted At: {order.submitted_at}\n"
+        result += f"Created At: {order.created_at}\n"
+        result += f"Updated At: {order.updated_at}\n"
+        # Additional core fields (these are optional)
+        if hasattr(order, 'asset_id') and order.asset_id:
+            result += f"Asset ID: {order.asset_id}\n"
+        if hasattr(order, 'order_type') and order.order_type:
+            result += f"Order Type: {order.order_type}\n"
+        if hasattr(order, 'ratio_qty') and order.ratio_qty:
+            result += f"Ratio Quantity: {order.ratio_qty}\n"
+
+        # Optional fields that may not always be present
+        if hasattr(order, 'filled_at') and order.filled_at:
+            result += f"Filled At: {order.filled_at}\n"
+        if hasattr(order, 'filled_avg_price') and order.filled_avg_price:
+            result += f"Filled Price: ${float(order.filled_avg_price):.2f}\n"
+        if hasattr(order, 'filled_qty') and order.filled_qty:
+            result += f"Filled Quantity: {order.filled_qty}\n"
+        if hasattr(order, 'limit_price') and order.limit_price:
+            result += f"Limit Price: ${float(order.limit_price):.2f}\n"
+        if hasattr(order, 'stop_price') and order.stop_price:
+            result += f"Stop Price: ${float(order.stop_price):.2f}\n"
+        if hasattr(order, 'trail_price') and order.trail_price:
+            result += f"Trail Price: ${float(order.trail_price):.2f}\n"
+        if hasattr(order, 'trail_percent') and order.trail_percent:
+            result += f"Trail Percent: {order.trail_percent}%\n"
+        if hasattr(order, 'notional') and order.notional:
+            result += f"Notional: ${float(order.notional):.2f}\n"
+        if hasattr(order, 'position_intent') and order.position_intent:
+            result += f"Position Intent: {order.position_intent}\n"
+        if hasattr(order, 'client_order_id') and order.client_order_id:
+            result += f"Client Order ID: {order.client_order_id}\n"
+        if hasattr(order, 'canceled_at') and order.canceled_at:
+            result += f"Canceled At: {order.canceled_at}\n"
+        if hasattr(order, 'expired_at') and order.expired_at:
+            result += f"Expired At: {order.expired_at}\n"
+        if hasattr(order, 'expires_at') and order.expires_at:
+            result += f"Expires At: {order.expires_at}\n"
+        if hasattr(order, 'failed_at') and order.failed_at:
+            result += f"Failed At: {order.failed_at}\n"
+        if hasattr(order, 'replaced_at') and order.replaced_at:
+            result += f"Replaced At: {order.replaced_at}\n"
+        if hasattr(order, 'replaced_by') and order.replaced_by:
+            result += f"Replaced By: {order.replaced_by}\n"
+        if hasattr(order, 'replaces') and order.replaces:
+            result += f"Replaces: {order.replaces}\n"
+        if hasattr(order, 'legs') and order.legs:
+            result += f"Legs: {order.legs}\n"
+        if hasattr(order, 'hwm') and order.hwm:
+            result += f"HWM: {order.hwm}\n"
+        result += "-----------------------------------\n"
+    return result
+
+
+def render_orders(orders):
+    out = Renderer()
+    out.line(f"All Orders (Last {len(orders)}):")
+    out.line("-----------------------------------")
+    out.rows(ORDER_ROW, orders)
+    return out.render()
+
+
+def best_of(fn, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sizes = [n for n in (100, 1_000, 10_000, 100_000, 1_000_000) if n <= args.max_rows]
+    cases = [("trades", make_trades, concat_trades, render_trades),
+             ("orders", make_orders, concat_orders, render_orders)]
+
+    print(f"{'record':<8}{'rows':>10}{'concat ms':>12}{'render ms':>12}{'concat us/row':>15}{'render us/row':>15}")
+    for name, make, concat, render in cases:
+        per_row = []
+        for n in sizes:
+            data = make(n)
+            assert render(data).count("\n") > 0
+            concat_s = best_of(concat, data, args.repeat)
+            render_s = best_of(render, data, args.repeat)
+            per_row.append(render_s / n)
+            print(f"{name:<8}{n:>10}{concat_s * 1e3:>12.2f}{render_s * 1e3:>12.2f}"
+                  f"{concat_s / n * 1e6:>15.3f}{render_s / n * 1e6:>15.3f}")
+        # Linear scaling: cost per row at the largest size stays within 2x of the smallest
+        ratio = per_row[-1] / per_row[0]
+        print(f"{name}: render cost per row {sizes[-1]} vs {sizes[0]} rows = {ratio:.2f}x "
+              f"({'linear' if ratio < 2 else 'NOT linear'})")
+
+
+if __name__ == "__main__":
+    main()
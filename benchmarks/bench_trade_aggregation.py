@@ -0,0 +1,122 @@
+# bench_trade_aggregation.py
+#
+# Trade aggregation benchmark
+# Location: /benchmarks/bench_trade_aggregation.py
+# Purpose: Measures how fast synthetic trade pages are folded into time, tick, volume and
+#          dollar bars and a volume profile, compares it with a per-trade Python loop
+#          and checks that the paged accumulators match the loop exactly.
+#
+# Usage: python benchmarks/bench_trade_aggregation.py [--trades 1000000] [--page-size 10000] [--repeat 3]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".github", "core"))
+
+from trade_aggregation import BarAccumulator, VolumeProfile  # noqa: E402
+
+# bar type -> bar size (5 minutes, trades, shares, traded value)
+BARS = {"time": 300 * 10**9, "tick": 5_000, "volume": 250_000, "dollar": 25_000_000}
+PRICE_STEP = 0.01
+
+
+def make_trades(n, seed=7):
+    # One trading day of trades as a random walk around $100, round-lot-ish sizes
+    rng = np.random.default_rng(seed)
+    stamps = np.sort(rng.integers(0, 23_400 * 10**9, n)) + 1_704_205_800 * 10**9
+    price = np.round(100 + np.cumsum(rng.normal(0, 0.01, n)), 2)
+    size = rng.choice([1, 10, 50, 100, 200, 500], n).astype(np.float64)
+    return stamps, price, size
+
+
+def paged(trades, page_size):
+    stamps, price, size = trades
+    accumulators = {bar_type: BarAccumulator(bar_type, bar_size) for bar_type, bar_size in BARS.items()}
+    profile = VolumeProfile(PRICE_STEP)
+    for start in range(0, len(stamps), page_size):
+        page = slice(start, start + page_size)
+        for accumulator in accumulators.values():
+            accumulator.add(stamps[page], price[page], size[page])
+        profile.add(price[page], size[page])
+    return {bar_type: accumulator.bars() for bar_type, accumulator in accumulators.items()}, profile.levels()
+
+
+def loop(trades):
+    # One dict update per trade and bar type, the way a per-record aggregation is usually written
+    stamps, price, size = (values.tolist() for values in trades)
+    bars = {}
+    for bar_type, bar_size in BARS.items():
+        rows, running = {}, 0.0
+        for t, p, s in zip(stamps, price, size):
+            if bar_type == "time":
+                key = t // bar_size
+            else:
+                key = int(running // bar_size)
+                running += 1 if bar_type == "tick" else s if bar_type == "volume" else p * s
+            row = rows.get(key)
+            if row is None:
+                rows[key] = [p, p, p, p, s, p * s, 1]
+            else:
+                row[1], row[2], row[3] = max(row[1], p), min(row[2], p), p
+                row[4] += s
+                row[5] += p * s
+                row[6] += 1
+        bars[bar_type] = rows
+    profile = {}
+    for p, s in zip(price, size):
+        level = round(p / PRICE_STEP)
+        volume, count = profile.get(level, (0.0, 0))
+        profile[level] = (volume + s, count + 1)
+    return bars, profile
+
+
+def matches(vectorized, reference):
+    bars, (prices, volume, count) = vectorized
+    reference_bars, reference_profile = reference
+    for bar_type, rows in reference_bars.items():
+        expected = np.array(list(rows.values()))
+        got = bars[bar_type]
+        columns = np.column_stack([got[name] for name in ("open", "high", "low", "close", "volume", "notional",
+                                                          "trades")])
+        if columns.shape != expected.shape or not np.allclose(columns, expected, rtol=1e-9):
+            return False
+    levels = sorted(reference_profile)
+    expected = np.array([reference_profile[level] for level in levels])
+    return (np.allclose(prices, np.array(levels) * PRICE_STEP) and np.allclose(volume, expected[:, 0])
+            and np.array_equal(count, expected[:, 1]))
+
+
+def best_of(fn, repeat, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trades", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    trades = make_trades(args.trades)
+    vector_s = best_of(paged, args.repeat, trades, args.page_size)
+    loop_s = best_of(loop, 1, trades)
+    same = matches(paged(trades, args.page_size), loop(trades))
+
+    print(f"{'method':<12}{'trades':>11}{'total ms':>12}{'trades/s':>14}")
+    print(f"{'paged':<12}{args.trades:>11}{vector_s * 1e3:>12.1f}{args.trades / vector_s:>14,.0f}")
+    print(f"{'loop':<12}{args.trades:>11}{loop_s * 1e3:>12.1f}{args.trades / loop_s:>14,.0f}")
+    print(f"speedup: {loop_s / vector_s:.1f}x (4 bar types + profile, {args.page_size:,}-trade pages); "
+          f"results {'match' if same else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,13 @@
 #
 # Command Line Interface for Alpaca MCP Server
 # Location: /src/alpaca_mcp_server/cli.py
-# Purpose: Provides the 'alpaca-mcp' command with init and serve subcommands
+# Purpose: Provides the 'alpaca-mcp' command with init, serve (optionally profiling startup
+#          imports), status and compact-bars subcommands
 
+import os
+import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -140,7 +144,13 @@ def init(api_key: Optional[str], secret_key: Optional[str],
     type=click.Path(exists=True, path_type=Path),
     help='Path to .env configuration file (default: .env in current directory)'
 )
-def serve(transport: str, host: str, port: int, config_file: Optional[Path]):
+@click.option(
+    '--profile-startup',
+    is_flag=True,
+    help='Print import time by module to stderr before starting the server'
+)
+def serve(transport: str, host: str, port: int, config_file: Optional[Path],
+          profile_startup: bool):
     """
     Start the Alpaca MCP server.
 
@@ -158,6 +168,7 @@ def serve(transport: str, host: str, port: int, config_file: Optional[Path]):
         alpaca-mcp serve --transport http          # Start HTTP server
         alpaca-mcp serve --transport http --port 9000  # Custom port
         alpaca-mcp serve --config-file ~/trading.env   # Custom config
+        alpaca-mcp serve --profile-startup         # Report import cost first
     """
     try:
         # Check if configuration exists
@@ -188,6 +199,9 @@ def serve(transport: str, host: str, port: int, config_file: Optional[Path]):
                 click.echo(f"   URL: http://{host}:{port}")
             click.echo()
 
+        if profile_startup:
+            _print_startup_profile(config_path)
+
         # Initialize and start the server
         server = AlpacaMCPServer(config_path)
         server.run(transport=transport, host=host, port=port)
@@ -207,6 +221,62 @@ def serve(transport: str, host: str, port: int, config_file: Optional[Path]):
         sys.exit(1)
 
 
+def _print_startup_profile(config_path: Path, top: int = 20) -> None:
+    """
+    Measure a cold import of the server module and print the slowest modules.
+
+    The import runs in a fresh interpreter with ``-X importtime`` so modules this
+    process has already loaded do not hide their cost. Output goes to stderr because
+    stdout carries the MCP protocol for stdio launches.
+    """
+    from dotenv import dotenv_values
+
+    project_root = Path(__file__).parent.parent.parent
+    env = dict(os.environ)
+    env.update({key: value for key, value in dotenv_values(config_path).items() if value is not None})
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(project_root), env.get("PYTHONPATH")]))
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import alpaca_mcp_server"],
+        cwd=str(project_root), env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    # Lines look like: "import time:       175 |      66971 |     mcp.server.lowlevel"
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    click.echo("Startup profile (python -X importtime -c 'import alpaca_mcp_server')", err=True)
+    if proc.returncode != 0:
+        errors = proc.stderr.strip().splitlines()
+        click.echo(f"   Import failed: {errors[-1] if errors else proc.returncode}", err=True)
+        click.echo(err=True)
+        return
+    total_us = next((cumulative for name, _, cumulative in modules if name == "alpaca_mcp_server"), 0)
+    click.echo(f"   Interpreter + import: {wall_ms:.0f} ms, "
+               f"alpaca_mcp_server import: {total_us / 1000:.0f} ms", err=True)
+    click.echo(err=True)
+    click.echo(f"   {'Cumulative':>10}  {'Self':>8}  Module", err=True)
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:top]:
+        click.echo(f"   {cumulative_us / 1000:>8.1f}ms  {self_us / 1000:>6.1f}ms  {name}", err=True)
+
+    # Self time per top-level package shows which dependency dominates
+    packages = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    click.echo(err=True)
+    click.echo("   Self time by package:", err=True)
+    for package, self_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:10]:
+        click.echo(f"   {self_us / 1000:>8.1f}ms  {package}", err=True)
+    click.echo(err=True)
+
+
 @main.command()
 @click.option(
     '--config-file',
@@ -247,6 +317,52 @@ def status(config_file: Optional[Path]):
         sys.exit(1)
 
 
+@main.command(name='compact-bars')
+@click.option(
+    '--store-dir',
+    type=click.Path(path_type=Path),
+    default=lambda: os.getenv("ALPACA_BAR_STORE_DIR", os.path.join("~", ".cache", "alpaca-mcp", "bars")),
+    help='Bar store directory (default: $ALPACA_BAR_STORE_DIR or ~/.cache/alpaca-mcp/bars)'
+)
+@click.option(
+    '--retention-days',
+    type=float,
+    default=lambda: float(os.getenv("ALPACA_BAR_STORE_RETENTION_DAYS", "0")),
+    help='Drop bars older than this many days (default: $ALPACA_BAR_STORE_RETENTION_DAYS, 0 keeps all)'
+)
+def compact_bars(store_dir: Path, retention_days: float):
+    """
+    Compact the on-disk bar store.
+
+    Applies the retention window, merges fetched-range metadata and rewrites
+    every bar file contiguously. Safe to run while the server is running: each
+    file is rewritten under the same per-file lock the server takes when it saves
+    new bars.
+
+    Examples:
+        alpaca-mcp compact-bars                      # Use configured retention
+        alpaca-mcp compact-bars --retention-days 90  # Keep the last 90 days
+    """
+    try:
+        # The bar store lives next to the other server modules in .github/core
+        core_path = Path(__file__).parent.parent.parent / ".github" / "core"
+        if str(core_path) not in sys.path:
+            sys.path.insert(0, str(core_path))
+        from bar_store import BarStore
+
+        store = BarStore(str(store_dir), retention_days=retention_days)
+        summary = store.compact()
+
+        click.echo(f"Compacted bar store: {store.root}")
+        click.echo(f"   Files: {summary['files']} ({summary['files_removed']} removed)")
+        click.echo(f"   Bars dropped by retention: {summary['bars_dropped']}")
+        click.echo(f"   Size: {summary['bytes_before'] / 1024:.1f} KiB -> {summary['bytes_after'] / 1024:.1f} KiB")
+
+    except Exception as e:
+        click.echo(f"Error compacting bar store: {e}")
+        sys.exit(1)
+
+
 # Entry point for console script
 if __name__ == "__main__":
     main()
\ No newline at end of file
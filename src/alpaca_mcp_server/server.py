@@ -7,10 +7,13 @@
 import os
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
 from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
+
+if TYPE_CHECKING:
+    # Only needed for annotations; the mcp package is imported with the tool module
+    from mcp.server.fastmcp import FastMCP
 
 # Import configuration management
 from .config import ConfigManager
@@ -39,7 +42,8 @@ class AlpacaMCPServer:
             load_dotenv(self.config.env_file)
 
         # Initialize MCP server (will be set up in _initialize_server)
-        self.mcp: Optional[FastMCP] = None
+        self.mcp: Optional["FastMCP"] = None
+        self._original_server = None
 
         # Alpaca clients (will be initialized when server starts)
         self._clients_initialized = False
@@ -90,13 +94,8 @@ class AlpacaMCPServer:
         if not self._validate_credentials():
             raise ValueError("Invalid or missing Alpaca API credentials")
 
-        # Detect appropriate log level
-        log_level = self._detect_environment()
-
-        # Initialize FastMCP server
-        self.mcp = FastMCP("alpaca-trading", log_level=log_level)
-
-        # Import and register all tools from the original implementation
+        # Import the original implementation; its module-level FastMCP instance already
+        # has every tool registered (clients are created lazily on first use)
         self._import_original_tools()
 
         self._clients_initialized = True
@@ -121,8 +120,9 @@ class AlpacaMCPServer:
 
         try:
             # Import the original server module
-            # This will execute all the tool registrations on our mcp instance
+            # This will execute all the tool registrations on its mcp instance
             import alpaca_mcp_server as original_server
+            self._original_server = original_server
 
             # Copy the configured mcp instance with all registered tools
             # The original server module registers tools on a global 'mcp' variable
@@ -166,13 +166,24 @@ class AlpacaMCPServer:
             if transport in ["http", "sse"]:
                 print(f"   Server will be available at: http://{host}:{port}")
 
+        # Build the SDK clients in the background while the MCP handshake proceeds
+        self._original_server.start_client_prewarm()
+        # Connect the market data streams configured to subscribe at startup
+        self._original_server.start_streams()
+        # Mirror orders from trade updates when ALPACA_ORDER_MIRROR is enabled
+        self._original_server.start_order_mirror()
+
         # Start the server with appropriate transport configuration
         if transport == "stdio":
-            # Standard I/O transport (default for most MCP clients)
+            # Standard I/O transport (default for most MCP clients); metrics go to
+            # ALPACA_METRICS_FILE when set, since there is no /metrics route
+            self._original_server.start_metrics_dump()
             self.mcp.run()
         else:
-            # HTTP or SSE transport for remote connections
-            self.mcp.run(transport=transport, host=host, port=port)
+            # HTTP or SSE transport for remote connections, which also serves /metrics
+            self.mcp.settings.host = host
+            self.mcp.settings.port = port
+            self.mcp.run(transport="streamable-http" if transport == "http" else "sse")
 
     def get_status(self) -> Dict[str, Any]:
         """
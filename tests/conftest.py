@@ -0,0 +1,119 @@
+# conftest.py
+#
+# Shared pytest setup
+# Location: /tests/conftest.py
+# Purpose: Makes the server helper modules in .github/core and the top-level server
+#          module importable from the tests, the same way alpaca_mcp_server.py does, and
+#          provides the server module to tool tests and a local market data websocket
+#          server for the stream cache tests.
+
+import asyncio
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+import msgpack
+import pytest
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE = os.path.join(ROOT, ".github", "core")
+PACKAGE = os.path.join(ROOT, "src", "alpaca_mcp_server")
+
+for path in (CORE, ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture(scope="session")
+def server_module():
+    """The alpaca_mcp_server module, imported with placeholder credentials (no client is built on import)."""
+    os.environ.setdefault("ALPACA_API_KEY", "test-key")
+    os.environ.setdefault("ALPACA_SECRET_KEY", "test-secret")
+    import alpaca_mcp_server
+    return alpaca_mcp_server
+
+
+@pytest.fixture(scope="session")
+def server_package():
+    """
+    The src/alpaca_mcp_server package, loaded under another name: with the repo root on
+    sys.path the name alpaca_mcp_server resolves to the top-level tool module instead.
+    """
+    name = "alpaca_mcp_server_package"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(PACKAGE, "__init__.py"),
+                                                      submodule_search_locations=[PACKAGE])
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[name] = package
+        spec.loader.exec_module(package)
+    return sys.modules[name]
+
+
+class FakeMarketDataServer:
+    """Local market data websocket: connect/auth handshake, subscription acks, pushed messages."""
+
+    def __init__(self):
+        self.subscriptions = []
+        self.accepting = True
+        self._connections = set()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._main()), daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with websockets.serve(self._handler, "127.0.0.1", 0) as server:
+            self.url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            self._ready.set()
+            await self._stopped.wait()
+
+    async def _handler(self, ws):
+        if not self.accepting:
+            await ws.close()
+            return
+        self._connections.add(ws)
+        try:
+            await ws.send(msgpack.packb([{"T": "success", "msg": "connected"}]))
+            assert msgpack.unpackb(await ws.recv())["action"] == "auth"
+            await ws.send(msgpack.packb([{"T": "success", "msg": "authenticated"}]))
+            async for message in ws:
+                request = msgpack.unpackb(message)
+                self.subscriptions.append(request)
+                ack = {key: value for key, value in request.items() if key != "action"}
+                await ws.send(msgpack.packb([{"T": "subscription", **ack}]))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(ws)
+
+    def push(self, *messages):
+        """Send market data messages to every connected client."""
+        async def send():
+            for ws in list(self._connections):
+                await ws.send(msgpack.packb(list(messages), datetime=False))
+        asyncio.run_coroutine_threadsafe(send(), self.loop).result(5)
+
+    def drop_clients(self, refuse: bool = True):
+        """Close every connection and, unless refuse is False, refuse new ones."""
+        self.accepting = not refuse
+        async def close():
+            for ws in list(self._connections):
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result(5)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self._stopped.set)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
@@ -0,0 +1,79 @@
+# test_bar_store.py
+#
+# Tests for the on-disk bar store
+# Location: /tests/test_bar_store.py
+# Purpose: Checks coverage tracking, retention on compaction and that a bar file being
+#          saved by one process is never rewritten by another (the server and the
+#          compact-bars command) at the same time.
+
+import multiprocessing
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+from bar_store import BarStore, _file_lock
+
+KEY = ("AAPL", "1Min", "iex")
+NOW = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+
+def minute_bars(start, count):
+    return [SimpleNamespace(timestamp=start + timedelta(minutes=i), open=1.0 + i, high=2.0 + i,
+                            low=0.5 + i, close=1.5 + i, volume=100.0, trade_count=None, vwap=None)
+            for i in range(count)]
+
+
+def test_write_records_coverage_and_merges(tmp_path):
+    store = BarStore(str(tmp_path), settle_seconds=0)
+    start = NOW - timedelta(days=2)
+    end = start + timedelta(minutes=10)
+    assert store.missing_ranges(KEY, start, end) == [(start, end)]
+
+    store.write(KEY, minute_bars(start, 10), [(start, end)], bar_seconds=60)
+    store.write(KEY, minute_bars(start + timedelta(minutes=5), 10),
+                [(start + timedelta(minutes=5), end + timedelta(minutes=5))], bar_seconds=60)
+
+    assert store.missing_ranges(KEY, start, end + timedelta(minutes=5)) == []
+    bars = store.read(KEY, start, end + timedelta(minutes=5))
+    assert len(bars) == 15
+    assert np.all(np.diff(bars["timestamp"]) > 0)
+
+
+def test_compact_applies_retention(tmp_path):
+    store = BarStore(str(tmp_path), settle_seconds=0)
+    old, recent = NOW - timedelta(days=30), NOW - timedelta(days=1)
+    store.write(KEY, minute_bars(old, 5), [(old, old + timedelta(minutes=5))], bar_seconds=60)
+    store.write(KEY, minute_bars(recent, 5), [(recent, recent + timedelta(minutes=5))], bar_seconds=60)
+
+    summary = store.compact(retention_days=7)
+
+    assert summary["files"] == 1 and summary["bars_dropped"] == 5
+    assert len(store.read(KEY, old, NOW)) == 5
+    assert store.missing_ranges(KEY, old, old + timedelta(minutes=5)) != []
+
+
+def _hold_lock(path, held, seconds):
+    with _file_lock(path):
+        held.set()
+        time.sleep(seconds)
+
+
+def test_write_waits_for_another_process(tmp_path):
+    store = BarStore(str(tmp_path), settle_seconds=0)
+    data_path, _ = store._paths(KEY)
+    data_path.parent.mkdir(parents=True)
+    context = multiprocessing.get_context("spawn")
+    held = context.Event()
+    holder = context.Process(target=_hold_lock, args=(data_path.with_suffix(".lock"), held, 0.5))
+    holder.start()
+    try:
+        assert held.wait(10)
+        started = time.monotonic()
+        start = NOW - timedelta(days=1)
+        store.write(KEY, minute_bars(start, 3), [(start, start + timedelta(minutes=3))], bar_seconds=60)
+        assert time.monotonic() - started >= 0.3
+    finally:
+        holder.join(10)
+    assert len(store.read(KEY, start, NOW)) == 3
@@ -0,0 +1,109 @@
+# test_bars_batch.py
+#
+# Tests for batched multi-symbol bar requests
+# Location: /tests/test_bars_batch.py
+# Purpose: Runs get_stock_bars_batch against a stub historical data client and checks
+#          that limit is sent upstream only when a request holds one symbol, and that
+#          the bar store is read through so repeat calls fetch nothing, with bars
+#          from different feeds kept under separate store keys.
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from alpaca.data.models import Bar
+
+from bar_store import BarStore
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class StubStockData:
+    """get_stock_bars over ten daily bars per symbol, honoring the window and the total limit."""
+
+    def __init__(self):
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get_stock_bars(self, request):
+        with self._lock:
+            self.requests.append(request)
+        symbols = request.symbol_or_symbols
+        symbols = [symbols] if isinstance(symbols, str) else symbols
+        start, end = (t if t.tzinfo else t.replace(tzinfo=timezone.utc) for t in (request.start, request.end))
+        data, sent = {}, 0
+        for symbol in symbols:
+            for day in range(10):
+                at = START + timedelta(days=day)
+                if request.limit is not None and sent >= request.limit:
+                    break
+                if start <= at <= end:
+                    data.setdefault(symbol, []).append(Bar(symbol, {
+                        "t": at, "o": day, "h": day + 1, "l": day, "c": day + 0.5, "v": 100, "n": 1, "vw": day}))
+                    sent += 1
+        return SimpleNamespace(data=data)
+
+
+@pytest.fixture
+def stock_data(server_module, monkeypatch):
+    stub = StubStockData()
+    monkeypatch.setattr(server_module, "stock_historical_data_client", stub)
+    monkeypatch.setattr(server_module, "bar_store", None)
+    return stub
+
+
+def fetch(server_module, symbols, **kwargs):
+    result = asyncio.run(server_module.get_stock_bars_batch(
+        symbols, start="2024-01-01", end="2024-01-20", format="json", **kwargs))
+    return json.loads(result)
+
+
+def counts(records):
+    per_symbol = {}
+    for record in records:
+        per_symbol[record["symbol"]] = per_symbol.get(record["symbol"], 0) + 1
+    return per_symbol
+
+
+def test_limit_is_sent_only_for_single_symbol_requests(server_module, stock_data, monkeypatch):
+    monkeypatch.setattr(server_module, "BARS_BATCH_SIZE", 2)
+    records = fetch(server_module, ["AAPL", "MSFT", "NVDA"], limit=3)
+
+    assert counts(records) == {"AAPL": 3, "MSFT": 3, "NVDA": 3}
+    assert sorted((len(r.symbol_or_symbols), r.limit) for r in stock_data.requests) == [(1, 3), (2, None)]
+
+
+def test_bar_store_is_read_through(server_module, stock_data, monkeypatch, tmp_path):
+    monkeypatch.setattr(server_module, "bar_store", BarStore(str(tmp_path), settle_seconds=0))
+
+    first = fetch(server_module, ["AAPL", "MSFT"], limit=4)
+    assert counts(first) == {"AAPL": 4, "MSFT": 4}
+    assert sorted(r.symbol_or_symbols for r in stock_data.requests) == ["AAPL", "MSFT"]
+
+    second = fetch(server_module, ["AAPL", "MSFT"], limit=4)
+    assert second == first
+    assert len(stock_data.requests) == 2
+
+
+def test_bar_store_keeps_feeds_apart(server_module, stock_data, monkeypatch, tmp_path):
+    from alpaca.data.enums import DataFeed
+    from alpaca.data.requests import StockBarsRequest
+    from alpaca.data.timeframe import TimeFrame
+
+    store = BarStore(str(tmp_path), settle_seconds=0)
+    monkeypatch.setattr(server_module, "bar_store", store)
+
+    def read(feed):
+        return asyncio.run(server_module._read_bar_store(
+            "stock_data", stock_data.get_stock_bars, StockBarsRequest, "AAPL", TimeFrame.Day,
+            feed.value if feed else "default", START, START + timedelta(days=20),
+            request_fields={"feed": feed} if feed else None))
+
+    assert len(read(None)) == 10
+    assert len(read(DataFeed.SIP)) == 10
+    assert [request.feed for request in stock_data.requests] == [None, DataFeed.SIP]
+    assert len(read(DataFeed.SIP)) == 10 and len(stock_data.requests) == 2
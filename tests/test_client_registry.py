@@ -0,0 +1,58 @@
+# test_client_registry.py
+#
+# Tests for lazy client construction and SDK leaf module loading
+# Location: /tests/test_client_registry.py
+# Purpose: Checks that clients are built once on first use and that sdk_module only
+#          bypasses the alpaca-py package initializers on verified SDK releases.
+
+import subprocess
+import sys
+import threading
+
+from conftest import CORE
+from client_registry import ClientRegistry
+
+
+def test_client_is_built_once_on_first_use():
+    built = []
+    registry = ClientRegistry()
+    client = registry.register("trading", lambda: built.append(1) or {"name": "trading"})
+    assert not registry.created("trading") and built == []
+
+    threads = [threading.Thread(target=lambda: client.get("name")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert built == [1]
+    assert client.get("name") == "trading"
+    assert registry.stats()["trading"]["created"]
+
+
+def run_isolated(code):
+    # sys.modules state is the point of these checks, so each one gets a fresh interpreter
+    prelude = f"import sys; sys.path.insert(0, {CORE!r}); import client_registry\n"
+    result = subprocess.run([sys.executable, "-c", prelude + code], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_leaf_modules_skip_package_initializer_on_verified_release():
+    code = (
+        "client_registry.VERIFIED_SDK_VERSIONS = (client_registry._installed_minor(),)\n"
+        "enums = client_registry.sdk_module('alpaca.data.enums')\n"
+        "print('alpaca.data' in sys.modules)\n"
+        "import alpaca.data\n"
+        "print(alpaca.data.enums is enums and alpaca.data.DataFeed is enums.DataFeed)\n"
+    )
+    assert run_isolated(code) == ["False", "True"]
+
+
+def test_unverified_release_uses_regular_import():
+    code = (
+        "client_registry.VERIFIED_SDK_VERSIONS = ()\n"
+        "client_registry.sdk_module('alpaca.data.enums')\n"
+        "print('alpaca.data' in sys.modules)\n"
+    )
+    assert run_isolated(code) == ["True"]
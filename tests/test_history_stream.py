@@ -0,0 +1,131 @@
+# test_history_stream.py
+#
+# Tests for lazy history paging and the bounded digests
+# Location: /tests/test_history_stream.py
+# Purpose: Pages a stub market data endpoint and checks that page tokens are followed
+#          one request at a time with the limit applied per page, that only head and
+#          tail rows are kept, and that the running statistics cover every record.
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from history_stream import HeadTail, HistoryDigest, QuoteStats, TradeStats, iter_pages, next_page
+
+
+def trades(count):
+    return [{"t": f"2024-01-02T15:00:{i:02d}Z", "p": 100.0 + i % 7, "s": 1 + i % 3} for i in range(count)]
+
+
+class StubDataAPI:
+    """GET /stocks/trades over a fixed record list, paged by offset tokens like the data API."""
+
+    def __init__(self, records, symbol="AAPL"):
+        self.records = records
+        self.symbol = symbol
+        self.calls = []
+
+    def get(self, path, params):
+        self.calls.append(dict(params))
+        offset = int(params.get("page_token") or 0)
+        end = offset + params["limit"]
+        token = str(end) if end < len(self.records) else None
+        return {"trades": {self.symbol: self.records[offset:end]}, "next_page_token": token}
+
+
+def test_pages_are_requested_one_at_a_time():
+    api = StubDataAPI(trades(25))
+    pages = iter_pages(api.get, "/stocks/trades", {"symbols": "AAPL", "limit": 5}, "trades", page_size=10)
+    assert api.calls == []
+
+    first = next_page(pages)
+    assert len(first["AAPL"]) == 10 and len(api.calls) == 1
+
+    rest = [page for page in iter(lambda: next_page(pages), None)]
+    assert [len(page["AAPL"]) for page in rest] == [10, 5]
+    assert [call.get("page_token") for call in api.calls] == [None, "10", "20"]
+    assert [call["limit"] for call in api.calls] == [10, 10, 10]
+    assert next_page(pages) is None and len(api.calls) == 3
+
+
+def test_limit_is_applied_per_page():
+    api = StubDataAPI(trades(25))
+    pages = list(iter_pages(api.get, "/stocks/trades", {"symbols": "AAPL"}, "trades", limit=23, page_size=10))
+
+    assert sum(len(page["AAPL"]) for page in pages) == 23
+    assert [call["limit"] for call in api.calls] == [10, 10, 3]
+
+
+def test_head_tail_keeps_the_ends():
+    rows = HeadTail(5)
+    for start in range(0, 25, 4):
+        rows.extend(list(range(start, min(start + 4, 25))))
+
+    assert rows.head == [0, 1, 2] and list(rows.tail) == [23, 24]
+    assert rows.records() == [0, 1, 2, 23, 24]
+    assert rows.count == 25 and rows.omitted == 20
+
+
+def test_digest_keeps_head_and_tail_and_summarizes_everything():
+    records = trades(1000)
+    api = StubDataAPI(records)
+    digest = HistoryDigest(TradeStats, max_rows=6)
+    for page in iter_pages(api.get, "/stocks/trades", {"symbols": "AAPL"}, "trades", page_size=100):
+        digest.add(page)
+
+    rows = digest.rows["AAPL"]
+    assert digest.pages == 10 and digest.count == 1000
+    assert rows.records() == records[:3] + records[-3:]
+    assert digest.truncated("AAPL") and not digest.truncated("MSFT")
+
+    price = np.array([r["p"] for r in records])
+    size = np.array([r["s"] for r in records], dtype=float)
+    stats = digest.stats["AAPL"].summary()
+    assert stats["count"] == 1000
+    assert (stats["open"], stats["close"]) == (records[0]["p"], records[-1]["p"])
+    assert (stats["start"], stats["end"]) == (records[0]["t"], records[-1]["t"])
+    assert (stats["high"], stats["low"]) == (price.max(), price.min())
+    assert stats["volume"] == size.sum()
+    assert np.isclose(stats["vwap"], (price * size).sum() / size.sum())
+
+    # Newest-first histories swap the ends
+    descending = digest.stats["AAPL"].summary(descending=True)
+    assert (descending["open"], descending["close"]) == (records[-1]["p"], records[0]["p"])
+
+
+def test_quote_stats_skip_one_sided_quotes():
+    stats = QuoteStats()
+    stats.add([{"t": "a", "bp": 10.0, "ap": 10.2}, {"t": "b", "bp": 0.0, "ap": 10.4}])
+    stats.add([{"t": "c", "bp": 9.9, "ap": 10.1}])
+
+    summary = stats.summary()
+    assert summary["count"] == 3
+    assert (summary["low_bid"], summary["high_ask"]) == (9.9, 10.2)
+    assert np.isclose(summary["avg_spread"], 0.2)
+
+
+def test_read_history_streams_pages_as_progress(server_module, monkeypatch):
+    monkeypatch.setattr(server_module, "HISTORY_PAGE_SIZE", 100)
+    records = trades(250)
+    api = StubDataAPI(records)
+    request = SimpleNamespace(limit=None, to_request_fields=lambda: {"symbols": "AAPL"})
+    messages = []
+
+    async def report_progress(progress, total, message):
+        messages.append((progress, message))
+
+    ctx = SimpleNamespace(request_context=SimpleNamespace(meta=SimpleNamespace(progressToken="t")),
+                          report_progress=report_progress)
+    sender = server_module._history_chunk_sender(ctx, lambda symbol, raw: raw["p"],
+                                                 lambda models: str(len(models)), None)
+
+    async def read():
+        return await server_module._read_history("stock_data", api, "/stocks/trades", request, "trades",
+                                                 TradeStats, 4, on_page=sender)
+
+    digest = asyncio.run(read())
+    assert digest.count == 250 and len(digest.rows["AAPL"].records()) == 4
+    assert len(api.calls) == len(messages) == 3
+    assert [progress for progress, _ in messages][-1] == 250
+    assert sum(int(message) for _, message in messages) == 250
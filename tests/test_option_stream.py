@@ -0,0 +1,175 @@
+# test_option_stream.py
+#
+# Tests for the on-demand option contract stream table
+# Location: /tests/test_option_stream.py
+# Purpose: Drives LatestOptionDataCache with a stub option stream and checks subscribe on
+#          first request, least-recently-used eviction when the table is full, the idle
+#          sweep, row reuse and the hit/miss/stale counters.
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from streaming import LatestOptionDataCache
+
+CALL = "AAPL250620C00200000"
+PUT = "AAPL250620P00200000"
+SPREAD_LEG = "AAPL250620C00210000"
+
+
+class StubOptionStream:
+    """Stands in for OptionDataStream: records (un)subscriptions, 'connected' while run() blocks."""
+
+    def __init__(self):
+        self._running = False
+        self._stop = threading.Event()
+        self.handlers = {}
+        self.unsubscribed = []
+
+    def subscribe_quotes(self, handler, *symbols):
+        self.handlers.update({symbol: handler for symbol in symbols})
+
+    def subscribe_trades(self, handler, *symbols):
+        pass
+
+    def unsubscribe_quotes(self, *symbols):
+        self.unsubscribed.extend(symbols)
+        for symbol in symbols:
+            self.handlers.pop(symbol, None)
+
+    def unsubscribe_trades(self, *symbols):
+        pass
+
+    def run(self):
+        self._running = True
+        self._stop.wait()
+        self._running = False
+
+    def stop(self):
+        self._stop.set()
+
+
+def quote(symbol, bid=1.2, ask=1.3):
+    return {"T": "q", "S": symbol, "bp": bid, "bs": 10, "ap": ask, "as": 12, "bx": "C", "ax": "X", "c": "A",
+            "t": datetime(2026, 10, 16, 14, 30, tzinfo=timezone.utc)}
+
+
+@pytest.fixture
+def make_cache():
+    caches = []
+
+    def make(**kwargs):
+        kwargs.setdefault("idle_seconds", 0)
+        cache = LatestOptionDataCache(StubOptionStream(), decode_quote=dict, decode_trade=dict, **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.runner.stop()
+
+
+def push(cache, *messages):
+    for message in messages:
+        asyncio.run(cache._on_quote(message))
+
+
+def connected(cache):
+    deadline = time.monotonic() + 5
+    while not cache.runner.is_connected() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return cache.runner.is_connected()
+
+
+def test_quote_is_served_after_subscription(make_cache):
+    cache = make_cache()
+    assert cache.get_quote(CALL) is None and cache.wants(CALL)
+    assert cache.subscribe([CALL, CALL]) == [CALL]
+    assert connected(cache) and not cache.wants(CALL)
+
+    # Subscribed but nothing streamed yet, and quotes for other contracts are dropped
+    assert cache.get_quote(CALL) is None
+    push(cache, quote(CALL), quote(PUT))
+    served = cache.get_quote(CALL)
+    assert (served["S"], served["bp"], served["ap"], served["bx"]) == (CALL, 1.2, 1.3, "C")
+    assert served["t"] == datetime(2026, 10, 16, 14, 30, tzinfo=timezone.utc)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_stale_and_disconnected_quotes_miss(make_cache):
+    cache = make_cache(quote_max_age=0.1)
+    cache.subscribe([CALL])
+    assert connected(cache)
+    push(cache, quote(CALL))
+    assert cache.get_quote(CALL) is not None
+
+    time.sleep(0.15)
+    assert cache.get_quote(CALL) is None
+    push(cache, quote(CALL))
+    cache.runner.stop()
+    cache.runner._thread.join(5)
+    assert cache.get_quote(CALL) is None
+    assert cache.stats()["stale"] == 2 and cache.stats()["hits"] == 1
+
+
+def test_full_table_evicts_least_recently_used(make_cache):
+    cache = make_cache(max_symbols=2, min_idle=0)
+    cache.subscribe([CALL, PUT])
+    assert connected(cache)
+    push(cache, quote(CALL), quote(PUT))
+    time.sleep(0.01)
+    cache.get_quote(CALL)
+
+    assert cache.subscribe([SPREAD_LEG]) == [SPREAD_LEG]
+    assert cache.runner.stream.unsubscribed == [PUT]
+    assert cache.wants(PUT) and not cache.wants(CALL)
+
+    # The freed row was cleared before reuse
+    assert cache.get_quote(SPREAD_LEG) is None
+    assert cache.get_quote(CALL) is not None
+    assert cache.stats()["subscribed"] == 3 and cache.stats()["unsubscribed"] == 1
+
+
+def test_recently_used_contracts_are_not_evicted(make_cache):
+    cache = make_cache(max_symbols=2, min_idle=60)
+    cache.subscribe([CALL, PUT])
+
+    assert cache.subscribe([SPREAD_LEG]) == []
+    assert cache.runner.stream.unsubscribed == [] and cache.wants(SPREAD_LEG)
+
+
+def test_sweep_drops_idle_contracts(make_cache):
+    cache = make_cache(idle_seconds=60)
+    cache.subscribe([CALL, PUT])
+    cache.idle_seconds = 0.2
+    time.sleep(0.12)
+    cache.get_quote(CALL)
+    time.sleep(0.12)
+
+    assert cache.sweep() == [PUT]
+    assert cache.runner.stream.unsubscribed == [PUT]
+    assert cache.stats()["symbols"] == 1
+
+
+def test_first_request_subscribes_in_the_background(server_module, make_cache, monkeypatch):
+    cache = make_cache(feed="indicative")
+    monkeypatch.setattr(server_module, "option_data_cache", cache)
+
+    async def request():
+        found = await server_module._get_streamed_option_data("quote", [CALL, PUT])
+        await asyncio.gather(*server_module._background_tasks)
+        return found
+
+    assert asyncio.run(request()) == {}
+    assert not cache.wants(CALL) and not cache.wants(PUT)
+    assert connected(cache)
+
+    push(cache, quote(CALL))
+    found = asyncio.run(request())
+    assert list(found) == [CALL] and found[CALL]["ap"] == 1.3
+    assert cache.stats()["subscribed"] == 2
+    # Another feed is never answered from the stream
+    assert asyncio.run(server_module._get_streamed_option_data("quote", [CALL], feed="opra")) == {}
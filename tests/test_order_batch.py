@@ -0,0 +1,120 @@
+# test_order_batch.py
+#
+# Tests for basket order submission
+# Location: /tests/test_order_batch.py
+# Purpose: Runs place_stock_order_batch against a stub trading client and checks
+#          whole-basket validation, deterministic client order IDs per New York
+#          trading day and the reporting of resubmitted orders as duplicates.
+
+import asyncio
+import json
+import threading
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from alpaca.common.exceptions import APIError
+
+from order_basket import DUPLICATE_CLIENT_ORDER_ID, client_order_ids, normalize_order
+
+BASKET = [{"symbol": "AAPL", "side": "buy", "quantity": 10},
+          {"symbol": "msft", "side": "SELL", "qty": 5, "type": "limit", "limit_price": 410}]
+
+
+class StubTradingClient:
+    """submit_order / get_order_by_client_id over an in-memory order table with the API's 422 on reuse."""
+
+    def __init__(self):
+        self.orders = {}
+        self.submitted = []
+        self._lock = threading.Lock()
+
+    def submit_order(self, request):
+        with self._lock:
+            self.submitted.append(request)
+            if request.client_order_id in self.orders:
+                raise APIError(json.dumps({"code": 40010001, "message": DUPLICATE_CLIENT_ORDER_ID}))
+            order = SimpleNamespace(id=uuid.uuid4(), status="accepted", client_order_id=request.client_order_id)
+            self.orders[request.client_order_id] = order
+            return order
+
+    def get_order_by_client_id(self, client_order_id):
+        return self.orders[client_order_id]
+
+
+@pytest.fixture
+def trading(server_module, monkeypatch):
+    stub = StubTradingClient()
+    monkeypatch.setattr(server_module, "trade_client", stub)
+    return stub
+
+
+def place(server_module, orders, **kwargs):
+    result = asyncio.run(server_module.place_stock_order_batch(orders, format="json", **kwargs))
+    return json.loads(result)
+
+
+def test_invalid_order_rejects_the_whole_basket(server_module, trading):
+    basket = BASKET + [{"symbol": "NVDA", "side": "hold", "quantity": 1}, {"symbol": "TSLA", "side": "buy"}]
+
+    result = asyncio.run(server_module.place_stock_order_batch(basket))
+
+    assert result.startswith("Basket rejected: 2 of 4 orders are invalid; nothing was submitted.")
+    assert "#3 NVDA" in result and "#4 TSLA: Missing required field: quantity." in result
+    assert trading.submitted == []
+
+
+def test_basket_is_submitted(server_module, trading):
+    records = place(server_module, BASKET)
+
+    assert [record["result"] for record in records] == ["submitted", "submitted"]
+    assert [(r.symbol, r.qty) for r in sorted(trading.submitted, key=lambda r: r.symbol)] == [("AAPL", 10),
+                                                                                             ("MSFT", 5)]
+    assert {record["client_order_id"] for record in records} == set(trading.orders)
+
+
+def test_same_basket_same_day_gets_same_ids(server_module, trading):
+    first = [record["client_order_id"] for record in place(server_module, BASKET, dry_run=True)]
+    second = [record["client_order_id"] for record in place(server_module, BASKET, dry_run=True)]
+
+    assert first == second
+    assert len(set(first)) == 2
+    assert trading.submitted == []
+
+
+def test_resubmission_is_reported_as_duplicate(server_module, trading):
+    records = place(server_module, BASKET)
+    repeat = place(server_module, BASKET)
+
+    assert [record["result"] for record in records] == ["submitted", "submitted"]
+    assert [record["result"] for record in repeat] == ["duplicate", "duplicate"]
+    # The existing orders are reported, and no new order was created
+    assert [record["order_id"] for record in repeat] == [record["order_id"] for record in records]
+    assert [record["status"] for record in repeat] == ["accepted", "accepted"]
+    assert len(trading.orders) == 2 and len(trading.submitted) == 4
+
+
+def test_other_api_errors_fail_the_order_only(server_module, trading, monkeypatch):
+    def reject_msft(request):
+        if request.symbol == "MSFT":
+            raise APIError(json.dumps({"code": 40310000, "message": "insufficient buying power"}))
+        return StubTradingClient.submit_order(trading, request)
+
+    monkeypatch.setattr(trading, "submit_order", reject_msft)
+    records = place(server_module, BASKET)
+
+    assert [(record["result"], record["error"]) for record in records] == [
+        ("submitted", None), ("failed", "insufficient buying power")]
+
+
+def test_ids_depend_on_trading_day_and_batch_id():
+    orders = [normalize_order(entry, {"order_type": "market"})[0] for entry in BASKET]
+
+    monday = client_order_ids(orders, trading_day=date(2026, 10, 12))
+    assert monday == client_order_ids(orders, trading_day=date(2026, 10, 12))
+    assert monday != client_order_ids(orders, trading_day=date(2026, 10, 13))
+    assert client_order_ids(orders, batch_id="rebal-q4")[0].startswith("rebal-q4-0-")
+    assert client_order_ids(orders, batch_id="rebal-q4") == client_order_ids(
+        orders, batch_id="rebal-q4", trading_day=date(2026, 10, 13))
@@ -0,0 +1,102 @@
+# test_order_book.py
+#
+# Tests for the sorted-array level 2 order book
+# Location: /tests/test_order_book.py
+# Purpose: Checks snapshot and incremental update merges (removals, repeated levels,
+#          inserts on both sides) against a dictionary book, and the depth, mid-price
+#          and fill-price reads.
+
+import numpy as np
+import pytest
+
+from order_book import L2Book
+
+
+def raw(bids=(), asks=(), reset=False):
+    message = {"b": [{"p": p, "s": s} for p, s in bids], "a": [{"p": p, "s": s} for p, s in asks], "t": "t"}
+    if reset:
+        message["r"] = True
+    return message
+
+
+def as_lists(book):
+    bids, asks = book.sides()
+    return list(zip(bids.price.tolist(), bids.size.tolist())), list(zip(asks.price.tolist(), asks.size.tolist()))
+
+
+def test_snapshot_is_sorted_best_first():
+    book = L2Book.from_raw(raw(bids=[(99.0, 1), (100.0, 2), (98.5, 3)], asks=[(101.5, 1), (101.0, 4)], reset=True))
+
+    assert as_lists(book) == ([(100.0, 2), (99.0, 1), (98.5, 3)], [(101.0, 4), (101.5, 1)])
+    assert book.best() == (100.0, 101.0) and book.mid() == 100.5
+    assert book.levels() == (3, 2)
+
+
+def test_update_changes_inserts_and_removes_levels():
+    book = L2Book.from_raw(raw(bids=[(100.0, 2), (99.0, 1)], asks=[(101.0, 4), (102.0, 1)], reset=True))
+
+    book.apply_raw(raw(bids=[(99.0, 0), (99.5, 5), (100.0, 3)], asks=[(100.5, 1), (102.0, 0)]))
+
+    assert as_lists(book) == ([(100.0, 3), (99.5, 5)], [(100.5, 1), (101.0, 4)])
+    # Removing a level that is not in the book is a no-op
+    book.apply_raw(raw(asks=[(105.0, 0)]))
+    assert book.levels() == (2, 2)
+
+
+def test_last_duplicate_in_one_update_wins():
+    book = L2Book.from_raw(raw(bids=[(100.0, 2)], asks=[(101.0, 4)], reset=True))
+
+    book.apply_raw(raw(bids=[(99.0, 1), (99.0, 7)], asks=[(101.0, 0), (101.0, 6), (102.0, 2), (102.0, 0)]))
+
+    assert as_lists(book) == ([(100.0, 2), (99.0, 7)], [(101.0, 6)])
+
+
+def test_reset_message_replaces_the_book():
+    book = L2Book.from_raw(raw(bids=[(100.0, 2)], asks=[(101.0, 4)], reset=True))
+    book.apply_raw(raw(bids=[(90.0, 1)], asks=[(91.0, 1)], reset=True))
+
+    assert as_lists(book) == ([(90.0, 1)], [(91.0, 1)])
+
+
+def test_random_updates_match_a_dictionary_book():
+    rng = np.random.default_rng(3)
+    book = L2Book()
+    expected = {"b": {}, "a": {}}
+    for step in range(300):
+        update = {}
+        for side, low in (("b", 90), ("a", 101)):
+            prices = (low + rng.integers(0, 20, 8) * 0.5).tolist()
+            sizes = np.where(rng.random(8) < 0.3, 0, rng.integers(1, 9, 8)).astype(float).tolist()
+            update[side] = list(zip(prices, sizes))
+            for price, size in update[side]:
+                if size:
+                    expected[side][price] = size
+                else:
+                    expected[side].pop(price, None)
+        book.apply_raw(raw(bids=update["b"], asks=update["a"]))
+
+    bids, asks = as_lists(book)
+    assert bids == sorted(expected["b"].items(), reverse=True)
+    assert asks == sorted(expected["a"].items())
+
+
+def test_depth_within_band():
+    book = L2Book.from_raw(raw(bids=[(99.9, 1), (99.0, 2)], asks=[(100.1, 3), (101.0, 4)], reset=True))
+
+    assert book.depth_within(20) == (1.0, 3.0)
+    assert book.depth_within(200) == (3.0, 7.0)
+
+
+def test_fill_price_walks_levels_and_reports_partial_fills():
+    book = L2Book.from_raw(raw(bids=[(100.0, 1), (99.0, 2)], asks=[(101.0, 1), (102.0, 2)], reset=True))
+
+    assert book.fill_price("buy", qty=1) == (101.0, 1.0)
+    price, filled = book.fill_price("buy", qty=2)
+    assert filled == 2.0 and price == pytest.approx(101.5)
+    # Deeper than the visible book: fills what is there
+    price, filled = book.fill_price("sell", qty=5)
+    assert filled == 3.0 and price == pytest.approx((100.0 + 2 * 99.0) / 3)
+    # Notional: 101 for the first unit, then 102 buys one more
+    price, filled = book.fill_price("buy", notional=203.0)
+    assert filled == pytest.approx(2.0) and price == pytest.approx(101.5)
+    assert L2Book().fill_price("buy", qty=1) == (None, 0.0)
@@ -0,0 +1,270 @@
+# test_order_mirror.py
+#
+# Tests for the trade-updates-fed order mirror
+# Location: /tests/test_order_mirror.py
+# Purpose: Drives OrderMirror with a fake trading stream and fake REST order listings
+#          and checks update ordering, reconciliation, the covered-history fallback of
+#          query(), paging of open orders, position snapshot invalidation and
+#          reconciliation backoff.
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import order_mirror
+from order_mirror import CLOSED_STATUSES, OrderMirror
+
+T0 = datetime(2026, 10, 12, 14, 0, tzinfo=timezone.utc)
+
+
+def order(id, status="new", minute=0, updated_minute=None, symbol="AAPL", side="buy"):
+    submitted = T0 + timedelta(minutes=minute)
+    updated = T0 + timedelta(minutes=minute if updated_minute is None else updated_minute)
+    return SimpleNamespace(id=id, client_order_id=f"cid-{id}", symbol=symbol, side=side, status=status,
+                           submitted_at=submitted, created_at=submitted, updated_at=updated)
+
+
+def update(event, order, execution_id=None, position_qty=None):
+    return SimpleNamespace(event=event, order=order, execution_id=execution_id, price=100.0, qty=1.0,
+                           position_qty=position_qty, timestamp=order.updated_at)
+
+
+class FakeTradingStream:
+    """Stands in for TradingStream: 'connected' while run() is blocked, with a fresh _ws per run."""
+
+    def __init__(self):
+        self._running = False
+        self._ws = None
+        self._stop = threading.Event()
+        self.handlers = []
+
+    def subscribe_trade_updates(self, handler):
+        self.handlers.append(handler)
+
+    def run(self):
+        self._ws = object()
+        self._running = True
+        self._stop.wait()
+        self._running = False
+
+    def stop(self):
+        self._stop.set()
+
+
+class FakeOrdersAPI:
+    """REST order listing (newest first, like GET /v2/orders) and lookup by id, with call counters."""
+
+    def __init__(self, orders=()):
+        self.orders = {o.id: o for o in orders}
+        # Orders only reachable by id (e.g. closed further back than the listed history)
+        self.unlisted = set()
+        self.listings = []
+        self.lookups = []
+        self.error = None
+
+    def fetch_orders(self, status, limit, until):
+        self.listings.append(status)
+        if self.error:
+            raise self.error
+        rows = [o for o in self.orders.values() if (o.status in CLOSED_STATUSES) == (status == "closed")
+                and o.id not in self.unlisted and (until is None or o.submitted_at < until)]
+        return sorted(rows, key=lambda o: o.submitted_at, reverse=True)[:limit]
+
+    def fetch_order(self, order_id):
+        self.lookups.append(order_id)
+        return self.orders[order_id]
+
+
+@pytest.fixture
+def api():
+    return FakeOrdersAPI()
+
+
+@pytest.fixture
+def make_mirror(api):
+    mirrors = []
+
+    def make(**kwargs):
+        mirror = OrderMirror(FakeTradingStream(), api.fetch_orders, api.fetch_order, **kwargs)
+        mirror.runner.start()
+        assert wait_for(mirror.runner.is_connected)
+        mirrors.append(mirror)
+        return mirror
+
+    yield make
+    for mirror in mirrors:
+        mirror.runner.stop()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def ids(orders):
+    return [o.id for o in orders]
+
+
+def test_not_ready_until_reconciled(make_mirror):
+    mirror = make_mirror()
+    assert mirror.query() is None and mirror.get("a") is None
+    mirror.reconcile()
+    assert mirror.ready() and mirror.query() == []
+
+
+def test_older_update_does_not_overwrite_newer(make_mirror):
+    mirror = make_mirror()
+    mirror.reconcile()
+
+    mirror.apply(update("fill", order("a", "filled", minute=0, updated_minute=5), execution_id="x1"))
+    mirror.apply(update("new", order("a", "new", minute=0, updated_minute=1)))
+
+    assert mirror.get("a").status == "filled"
+    assert mirror.get(client_order_id="cid-a").status == "filled"
+    assert ids(mirror.query(status="open")) == []
+    assert ids(mirror.query(status="closed")) == ["a"]
+    assert mirror.stats()["events"] == 2
+
+
+def test_repeated_execution_is_one_fill(make_mirror):
+    mirror = make_mirror()
+    mirror.reconcile()
+    filled = order("a", "filled", updated_minute=2)
+
+    mirror.apply(update("fill", filled, execution_id="x1"))
+    mirror.apply(update("fill", filled, execution_id="x1"))
+
+    assert [fill.execution_id for fill in mirror.fills()] == ["x1"]
+
+
+def test_reconcile_refetches_stale_open_orders(api, make_mirror):
+    mirror = make_mirror()
+    mirror.reconcile()
+    mirror.apply(update("new", order("a", "new", minute=1)))
+    mirror.apply(update("fill", order("b", "filled", minute=2), execution_id="x1"))
+    # Canceled while the stream was down, and no longer in either listing
+    api.orders["a"] = order("a", "canceled", minute=1, updated_minute=3)
+    api.orders["c"] = order("c", "new", minute=4)
+    api.unlisted = {"a"}
+
+    mirror.reconcile()
+
+    # Only the open order missing from both listings is looked up; closed orders are final
+    assert api.lookups == ["a"]
+    assert mirror.get("a").status == "canceled"
+    assert ids(mirror.query(status="open")) == ["c"]
+
+
+@pytest.fixture
+def covered(api, make_mirror):
+    # Five closed orders but only the newest three fit in the reconciled history
+    api.orders = {f"c{i}": order(f"c{i}", "filled", minute=i) for i in range(1, 6)}
+    api.orders["o9"] = order("o9", "new", minute=9)
+    mirror = make_mirror(history=3)
+    mirror.reconcile()
+    return mirror
+
+
+def test_covered_window_serves_newest_orders(covered):
+    assert ids(covered.query(status="closed", limit=2)) == ["c5", "c4"]
+    assert ids(covered.query(status="all", limit=3)) == ["o9", "c5", "c4"]
+    assert covered.stats()["covered_since"] == T0 + timedelta(minutes=3)
+
+
+def test_limit_beyond_covered_window_falls_back(covered):
+    assert covered.query(status="closed", limit=4) is None
+    assert covered.query(status="all", limit=10) is None
+    assert ids(covered.query(status="open", limit=10)) == ["o9"]
+
+
+def test_ascending_listing_falls_back_unless_after_is_covered(covered):
+    assert covered.query(status="closed", direction="asc") is None
+    after = T0 + timedelta(minutes=3, seconds=30)
+    assert ids(covered.query(status="closed", direction="asc", after=after)) == ["c4", "c5"]
+
+
+def test_full_history_serves_any_listing(api, make_mirror):
+    api.orders = {f"c{i}": order(f"c{i}", "filled", minute=i) for i in range(1, 4)}
+    mirror = make_mirror(history=10)
+    mirror.reconcile()
+
+    assert ids(mirror.query(status="closed", direction="asc", limit=10)) == ["c1", "c2", "c3"]
+    assert ids(mirror.query(status="closed", until=T0 + timedelta(minutes=3))) == ["c2", "c1"]
+
+
+def test_open_order_pages_overlap_on_shared_timestamps(api, make_mirror, monkeypatch):
+    monkeypatch.setattr(order_mirror, "ORDERS_PAGE_LIMIT", 3)
+    # A page's worth of orders share the timestamp at the first page's boundary
+    minutes = [9, 8, 5, 5, 5, 2, 1]
+    api.orders = {f"o{i}": order(f"o{i}", minute=minute) for i, minute in enumerate(minutes)}
+    mirror = make_mirror()
+
+    mirror.reconcile()
+
+    assert sorted(ids(mirror.query(status="open", limit=100))) == sorted(api.orders)
+    assert api.listings.count("open") == 3
+
+
+def test_fill_discards_positions_snapshot_taken_before_it(make_mirror):
+    mirror = make_mirror()
+    mirror.reconcile()
+    generation = mirror.position_generation
+
+    # A fill lands while the REST positions request is in flight
+    mirror.apply(update("fill", order("a", "filled", updated_minute=1), execution_id="x1", position_qty=10))
+    mirror.store_positions([SimpleNamespace(symbol="AAPL", qty="9")], generation)
+    assert mirror.positions() is None
+
+    mirror.store_positions([SimpleNamespace(symbol="AAPL", qty="10")], mirror.position_generation)
+    assert [p.qty for p in mirror.positions()] == ["10"]
+
+    mirror.apply(update("partial_fill", order("b", "partially_filled", updated_minute=2), execution_id="x2"))
+    assert mirror.positions() is None
+
+
+def test_failed_reconciliation_backs_off(api, make_mirror):
+    mirror = make_mirror(backoff_base=0.05, backoff_max=0.2)
+    api.error = RuntimeError("forbidden")
+    connection = mirror._step(None)
+    assert connection is mirror.runner.stream._ws
+
+    delays = []
+    for _ in range(5):
+        calls = len(api.listings)
+        mirror._step(connection)
+        assert len(api.listings) == calls + 1
+        delays.append(mirror.stats()["retry_in"])
+        # Retrying right away is held back
+        mirror._step(connection)
+        assert len(api.listings) == calls + 1
+        time.sleep(delays[-1] + 0.01)
+
+    assert mirror.stats()["consecutive_errors"] == mirror.reconcile_errors == 5
+    for got, expected in zip(delays, [0.05, 0.1, 0.2, 0.2, 0.2]):
+        assert expected - 0.02 <= got <= expected
+    assert mirror.last_error == "forbidden"
+
+    api.error = None
+    mirror._step(connection)
+    assert mirror.ready()
+    assert mirror.stats()["consecutive_errors"] == 0 and mirror.stats()["retry_in"] is None
+
+
+def test_reconnect_requires_new_reconciliation(make_mirror):
+    mirror = make_mirror()
+    connection = mirror._step(None)
+    mirror._step(connection)
+    assert mirror.ready()
+
+    mirror.runner.stream._ws = object()
+    connection = mirror._step(connection)
+    assert not mirror.ready()
+    mirror._step(connection)
+    assert mirror.ready()
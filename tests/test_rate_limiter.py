@@ -0,0 +1,169 @@
+# test_rate_limiter.py
+#
+# Tests for the per-family request budget and 429 handling
+# Location: /tests/test_rate_limiter.py
+# Purpose: Runs the pooled transport against a local HTTP stub that answers 429 with
+#          Retry-After and checks the backoff, retry count and wait metrics, and
+#          checks that order requests are served ahead of market data in TokenBucket.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from alpaca.common.exceptions import APIError
+from alpaca.common.rest import RESTClient
+
+import http_transport
+from http_transport import PooledTransportMixin, configure_rate_limits
+from rate_limiter import (FAMILY_MARKET_DATA, FAMILY_TRADING, PRIORITY_DATA, PRIORITY_ORDERS,
+                          RateLimiter, TokenBucket, retry_after_seconds)
+
+
+class StubAPI:
+    """Local HTTP server answering each request with the next scripted (status, headers) reply."""
+
+    def __init__(self):
+        self.replies = []
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append((time.monotonic(), self.path))
+                status, headers = stub.replies.pop(0) if stub.replies else (200, {})
+                body = json.dumps({"status": status}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def gaps(self):
+        """Seconds between consecutive requests."""
+        times = [at for at, _ in self.requests]
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+class StubClient(PooledTransportMixin, RESTClient):
+    rate_limit_family = FAMILY_TRADING
+
+
+@pytest.fixture
+def stub():
+    stub = StubAPI()
+    yield stub
+    stub.server.shutdown()
+
+
+@pytest.fixture
+def limiter():
+    previous = http_transport.get_rate_limiter()
+    limiter = RateLimiter({FAMILY_TRADING: 6000}, backoff_base=0.05)
+    configure_rate_limits(limiter)
+    yield limiter
+    configure_rate_limits(previous)
+
+
+def client_for(stub, retry_attempts=3):
+    return StubClient(stub.url, api_key="key", secret_key="secret", retry_attempts=retry_attempts)
+
+
+def test_429_is_retried_after_retry_after(stub, limiter):
+    stub.replies = [(429, {"Retry-After": "0.3"}), (429, {"Retry-After": "0.2"}), (200, {})]
+
+    assert client_for(stub).get("/account") == {"status": 200}
+
+    assert len(stub.requests) == 3
+    # Retry-After plus up to backoff_base of jitter
+    first, second = stub.gaps()
+    assert 0.3 <= first < 0.3 + 0.05 + 0.1
+    assert 0.2 <= second < 0.2 + 0.05 + 0.1
+    stats = limiter.stats()[FAMILY_TRADING]
+    assert (stats["rate_limited"], stats["retries"]) == (2, 2)
+
+
+def test_retries_stop_after_the_retry_budget(stub, limiter):
+    stub.replies = [(429, {"Retry-After": "0"})] * 5
+
+    with pytest.raises(APIError):
+        client_for(stub, retry_attempts=2).get("/account")
+
+    assert len(stub.requests) == 3
+    stats = limiter.stats()[FAMILY_TRADING]
+    assert (stats["rate_limited"], stats["retries"]) == (3, 2)
+
+
+def test_exhausted_budget_makes_the_next_request_wait(stub, limiter):
+    reset = time.time() + 0.4
+    stub.replies = [(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": f"{reset:.3f}"}), (200, {})]
+    client = client_for(stub)
+
+    client.get("/account")
+    client.get("/account")
+
+    assert stub.gaps()[0] >= 0.3
+    stats = limiter.stats()[FAMILY_TRADING]
+    assert stats["throttled"] == 1 and stats["acquired"] == 2
+    assert 300 <= stats["max_wait_ms"] == stats["avg_wait_ms"]
+    assert stats["wait_ms_by_priority"]["trading"] == stats["max_wait_ms"]
+
+
+def test_unlimited_family_is_not_throttled(limiter):
+    assert limiter.bucket(FAMILY_MARKET_DATA) is None
+    assert limiter.acquire(FAMILY_MARKET_DATA, PRIORITY_DATA) == 0.0
+
+
+def test_retry_after_formats():
+    assert retry_after_seconds({"Retry-After": "2"}) == 2.0
+    assert retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:05 GMT"},
+                               now=1445412480.0) == 5.0
+    assert retry_after_seconds({"X-RateLimit-Reset": "1010"}, now=1000.0) == 10.0
+    assert retry_after_seconds({}) is None
+
+
+def drain(bucket):
+    while bucket.try_acquire(PRIORITY_ORDERS) == 0.0:
+        pass
+
+
+def test_orders_are_served_before_market_data():
+    # 10 tokens per second, so a waiter gets the next token after about 0.1 s
+    bucket = TokenBucket(FAMILY_TRADING, per_minute=600)
+    drain(bucket)
+    served = []
+
+    def take(priority, name):
+        bucket.acquire(priority)
+        served.append(name)
+
+    data = threading.Thread(target=take, args=(PRIORITY_DATA, "data"))
+    orders = threading.Thread(target=take, args=(PRIORITY_ORDERS, "orders"))
+    data.start()
+    time.sleep(0.02)
+    orders.start()
+    data.join(5)
+    orders.join(5)
+
+    assert served == ["orders", "data"]
+    assert bucket.stats()["wait_ms_by_priority"].keys() == {"orders", "data"}
+
+
+def test_reserve_is_kept_for_orders():
+    bucket = TokenBucket(FAMILY_TRADING, per_minute=60, reserve=2)
+    bucket._tokens = 2.5
+
+    assert bucket.try_acquire(PRIORITY_DATA) > 0
+    assert bucket.try_acquire(PRIORITY_ORDERS) == 0.0
+    assert bucket.try_acquire(PRIORITY_ORDERS) == 0.0
@@ -0,0 +1,59 @@
+# test_scanner.py
+#
+# Tests for the vectorized market scanner
+# Location: /tests/test_scanner.py
+# Purpose: Checks metric columns built from snapshots, condition parsing and that a
+#          metric missing for a symbol fails every condition, != included.
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from scanner import parse_conditions, scan, snapshot_table
+
+
+def snapshot(price, open_, prev_close=None, volume=1_000.0, prev_volume=500.0):
+    daily = SimpleNamespace(open=open_, high=open_ * 1.02, low=open_ * 0.98, close=price, volume=volume, vwap=price)
+    previous = None if prev_close is None else SimpleNamespace(close=prev_close, volume=prev_volume)
+    return SimpleNamespace(latest_trade=SimpleNamespace(price=price),
+                           latest_quote=SimpleNamespace(bid_price=price - 0.01, ask_price=price + 0.01),
+                           daily_bar=daily, minute_bar=None, previous_daily_bar=previous)
+
+
+@pytest.fixture
+def table():
+    return snapshot_table([snapshot(103.0, 102.0, prev_close=100.0),
+                           snapshot(51.0, 50.0),                      # no previous daily bar
+                           snapshot(20.0, 20.0, prev_close=20.0)])
+
+
+def test_metrics(table):
+    assert table["gap_pct"][0] == pytest.approx(2.0)
+    assert table["change_pct"][0] == pytest.approx(3.0)
+    assert table["volume_ratio"][0] == pytest.approx(2.0)
+    assert np.isnan(table["gap_pct"][1]) and np.isnan(table["minute_volume"]).all()
+
+
+@pytest.mark.parametrize("condition", ["gap_pct != 2", "gap_pct == 2", "gap_pct > -100", "gap_pct <= 100"])
+def test_missing_metric_fails_every_condition(table, condition):
+    ranked, matched = scan(table, parse_conditions([condition]))
+    assert 1 not in ranked.tolist()
+
+
+def test_not_equal_still_matches_other_values(table):
+    ranked, matched = scan(table, parse_conditions(["gap_pct != 0"]))
+    assert ranked.tolist() == [0] and matched == 1
+
+
+def test_ranking_and_top(table):
+    ranked, matched = scan(table, parse_conditions(["price > 10"]), sort_by="change_pct", top=2)
+    assert matched == 3
+    assert ranked.tolist() == [0, 2]
+
+
+def test_invalid_condition():
+    with pytest.raises(ValueError, match="Unknown metric"):
+        parse_conditions(["beta > 1"])
+    with pytest.raises(ValueError, match="Invalid condition"):
+        parse_conditions(["gap_pct >> 1"])
@@ -0,0 +1,50 @@
+# test_sdk_executor.py
+#
+# Tests for the thread-pool dispatch layer
+# Location: /tests/test_sdk_executor.py
+# Purpose: Checks that lane concurrency caps hold and that one executor keeps working
+#          across several event loops (repeated asyncio.run calls from the CLI and tests).
+
+import asyncio
+import threading
+import time
+
+from sdk_executor import SDKExecutor
+
+
+def test_lane_limit_caps_concurrent_calls():
+    executor = SDKExecutor(max_workers=8, client_limits={"trading": 2})
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(executor.run("trading", call) for _ in range(6)))
+
+    assert asyncio.run(main()) == ["ok"] * 6
+    assert max(peak) == 2
+    assert executor.stats()["trading"]["completed"] == 6
+    executor.shutdown(wait=True)
+
+
+def test_executor_survives_a_new_event_loop():
+    executor = SDKExecutor(max_workers=2, default_limit=1)
+
+    async def main(value):
+        # Two calls contend for the lane, so the second waits on the semaphore
+        return await asyncio.gather(executor.run("stock_data", lambda: value),
+                                    executor.run("stock_data", lambda: value + 1))
+
+    assert asyncio.run(main(1)) == [1, 2]
+    assert asyncio.run(main(10)) == [10, 11]
+    assert executor.stats()["stock_data"]["completed"] == 4
+    executor.shutdown(wait=True)
@@ -0,0 +1,85 @@
+# test_server_startup.py
+#
+# Tests for what happens on import and on AlpacaMCPServer.run
+# Location: /tests/test_server_startup.py
+# Purpose: Checks that importing the server has no network side effects and that the
+#          packaged entry point starts the background services for every transport.
+
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import CORE, ROOT
+
+
+def import_isolated(code, **env):
+    """Run code after importing the server in a fresh interpreter and return its stdout lines."""
+    environment = dict(os.environ, ALPACA_API_KEY="test-key", ALPACA_SECRET_KEY="test-secret", **env)
+    prelude = (f"import sys; sys.path[:0] = [{CORE!r}, {ROOT!r}]\n"
+               "import alpaca_mcp_server as server\n")
+    result = subprocess.run([sys.executable, "-c", prelude + code], capture_output=True, text=True,
+                            timeout=60, env=environment, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_import_does_not_start_streams():
+    out = import_isolated(
+        "print(server.stock_data_cache.runner.is_alive(), len(server.stock_data_cache._symbols))",
+        ALPACA_STREAM_QUOTES="true", ALPACA_STREAM_SYMBOLS="SPY,AAPL")
+    assert out == ["False", "0"]
+
+
+# Tool-group helpers that pull in numpy, and the stream caches, are imported only when used or enabled
+DEFERRED_MODULES = ["history_stream", "trade_aggregation", "streaming", "order_book", "order_mirror", "numpy"]
+
+
+def test_import_defers_heavy_modules():
+    out = import_isolated(f"print(*[name in sys.modules for name in {DEFERRED_MODULES!r}])")
+    assert out == ["False"] * len(DEFERRED_MODULES)
+
+
+class FakeMCP:
+    def __init__(self):
+        self.settings = SimpleNamespace(host=None, port=None)
+        self.runs = []
+
+    def run(self, transport="stdio"):
+        self.runs.append(transport)
+
+
+@pytest.mark.parametrize("transport", ["stdio", "http", "sse"])
+def test_run_starts_background_services(transport, server_package, monkeypatch):
+    monkeypatch.setenv("MCP_CLIENT", "pycharm")
+    started = []
+    server = server_package.AlpacaMCPServer.__new__(server_package.AlpacaMCPServer)
+    server._clients_initialized = True
+    server.mcp = FakeMCP()
+    server._original_server = SimpleNamespace(
+        start_client_prewarm=lambda: started.append("prewarm"),
+        start_metrics_dump=lambda: started.append("metrics"),
+        start_streams=lambda: started.append("streams"),
+        start_order_mirror=lambda: started.append("order_mirror"))
+
+    server.run(transport=transport)
+
+    assert {"prewarm", "streams", "order_mirror"} <= set(started)
+    assert server.mcp.runs == ["stdio" if transport == "stdio" else
+                               "streamable-http" if transport == "http" else "sse"]
+
+
+def test_mirror_reconciliation_goes_through_the_trading_lane(server_module, monkeypatch):
+    calls = []
+    stub = SimpleNamespace(get_orders=lambda request: calls.append(request) or [],
+                           get_order_by_id=lambda order_id: calls.append(order_id) or order_id)
+    monkeypatch.setattr(server_module, "trade_client", stub)
+    lane = server_module.sdk_executor.stats().get("trading", {"completed": 0})
+
+    assert server_module._fetch_mirror_orders("open", 500, None) == []
+    assert server_module._fetch_mirror_order("abc") == "abc"
+
+    assert calls[0].limit == 500 and calls[1] == "abc"
+    assert server_module.sdk_executor.stats()["trading"]["completed"] == lane["completed"] + 2
@@ -0,0 +1,175 @@
+# test_streaming.py
+#
+# Tests for the websocket-fed latest stock and crypto data caches
+# Location: /tests/test_streaming.py
+# Purpose: Runs real StockDataStream and CryptoDataStream clients against a local msgpack
+#          websocket server that speaks the market data protocol, and checks that the
+#          caches serve streamed quotes, trades, bars and order books and miss once data
+#          is stale or the stream is disconnected or has reconnected.
+
+import time
+
+import msgpack
+import pytest
+
+from alpaca.data.enums import CryptoFeed, DataFeed
+from alpaca.data.live.crypto import CryptoDataStream
+from alpaca.data.live.stock import StockDataStream
+
+from conftest import FakeMarketDataServer, wait_for
+from streaming import LatestCryptoDataCache, LatestStockDataCache
+
+
+NOW = msgpack.Timestamp.from_unix(time.time())
+QUOTE = {"T": "q", "S": "AAPL", "bx": "V", "bp": 189.5, "bs": 3, "ax": "V", "ap": 189.6, "as": 2,
+         "c": ["R"], "z": "C", "t": NOW}
+TRADE = {"T": "t", "S": "AAPL", "i": 7, "x": "V", "p": 189.55, "s": 100, "c": ["@"], "z": "C", "t": NOW}
+BAR = {"T": "b", "S": "AAPL", "o": 189.0, "h": 190.0, "l": 188.5, "c": 189.55, "v": 12_000, "n": 140,
+       "vw": 189.4, "t": NOW}
+
+
+@pytest.fixture
+def server():
+    server = FakeMarketDataServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_cache(server):
+    caches = []
+
+    def make(**kwargs):
+        stream = StockDataStream("key", "secret", feed=DataFeed.IEX, url_override=server.url)
+        cache = LatestStockDataCache(stream, feed="iex", **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.runner.stop()
+
+
+def subscribe_and_connect(server, cache, symbols):
+    assert cache.subscribe(symbols) == symbols
+    assert wait_for(lambda: cache.runner.is_connected() and server.subscriptions)
+
+
+def test_serves_streamed_quote_trade_and_bar(server, make_cache):
+    cache = make_cache()
+    subscribe_and_connect(server, cache, ["AAPL"])
+    request = server.subscriptions[-1]
+    assert request["quotes"] == request["trades"] == request["bars"] == ["AAPL"]
+
+    assert cache.get_quote("AAPL") is None
+    server.push(QUOTE, TRADE, BAR)
+    assert wait_for(lambda: cache.messages == 3)
+
+    quote, trade, bar = cache.get_quote("AAPL"), cache.get_trade("AAPL"), cache.get_bar("AAPL")
+    assert (quote.symbol, quote.bid_price, quote.ask_price, quote.ask_size) == ("AAPL", 189.5, 189.6, 2)
+    assert (trade.price, trade.size, trade.id) == (189.55, 100, 7)
+    assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (189.0, 190.0, 188.5, 189.55, 12_000)
+    assert cache.get_quote("MSFT") is None
+    assert cache.stats()["hits"] == 3
+
+
+def test_subscriptions_are_bounded(server, make_cache):
+    cache = make_cache(max_symbols=2)
+    assert cache.subscribe(["AAPL", "MSFT", "NVDA"]) == ["AAPL", "MSFT"]
+    assert not cache.wants("NVDA")
+    assert cache.subscribe(["AAPL"]) == []
+
+
+def test_stale_data_falls_back(server, make_cache):
+    cache = make_cache(quote_max_age=0.2, bar_max_age=60)
+    subscribe_and_connect(server, cache, ["AAPL"])
+    server.push(QUOTE, BAR)
+    assert wait_for(lambda: cache.messages == 2)
+    assert cache.get_quote("AAPL") is not None
+
+    time.sleep(0.3)
+    assert cache.get_quote("AAPL") is None
+    assert cache.get_bar("AAPL") is not None
+    assert cache.stats()["stale"] == 1
+
+
+def test_disconnect_falls_back(server, make_cache):
+    cache = make_cache()
+    subscribe_and_connect(server, cache, ["AAPL"])
+    server.push(QUOTE)
+    assert wait_for(lambda: cache.messages == 1)
+    assert cache.get_quote("AAPL") is not None
+
+    server.drop_clients()
+    assert wait_for(lambda: not cache.runner.is_connected())
+    assert cache.get_quote("AAPL") is None
+    assert cache.stats()["connected"] is False
+
+
+def book_message(bids, asks, reset=False):
+    message = {"T": "o", "S": "BTC/USD", "t": NOW, "b": [{"p": p, "s": s} for p, s in bids],
+               "a": [{"p": p, "s": s} for p, s in asks]}
+    if reset:
+        message["r"] = True
+    return message
+
+
+@pytest.fixture
+def crypto_cache(server):
+    stream = CryptoDataStream("key", "secret", raw_data=True, feed=CryptoFeed.US, url_override=server.url)
+    # Reconnect quickly after the fake server drops the connection
+    stream._reconnect_min_backoff = stream._reconnect_max_backoff = 0.05
+    cache = LatestCryptoDataCache(stream, decode_quote=dict, decode_trade=dict, feed="us")
+    yield cache
+    cache.runner.stop()
+
+
+def test_crypto_book_follows_snapshot_and_updates(server, crypto_cache):
+    subscribe_and_connect(server, crypto_cache, ["BTC/USD"])
+    assert server.subscriptions[-1]["orderbooks"] == ["BTC/USD"]
+
+    # An update without a snapshot on this connection is ignored
+    server.push(book_message([(64_000.0, 1.0)], []))
+    server.push(book_message([(64_000.0, 1.0), (63_990.0, 2.0)], [(64_010.0, 0.5), (64_020.0, 1.5)], reset=True))
+    server.push(book_message([(63_990.0, 0.0), (63_995.0, 3.0), (63_995.0, 4.0)], [(64_005.0, 0.25)]))
+    assert wait_for(lambda: crypto_cache.book_updates == 2)
+
+    bids, asks = crypto_cache.get_book("BTC/USD").sides()
+    assert list(zip(bids.price.tolist(), bids.size.tolist())) == [(64_000.0, 1.0), (63_995.0, 4.0)]
+    assert asks.price.tolist() == [64_005.0, 64_010.0, 64_020.0]
+    assert crypto_cache.get_book("ETH/USD") is None
+
+
+def test_crypto_quote_and_trade_are_decoded_on_read(server, crypto_cache):
+    subscribe_and_connect(server, crypto_cache, ["BTC/USD"])
+    server.push({"T": "q", "S": "BTC/USD", "bp": 64_000.0, "bs": 1.0, "ap": 64_010.0, "as": 0.5, "t": NOW},
+                {"T": "t", "S": "BTC/USD", "p": 64_005.0, "s": 0.1, "i": 9, "tks": "B", "t": NOW})
+    assert wait_for(lambda: crypto_cache.messages == 2)
+
+    assert crypto_cache.get_quote("BTC/USD")["ap"] == 64_010.0
+    assert crypto_cache.get_trade("BTC/USD")["p"] == 64_005.0
+    assert crypto_cache.get_quote("ETH/USD") is None
+
+
+def test_crypto_book_is_stale_after_reconnect_until_new_snapshot(server, crypto_cache):
+    subscribe_and_connect(server, crypto_cache, ["BTC/USD"])
+    server.push(book_message([(64_000.0, 1.0)], [(64_010.0, 1.0)], reset=True))
+    assert wait_for(lambda: crypto_cache.book_updates == 1)
+    assert crypto_cache.get_book("BTC/USD") is not None
+    first_connection = crypto_cache.runner.stream._ws
+
+    server.subscriptions.clear()
+    server.drop_clients(refuse=False)
+    assert wait_for(lambda: crypto_cache.runner.is_connected() and server.subscriptions
+                    and crypto_cache.runner.stream._ws is not first_connection)
+    assert crypto_cache.get_book("BTC/USD") is None
+
+    # Updates on the new connection do not revive the old snapshot
+    server.push(book_message([(63_000.0, 1.0)], []))
+    time.sleep(0.1)
+    assert crypto_cache.get_book("BTC/USD") is None
+
+    server.push(book_message([(63_500.0, 2.0)], [(63_510.0, 1.0)], reset=True))
+    assert wait_for(lambda: crypto_cache.get_book("BTC/USD") is not None)
+    assert crypto_cache.get_book("BTC/USD").best() == (63_500.0, 63_510.0)
+    assert crypto_cache.stats()["stale"] >= 2
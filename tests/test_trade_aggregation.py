@@ -0,0 +1,97 @@
+# test_trade_aggregation.py
+#
+# Tests for the streaming trade aggregators
+# Location: /tests/test_trade_aggregation.py
+# Purpose: Checks that folding trades page by page gives the same time, tick, volume
+#          and dollar bars and the same volume profile as folding them all at once,
+#          and checks bar thresholds and the value area against small hand-made cases.
+
+import numpy as np
+import pytest
+
+from trade_aggregation import BarAccumulator, VolumeProfile, parse_interval, trade_arrays, value_area
+
+SIZES = {"time": parse_interval("1Min"), "tick": 7, "volume": 900, "dollar": 50_000}
+
+
+def random_trades(count=2000, seed=7):
+    # Quarter-dollar prices and whole sizes keep every sum exact, whatever the grouping
+    rng = np.random.default_rng(seed)
+    stamps = np.cumsum(rng.integers(1, 400, count)) * 10**8 + 1_700_000_000 * 10**9
+    price = 100.0 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], count))
+    size = rng.integers(1, 200, count).astype(np.float64)
+    return stamps.astype(np.int64), price, size
+
+
+def pages(count, seed=11):
+    """Random page boundaries, including pages that start in the middle of a bar."""
+    rng = np.random.default_rng(seed)
+    cuts = np.sort(rng.choice(np.arange(1, count), 40, replace=False))
+    return list(zip(np.r_[0, cuts], np.r_[cuts, count]))
+
+
+@pytest.mark.parametrize("bar_type", sorted(SIZES))
+def test_paged_bars_match_one_pass(bar_type):
+    stamps, price, size = random_trades()
+    whole = BarAccumulator(bar_type, SIZES[bar_type])
+    whole.add(stamps, price, size)
+    paged = BarAccumulator(bar_type, SIZES[bar_type])
+    for start, end in pages(len(stamps)):
+        paged.add(stamps[start:end], price[start:end], size[start:end])
+
+    assert paged.trades == whole.trades == len(stamps)
+    np.testing.assert_array_equal(paged.bars(), whole.bars())
+    assert paged.bars()["trades"].sum() == len(stamps)
+    assert len(np.unique(paged.bars()["key"])) == len(paged.bars())
+
+
+def test_single_trade_pages_match_one_pass():
+    stamps, price, size = random_trades(count=300)
+    whole = BarAccumulator("volume", 500)
+    whole.add(stamps, price, size)
+    paged = BarAccumulator("volume", 500)
+    for i in range(len(stamps)):
+        paged.add(stamps[i:i + 1], price[i:i + 1], size[i:i + 1])
+
+    np.testing.assert_array_equal(paged.bars(), whole.bars())
+
+
+def test_threshold_trade_closes_its_bar():
+    bars = BarAccumulator("volume", 10)
+    bars.add(np.arange(5), np.array([1.0, 2.0, 3.0, 4.0, 5.0]), np.array([4.0, 6.0, 3.0, 7.0, 1.0]))
+
+    result = bars.bars()
+    assert result["trades"].tolist() == [2, 2, 1]
+    assert result["volume"].tolist() == [10.0, 10.0, 1.0]
+    assert (result["open"].tolist(), result["close"].tolist()) == ([1.0, 3.0, 5.0], [2.0, 4.0, 5.0])
+
+
+def test_paged_profile_matches_one_pass():
+    stamps, price, size = random_trades()
+    whole = VolumeProfile(0.25)
+    whole.add(price, size)
+    paged = VolumeProfile(0.25)
+    for start, end in pages(len(price)):
+        paged.add(price[start:end], size[start:end])
+
+    for multiple in (1, 4):
+        for expected, actual in zip(whole.levels(multiple), paged.levels(multiple)):
+            np.testing.assert_array_equal(actual, expected)
+    assert paged.vwap == whole.vwap
+    assert paged.levels()[1].sum() == size.sum()
+
+
+def test_value_area_grows_toward_the_heavier_side():
+    prices = np.array([10.0, 11.0, 12.0, 13.0, 14.0])
+    volume = np.array([5.0, 10.0, 40.0, 30.0, 15.0])
+
+    assert value_area(prices, volume, 0.7) == (12.0, 12.0, 13.0)
+    assert value_area(prices, volume, 0.8) == (12.0, 12.0, 14.0)
+    assert value_area(prices, volume, 1.0) == (12.0, 10.0, 14.0)
+
+
+def test_trade_arrays_parse_nanosecond_times():
+    stamps, price, size = trade_arrays([{"t": "2024-01-02T15:30:00.123456789Z", "p": 10.5, "s": 3},
+                                        {"t": "2024-01-02T15:30:01Z", "p": 10.75}])
+    assert stamps.tolist() == [1704209400123456789, 1704209401000000000]
+    assert price.tolist() == [10.5, 10.75] and size.tolist() == [3.0, 0.0]